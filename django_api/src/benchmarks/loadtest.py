@@ -0,0 +1,283 @@
+import http.client
+import json
+import secrets
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+from uuid import uuid4
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import DEFAULT_DB_ALIAS
+from django.urls import reverse
+
+from benchmarks.reporting import latency_summary
+from core.metrics import DURATION_BUCKETS
+from documents.models import Document, DocumentChunk
+from documents.vectors import format_embedding
+from plans.models import Plan
+from queries.clients import LocalEmbeddingClient
+from users.models import User
+from users.services import TokenService
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+USERNAME_PREFIX = "loadtest-"
+# Gerada por execução: os usuários são semeados e removidos pelo mesmo processo
+LOADTEST_PASSWORD = secrets.token_urlsafe(16)
+SEED_CHUNKS = (
+    "A política de férias concede trinta dias corridos por ano.",
+    "O reembolso de despesas deve ser solicitado em até dez dias.",
+    "O expediente vai das 9h às 18h com uma hora de almoço.",
+)
+QUESTION = "Quantos dias de férias por ano?"
+
+
+@dataclass(frozen=True, slots=True)
+class SeedUser:
+    """Usuário semeado, com tokens emitidos antes da carga"""
+    email: str
+    access_token: str
+    refresh_token: str
+
+
+@dataclass(slots=True)
+class LoadTestSeed:
+    """Dados semeados para uma execução do loadtest"""
+    run_id: str
+    users: list[SeedUser]
+    created_plan: bool = False
+
+    def user(self, n: int) -> SeedUser:
+        return self.users[n % len(self.users)]
+
+
+@dataclass(frozen=True, slots=True)
+class Scenario:
+    """
+    Requisição roteirizada: ``build(seed, n)`` monta o corpo JSON (ou None)
+    e os headers da n-ésima requisição. Novos endpoints entram em SCENARIOS.
+    """
+    name: str
+    method: str
+    url_name: str
+    build: Callable[[LoadTestSeed, int], tuple[dict | None, dict[str, str]]]
+    expected_status: int = 200
+
+
+def _bearer(seed: LoadTestSeed, n: int) -> dict[str, str]:
+    return {"Authorization": f"Bearer {seed.user(n).access_token}"}
+
+
+def _register(seed: LoadTestSeed, n: int) -> tuple[dict, dict[str, str]]:
+    username = f"{USERNAME_PREFIX}{seed.run_id}-{n}"
+    return {"email": f"{username}@example.com", "username": username, "password": LOADTEST_PASSWORD}, {}
+
+
+def _login(seed: LoadTestSeed, n: int) -> tuple[dict, dict[str, str]]:
+    return {"email": seed.user(n).email, "password": LOADTEST_PASSWORD, "remember_me": True}, {}
+
+
+def _refresh(seed: LoadTestSeed, n: int) -> tuple[dict, dict[str, str]]:
+    # A RefreshTokenView lê o refresh token do cookie, como o navegador envia
+    return {}, {"Cookie": f"{settings.SIMPLE_JWT['AUTH_COOKIE_REFRESH']}={seed.user(n).refresh_token}"}
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("register", "POST", "users:register", _register, expected_status=201),
+        Scenario("login", "POST", "users:login", _login),
+        Scenario("refresh", "POST", "users:refresh_token", _refresh),
+        Scenario("documents", "GET", "documents:list", lambda seed, n: (None, _bearer(seed, n))),
+        Scenario("history", "GET", "queries:history", lambda seed, n: (None, _bearer(seed, n))),
+        Scenario("ask", "POST", "queries:ask", lambda seed, n: ({"query": QUESTION}, _bearer(seed, n))),
+    )
+}
+
+
+def seed_database(users: int, using: str = DEFAULT_DB_ALIAS) -> LoadTestSeed:
+    """
+    ``users`` usuários FREE com a mesma senha (um hash só, para não pagar o
+    hasher N vezes), um documento indexado cada e tokens já emitidos.
+    Cria o plano FREE se faltar (o registro exige), e o remove na limpeza.
+    """
+    _, created_plan = Plan.objects.using(using).get_or_create(
+        tier=Plan.PlanChoices.FREE, plan_type=Plan.UserChoices.INDIVIDUAL, defaults={"name": "Free"},
+    )
+    run_id = uuid4().hex[:8]
+    password = make_password(LOADTEST_PASSWORD)
+    rows = User.objects.using(using).bulk_create(
+        User(email=f"{USERNAME_PREFIX}{run_id}-seed-{n}@example.com",
+             username=f"{USERNAME_PREFIX}{run_id}-seed-{n}", password=password)
+        for n in range(users)
+    )
+    documents = Document.objects.using(using).bulk_create(
+        Document(user=user, title="Manual do colaborador", status=Document.StatusChoices.INDEXED) for user in rows
+    )
+    embeddings = LocalEmbeddingClient(settings.RAG["EMBEDDING_DIMENSIONS"])
+    vectors = [format_embedding(embeddings.embed_one(text)) for text in SEED_CHUNKS]
+    DocumentChunk.objects.using(using).bulk_create(
+        DocumentChunk(document=document, chunk_index=index, text=text, embedding=vector)
+        for document in documents
+        for index, (text, vector) in enumerate(zip(SEED_CHUNKS, vectors, strict=True))
+    )
+
+    seeded = []
+    for user in rows:
+        tokens = TokenService.generate_tokens_for_user(user)
+        seeded.append(SeedUser(user.email, tokens["jwt-access"], tokens["jwt-refresh"]))
+    return LoadTestSeed(run_id=run_id, users=seeded, created_plan=created_plan)
+
+
+def cleanup_database(seed: LoadTestSeed | None = None, using: str = DEFAULT_DB_ALIAS) -> None:
+    """Remove os usuários do loadtest (semeados e registrados) e o que depende deles"""
+    users = User.objects.using(using).filter(username__startswith=USERNAME_PREFIX)
+    DocumentChunk.objects.using(using).filter(document__user__in=users).delete()
+    users.delete()
+    if seed is not None and seed.created_plan:
+        Plan.objects.using(using).filter(tier=Plan.PlanChoices.FREE, plan_type=Plan.UserChoices.INDIVIDUAL).delete()
+
+
+def histogram(samples_ms: list[float]) -> dict[str, int]:
+    """Contagem por faixa de latência (ms), nas faixas do http_request_duration_seconds"""
+    bounds = [bound * 1000 for bound in DURATION_BUCKETS]
+    counts = [0] * (len(bounds) + 1)
+    for value in samples_ms:
+        counts[next((n for n, bound in enumerate(bounds) if value <= bound), len(bounds))] += 1
+    labels = [f"{bound:g}" for bound in bounds] + ["+Inf"]
+    return dict(zip(labels, counts, strict=True))
+
+
+@dataclass(slots=True)
+class LoadResult:
+    """Resultado de um cenário numa concorrência fixa"""
+    scenario: str
+    concurrency: int
+    elapsed: float
+    samples_ms: list[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        requests = len(self.samples_ms) + self.errors
+        return {
+            "scenario": self.scenario,
+            "concurrency": self.concurrency,
+            "requests": requests,
+            "errors": self.errors,
+            "error_rate": round(self.errors / requests, 4) if requests else 0.0,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "requests_per_sec": round(len(self.samples_ms) / self.elapsed, 2) if self.elapsed else 0.0,
+            "latency": latency_summary(self.samples_ms),
+            "histogram": histogram(self.samples_ms),
+        }
+
+
+class LoadRunner:
+    """
+    Carga em malha fechada: ``concurrency`` clientes, cada um com a sua
+    conexão keep-alive, disparam as requisições do cenário até completar
+    ``total``. Só as respostas com o status esperado entram nas latências;
+    o resto (inclusive falhas de conexão, status 0) conta como erro.
+    """
+
+    def __init__(self, host: str, port: int, host_header: str, timeout: float = 30.0) -> None:
+        self.host = host
+        self.port = port
+        self.host_header = host_header
+        self.timeout = timeout
+
+    def run(self, scenario: Scenario, seed: LoadTestSeed, concurrency: int, total: int, offset: int = 0) -> LoadResult:
+        path = reverse(scenario.url_name)
+        result = LoadResult(scenario.name, concurrency, 0.0)
+        lock = threading.Lock()
+        remaining = iter(range(offset, offset + total))
+
+        def client() -> None:
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                while True:
+                    with lock:
+                        n = next(remaining, None)
+                    if n is None:
+                        return
+                    status, ms = self._request(connection, scenario, path, seed, n)
+                    with lock:
+                        result.statuses[status] += 1
+                        if status == scenario.expected_status:
+                            result.samples_ms.append(ms)
+                        else:
+                            result.errors += 1
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=client, daemon=True) for _ in range(concurrency)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    def _request(
+        self,
+        connection: http.client.HTTPConnection,
+        scenario: Scenario,
+        path: str,
+        seed: LoadTestSeed,
+        n: int,
+    ) -> tuple[int, float]:
+        body, headers = scenario.build(seed, n)
+        headers = {"Host": self.host_header, **headers}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        started = time.perf_counter()
+        try:
+            connection.request(scenario.method, path, body=payload, headers=headers)
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            # A próxima requisição reabre a conexão
+            connection.close()
+            return 0, (time.perf_counter() - started) * 1000
+        return response.status, (time.perf_counter() - started) * 1000
+
+
+def check_budget(
+    results: list[dict],
+    baseline: list[dict] | None,
+    max_regression: float,
+    max_error_rate: float,
+    latency_slack_ms: float = 5.0,
+) -> list[str]:
+    """
+    Violações do orçamento de regressão: taxa de erro acima de
+    ``max_error_rate`` e, para cada (cenário, concorrência) presente no
+    relatório de referência, p95 mais de ``max_regression`` acima (e mais
+    de ``latency_slack_ms``, para o ruído de endpoints rápidos) ou vazão
+    mais de ``max_regression`` abaixo.
+    """
+    violations = []
+    reference = {(r["scenario"], r["concurrency"]): r for r in baseline or []}
+    for result in results:
+        label = f"{result['scenario']}@{result['concurrency']}"
+        if result["error_rate"] > max_error_rate:
+            violations.append(f"{label}: taxa de erro {result['error_rate']:.2%} > {max_error_rate:.2%}")
+
+        before = reference.get((result["scenario"], result["concurrency"]))
+        if before is None:
+            continue
+        p95, p95_before = result["latency"]["p95_ms"], before["latency"]["p95_ms"]
+        if p95 > p95_before * (1 + max_regression) and p95 - p95_before > latency_slack_ms:
+            violations.append(f"{label}: p95 {p95:.1f} ms > {p95_before:.1f} ms da referência")
+        rps, rps_before = result["requests_per_sec"], before["requests_per_sec"]
+        if rps < rps_before * (1 - max_regression):
+            violations.append(f"{label}: {rps:.1f} req/s < {rps_before:.1f} req/s da referência")
+    return violations
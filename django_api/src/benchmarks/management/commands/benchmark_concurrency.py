@@ -0,0 +1,269 @@
+import asyncio
+import io
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, TypedDict, Unpack
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.core.wsgi import get_wsgi_application
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from benchmarks.reporting import latency_summary, write_report
+from documents.models import Document, DocumentChunk
+from documents.vectors import format_embedding
+from queries.clients import LocalEmbeddingClient
+from queries.log_writer import get_query_log_writer
+from users.models import User
+from users.services import TokenService
+
+if TYPE_CHECKING:
+    from django.core.handlers.asgi import ASGIHandler
+    from django.core.handlers.wsgi import WSGIHandler
+
+SEED_CHUNKS = [
+    "A política de férias concede trinta dias corridos por ano.",
+    "O reembolso de despesas deve ser solicitado em até dez dias.",
+    "O expediente vai das 9h às 18h com uma hora de almoço.",
+]
+QUESTION = "Quantos dias de férias por ano?"
+
+
+class ConcurrencyOptions(TypedDict):
+    concurrency: str
+    requests: int
+    latency_ms: int
+    wsgi_threads: int
+    output: str | None
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara consultas RAG simultâneas por processo sob ASGI e WSGI, "
+        "com latência simulada do LLM."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--concurrency", default="10,50,100", help="Clientes simultâneos, separados por vírgula.")
+        parser.add_argument("--requests", type=int, default=0, help="Requisições por cenário (padrão: 4x a concorrência).")
+        parser.add_argument("--latency-ms", type=int, default=200, help="Latência simulada do LLM local.")
+        parser.add_argument("--wsgi-threads", type=int, default=8, help="Threads do worker WSGI (ex.: gunicorn gthread).")
+        parser.add_argument("--output", help="Arquivo JSON de saída.")
+
+    def handle(self, *args: object, **options: Unpack[ConcurrencyOptions]) -> None:
+        levels = [int(c) for c in options["concurrency"].split(",")]
+        rag = {
+            **settings.RAG,
+            "EMBEDDING_BACKEND": "local",
+            "LLM_BACKEND": "local",
+            "VECTOR_SEARCH": "python",
+            "LOCAL_LATENCY_MS": options["latency_ms"],
+        }
+
+        with override_settings(RAG=rag):
+            user = self._seed(rag["EMBEDDING_DIMENSIONS"])
+            try:
+                token = TokenService.generate_tokens_for_user(user)["jwt-access"]
+                request = _AskRequest(token)
+                asgi_app = get_asgi_application()
+                wsgi_app = get_wsgi_application()
+
+                results = []
+                for concurrency in levels:
+                    total = options["requests"] or concurrency * 4
+                    results.append(self._summarize(
+                        "asgi", concurrency, *asyncio.run(request.run_asgi(asgi_app, concurrency, total)),
+                    ))
+                    results.append(self._summarize(
+                        "wsgi", concurrency,
+                        *request.run_wsgi(wsgi_app, concurrency, options["wsgi_threads"], total),
+                        wsgi_threads=options["wsgi_threads"],
+                    ))
+            finally:
+                # Grava os QueryLogs pendentes (inclusive o lote em coleta na
+                # thread de fundo) antes de remover o usuário
+                get_query_log_writer().stop()
+                user.delete()
+
+        if any(r["errors"] == r["requests"] for r in results):
+            msg = "Todas as requisições de algum cenário falharam"
+            raise CommandError(msg)
+
+        self.stdout.write(write_report("concurrency", results, options["output"]))
+
+    def _seed(self, dimensions: int) -> User:
+        user = User.objects.create_user(
+            email="benchmark-concurrency@example.com",
+            username="benchmark-concurrency",
+            password=None,
+        )
+        document = Document.objects.create(
+            user=user,
+            title="Manual do colaborador",
+            status=Document.StatusChoices.INDEXED,
+        )
+        embeddings = LocalEmbeddingClient(dimensions)
+        DocumentChunk.objects.bulk_create([
+            DocumentChunk(
+                document=document,
+                chunk_index=index,
+                text=text,
+                embedding=format_embedding(embeddings.embed_one(text)),
+            )
+            for index, text in enumerate(SEED_CHUNKS)
+        ])
+        return user
+
+    def _summarize(
+        self,
+        server: str,
+        concurrency: int,
+        elapsed: float,
+        samples: list[float],
+        errors: int,
+        **extra: int,
+    ) -> dict:
+        ok = len(samples)
+        throughput = ok / elapsed if elapsed else 0.0
+        llm_latency_s = settings.RAG["LOCAL_LATENCY_MS"] / 1000
+        return {
+            "server": server,
+            "concurrency": concurrency,
+            **extra,
+            "requests": ok + errors,
+            "errors": errors,
+            "requests_per_sec": round(throughput, 2),
+            # Lei de Little: média de consultas esperando o LLM ao mesmo tempo
+            # no processo (o teto do WSGI é o número de threads)
+            "llm_in_flight": round(throughput * llm_latency_s, 2),
+            "latency": latency_summary(samples),
+        }
+
+
+class _AskRequest:
+    """POST /api/queries/ask/ montado direto para os apps ASGI e WSGI"""
+
+    def __init__(self, token: str) -> None:
+        self.path = reverse("queries:ask")
+        self.body = json.dumps({"query": QUESTION}).encode()
+        self.authorization = f"Bearer {token}"
+        self.host = next(
+            (h for h in settings.ALLOWED_HOSTS if h != "*" and not h.startswith(".")),
+            "localhost",
+        )
+
+    async def run_asgi(self, app: ASGIHandler, concurrency: int, total: int) -> tuple[float, list[float], int]:
+        slots = asyncio.Semaphore(concurrency)
+        samples: list[float] = []
+        errors = 0
+
+        async def one() -> None:
+            nonlocal errors
+            async with slots:
+                started = time.perf_counter()
+                status = await self._call_asgi(app)
+                if status == 200:
+                    samples.append((time.perf_counter() - started) * 1000)
+                else:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        return time.perf_counter() - started, samples, errors
+
+    async def _call_asgi(self, app: ASGIHandler) -> int:
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": self.path,
+            "raw_path": self.path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [
+                (b"host", self.host.encode()),
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(self.body)).encode()),
+                (b"authorization", self.authorization.encode()),
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": (self.host, 80),
+        }
+        messages = [{"type": "http.request", "body": self.body, "more_body": False}]
+        status = 0
+
+        async def receive() -> dict[str, object]:
+            if not messages:
+                # Cliente nunca desconecta: o handler cancela esta espera ao terminar
+                await asyncio.Event().wait()
+            return messages.pop()
+
+        async def send(message: dict[str, object]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        await app(scope, receive, send)
+        return status
+
+    def run_wsgi(self, app: WSGIHandler, concurrency: int, threads: int, total: int) -> tuple[float, list[float], int]:
+        # Clientes simultâneos disputam as threads do worker; a latência inclui
+        # a espera na fila, como num gunicorn gthread
+        with (
+            ThreadPoolExecutor(max_workers=threads) as server,
+            ThreadPoolExecutor(max_workers=concurrency) as clients,
+        ):
+            def one(_: int) -> tuple[int, float]:
+                started = time.perf_counter()
+                status = server.submit(self._call_wsgi, app).result()
+                return status, (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            responses = list(clients.map(one, range(total)))
+            elapsed = time.perf_counter() - started
+
+        samples = [ms for status, ms in responses if status == 200]
+        return elapsed, samples, len(responses) - len(samples)
+
+    def _call_wsgi(self, app: WSGIHandler) -> int:
+        environ = {
+            "REQUEST_METHOD": "POST",
+            "SCRIPT_NAME": "",
+            "PATH_INFO": self.path,
+            "QUERY_STRING": "",
+            "SERVER_NAME": self.host,
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "CONTENT_TYPE": "application/json",
+            "CONTENT_LENGTH": str(len(self.body)),
+            "HTTP_HOST": self.host,
+            "HTTP_AUTHORIZATION": self.authorization,
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(self.body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        status = []
+
+        def start_response(
+            status_line: str, headers: list[tuple[str, str]], exc_info: object = None,
+        ) -> None:
+            status.append(int(status_line.split(" ", 1)[0]))
+
+        response = app(environ, start_response)
+        try:
+            for _ in response:
+                pass
+        finally:
+            if hasattr(response, "close"):
+                response.close()
+        return status[0] if status else 0
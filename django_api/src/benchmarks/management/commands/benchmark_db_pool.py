@@ -0,0 +1,108 @@
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypedDict, Unpack
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db.utils import ConnectionHandler
+
+from benchmarks.reporting import latency_summary, write_report
+
+MODES = ("no_pooling", "persistent", "pool")
+QUERY = "SELECT 1"
+
+
+class DbPoolOptions(TypedDict):
+    database: str
+    modes: str
+    workers: int
+    requests: int
+    queries: int
+    output: str | None
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede requisições/s com conexão nova por requisição, conexões "
+        "persistentes (CONN_MAX_AGE) e o pool do psycopg."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--database", default="default", help="Alias de DATABASES usado como base.")
+        parser.add_argument("--modes", default=",".join(MODES), help="Modos separados por vírgula.")
+        parser.add_argument("--workers", type=int, default=4, help="Threads simultâneas (uma conexão cada).")
+        parser.add_argument("--requests", type=int, default=500, help="Requisições simuladas por modo.")
+        parser.add_argument("--queries", type=int, default=3, help="Queries por requisição.")
+        parser.add_argument("--output", help="Arquivo JSON de saída.")
+
+    def handle(self, *args: object, **options: Unpack[DbPoolOptions]) -> None:
+        base = settings.DATABASES.get(options["database"])
+        if base is None:
+            msg = f"Database '{options['database']}' não configurado"
+            raise CommandError(msg)
+
+        results = []
+        for mode in options["modes"].split(","):
+            if mode not in MODES:
+                msg = f"Modo inválido: {mode} (use {', '.join(MODES)})"
+                raise CommandError(msg)
+            if mode == "pool" and base["ENGINE"] != "django.db.backends.postgresql":
+                self.stderr.write("Ignorando 'pool': só disponível no PostgreSQL")
+                continue
+            results.append(self._run(mode, base, options))
+
+        self.stdout.write(write_report("db_pool", results, options["output"]))
+
+    @staticmethod
+    def _settings_for(mode: str, base: dict) -> dict:
+        config = copy.deepcopy(base)
+        config.pop("TEST", None)
+        pool = config.setdefault("OPTIONS", {}).pop("pool", None)
+        if mode == "pool":
+            config["OPTIONS"]["pool"] = pool if isinstance(pool, dict) else {}
+            config["CONN_MAX_AGE"] = 0
+        else:
+            config["CONN_MAX_AGE"] = 600 if mode == "persistent" else 0
+        return config
+
+    def _run(self, mode: str, base: dict, options: DbPoolOptions) -> dict:
+        # Alias próprio: os pools do backend são globais por alias. O handler
+        # exige um 'default', que nunca é aberto aqui.
+        alias = f"benchmark-{mode}"
+        config = self._settings_for(mode, base)
+        handler = ConnectionHandler({"default": copy.deepcopy(config), alias: config})
+        workers = options["workers"]
+        per_worker = [options["requests"] // workers + (n < options["requests"] % workers) for n in range(workers)]
+
+        def worker(count: int) -> list[float]:
+            connection = handler[alias]
+            samples = []
+            try:
+                for _ in range(count):
+                    started = time.perf_counter()
+                    with connection.cursor() as cursor:
+                        for _ in range(options["queries"]):
+                            cursor.execute(QUERY)
+                            cursor.fetchone()
+                    # O mesmo que o Django faz no fim de cada requisição
+                    connection.close_if_unusable_or_obsolete()
+                    samples.append((time.perf_counter() - started) * 1000)
+            finally:
+                connection.close()
+            return samples
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            samples = [sample for chunk in executor.map(worker, per_worker) for sample in chunk]
+        elapsed = time.perf_counter() - started
+
+        connection = handler[alias]
+        if mode == "pool":
+            connection.close_pool()
+        return {
+            "mode": mode,
+            "workers": workers,
+            "requests_per_sec": round(len(samples) / elapsed, 2),
+            "latency": latency_summary(samples),
+        }
@@ -0,0 +1,113 @@
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, TypedDict, Unpack
+from uuid import UUID, uuid4
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from benchmarks.reporting import write_report
+from core.renderers import dumps
+from documents.dtos import ChunkSearchHit
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+TEXT = "A política de férias concede trinta dias corridos por ano. " * 8
+
+
+@dataclass(frozen=True)
+class DictChunkSearchHit:
+    """ChunkSearchHit como era antes (dataclass com __dict__), para comparação"""
+    chunk_id: UUID
+    document_id: UUID
+    document_title: str
+    chunk_index: int
+    text: str
+    score: float
+
+
+def as_dict(
+    chunk_id: UUID, document_id: UUID, document_title: str, chunk_index: int, text: str, score: float,
+) -> dict[str, Any]:
+    return {
+        "chunk_id": chunk_id,
+        "document_id": document_id,
+        "document_title": document_title,
+        "chunk_index": chunk_index,
+        "text": text,
+        "score": score,
+    }
+
+
+VARIANTS: dict[str, Callable[..., Any]] = {
+    "dict": as_dict,
+    "dataclass": DictChunkSearchHit,
+    "slotted_dto": ChunkSearchHit,
+}
+
+
+class DtosOptions(TypedDict):
+    count: int
+    repeat: int
+    output: str | None
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark dos DTOs da busca: custo de construção, memória "
+        "alocada (tracemalloc) e serialização por objeto."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--count", type=int, default=10_000, help="Objetos criados por rodada.")
+        parser.add_argument("--repeat", type=int, default=5, help="Rodadas por variante (vale a melhor).")
+        parser.add_argument("--output", help="Arquivo JSON de saída.")
+
+    def handle(self, *args: object, **options: Unpack[DtosOptions]) -> None:
+        count = options["count"]
+        repeat = options["repeat"]
+        document_id = uuid4()
+        # Valores criados antes da medição: só o custo do contêiner entra na conta
+        rows = [(uuid4(), document_id, "Manual", index, TEXT, 0.5) for index in range(count)]
+
+        results = []
+        for name, factory in VARIANTS.items():
+            objects = [factory(*row) for row in rows]
+            results.append({
+                "variant": name,
+                "count": count,
+                "construct_ns_per_object": round(self._best(lambda factory=factory: [factory(*row) for row in rows], repeat) / count, 1),
+                "bytes_per_object": round(self._allocated(factory, rows) / count, 1),
+                "serialize_ns_per_object": round(self._best(lambda objects=objects: dumps(objects), repeat) / count, 1),
+            })
+
+        self.stdout.write(write_report("dtos", results, options["output"]))
+
+    @staticmethod
+    def _best(func: Callable[[], Any], repeat: int) -> float:
+        """Menor tempo (ns) entre as rodadas, com o GC desligado"""
+        timings = []
+        gc.disable()
+        try:
+            for _ in range(repeat):
+                started = time.perf_counter_ns()
+                func()
+                timings.append(time.perf_counter_ns() - started)
+        finally:
+            gc.enable()
+        return min(timings)
+
+    @staticmethod
+    def _allocated(factory: Callable[..., Any], rows: list[tuple]) -> int:
+        """Bytes alocados e retidos pelos objetos (a lista que os guarda é descontada)"""
+        holder = [None] * len(rows)
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            for index, row in enumerate(rows):
+                holder[index] = factory(*row)
+            return tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
@@ -0,0 +1,399 @@
+import cProfile
+import json
+import resource
+import sys
+import textwrap
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, TypedDict, Unpack
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connections
+from django.test.utils import override_settings
+
+from benchmarks.reporting import SeededRandom, latency_summary, write_report
+from core.db import ingestion_db_alias, use_primary
+from core.profiling import RequestProfile, current_profile
+from documents import ingestion
+from documents.ingestion import IngestionService
+from documents.models import Document, DocumentChunk
+from users.models import User
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+FORMATS = {
+    "txt": "text/plain",
+    "html": "text/html",
+    "json": "application/json",
+    "csv": "text/csv",
+    "pdf": "application/pdf",
+}
+STAGES = ("extract", "chunk", "embedding", "persist")
+USERNAME = "benchmark-ingestion"
+STORAGE_PREFIX = "benchmarks/ingestion/"
+# Sem acentos: o PDF gerado usa a fonte padrão Helvetica (WinAnsi)
+VOCABULARY = (
+    "contrato", "reembolso", "ferias", "politica", "cliente", "prazo", "fatura", "seguro",
+    "auditoria", "salario", "beneficio", "juridico", "suporte", "entrega", "pagamento", "relatorio",
+    "de", "o", "a", "para", "com", "em", "por", "que",
+)
+PDF_LINE_WIDTH = 90
+PDF_LINES_PER_PAGE = 60
+
+
+class IngestionOptions(TypedDict):
+    sizes: str
+    formats: str
+    documents: int
+    workers: str
+    batch_size: int | None
+    database: str | None
+    seed: int
+    profile_dir: str | None
+    keep: bool
+    output: str | None
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede a ingestão de ponta a ponta (extract, chunk, embedding local e "
+        "persist em DocumentChunk) com arquivos sintéticos de vários formatos "
+        "e tamanhos, para cada número de workers: documentos/min, chunks/s, "
+        "pico de RSS e tempo por etapa."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--sizes", default="4,64,512", help="Tamanhos dos arquivos em KB, separados por vírgula.")
+        parser.add_argument("--formats", default="txt,html,json,csv,pdf", help="Formatos, separados por vírgula.")
+        parser.add_argument("--documents", type=int, default=4, help="Documentos por (formato, tamanho).")
+        parser.add_argument("--workers", default="1,2,4", help="Workers simultâneos, separados por vírgula.")
+        parser.add_argument("--batch-size", type=int, default=None, help="Documentos por claim (padrão: INGESTION['BATCH_SIZE']).")
+        parser.add_argument("--database", default=None, help="Alias do banco (padrão: o de ingestão).")
+        parser.add_argument("--seed", type=int, default=42, help="Semente do gerador de texto.")
+        parser.add_argument(
+            "--profile-dir",
+            help=(
+                "Grava um cProfile por etapa (ingestion-<etapa>.prof, para pstats/snakeviz) numa "
+                "passada sequencial à parte. Para py-spy, rode o comando sob 'py-spy record'."
+            ),
+        )
+        parser.add_argument("--keep", action="store_true", help="Mantém usuário, documentos e arquivos ao final.")
+        parser.add_argument("--output", help="Arquivo JSON de saída.")
+
+    def handle(self, *args: object, **options: Unpack[IngestionOptions]) -> None:
+        formats = options["formats"].split(",")
+        for name in formats:
+            if name not in FORMATS:
+                msg = f"Formato inválido: {name} (use {', '.join(FORMATS)})"
+                raise CommandError(msg)
+        if "pdf" in formats and ingestion.pypdf is None:
+            self.stderr.write("Ignorando 'pdf': requer pypdf (pip install django_api[pdf])")
+            formats.remove("pdf")
+
+        using = options["database"] or ingestion_db_alias()
+        levels = [int(n) for n in options["workers"].split(",")]
+        if not connections[using].features.has_select_for_update_skip_locked:
+            # Sem SKIP LOCKED os workers pegariam os mesmos documentos
+            if any(n > 1 for n in levels):
+                self.stderr.write(f"Só 1 worker em {connections[using].vendor}: o banco não tem SKIP LOCKED")
+            levels = [1]
+
+        rag = {**settings.RAG, "EMBEDDING_BACKEND": "local"}
+        with override_settings(RAG=rag), use_primary():
+            self._cleanup(using)
+            try:
+                files = _Files(options["seed"]).seed(
+                    formats, [int(kb) for kb in options["sizes"].split(",")], options["documents"], using,
+                )
+                runs = [self._run(workers, files, options["batch_size"], using) for workers in levels]
+                profiles = self._profile(files, options["profile_dir"], using) if options["profile_dir"] else []
+            finally:
+                if not options["keep"]:
+                    self._cleanup(using)
+
+        report = {
+            "corpus": {
+                "database": connections[using].vendor,
+                "documents": len(files),
+                "bytes": sum(file.size_bytes for file in files.values()),
+                "formats": formats,
+                "sizes_kb": sorted({file.size_kb for file in files.values()}),
+                "chunk_size": settings.INGESTION["CHUNK_SIZE"],
+                "embedding_dimensions": rag["EMBEDDING_DIMENSIONS"],
+            },
+            "runs": runs,
+            "profiles": profiles,
+        }
+        self.stdout.write(write_report("ingestion", report, options["output"]))
+
+    def _run(self, workers: int, files: dict[UUID, _File], batch_size: int | None, using: str) -> dict:
+        self._requeue(files, using)
+        rss_scope = "run" if _reset_peak_rss() else "process"
+        samples: list[_Sample] = []
+        lock = threading.Lock()
+
+        def worker() -> None:
+            try:
+                while ids := IngestionService.claim(batch_size or settings.INGESTION["BATCH_SIZE"], using):
+                    for document_id in ids:
+                        sample = _ingest(document_id, files[document_id], using)
+                        with lock:
+                            samples.append(sample)
+            finally:
+                connections[using].close()
+
+        started = time.perf_counter()
+        if workers == 1:
+            # Como o run_ingestion: um worker na thread principal
+            while ids := IngestionService.claim(batch_size or settings.INGESTION["BATCH_SIZE"], using):
+                samples += [_ingest(document_id, files[document_id], using) for document_id in ids]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for future in [pool.submit(worker) for _ in range(workers)]:
+                    future.result()
+        elapsed = time.perf_counter() - started
+
+        failed = Document.objects.using(using).filter(
+            id__in=list(files), status=Document.StatusChoices.FAILED,
+        ).count()
+        chunks = sum(sample.chunks for sample in samples)
+        groups: dict[tuple[str, int], list[_Sample]] = defaultdict(list)
+        for sample in samples:
+            groups[sample.file.format, sample.file.size_kb].append(sample)
+
+        return {
+            "workers": workers,
+            "documents": len(samples),
+            "failed": failed,
+            "chunks": chunks,
+            "elapsed_seconds": round(elapsed, 3),
+            "documents_per_min": round(len(samples) / elapsed * 60, 2) if elapsed else 0.0,
+            "chunks_per_sec": round(chunks / elapsed, 2) if elapsed else 0.0,
+            "peak_rss_mb": _peak_rss_mb(),
+            "peak_rss_scope": rss_scope,
+            "latency": latency_summary([sample.ms for sample in samples]),
+            "stages": _stage_summary(samples),
+            "files": [
+                {
+                    "format": file_format,
+                    "size_kb": size_kb,
+                    "documents": len(group),
+                    "chunks": sum(sample.chunks for sample in group),
+                    "latency": latency_summary([sample.ms for sample in group]),
+                    "stages_mean_ms": {
+                        stage: summary["mean_ms"] for stage, summary in _stage_summary(group).items()
+                    },
+                }
+                for (file_format, size_kb), group in sorted(groups.items())
+            ],
+        }
+
+    def _profile(self, files: dict[UUID, _File], profile_dir: str, using: str) -> list[str]:
+        """
+        Passada sequencial à parte com um cProfile por etapa: o cProfile
+        admite um perfil ativo por vez e distorceria as medições acima.
+        """
+        self._requeue(files, using)
+        profilers = {stage: cProfile.Profile() for stage in STAGES}
+        while ids := IngestionService.claim(settings.INGESTION["BATCH_SIZE"], using):
+            for document_id in ids:
+                token = current_profile.set(RequestProfile(profilers=profilers))
+                try:
+                    IngestionService.ingest(document_id, using)
+                finally:
+                    current_profile.reset(token)
+
+        directory = Path(profile_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for stage, profiler in profilers.items():
+            path = directory / f"ingestion-{stage}.prof"
+            profiler.dump_stats(path)
+            paths.append(str(path))
+        return paths
+
+    @staticmethod
+    def _requeue(files: dict[UUID, _File], using: str) -> None:
+        """Volta o corpus para a fila, sem os chunks da rodada anterior"""
+        DocumentChunk.objects.using(using).filter(document_id__in=list(files)).delete()
+        Document.objects.using(using).filter(id__in=list(files)).update(status=Document.StatusChoices.UPLOADED)
+
+    @staticmethod
+    def _cleanup(using: str) -> None:
+        documents = Document.objects.using(using).filter(user__username=USERNAME)
+        storage = Document._meta.get_field("file_key").storage
+        for name in documents.values_list("file_key", flat=True):
+            storage.delete(name)
+        DocumentChunk.objects.using(using).filter(document__in=documents).delete()
+        documents.delete()
+        User.objects.using(using).filter(username=USERNAME).delete()
+
+
+class _File:
+    __slots__ = ("format", "size_bytes", "size_kb")
+
+    def __init__(self, file_format: str, size_kb: int, size_bytes: int) -> None:
+        self.format = file_format
+        self.size_kb = size_kb
+        self.size_bytes = size_bytes
+
+
+class _Sample:
+    __slots__ = ("chunks", "file", "ms", "stages")
+
+    def __init__(self, file: _File, ms: float, chunks: int, stages: dict[str, list[float]]) -> None:
+        self.file = file
+        self.ms = ms
+        self.chunks = chunks
+        self.stages = stages
+
+
+class _Files:
+    """Arquivos sintéticos determinísticos (pela semente) no storage de Document.file_key"""
+
+    def __init__(self, seed: int) -> None:
+        self.rng = SeededRandom(seed)
+
+    def seed(self, formats: list[str], sizes_kb: list[int], documents: int, using: str) -> dict[UUID, _File]:
+        user = User(email=f"{USERNAME}@example.com", username=USERNAME)
+        user.set_unusable_password()
+        user.save(using=using)
+        storage = Document._meta.get_field("file_key").storage
+
+        files: dict[UUID, _File] = {}
+        for file_format in formats:
+            for size_kb in sizes_kb:
+                for n in range(documents):
+                    content = self.render(file_format, self.text(size_kb * 1024))
+                    name = storage.save(f"{STORAGE_PREFIX}{size_kb}kb-{n}.{file_format}", ContentFile(content))
+                    document = Document.objects.using(using).create(
+                        user=user,
+                        title=f"{file_format} {size_kb} KB #{n}",
+                        file_key=name,
+                        mime_type=FORMATS[file_format],
+                        size_bytes=len(content),
+                    )
+                    files[document.id] = _File(file_format, size_kb, len(content))
+        return files
+
+    def text(self, size: int) -> str:
+        """Parágrafos de frases com palavras do vocabulário até ``size`` caracteres"""
+        sentences: list[str] = []
+        length = 0
+        while length < size:
+            words = self.rng.choices(VOCABULARY, k=self.rng.randint(8, 16))
+            sentence = " ".join(words).capitalize() + "."
+            # Um parágrafo a cada ~5 frases
+            sentences.append(sentence + ("\n\n" if self.rng.random() < 0.2 else " "))
+            length += len(sentences[-1])
+        return "".join(sentences)
+
+    @staticmethod
+    def render(file_format: str, text: str) -> bytes:
+        paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
+        if file_format == "html":
+            body = "".join(f"<p>{p}</p>\n" for p in paragraphs)
+            return f"<html><head><title>Benchmark</title></head><body>\n{body}</body></html>".encode()
+        if file_format == "json":
+            return json.dumps({"paragraphs": paragraphs}, ensure_ascii=False).encode()
+        if file_format == "csv":
+            return "".join(f'{n},"{p}"\n' for n, p in enumerate(paragraphs)).encode()
+        if file_format == "pdf":
+            return _pdf(text)
+        return text.encode()
+
+
+def _ingest(document_id: UUID, file: _File, using: str) -> _Sample:
+    """Ingestão de um documento com as etapas medidas pelos spans do IngestionService"""
+    profile = RequestProfile()
+    token = current_profile.set(profile)
+    try:
+        started = time.perf_counter()
+        chunks = IngestionService.ingest(document_id, using)
+        ms = (time.perf_counter() - started) * 1000
+    finally:
+        current_profile.reset(token)
+    return _Sample(file, ms, chunks, profile.stages)
+
+
+def _stage_summary(samples: list[_Sample]) -> dict[str, dict[str, float]]:
+    """
+    Tempo total e médio por documento de cada etapa, e a fração do tempo
+    somado das etapas (com vários workers a soma passa do tempo de parede).
+    Spans fora de STAGES ficam de fora: o ``db`` do timer de queries
+    (install_db_timer) já está contido nas etapas e seria contado duas vezes.
+    """
+    totals = dict.fromkeys(STAGES, 0.0)
+    for sample in samples:
+        for stage in STAGES:
+            if stage in sample.stages:
+                totals[stage] += sample.stages[stage][1]
+    overall = sum(totals.values())
+    return {
+        stage: {
+            "total_ms": round(total_ms, 3),
+            "mean_ms": round(total_ms / len(samples), 3) if samples else 0.0,
+            "share": round(total_ms / overall, 4) if overall else 0.0,
+        }
+        for stage, total_ms in totals.items()
+    }
+
+
+def _pdf(text: str) -> bytes:
+    """PDF mínimo (Helvetica, uma linha por Tj) com o texto quebrado em páginas"""
+    lines = textwrap.wrap(" ".join(text.split()), PDF_LINE_WIDTH)
+    pages = [lines[n:n + PDF_LINES_PER_PAGE] for n in range(0, len(lines), PDF_LINES_PER_PAGE)] or [[]]
+    # 1: catálogo, 2: páginas, 3: fonte; depois (página, conteúdo) por página
+    kids = " ".join(f"{4 + 2 * n} 0 R" for n in range(len(pages)))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for n, page in enumerate(pages):
+        escaped = (line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for line in page)
+        stream = ("BT /F1 10 Tf 12 TL 40 800 Td " + " ".join(f"({line}) Tj T*" for line in escaped) + " ET").encode()
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Contents {5 + 2 * n} 0 R "
+            f"/Resources << /Font << /F1 3 0 R >> >> >>".encode(),
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def _reset_peak_rss() -> bool:
+    """Zera o pico de RSS do processo (Linux); False se não der"""
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        return False
+    return True
+
+
+def _peak_rss_mb() -> float:
+    """Pico de RSS (VmHWM no Linux; senão ru_maxrss, que só cresce)"""
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes no macOS, KB nos demais
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
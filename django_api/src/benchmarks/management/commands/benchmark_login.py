@@ -0,0 +1,115 @@
+import os
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypedDict, Unpack
+
+from django.contrib.auth.hashers import get_hasher, make_password, verify_password
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+
+from benchmarks.reporting import latency_summary, write_report
+from users.dtos import UserLoginDTO
+from users.models import User
+from users.services import AuthService
+
+# Gerada por execução: o hash e a verificação acontecem no mesmo processo
+BENCHMARK_PASSWORD = secrets.token_urlsafe(16)
+
+
+class LoginOptions(TypedDict):
+    hashers: str
+    workers: str
+    iterations: int
+    end_to_end: bool
+    output: str | None
+
+
+class Command(BaseCommand):
+    help = "Mede logins/s por núcleo para cada hasher de senha configurado."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--hashers",
+            default="default",
+            help="Algoritmos separados por vírgula (ex.: pbkdf2_sha256,argon2). 'default' = preferido.",
+        )
+        parser.add_argument("--workers", default="1", help="Tamanhos de pool separados por vírgula (ex.: 1,2,4).")
+        parser.add_argument("--iterations", type=int, default=50, help="Verificações por cenário.")
+        parser.add_argument(
+            "--end-to-end",
+            action="store_true",
+            help="Também mede AuthService.authenticate_user (DB + tokens), com rollback no final.",
+        )
+        parser.add_argument("--output", help="Arquivo JSON de saída.")
+
+    def handle(self, *args: object, **options: Unpack[LoginOptions]) -> None:
+        iterations = options["iterations"]
+        workers_list = [int(w) for w in options["workers"].split(",")]
+        cpu_count = os.cpu_count() or 1
+
+        results = []
+        for algorithm in options["hashers"].split(","):
+            try:
+                hasher = get_hasher(algorithm)
+                encoded = make_password(BENCHMARK_PASSWORD, hasher=algorithm)
+            except ValueError as err:
+                self.stderr.write(f"Ignorando '{algorithm}': {err}")
+                continue
+
+            for workers in workers_list:
+                elapsed, samples = self._run_hashing(encoded, workers, iterations)
+                logins_per_sec = iterations / elapsed
+                results.append({
+                    "scenario": "verify_password",
+                    "hasher": hasher.algorithm,
+                    "workers": workers,
+                    "logins_per_sec": round(logins_per_sec, 2),
+                    "logins_per_sec_per_core": round(logins_per_sec / min(workers, cpu_count), 2),
+                    "latency": latency_summary(samples),
+                })
+
+        if options["end_to_end"]:
+            results.append(self._run_end_to_end(iterations))
+
+        if not results:
+            msg = "Nenhum hasher válido para medir"
+            raise CommandError(msg)
+
+        self.stdout.write(write_report("login", results, options["output"]))
+
+    def _run_hashing(self, encoded: str, workers: int, iterations: int) -> tuple[float, list[float]]:
+        def verify_once(_: int) -> float:
+            started = time.perf_counter()
+            verify_password(BENCHMARK_PASSWORD, encoded)
+            return (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            samples = list(executor.map(verify_once, range(iterations)))
+        return time.perf_counter() - started, samples
+
+    def _run_end_to_end(self, iterations: int) -> dict:
+        samples = []
+        with transaction.atomic():
+            user = User.objects.create_user(
+                email="benchmark-login@example.com",
+                username="benchmark-login",
+                password=BENCHMARK_PASSWORD,
+            )
+            dto = UserLoginDTO(email=user.email, password=BENCHMARK_PASSWORD)
+            started = time.perf_counter()
+            for _ in range(iterations):
+                call_started = time.perf_counter()
+                AuthService.authenticate_user(dto)
+                samples.append((time.perf_counter() - call_started) * 1000)
+            elapsed = time.perf_counter() - started
+            transaction.set_rollback(True)
+
+        return {
+            "scenario": "authenticate_user",
+            "workers": 1,
+            "logins_per_sec": round(iterations / elapsed, 2),
+            "logins_per_sec_per_core": round(iterations / elapsed, 2),
+            "latency": latency_summary(samples),
+        }
@@ -0,0 +1,351 @@
+import heapq
+import math
+import time
+import tracemalloc
+import uuid
+from array import array
+from itertools import islice
+from operator import itemgetter
+from typing import TYPE_CHECKING, TypedDict, Unpack
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import override_settings
+
+from benchmarks.reporting import SeededRandom, latency_summary, write_report
+from core.db import use_primary
+from documents.models import Document, DocumentChunk
+from documents.repositories import DocumentChunkRepository
+from documents.vector_index import VectorIndexService, recall_at_k
+from documents.vectors import cosine_similarity, format_embedding, parse_embedding
+from users.models import User
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+STRATEGIES = ("exact", "ann", "hybrid", "quantized")
+USERNAME_PREFIX = "benchmark-retrieval-"
+VOCABULARY = (
+    "contrato", "reembolso", "férias", "política", "cliente", "prazo", "fatura", "seguro",
+    "auditoria", "salário", "benefício", "jurídico", "suporte", "entrega", "pagamento", "relatório",
+)
+# Candidatos por resultado antes do rerank (híbrida e quantizada)
+OVERSAMPLE = 4
+# Constante da Reciprocal Rank Fusion
+RRF_K = 60
+
+
+class RetrievalOptions(TypedDict):
+    chunks: int
+    tenants: int
+    documents: int
+    dimensions: int
+    clusters: int
+    queries: int
+    k: int
+    strategies: str
+    plan: str
+    seed: int
+    batch_size: int
+    keep: bool
+    output: str | None
+
+
+class Command(BaseCommand):
+    help = (
+        "Gera um corpus sintético (tenants, documentos e chunks com embeddings "
+        "agrupados) e mede QPS, latência, recall@k e memória das estratégias de "
+        "busca. Use um banco descartável: 'ann' reconstrói o índice vetorial."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--chunks", type=int, default=10_000, help="Total de chunks do corpus.")
+        parser.add_argument("--tenants", type=int, default=4, help="Usuários (escopos de busca).")
+        parser.add_argument("--documents", type=int, default=10, help="Documentos por tenant.")
+        parser.add_argument("--dimensions", type=int, default=64, help="Dimensão dos embeddings.")
+        parser.add_argument("--clusters", type=int, default=32, help="Tópicos (centros dos embeddings).")
+        parser.add_argument("--queries", type=int, default=50, help="Consultas por estratégia.")
+        parser.add_argument("--k", type=int, default=10, help="Resultados por consulta (recall@k).")
+        parser.add_argument("--strategies", default=",".join(STRATEGIES), help="Estratégias separadas por vírgula.")
+        parser.add_argument("--plan", default="FREE", help="Plano cujos ef_search/probes a busca 'ann' usa.")
+        parser.add_argument("--seed", type=int, default=42, help="Semente do gerador.")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Chunks por lote de inserção.")
+        parser.add_argument("--keep", action="store_true", help="Mantém o corpus no banco ao final.")
+        parser.add_argument("--output", help="Arquivo JSON de saída.")
+
+    def handle(self, *args: object, **options: Unpack[RetrievalOptions]) -> None:
+        strategies = options["strategies"].split(",")
+        for strategy in strategies:
+            if strategy not in STRATEGIES:
+                msg = f"Estratégia inválida: {strategy} (use {', '.join(STRATEGIES)})"
+                raise CommandError(msg)
+
+        using = DEFAULT_DB_ALIAS
+        connection = connections[using]
+        pgvector = connection.vendor == "postgresql" and self._has_pgvector(using)
+        if "ann" in strategies and not pgvector:
+            self.stderr.write("Ignorando 'ann': requer PostgreSQL com pgvector")
+            strategies.remove("ann")
+
+        rag = {
+            **settings.RAG,
+            "EMBEDDING_DIMENSIONS": options["dimensions"],
+            "VECTOR_SEARCH": "pgvector" if pgvector else "python",
+        }
+        corpus = _Corpus(options)
+        # Tudo no primário: réplicas atrasadas não veriam o corpus recém-gravado
+        with override_settings(RAG=rag), use_primary():
+            self._cleanup(using)
+            try:
+                started = time.perf_counter()
+                tenants = corpus.seed(using, options["batch_size"])
+                seed_seconds = time.perf_counter() - started
+                queries = corpus.queries(tenants, options["queries"])
+
+                exact = self._strategies(corpus, options)["exact"]
+                truth = [exact(query) for query in queries]
+                results = [
+                    self._measure(name, search, queries, truth, corpus, options, using)
+                    for name, search in self._strategies(corpus, options).items()
+                    if name in strategies
+                ]
+            finally:
+                if not options["keep"]:
+                    self._cleanup(using)
+
+        report = {
+            "corpus": {
+                "database": connection.vendor,
+                "chunks": options["chunks"],
+                "tenants": options["tenants"],
+                "dimensions": options["dimensions"],
+                "k": options["k"],
+                "seed_seconds": round(seed_seconds, 3),
+                "exact_backend": rag["VECTOR_SEARCH"],
+            },
+            "strategies": results,
+        }
+        self.stdout.write(write_report("retrieval", report, options["output"]))
+
+    def _strategies(self, corpus: _Corpus, options: RetrievalOptions) -> dict[str, Callable[[_Query], list]]:
+        k, plan = options["k"], options["plan"]
+        return {
+            "exact": lambda query: [
+                hit.chunk_id for hit in DocumentChunkRepository.search_exact(query.embedding, query.user_id, None, k)
+            ],
+            "ann": lambda query: [
+                hit.chunk_id for hit in DocumentChunkRepository.search_ann(query.embedding, query.user_id, None, k, plan)
+            ],
+            "hybrid": lambda query: _hybrid_search(query, k),
+            "quantized": corpus.quantized_search(k),
+        }
+
+    def _measure(
+        self,
+        name: str,
+        search: Callable[[_Query], list],
+        queries: list[_Query],
+        truth: list[list],
+        corpus: _Corpus,
+        options: RetrievalOptions,
+        using: str,
+    ) -> dict:
+        extra: dict = {}
+        if name == "ann":
+            started = time.perf_counter()
+            status = VectorIndexService.rebuild(using=using)
+            extra = {"build_seconds": round(time.perf_counter() - started, 3), "index_bytes": status.size_bytes,
+                     "index_params": status.params}
+        search(queries[0])  # aquecimento (caches, conexão, índice quantizado)
+
+        latencies, recalls = [], []
+        started = time.perf_counter()
+        for query, expected in zip(queries, truth, strict=True):
+            query_started = time.perf_counter()
+            found = search(query)
+            latencies.append((time.perf_counter() - query_started) * 1000)
+            recalls.append(recall_at_k(expected, found))
+        elapsed = time.perf_counter() - started
+
+        # Memória numa passada à parte: o tracemalloc distorce a latência
+        tracemalloc.start()
+        try:
+            for query in queries[:5]:
+                search(query)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        if name == "quantized":
+            extra = {"store_bytes": corpus.store_bytes()}
+
+        return {
+            "strategy": name,
+            "queries": len(queries),
+            "qps": round(len(queries) / elapsed, 2) if elapsed else 0.0,
+            "latency": latency_summary(latencies),
+            f"recall_at_{options['k']}": round(sum(recalls) / len(recalls), 4),
+            "peak_memory_bytes": peak,
+            **extra,
+        }
+
+    @staticmethod
+    def _has_pgvector(using: str) -> bool:
+        with connections[using].cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'vector'")
+            return cursor.fetchone() is not None
+
+    @staticmethod
+    def _cleanup(using: str) -> None:
+        users = User.objects.using(using).filter(username__startswith=USERNAME_PREFIX)
+        # Sem FKs apontando para chunks: DELETE direto, sem carregar as linhas
+        DocumentChunk.objects.using(using).filter(document__user__in=users).delete()
+        Document.objects.using(using).filter(user__in=users).delete()
+        users.delete()
+
+
+class _Query:
+    __slots__ = ("cluster", "embedding", "text", "user_id")
+
+    def __init__(self, user_id: uuid.UUID, embedding: list[float], text: str, cluster: int) -> None:
+        self.user_id = user_id
+        self.embedding = embedding
+        self.text = text
+        self.cluster = cluster
+
+
+class _Corpus:
+    """
+    Corpus determinístico (pela semente): embeddings normalizados em torno
+    de ``clusters`` centros, e o texto de cada chunk começa pela palavra do
+    tópico, para a busca híbrida ter o que casar.
+    """
+
+    def __init__(self, options: RetrievalOptions) -> None:
+        self.options = options
+        self.rng = SeededRandom(options["seed"])
+        self.dimensions = options["dimensions"]
+        self.centers = [self._normalize([self.rng.gauss(0, 1) for _ in range(self.dimensions)])
+                        for _ in range(options["clusters"])]
+        self.topics = [f"topico{n}" for n in range(options["clusters"])]
+        self._quantized: dict[uuid.UUID, tuple[list, list[array]]] = {}
+
+    def seed(self, using: str, batch_size: int) -> list[uuid.UUID]:
+        options = self.options
+        users = [
+            User(email=f"{USERNAME_PREFIX}{n}@example.com", username=f"{USERNAME_PREFIX}{n}")
+            for n in range(options["tenants"])
+        ]
+        for user in users:
+            user.set_unusable_password()
+        User.objects.using(using).bulk_create(users)
+
+        documents = [
+            Document(user=user, title=f"Documento {n}", status=Document.StatusChoices.INDEXED)
+            for user in users
+            for n in range(options["documents"])
+        ]
+        Document.objects.using(using).bulk_create(documents)
+
+        rows = self._chunks(documents, options["chunks"])
+        if connections[using].vendor == "postgresql":
+            self._copy(using, rows)
+        else:
+            while batch := list(islice(rows, batch_size)):
+                DocumentChunk.objects.using(using).bulk_create(DocumentChunk(**row) for row in batch)
+        return [user.id for user in users]
+
+    def queries(self, tenants: list[uuid.UUID], count: int) -> list[_Query]:
+        queries = []
+        for _ in range(count):
+            cluster = self.rng.randrange(len(self.centers))
+            queries.append(_Query(self.rng.choice(tenants), self._around(cluster), self.topics[cluster], cluster))
+        return queries
+
+    def store_bytes(self) -> int:
+        """Memória dos vetores int8 já carregados"""
+        return sum(len(vector) for _, vectors in self._quantized.values() for vector in vectors)
+
+    def quantized_search(self, k: int) -> Callable[[_Query], list]:
+        """
+        Quantização escalar int8 em memória (1 byte por dimensão), com
+        rerank dos OVERSAMPLE*k melhores pelos vetores originais.
+        """
+        def search(query: _Query) -> list:
+            ids, vectors = self._quantized_store(query.user_id)
+            target = _quantize(query.embedding)
+            scored = ((math.sumprod(target, vector), index) for index, vector in enumerate(vectors))
+            candidates = [ids[index] for _, index in heapq.nlargest(OVERSAMPLE * k, scored, key=itemgetter(0))]
+            rows = DocumentChunk.objects.filter(id__in=candidates).values_list("id", "embedding")
+            reranked = ((cosine_similarity(query.embedding, parse_embedding(raw)), chunk_id) for chunk_id, raw in rows)
+            return [chunk_id for _, chunk_id in heapq.nlargest(k, reranked, key=itemgetter(0))]
+        return search
+
+    def _quantized_store(self, user_id: uuid.UUID) -> tuple[list, list[array]]:
+        if user_id not in self._quantized:
+            rows = DocumentChunkRepository.searchable(user_id).values_list("id", "embedding").iterator(chunk_size=2000)
+            ids, vectors = [], []
+            for chunk_id, raw in rows:
+                ids.append(chunk_id)
+                vectors.append(_quantize(parse_embedding(raw)))
+            self._quantized[user_id] = (ids, vectors)
+        return self._quantized[user_id]
+
+    def _chunks(self, documents: list[Document], total: int) -> Iterator[dict]:
+        per_document = max(total // len(documents), 1)
+        for document in documents:
+            for index in range(per_document):
+                cluster = self.rng.randrange(len(self.centers))
+                yield {
+                    "id": uuid.uuid4(),
+                    "document_id": document.id,
+                    "chunk_index": index,
+                    "text": f"{self.topics[cluster]} " + " ".join(self.rng.choices(VOCABULARY, k=12)),
+                    "embedding": format_embedding(self._around(cluster)),
+                }
+
+    @staticmethod
+    def _copy(using: str, rows: Iterator[dict]) -> None:
+        """COPY do psycopg: bem mais rápido que INSERT para milhões de linhas"""
+        columns = ("id", "document_id", "chunk_index", "text", "embedding", "metadata")
+        with connections[using].cursor() as cursor, cursor.cursor.copy(
+            f'COPY "document_chunks" ({", ".join(columns)}) FROM STDIN',
+        ) as copy:
+            for row in rows:
+                copy.write_row((row["id"], row["document_id"], row["chunk_index"], row["text"], row["embedding"], "{}"))
+
+    def _around(self, cluster: int) -> list[float]:
+        center = self.centers[cluster]
+        return self._normalize([value + self.rng.gauss(0, 0.35) for value in center])
+
+    def _normalize(self, vector: list[float]) -> list[float]:
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+
+def _quantize(vector: list[float]) -> array:
+    """int8 com escala fixa (vetores normalizados ficam em [-1, 1])"""
+    return array("b", (max(-127, min(127, round(value * 127))) for value in vector))
+
+
+def _hybrid_search(query: _Query, k: int) -> list:
+    """
+    Busca vetorial exata + busca por palavra (índice full-text no
+    PostgreSQL), combinadas por Reciprocal Rank Fusion.
+    """
+    limit = OVERSAMPLE * k
+    vector_ids = [
+        hit.chunk_id for hit in DocumentChunkRepository.search_exact(query.embedding, query.user_id, None, limit)
+    ]
+    chunks = DocumentChunkRepository.searchable(query.user_id)
+    if connections[chunks.db].vendor == "postgresql":
+        chunks = DocumentChunkRepository.filter_full_text(chunks, query.text)
+    else:
+        chunks = chunks.filter(text__startswith=f"{query.text} ")
+    keyword_ids = list(chunks.values_list("id", flat=True)[:limit])
+
+    scores: dict = {}
+    for ranking in (vector_ids, keyword_ids):
+        for rank, chunk_id in enumerate(ranking):
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + 1 / (RRF_K + rank)
+    return [chunk_id for chunk_id, _ in heapq.nlargest(k, scores.items(), key=itemgetter(1))]
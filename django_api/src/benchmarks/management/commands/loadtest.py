@@ -0,0 +1,150 @@
+import json
+import threading
+from contextlib import nullcontext
+from pathlib import Path
+from typing import TypedDict, Unpack
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+from django.test.utils import override_settings
+
+from benchmarks.loadtest import (
+    SCENARIOS,
+    LoadRunner,
+    check_budget,
+    cleanup_database,
+    seed_database,
+)
+from benchmarks.reporting import write_report
+from core.db import use_primary
+from queries.log_writer import get_query_log_writer
+
+
+class LoadtestOptions(TypedDict):
+    scenarios: str
+    concurrency: str
+    requests: int
+    warmup: int
+    users: int
+    base_url: str | None
+    baseline: str | None
+    max_regression: float
+    max_error_rate: float
+    latency_slack_ms: float
+    output: str | None
+
+
+class Command(BaseCommand):
+    help = (
+        "Teste de carga dos endpoints de autenticação e consulta: semeia o "
+        "banco, roda cada cenário em concorrências fixas contra um servidor "
+        "local e falha se o orçamento de regressão for excedido."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--scenarios", default="register,login,refresh,documents,ask", help=f"Cenários separados por vírgula ({', '.join(SCENARIOS)}).")
+        parser.add_argument("--concurrency", default="1,10,50", help="Clientes simultâneos, separados por vírgula.")
+        parser.add_argument("--requests", type=int, default=200, help="Requisições por (cenário, concorrência).")
+        parser.add_argument("--warmup", type=int, default=5, help="Requisições de aquecimento por cenário, fora das medições.")
+        parser.add_argument("--users", type=int, default=50, help="Usuários semeados (login, refresh e consultas alternam entre eles).")
+        parser.add_argument(
+            "--base-url",
+            help=(
+                "Servidor já em execução sobre o mesmo banco (ex.: http://127.0.0.1:8000). "
+                "Sem ele, sobe um servidor WSGI no processo com os backends RAG locais."
+            ),
+        )
+        parser.add_argument("--baseline", help="Relatório JSON de uma execução anterior, para o orçamento de regressão.")
+        parser.add_argument("--max-regression", type=float, default=0.2, help="Piora tolerada de p95 e vazão contra a referência (fração).")
+        parser.add_argument("--max-error-rate", type=float, default=0.01, help="Taxa de erro tolerada por cenário (fração).")
+        parser.add_argument("--latency-slack-ms", type=float, default=5.0, help="Piora absoluta de p95 sempre tolerada (ruído).")
+        parser.add_argument("--output", help="Arquivo JSON de saída.")
+
+    def handle(self, *args: object, **options: Unpack[LoadtestOptions]) -> None:
+        scenarios = options["scenarios"].split(",")
+        for name in scenarios:
+            if name not in SCENARIOS:
+                msg = f"Cenário inválido: {name} (use {', '.join(SCENARIOS)})"
+                raise CommandError(msg)
+        levels = [int(c) for c in options["concurrency"].split(",")]
+        baseline = None
+        if options["baseline"]:
+            baseline = json.loads(Path(options["baseline"]).read_text(encoding="utf-8"))["results"]["runs"]
+
+        # Backends locais só valem para o servidor no processo; um externo usa a própria configuração
+        rag = {**settings.RAG, "EMBEDDING_BACKEND": "local", "LLM_BACKEND": "local"}
+        local_backends = nullcontext() if options["base_url"] else override_settings(RAG=rag)
+        # Tudo no primário: réplicas atrasadas não veriam os dados recém-semeados
+        with local_backends, use_primary():
+            cleanup_database()
+            seed = seed_database(options["users"])
+            server = None
+            try:
+                if options["base_url"]:
+                    url = urlsplit(options["base_url"])
+                    if url.scheme != "http" or not url.hostname:
+                        msg = f"--base-url inválida: {options['base_url']} (use http://host:porta)"
+                        raise CommandError(msg)
+                    runner = LoadRunner(url.hostname, url.port or 80, url.netloc)
+                else:
+                    server = _LocalServer()
+                    runner = LoadRunner(*server.address, server.host_header)
+
+                runs = []
+                offset = 0
+                for name in scenarios:
+                    scenario = SCENARIOS[name]
+                    # Índices distintos por requisição: o registro não repete e-mails
+                    runner.run(scenario, seed, 1, options["warmup"], offset)
+                    offset += options["warmup"]
+                    for concurrency in levels:
+                        runs.append(runner.run(scenario, seed, concurrency, options["requests"], offset).to_dict())
+                        offset += options["requests"]
+            finally:
+                if server is not None:
+                    server.stop()
+                # Grava os QueryLogs pendentes antes de remover os usuários
+                get_query_log_writer().stop()
+                cleanup_database(seed)
+
+        violations = check_budget(
+            runs, baseline, options["max_regression"], options["max_error_rate"], options["latency_slack_ms"],
+        )
+        report = {
+            "server": options["base_url"] or "in-process-wsgi",
+            "users": options["users"],
+            "runs": runs,
+            "violations": violations,
+        }
+        self.stdout.write(write_report("loadtest", report, options["output"]))
+        if violations:
+            msg = "Orçamento de regressão excedido:\n" + "\n".join(violations)
+            raise CommandError(msg)
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+class _LocalServer:
+    """Servidor WSGI com threads (o do runserver) numa porta livre, em segundo plano"""
+
+    def __init__(self) -> None:
+        self.httpd = ThreadedWSGIServer(("127.0.0.1", 0), _QuietHandler, allow_reuse_address=False)
+        self.httpd.set_app(get_wsgi_application())
+        self.address = self.httpd.server_address[:2]
+        self.host_header = next(
+            (h for h in settings.ALLOWED_HOSTS if h != "*" and not h.startswith(".")),
+            "localhost",
+        )
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join()
@@ -0,0 +1,60 @@
+import json
+import math
+import os
+import platform
+import random
+from pathlib import Path
+from typing import Any
+
+from django.utils import timezone
+
+
+class SeededRandom(random.Random):
+    """
+    Gerador com semente dos dados sintéticos: a mesma ``--seed`` gera o mesmo
+    corpus, para comparar relatórios entre builds. Não serve para segredos.
+    """
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Percentil ``q`` (0-100) por nearest-rank de uma lista já ordenada"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(len(sorted_values) * q / 100))
+    return sorted_values[rank - 1]
+
+
+def latency_summary(samples_ms: list[float]) -> dict[str, float]:
+    """Resumo de latências (ms): contagem, média e p50/p95/p99/max"""
+    values = sorted(samples_ms)
+    count = len(values)
+    return {
+        "count": count,
+        "mean_ms": round(sum(values) / count, 3) if count else 0.0,
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "p99_ms": round(percentile(values, 99), 3),
+        "max_ms": round(values[-1], 3) if count else 0.0,
+    }
+
+
+def environment() -> dict[str, Any]:
+    """Metadados da máquina, para comparar relatórios entre builds"""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "generated_at": timezone.now().isoformat(),
+    }
+
+
+def write_report(name: str, results: object, output: str | None = None) -> str:
+    """Serializa o relatório em JSON e grava em ``output`` (se informado)"""
+    report = json.dumps(
+        {"benchmark": name, "environment": environment(), "results": results},
+        indent=2,
+        default=str,
+    )
+    if output:
+        Path(output).write_text(report, encoding="utf-8")
+    return report
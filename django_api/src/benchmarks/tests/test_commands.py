@@ -0,0 +1,175 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from users.models import User
+
+
+class BenchmarkLoginCommandTestCase(TestCase):
+    """Testes para manage.py benchmark_login"""
+
+    def test_reports_logins_per_second(self) -> None:
+        """
+        O que testa: Execução curta do benchmark de login
+        Resultado esperado [PASS]:
+        - JSON com um resultado por (hasher, workers) e o cenário end-to-end
+        - logins_per_sec_per_core > 0
+        """
+        out = StringIO()
+
+        call_command(
+            "benchmark_login",
+            "--hashers=pbkdf2_sha1",
+            "--workers=1,2",
+            "--iterations=2",
+            "--end-to-end",
+            stdout=out,
+        )
+
+        report = json.loads(out.getvalue())
+        results = report["results"]
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[-1]["scenario"], "authenticate_user")
+        self.assertTrue(all(r["logins_per_sec_per_core"] > 0 for r in results))
+
+
+# Os QueryLogs saem num lote só, no stop() do comando, sem disputar o banco com as requisições
+@override_settings(LOG_WRITER={**settings.LOG_WRITER, "ASYNC": True, "FLUSH_INTERVAL": 60})
+class BenchmarkConcurrencyCommandTestCase(TransactionTestCase):
+    """Testes para manage.py benchmark_concurrency"""
+
+    def test_compares_asgi_and_wsgi(self) -> None:
+        """
+        O que testa: Execução curta do comparativo ASGI x WSGI
+        Resultado esperado [PASS]:
+        - Um resultado por servidor, sem erros
+        - Usuário do benchmark removido ao final
+        """
+        out = StringIO()
+
+        call_command(
+            "benchmark_concurrency",
+            "--concurrency=2",
+            "--requests=4",
+            "--latency-ms=0",
+            "--wsgi-threads=2",
+            stdout=out,
+        )
+
+        results = json.loads(out.getvalue())["results"]
+        self.assertEqual([r["server"] for r in results], ["asgi", "wsgi"])
+        self.assertTrue(all(r["errors"] == 0 for r in results))
+        self.assertFalse(User.objects.filter(username="benchmark-concurrency").exists())
+
+
+class BenchmarkDTOsCommandTestCase(TestCase):
+    """Testes para manage.py benchmark_dtos"""
+
+    def test_compares_variants(self) -> None:
+        """
+        O que testa: Execução curta do micro-benchmark de DTOs
+        Resultado esperado [PASS]:
+        - Um resultado por variante (dict, dataclass, slotted_dto)
+        - DTO com slots aloca menos memória por objeto que a dataclass com __dict__
+        """
+        out = StringIO()
+
+        call_command("benchmark_dtos", "--count=200", "--repeat=1", stdout=out)
+
+        results = {r["variant"]: r for r in json.loads(out.getvalue())["results"]}
+        self.assertEqual(set(results), {"dict", "dataclass", "slotted_dto"})
+        self.assertLess(results["slotted_dto"]["bytes_per_object"], results["dataclass"]["bytes_per_object"])
+
+
+class BenchmarkDBPoolCommandTestCase(TestCase):
+    """Testes para manage.py benchmark_db_pool"""
+
+    def test_reports_requests_per_second(self) -> None:
+        """
+        O que testa: Execução curta do benchmark de conexões (SQLite nos testes)
+        Resultado esperado [PASS]:
+        - Um resultado por modo suportado ('pool' ignorado fora do PostgreSQL)
+        - requests_per_sec > 0
+        """
+        out = StringIO()
+
+        call_command("benchmark_db_pool", "--workers=2", "--requests=6", stdout=out, stderr=StringIO())
+
+        results = json.loads(out.getvalue())["results"]
+        self.assertEqual([r["mode"] for r in results], ["no_pooling", "persistent"])
+        self.assertTrue(all(r["requests_per_sec"] > 0 for r in results))
+        self.assertTrue(all(r["latency"]["count"] == 6 for r in results))
+
+
+class BenchmarkRetrievalCommandTestCase(TestCase):
+    """Testes para manage.py benchmark_retrieval"""
+
+    def test_reports_strategies(self) -> None:
+        """
+        O que testa: Corpus pequeno no SQLite com as estratégias disponíveis
+        Resultado esperado [PASS]:
+        - 'ann' ignorada fora do PostgreSQL; exact, hybrid e quantized medidas
+        - Busca exata com recall 1.0 (é a referência); quantizada com recall alto
+        - Corpus removido ao final
+        """
+        out = StringIO()
+
+        call_command(
+            "benchmark_retrieval", "--chunks=400", "--tenants=2", "--documents=2", "--dimensions=16",
+            "--clusters=4", "--queries=5", "--k=5", stdout=out, stderr=StringIO(),
+        )
+
+        report = json.loads(out.getvalue())["results"]
+        results = {r["strategy"]: r for r in report["strategies"]}
+        self.assertEqual(set(results), {"exact", "hybrid", "quantized"})
+        self.assertEqual(results["exact"]["recall_at_5"], 1.0)
+        self.assertGreaterEqual(results["quantized"]["recall_at_5"], 0.8)
+        # 1 byte por dimensão: 200 chunks x 16 por tenant consultado
+        self.assertIn(results["quantized"]["store_bytes"], {200 * 16, 400 * 16})
+        self.assertTrue(all(r["qps"] > 0 and r["peak_memory_bytes"] > 0 for r in results.values()))
+        self.assertEqual(report["corpus"]["chunks"], 400)
+        self.assertFalse(User.objects.filter(username__startswith="benchmark-retrieval-").exists())
+
+
+class BenchmarkIngestionCommandTestCase(TestCase):
+    """Testes para manage.py benchmark_ingestion"""
+
+    def setUp(self) -> None:
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+    def test_reports_runs_and_profiles(self) -> None:
+        """
+        O que testa: Corpus pequeno (3 formatos x 2 tamanhos) no SQLite com --profile-dir
+        Resultado esperado [PASS]:
+        - Só a rodada de 1 worker (SQLite não tem SKIP LOCKED), sem falhas
+        - Documentos/min, chunks/s, RSS e as quatro etapas medidas, por formato e tamanho
+        - Um .prof por etapa; usuário, documentos e arquivos removidos ao final
+        """
+        out, err = StringIO(), StringIO()
+        profile_dir = os.path.join(self.media_root, "profiles")
+
+        with override_settings(MEDIA_ROOT=self.media_root):
+            call_command(
+                "benchmark_ingestion", "--formats=txt,html,csv", "--sizes=2,8", "--documents=2",
+                "--workers=1,2", f"--profile-dir={profile_dir}", stdout=out, stderr=err,
+            )
+
+        report = json.loads(out.getvalue())["results"]
+        self.assertIn("SKIP LOCKED", err.getvalue())
+        self.assertEqual(report["corpus"]["documents"], 12)
+        [run] = report["runs"]
+        self.assertEqual((run["workers"], run["documents"], run["failed"]), (1, 12, 0))
+        self.assertTrue(run["documents_per_min"] > 0 and run["chunks_per_sec"] > 0 and run["peak_rss_mb"] > 0)
+        self.assertEqual(set(run["stages"]), {"extract", "chunk", "embedding", "persist"})
+        self.assertAlmostEqual(sum(stage["share"] for stage in run["stages"].values()), 1.0, places=2)
+        self.assertEqual(len(run["files"]), 6)
+        self.assertTrue(all(len(report["profiles"]) == 4 and os.path.exists(path) for path in report["profiles"]))
+        self.assertFalse(User.objects.filter(username="benchmark-ingestion").exists())
+        self.assertEqual(os.listdir(os.path.join(self.media_root, "benchmarks", "ingestion")), [])
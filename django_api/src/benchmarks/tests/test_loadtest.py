@@ -0,0 +1,119 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+
+from benchmarks.loadtest import check_budget, histogram
+from plans.models import Plan
+from users.models import User
+
+FAST_HASHING = {**settings.PASSWORD_HASHING, "PBKDF2_ITERATIONS": 1000}
+
+
+def run(
+    scenario: str = "login", concurrency: int = 1, p95: float = 10.0, rps: float = 100.0, error_rate: float = 0.0,
+) -> dict:
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "error_rate": error_rate,
+        "requests_per_sec": rps,
+        "latency": {"p95_ms": p95},
+    }
+
+
+class CheckBudgetTestCase(SimpleTestCase):
+    """Testes para benchmarks.loadtest.check_budget"""
+
+    def test_within_budget(self) -> None:
+        """
+        O que testa: p95 e vazão dentro da tolerância, e piora de p95 menor que a folga absoluta
+        Resultado esperado [PASS]: Nenhuma violação
+        """
+        baseline = [run(p95=10.0, rps=100.0), run(scenario="refresh", p95=1.0)]
+        results = [run(p95=11.5, rps=85.0), run(scenario="refresh", p95=4.0)]
+
+        self.assertEqual(check_budget(results, baseline, max_regression=0.2, max_error_rate=0.01), [])
+
+    def test_regressions(self) -> None:
+        """
+        O que testa: p95 acima, vazão abaixo e taxa de erro acima do orçamento
+        Resultado esperado [FAIL]: Uma violação de cada, identificada por cenário@concorrência
+        """
+        baseline = [run(p95=100.0, rps=100.0)]
+        results = [run(p95=130.0, rps=70.0, error_rate=0.05)]
+
+        violations = check_budget(results, baseline, max_regression=0.2, max_error_rate=0.01)
+
+        self.assertEqual(len(violations), 3)
+        self.assertTrue(all(v.startswith("login@1:") for v in violations))
+
+    def test_histogram_buckets(self) -> None:
+        """
+        O que testa: Contagem de latências pelas faixas do http_request_duration_seconds
+        Resultado esperado [PASS]: Cada amostra na menor faixa que a contém; acima de 30 s em +Inf
+        """
+        counts = histogram([1.0, 5.0, 7.0, 40_000.0])
+
+        self.assertEqual((counts["5"], counts["10"], counts["+Inf"]), (2, 1, 1))
+        self.assertEqual(sum(counts.values()), 4)
+
+
+@override_settings(PASSWORD_HASHING=FAST_HASHING)
+class LoadTestCommandTestCase(TransactionTestCase):
+    """Testes para manage.py loadtest"""
+
+    def call(self, *args: str, out: StringIO | None = None) -> None:
+        # Um usuário semeado: o last_login só é gravado no aquecimento, e o
+        # SQLite em memória não aceita escritas simultâneas das threads do servidor
+        call_command("loadtest", "--requests=4", "--warmup=1", "--users=1", *args, stdout=out or StringIO())
+
+    def test_runs_scenarios_against_local_server(self) -> None:
+        """
+        O que testa: Cenários de login, refresh e listagem no servidor WSGI local com 1 e 2 clientes
+        Resultado esperado [PASS]:
+        - Um resultado por (cenário, concorrência), sem erros, com histograma somando as requisições
+        - Usuários do loadtest e o plano FREE semeado removidos ao final
+        """
+        out = StringIO()
+
+        self.call("--scenarios=login,refresh,documents", "--concurrency=1,2", out=out)
+
+        report = json.loads(out.getvalue())["results"]
+        runs = report["runs"]
+        self.assertEqual([(r["scenario"], r["concurrency"]) for r in runs][:3], [("login", 1), ("login", 2), ("refresh", 1)])
+        self.assertEqual(len(runs), 6)
+        for result in runs:
+            self.assertEqual(result["errors"], 0, result)
+            self.assertEqual(sum(result["histogram"].values()), 4)
+            self.assertGreater(result["requests_per_sec"], 0)
+        self.assertEqual(report["violations"], [])
+        self.assertFalse(User.objects.filter(username__startswith="loadtest-").exists())
+        self.assertFalse(Plan.objects.exists())
+
+    def test_fails_when_budget_exceeded(self) -> None:
+        """
+        O que testa: Registro medido contra uma referência com vazão inalcançável
+        Resultado esperado [FAIL]:
+        - Registros concluídos (201), mas CommandError listando a violação de register@1
+        - Relatório escrito antes da falha; usuários registrados removidos
+        """
+        baseline = {"results": {"runs": [
+            {**run(scenario="register", concurrency=1, rps=1e9), "latency": {"p95_ms": 1e9}},
+        ]}}
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as file:
+            json.dump(baseline, file)
+        self.addCleanup(os.remove, file.name)
+        out = StringIO()
+
+        with self.assertRaisesMessage(CommandError, "register@1"):
+            self.call("--scenarios=register", "--concurrency=1", f"--baseline={file.name}", out=out)
+
+        [result] = json.loads(out.getvalue())["results"]["runs"]
+        self.assertEqual((result["errors"], result["statuses"]), (0, {"201": 4}))
+        self.assertFalse(User.objects.filter(username__startswith="loadtest-").exists())
@@ -0,0 +1,76 @@
+import inspect
+from typing import TYPE_CHECKING, Self
+
+from asgiref.sync import sync_to_async
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from django.http import HttpRequest, HttpResponseBase
+    from rest_framework.views import APIView
+
+
+class _ExceptionResponse:
+    """
+    Converte a exceção do bloco em resposta com ``view.handle_exception``,
+    como o ``except Exception`` do APIView.dispatch: o EXCEPTION_HANDLER
+    monta a resposta ou o DRF relança o que ele não tratar. BaseException
+    (ex.: CancelledError numa desconexão) continua propagando.
+    """
+
+    def __init__(self, view: APIView) -> None:
+        self.view = view
+        self.response: HttpResponseBase | None = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> bool:
+        if not isinstance(exc, Exception):
+            return False
+        self.response = self.view.handle_exception(exc)
+        return True
+
+
+class AsyncAPIViewMixin:
+    """
+    Permite handlers ``async def`` em views do DRF.
+
+    O DRF só despacha views síncronas; este mixin reimplementa o ``dispatch``
+    como corrotina, então o Django marca a view como async e, sob ASGI, ela roda
+    no event loop sem ocupar uma thread enquanto espera I/O (LLM, embeddings,
+    ORM async). Sob WSGI continua funcionando via ``async_to_sync``.
+
+    Autenticação, permissões e throttling (``initial``) rodam numa thread do
+    ``sync_to_async``: podem ler cache e banco (a revogação de tokens da
+    StatelessJWTAuthentication faz os dois) sem bloquear o loop. O exception
+    handler roda no loop. Usar antes de ``GenericAPIView`` na herança.
+    """
+
+    async def dispatch(self, request: HttpRequest, *args: object, **kwargs: object) -> HttpResponseBase:
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        with _ExceptionResponse(self) as handled:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+            handled.response = response
+
+        self.response = self.finalize_response(request, handled.response, *args, **kwargs)
+        return self.response
@@ -0,0 +1,60 @@
+from django.db import connections, models, router
+from psycopg import sql
+
+
+def insert_instances(*instances: models.Model, using: str | None = None) -> None:
+    """
+    Insere instâncias de models diferentes num único statement.
+
+    No Postgres monta um INSERT com CTEs (``WITH a AS (INSERT ...), b AS
+    (INSERT ...) INSERT ...``), então N linhas em N tabelas custam um round
+    trip. As PKs precisam ser geradas no cliente (UUID default), e as FKs do
+    Django são DEFERRABLE INITIALLY DEFERRED, então a ordem entre as CTEs não
+    importa. Sinais de save não são disparados.
+
+    Como um ``save()``, cada model passa pelo ``router.db_for_write``: a
+    escrita fica registrada no roteamento da requisição (core.db), que fixa
+    as leituras seguintes no primário e devolve o cookie de read-your-writes.
+
+    Em outros bancos cai para um ``save(force_insert=True)`` por instância.
+    """
+    aliases = [router.db_for_write(type(instance), instance=instance) for instance in instances]
+    using = using or aliases[0]
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        for instance in instances:
+            instance.save(force_insert=True, using=using)
+        return
+
+    statements: list[sql.Composed] = []
+    params: list = []
+    for instance in instances:
+        fields = [f for f in instance._meta.concrete_fields if not f.generated]
+        statements.append(
+            sql.SQL("INSERT INTO {} ({}) VALUES ({})").format(
+                sql.Identifier(instance._meta.db_table),
+                sql.SQL(", ").join(sql.Identifier(f.column) for f in fields),
+                sql.SQL(", ").join(sql.Placeholder() * len(fields)),
+            )
+        )
+        params.extend(
+            f.get_db_prep_save(f.pre_save(instance, add=True), connection) for f in fields
+        )
+
+    *ctes, last = statements
+    statement = last
+    if ctes:
+        statement = sql.SQL("WITH {} {}").format(
+            sql.SQL(", ").join(
+                sql.SQL("{} AS ({})").format(sql.Identifier(f"_insert_{n}"), cte)
+                for n, cte in enumerate(ctes)
+            ),
+            last,
+        )
+
+    with connection.cursor() as cursor:
+        cursor.execute(statement.as_string(cursor.connection), params)
+
+    for instance in instances:
+        instance._state.adding = False
+        instance._state.db = using
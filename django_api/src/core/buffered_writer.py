@@ -0,0 +1,147 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+_POLL_INTERVAL = 0.1
+
+
+class BufferedWriter[T]:
+    """
+    Buffer em memória que agrupa registros e os grava em lote.
+
+    Os registros entram numa fila limitada (memória controlada) e uma thread
+    de fundo chama ``flush_func`` quando o lote atinge ``batch_size`` ou
+    quando ``flush_interval`` segundos se passam desde o último flush.
+
+    Backpressure: se a fila estiver cheia, ``submit`` espera no máximo
+    ``block_timeout`` segundos e depois descarta o registro (contabilizado em
+    ``dropped``). Observabilidade nunca deve derrubar a requisição.
+
+    Com ``async_mode=False`` o flush acontece na própria thread chamadora,
+    útil em testes e em desenvolvimento.
+    """
+
+    def __init__(
+        self,
+        flush_func: Callable[[list[T]], None],
+        *,
+        name: str = "buffered-writer",
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 10_000,
+        block_timeout: float = 0.05,
+        async_mode: bool = True,
+    ) -> None:
+        self.flush_func = flush_func
+        self.name = name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.block_timeout = block_timeout
+        self.async_mode = async_mode
+        self.dropped = 0
+
+        self._queue: queue.Queue[T] = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._atexit_registered = False
+
+    def submit(self, record: T) -> bool:
+        """Enfileira um registro. Retorna False se foi descartado."""
+        if not self.async_mode:
+            self._write([record])
+            return True
+
+        self._ensure_started()
+        try:
+            self._queue.put(record, timeout=self.block_timeout)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            logger.warning(f"{self.name}: fila cheia, registro descartado")
+            return False
+        return True
+
+    def flush(self) -> int:
+        """Grava imediatamente tudo o que está na fila. Retorna o total gravado."""
+        total = 0
+        while True:
+            batch = self._drain(self.batch_size)
+            if not batch:
+                return total
+            self._write(batch)
+            total += len(batch)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Para a thread de fundo e faz o flush final (graceful shutdown)."""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._stop_event.set()
+            thread.join(timeout)
+        self.flush()
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _ensure_started(self) -> None:
+        # Threads não sobrevivem a fork (ex.: gunicorn --preload), por isso o
+        # pid é verificado e a thread recriada no processo filho.
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.stop)
+                self._atexit_registered = True
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            batch = self._collect()
+            if batch:
+                self._write(batch)
+
+    def _collect(self) -> list[T]:
+        """Acumula registros até fechar um lote ou estourar o intervalo."""
+        batch: list[T] = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._stop_event.is_set():
+                break
+            try:
+                # Espera em fatias curtas para reagir rápido ao stop().
+                batch.append(self._queue.get(timeout=min(remaining, _POLL_INTERVAL)))
+            except queue.Empty:
+                continue
+        return batch
+
+    def _drain(self, limit: int) -> list[T]:
+        batch: list[T] = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: list[T]) -> None:
+        try:
+            self.flush_func(batch)
+        except Exception:
+            logger.exception(f"{self.name}: falha ao gravar lote de {len(batch)} registros")
@@ -0,0 +1,98 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from django.db.models import Model
+
+INGESTION_DB_ALIAS = "ingestion"
+REPLICA_ALIAS_PREFIX = "replica_"
+
+# Sorteio da réplica de cada leitura; a fonte do SO dispensa semente por worker
+_balancer = random.SystemRandom()
+
+
+def ingestion_db_alias() -> str:
+    """
+    Alias para cargas em lote (importações, jobs de manutenção): o mesmo
+    banco com um pool próprio, para não disputar conexões com a API. Cai para
+    ``default`` quando não configurado (ex.: SQLite nos testes).
+    """
+    return INGESTION_DB_ALIAS if INGESTION_DB_ALIAS in settings.DATABASES else DEFAULT_DB_ALIAS
+
+
+def replica_aliases() -> list[str]:
+    """Aliases das réplicas de leitura configuradas (DB_REPLICA_HOSTS)"""
+    return [alias for alias in settings.DATABASES if alias.startswith(REPLICA_ALIAS_PREFIX)]
+
+
+class RoutingState:
+    """
+    Estado de roteamento de uma requisição. Mutável e compartilhado pelo
+    ContextVar, então uma escrita feita numa thread do ``sync_to_async`` fixa
+    as leituras seguintes da requisição no primário.
+    """
+
+    __slots__ = ("pinned", "wrote")
+
+    def __init__(self, *, pinned: bool = False) -> None:
+        self.pinned = pinned
+        self.wrote = False
+
+
+current_routing: ContextVar[RoutingState | None] = ContextVar("current_routing", default=None)
+
+
+@contextmanager
+def use_primary() -> Iterator[RoutingState]:
+    """Lê do primário dentro do bloco (ex.: fora de requisições, logo após uma escrita)"""
+    state = RoutingState(pinned=True)
+    token = current_routing.set(state)
+    try:
+        yield state
+    finally:
+        current_routing.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Leituras vão para uma réplica (aleatória) e escritas para o primário.
+
+    Read-your-writes: depois da primeira escrita da requisição, as leituras
+    dela também vão ao primário; o ReplicaRoutingMiddleware estende isso ao
+    cliente por REPLICA_ROUTING['STICKY_SECONDS'] (atraso de replicação) com
+    um cookie. Leituras dentro de ``transaction.atomic`` usam o primário.
+    Escritas nos models de REPLICA_ROUTING['UNPINNED_MODELS'] (logs,
+    agregados) não fixam, senão toda consulta RAG tiraria o cliente das
+    réplicas. Sem réplicas configuradas, tudo fica no ``default``.
+    """
+
+    def db_for_read(self, model: type[Model], **hints: object) -> str | None:
+        replicas = replica_aliases()
+        if not replicas:
+            return None
+        state = current_routing.get()
+        if (state is not None and state.pinned) or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return _balancer.choice(replicas)
+
+    def db_for_write(self, model: type[Model], **hints: object) -> str:
+        state = current_routing.get()
+        if state is not None and model._meta.label_lower not in settings.REPLICA_ROUTING["UNPINNED_MODELS"]:
+            state.pinned = state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: object) -> bool:
+        # Todos os aliases apontam para o mesmo banco (réplicas e 'ingestion')
+        return True
+
+    def allow_migrate(
+        self, db: str, app_label: str, model_name: str | None = None, **hints: object,
+    ) -> bool | None:
+        return None if db == DEFAULT_DB_ALIAS else False
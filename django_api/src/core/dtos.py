@@ -0,0 +1,30 @@
+from dataclasses import fields
+from typing import Any, ClassVar
+
+
+class DTO:
+    """
+    Base dos DTOs da camada de serviço.
+
+    As subclasses usam ``@dataclass(frozen=True, slots=True)``: sem
+    ``__dict__`` por instância, cada objeto ocupa só os slots dos campos e é
+    criado mais rápido, o que importa nos DTOs gerados aos milhares por
+    consulta (trechos, citações). O FastJSONRenderer (orjson) serializa
+    dataclasses direto, sem passar por ``to_dict``.
+    """
+
+    __slots__ = ()
+    _field_names: ClassVar[tuple[str, ...]]
+
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        super().__init_subclass__(**kwargs)
+        # Preenchido de forma preguiçosa: o @dataclass roda depois do __init_subclass__
+        cls._field_names = ()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Dict raso dos campos, sem copiar os valores (listas e dicts são compartilhados)"""
+        cls = type(self)
+        names = cls._field_names
+        if not names:
+            names = cls._field_names = tuple(field.name for field in fields(cls))
+        return {name: getattr(self, name) for name in names}
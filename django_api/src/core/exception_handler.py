@@ -8,6 +8,7 @@ from rest_framework import status
 from rest_framework.exceptions import APIException, ValidationError
 from rest_framework.response import Response
 
+from core.profiling import get_trace_id
 from users.exceptions import BaseException
 from users.response_handler import APIResponse, ErroreDtail
 
@@ -28,7 +29,8 @@ def custom_exception_handler(exc: Exception, context: dict[str, Any]) -> Respons
     Já o BaseException vai pegar as exceptions customizadas dos usuários.
     """
 
-    trace_id = str(uuid4())
+    # Mesmo id do header X-Trace-Id (core.middleware), para achar a requisição nos logs
+    trace_id = get_trace_id() or str(uuid4())
     timestamp = timezone.now()
 
     if isinstance(exc, BaseException):
@@ -0,0 +1,14 @@
+from rest_framework import status
+
+from users import exceptions
+
+
+class InvalidCursorException(exceptions.BaseException):
+    """Exception raised when a pagination cursor is malformed or from another listing."""
+
+    def __init__(self, message: str = "Invalid pagination cursor.") -> None:
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            error_code="invalid_cursor",
+        )
@@ -0,0 +1,165 @@
+import hmac
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from functools import cache
+
+from django.conf import settings
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseForbidden,
+    HttpResponseNotFound,
+)
+from django.utils.module_loading import import_string
+
+# Segundos; cobre de respostas em cache até chamadas longas ao LLM
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsSink(ABC):
+    """Destino das medições por requisição (PROFILING['METRICS_SINK'])"""
+
+    @abstractmethod
+    def observe_request(
+        self,
+        *,
+        method: str,
+        route: str,
+        status: int,
+        duration_ms: float,
+        stages: dict[str, list[float]],
+    ) -> None:
+        """
+        Registra uma requisição. ``stages`` mapeia etapa -> [contagem, ms]
+        (ver core.profiling.RequestProfile).
+        """
+
+
+class NullMetricsSink(MetricsSink):
+    """Descarta as medições"""
+
+    def observe_request(self, **kwargs: object) -> None:
+        pass
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class PrometheusMetricsSink(MetricsSink):
+    """
+    Agrega as medições em memória e as expõe no formato texto do Prometheus
+    (servido em /metrics), sem depender de prometheus_client.
+
+    Os valores são por processo: com vários workers, cada um é um alvo de
+    scrape separado. ``route`` é o padrão da URL, não o path, para manter a
+    cardinalidade baixa.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._requests: defaultdict[tuple[str, str, str], int] = defaultdict(int)
+        # (method, route) -> [contagem por bucket..., soma]
+        self._durations: dict[tuple[str, str], list[float]] = {}
+        self._stage_calls: defaultdict[str, int] = defaultdict(int)
+        self._stage_seconds: defaultdict[str, float] = defaultdict(float)
+
+    def observe_request(
+        self,
+        *,
+        method: str,
+        route: str,
+        status: int,
+        duration_ms: float,
+        stages: dict[str, list[float]],
+    ) -> None:
+        seconds = duration_ms / 1000
+        with self._lock:
+            self._requests[method, route, str(status)] += 1
+            histogram = self._durations.setdefault(
+                (method, route), [0] * (len(DURATION_BUCKETS) + 1) + [0.0],
+            )
+            for n, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    histogram[n] += 1
+            histogram[len(DURATION_BUCKETS)] += 1  # +Inf
+            histogram[-1] += seconds
+            for stage, (count, total_ms) in stages.items():
+                self._stage_calls[stage] += int(count)
+                self._stage_seconds[stage] += total_ms / 1000
+
+    def render(self) -> str:
+        """Exposição no formato texto 0.0.4"""
+        lines = [
+            "# HELP http_requests_total Requisições HTTP atendidas.",
+            "# TYPE http_requests_total counter",
+        ]
+        with self._lock:
+            for (method, route, status), value in sorted(self._requests.items()):
+                lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {value}")
+
+            lines += [
+                "# HELP http_request_duration_seconds Duração das requisições HTTP.",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            for (method, route), histogram in sorted(self._durations.items()):
+                for bound, value in zip((*DURATION_BUCKETS, "+Inf"), histogram[:-1], strict=True):
+                    labels = _labels(method=method, route=route, le=str(bound))
+                    lines.append(f"http_request_duration_seconds_bucket{labels} {value}")
+                labels = _labels(method=method, route=route)
+                lines.append(f"http_request_duration_seconds_sum{labels} {histogram[-1]}")
+                lines.append(f"http_request_duration_seconds_count{labels} {histogram[-2]}")
+
+            lines += [
+                "# HELP http_request_stage_calls_total Chamadas por etapa (db, cache, embedding, ...).",
+                "# TYPE http_request_stage_calls_total counter",
+            ]
+            lines += [
+                f"http_request_stage_calls_total{_labels(stage=stage)} {value}"
+                for stage, value in sorted(self._stage_calls.items())
+            ]
+            lines += [
+                "# HELP http_request_stage_seconds_total Tempo gasto por etapa.",
+                "# TYPE http_request_stage_seconds_total counter",
+            ]
+            lines += [
+                f"http_request_stage_seconds_total{_labels(stage=stage)} {value}"
+                for stage, value in sorted(self._stage_seconds.items())
+            ]
+        return "\n".join(lines) + "\n"
+
+
+@cache
+def _load_sink(path: str) -> MetricsSink:
+    return import_string(path)()
+
+
+def get_metrics_sink() -> MetricsSink:
+    """Sink configurado em PROFILING['METRICS_SINK'] (um por processo)"""
+    return _load_sink(settings.PROFILING["METRICS_SINK"])
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """
+    Endpoint de scrape do Prometheus.
+
+    Exige ``Authorization: Bearer <PROFILING['METRICS_TOKEN']>``; sem token
+    configurado o endpoint fica fechado (403).
+    """
+    token = settings.PROFILING["METRICS_TOKEN"]
+    if not token or not hmac.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {token}",
+    ):
+        return HttpResponseForbidden()
+
+    sink = get_metrics_sink()
+    if not hasattr(sink, "render"):
+        return HttpResponseNotFound()
+    return HttpResponse(sink.render(), content_type=PROMETHEUS_CONTENT_TYPE)
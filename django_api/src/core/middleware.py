@@ -0,0 +1,171 @@
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from core.db import RoutingState, current_routing, replica_aliases
+from core.metrics import get_metrics_sink
+from core.profiling import (
+    RequestProfile,
+    clean_trace_id,
+    current_profile,
+    install_db_timer,
+    sampled_profiler,
+    span,
+)
+from core.query_budget import QueryRecorder, log_duplicate_queries, recording
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterator
+    from contextvars import Token
+
+    from django.http import HttpRequest, HttpResponseBase
+    from django.template.response import SimpleTemplateResponse
+
+TRACE_ID_HEADER = "X-Trace-Id"
+
+
+class RequestProfilingMiddleware:
+    """
+    Perfil por requisição: atribui um trace id (ou reaproveita o
+    ``X-Trace-Id`` recebido), mede as etapas quentes (queries, cache,
+    embedding, LLM, serialização) e devolve o resultado em ``Server-Timing``
+    e no sink de métricas (PROFILING). Com QUERY_BUDGET['LOG_DUPLICATES'],
+    registra em log as queries repetidas na requisição (N+1).
+
+    Suporta os modos sync e async, para não forçar troca de contexto nas views
+    async sob ASGI. Deve ser o primeiro da lista MIDDLEWARE, para que ``total``
+    cubra os demais middlewares.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        install_db_timer()
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase | Awaitable[HttpResponseBase]:
+        if self.async_mode:
+            return self.__acall__(request)
+        profile = RequestProfile(clean_trace_id(request.headers.get(TRACE_ID_HEADER)))
+        token = current_profile.set(profile)
+        try:
+            with sampled_profiler(profile, request), self._detect_duplicates(request):
+                response = self.get_response(request)
+            self._finish(request, response, profile)
+        finally:
+            current_profile.reset(token)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        profile = RequestProfile(clean_trace_id(request.headers.get(TRACE_ID_HEADER)))
+        token = current_profile.set(profile)
+        try:
+            with sampled_profiler(profile, request), self._detect_duplicates(request):
+                response = await self.get_response(request)
+            self._finish(request, response, profile)
+        finally:
+            current_profile.reset(token)
+        return response
+
+    def process_template_response(
+        self, request: HttpRequest, response: SimpleTemplateResponse,
+    ) -> SimpleTemplateResponse:
+        # Respostas do DRF são renderizadas depois da view: mede a serialização
+        render = response.render
+
+        def timed_render() -> SimpleTemplateResponse:
+            with span("serialize"):
+                return render()
+
+        response.render = timed_render
+        return response
+
+    @staticmethod
+    @contextmanager
+    def _detect_duplicates(request: HttpRequest) -> Iterator[None]:
+        config = settings.QUERY_BUDGET
+        if not config["LOG_DUPLICATES"]:
+            yield
+            return
+        with recording(QueryRecorder(config["DUPLICATE_THRESHOLD"])) as recorder:
+            yield
+        log_duplicate_queries(recorder, f"{request.method} {request.path}")
+
+    @staticmethod
+    def _finish(request: HttpRequest, response: HttpResponseBase, profile: RequestProfile) -> None:
+        response[TRACE_ID_HEADER] = profile.trace_id
+        if settings.PROFILING["SERVER_TIMING"]:
+            response["Server-Timing"] = profile.server_timing()
+
+        match = getattr(request, "resolver_match", None)
+        get_metrics_sink().observe_request(
+            method=request.method,
+            route=match.route if match else "<unmatched>",
+            status=response.status_code,
+            duration_ms=profile.elapsed_ms(),
+            stages=profile.stages,
+        )
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Escopo de roteamento das réplicas (core.db.ReplicaRouter) por requisição.
+
+    Se a requisição escreveu no primário, devolve um cookie que mantém as
+    leituras do cliente no primário por REPLICA_ROUTING['STICKY_SECONDS'],
+    para ele ver a própria escrita mesmo com atraso de replicação. Sem
+    réplicas configuradas não faz nada.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase | Awaitable[HttpResponseBase]:
+        if self.async_mode:
+            return self.__acall__(request)
+        if not replica_aliases():
+            return self.get_response(request)
+        state, token = self._start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_routing.reset(token)
+        return self._finish(response, state)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        if not replica_aliases():
+            return await self.get_response(request)
+        state, token = self._start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_routing.reset(token)
+        return self._finish(response, state)
+
+    @staticmethod
+    def _start(request: HttpRequest) -> tuple[RoutingState, Token[RoutingState | None]]:
+        pinned = request.COOKIES.get(settings.REPLICA_ROUTING["PIN_COOKIE"]) == "1"
+        state = RoutingState(pinned=pinned)
+        return state, current_routing.set(state)
+
+    @staticmethod
+    def _finish(response: HttpResponseBase, state: RoutingState) -> HttpResponseBase:
+        config = settings.REPLICA_ROUTING
+        if state.wrote and config["STICKY_SECONDS"] > 0:
+            response.set_cookie(
+                config["PIN_COOKIE"], "1",
+                max_age=config["STICKY_SECONDS"], httponly=True, samesite="Lax",
+            )
+        return response
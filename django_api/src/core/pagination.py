@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+from typing import Any
+
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.db.models import Model, Q, QuerySet
+from rest_framework import serializers
+
+from core.exceptions import InvalidCursorException
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+@dataclass(frozen=True, slots=True)
+class CursorPage[T]:
+    """Página de uma listagem por cursor"""
+    results: list[T]
+    next_cursor: str | None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"results": self.results, "next_cursor": self.next_cursor}
+
+
+class KeysetPaginator:
+    """
+    Paginação por keyset (cursor): a próxima página é ``WHERE (chave) <
+    (última chave vista)`` na ordem do índice, em vez de OFFSET.
+
+    Com um índice que cubra o filtro + ``ordering`` o custo de qualquer página
+    é o da primeira: o banco desce no índice até o cursor e lê ``page_size``
+    linhas, enquanto OFFSET lê e descarta todas as anteriores.
+
+    ``ordering`` deve ser única (terminar num campo único, como ``id``) para
+    não pular nem repetir linhas com valores empatados. O cursor é opaco e
+    assinado com a ordering, então não pode ser editado nem reaproveitado em
+    outra listagem.
+    """
+
+    def __init__(self, ordering: tuple[str, ...]) -> None:
+        self.ordering = ordering
+        self.fields = [name.removeprefix("-") for name in ordering]
+        self.salt = f"core.pagination:{','.join(ordering)}"
+
+    def paginate(
+        self,
+        queryset: QuerySet,
+        cursor: str | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> CursorPage:
+        """
+        Raises:
+            InvalidCursorException: Se o cursor for inválido ou de outra listagem
+        """
+        queryset = queryset.order_by(*self.ordering)
+        if cursor:
+            queryset = queryset.filter(self._after(self._decode(queryset.model, cursor)))
+
+        rows = list(queryset[:page_size + 1])
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        return CursorPage(
+            results=rows,
+            next_cursor=self._encode(rows[-1]) if has_next else None,
+        )
+
+    def _after(self, values: list[Any]) -> Q:
+        """
+        Linhas depois de ``values`` na ordering, expandida em
+        ``(a < x) OR (a = x AND b < y) ...``. A condição redundante
+        ``a <= x`` no início deixa o banco fazer um range scan no índice.
+        """
+        condition = Q()
+        equal = Q()
+        for name, field, value in zip(self.ordering, self.fields, values, strict=True):
+            lookup = "lt" if name.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{field}__{lookup}": value})
+            equal &= Q(**{field: value})
+        first = self.ordering[0]
+        bound = Q(**{f"{self.fields[0]}__{'lte' if first.startswith('-') else 'gte'}": values[0]})
+        return bound & condition
+
+    def _encode(self, row: Model | dict[str, object]) -> str:
+        get = row.__getitem__ if isinstance(row, dict) else lambda name: getattr(row, name)
+        return signing.dumps([str(get(field)) for field in self.fields], salt=self.salt, compress=True)
+
+    def _decode(self, model: type[Model], cursor: str) -> list[Any]:
+        try:
+            raw = signing.loads(cursor, salt=self.salt)
+            return [
+                model._meta.get_field(field).to_python(value)
+                for field, value in zip(self.fields, raw, strict=True)
+            ]
+        except (signing.BadSignature, ValidationError, ValueError, TypeError) as err:
+            raise InvalidCursorException from err
+
+
+class CursorPageSerializer(serializers.Serializer):
+    """Parâmetros de paginação por cursor (?cursor=...&page_size=...)"""
+
+    cursor = serializers.CharField(required=False, allow_blank=True)
+    page_size = serializers.IntegerField(min_value=1, max_value=MAX_PAGE_SIZE, default=DEFAULT_PAGE_SIZE)
@@ -0,0 +1,199 @@
+import contextvars
+import cProfile
+import logging
+import random
+import re
+import threading
+import time
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from django.db.backends.base.base import BaseDatabaseWrapper
+    from django.http import HttpRequest
+
+logger = logging.getLogger(__name__)
+
+# Aceita o id vindo do proxy/cliente só se for curto e seguro para logs/headers
+_TRACE_ID_RE = re.compile(r"^[A-Za-z0-9._-]{8,64}$")
+
+
+class RequestProfile:
+    """
+    Medições de uma requisição: trace id e tempo/contagem por etapa (db,
+    cache, embedding, llm, serialize, ...).
+
+    Fica num ContextVar, que o asgiref copia para as threads de
+    sync_to_async e para as tasks do event loop, então as etapas executadas
+    fora da thread da requisição também são somadas.
+
+    ``profilers`` (etapa -> cProfile.Profile) perfila só os blocos daquelas
+    etapas, acumulando entre execuções; o cProfile admite um perfil ativo
+    por vez, então só serve para execuções sequenciais (benchmark_ingestion).
+    """
+
+    __slots__ = ("_lock", "cache_hits", "cache_misses", "profilers", "stages", "started", "trace_id")
+
+    def __init__(self, trace_id: str | None = None, profilers: dict[str, cProfile.Profile] | None = None) -> None:
+        self.trace_id = trace_id or uuid4().hex
+        self.started = time.perf_counter()
+        self.stages: dict[str, list[float]] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.profilers = profilers
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, duration_ms: float, count: int = 1) -> None:
+        with self._lock:
+            totals = self.stages.setdefault(stage, [0, 0.0])
+            totals[0] += count
+            totals[1] += duration_ms
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self) -> str:
+        """Valor do header Server-Timing (ms, com a contagem em desc)"""
+        entries = [
+            f'{stage};dur={total_ms:.1f};desc="{count}x"'
+            for stage, (count, total_ms) in sorted(self.stages.items())
+        ]
+        if self.cache_hits or self.cache_misses:
+            entries.append(f'cache-local;desc="{self.cache_hits} hit/{self.cache_misses} miss"')
+        entries.append(f"total;dur={self.elapsed_ms():.1f}")
+        return ", ".join(entries)
+
+
+current_profile: contextvars.ContextVar[RequestProfile | None] = contextvars.ContextVar(
+    "current_profile", default=None,
+)
+
+
+def get_trace_id() -> str | None:
+    """Trace id da requisição atual (None fora de uma requisição)"""
+    profile = current_profile.get()
+    return profile.trace_id if profile else None
+
+
+def clean_trace_id(value: str | None) -> str | None:
+    """Trace id recebido em header, se tiver formato aceitável"""
+    if value and _TRACE_ID_RE.match(value):
+        return value
+    return None
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Soma o tempo do bloco na etapa ``stage`` da requisição atual"""
+    profile = current_profile.get()
+    if profile is None:
+        yield
+        return
+    profiler = profile.profilers.get(stage) if profile.profilers else None
+    started = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        profile.add(stage, (time.perf_counter() - started) * 1000)
+
+
+def record_cache(*, hit: bool) -> None:
+    """Conta um acerto/erro de cache em memória do processo"""
+    profile = current_profile.get()
+    if profile is None:
+        return
+    if hit:
+        profile.cache_hits += 1
+    else:
+        profile.cache_misses += 1
+
+
+def _db_timer(execute: Callable[..., object], sql: str, params: object, *args: object) -> object:
+    profile = current_profile.get()
+    if profile is None:
+        return execute(sql, params, *args)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, *args)
+    finally:
+        profile.add("db", (time.perf_counter() - started) * 1000)
+
+
+def install_execute_wrapper(wrapper: Callable) -> None:
+    """
+    Instala ``wrapper`` (ver connection.execute_wrapper) de forma permanente
+    em todas as conexões, atuais e futuras. Idempotente.
+
+    ``connection.execute_wrapper()`` só vale para a conexão da thread atual,
+    e as queries das views async rodam em threads do sync_to_async; por isso
+    o wrapper fica em toda conexão e decide pelo ContextVar se mede algo.
+    """
+    def install(sender: object, connection: BaseDatabaseWrapper, **kwargs: object) -> None:
+        if wrapper not in connection.execute_wrappers:
+            connection.execute_wrappers.append(wrapper)
+
+    connection_created.connect(install, weak=False, dispatch_uid=f"{wrapper.__module__}.{wrapper.__qualname__}")
+    for connection in connections.all(initialized_only=True):
+        install(None, connection)
+
+
+def install_db_timer() -> None:
+    """Liga a medição de queries (idempotente)"""
+    install_execute_wrapper(_db_timer)
+
+
+# Só uma requisição perfilada por vez: o cProfile não aceita perfis aninhados
+_profiler_lock = threading.Lock()
+# Sorteio da amostragem; a fonte do SO dispensa semente por worker
+_sampler = random.SystemRandom()
+
+
+@contextmanager
+def cprofile_hook(profile: RequestProfile, request: HttpRequest) -> Iterator[None]:
+    """
+    Perfila a requisição com cProfile e grava ``<trace_id>.prof`` em
+    PROFILING['PROFILE_DIR'] (abrir com snakeviz/pstats).
+
+    Em views async o perfil inclui outras tasks do mesmo event loop; use
+    de preferência em workers WSGI ou com baixa concorrência.
+    """
+    if not _profiler_lock.acquire(blocking=False):
+        yield
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+        directory = Path(settings.PROFILING["PROFILE_DIR"])
+        directory.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(directory / f"{profile.trace_id}.prof")
+        logger.info(f"Perfil gravado para {request.path} (trace_id: {profile.trace_id})")
+    finally:
+        _profiler_lock.release()
+
+
+def sampled_profiler(profile: RequestProfile, request: HttpRequest) -> AbstractContextManager[None]:
+    """
+    Hook de profiling amostrado: com probabilidade PROFILING['SAMPLE_RATE']
+    devolve o context manager de PROFILING['PROFILER'] (padrão: cProfile).
+    """
+    config = settings.PROFILING
+    if not config["SAMPLE_RATE"] or _sampler.random() >= config["SAMPLE_RATE"]:
+        return nullcontext()
+    from django.utils.module_loading import import_string
+    return import_string(config["PROFILER"])(profile, request)
@@ -0,0 +1,173 @@
+import contextvars
+import functools
+import inspect
+import logging
+import threading
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+
+from core.profiling import install_execute_wrapper
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from types import TracebackType
+
+logger = logging.getLogger(__name__)
+
+_active_recorders: contextvars.ContextVar[tuple[QueryRecorder, ...]] = contextvars.ContextVar(
+    "active_query_recorders", default=(),
+)
+
+
+class QueryBudgetExceededError(AssertionError):
+    """Bloco executou mais queries (ou mais repetições de uma query) que o orçamento"""
+
+
+def _app_stack() -> str:
+    """Stack trace só com frames do projeto (sem Django, asgiref e este módulo)"""
+    base_dir = str(settings.BASE_DIR)
+    frames = [
+        frame for frame in traceback.extract_stack()
+        if frame.filename.startswith(base_dir) and frame.filename != __file__
+    ]
+    return "".join(traceback.format_list(frames))
+
+
+class QueryRecorder:
+    """
+    Registra o SQL executado enquanto está ativo (ver ``recording``),
+    inclusive nas threads de sync_to_async, que herdam o contexto.
+
+    Quando um mesmo SQL (já parametrizado, então iguais = mesmo padrão)
+    chega a ``duplicate_threshold`` execuções, guarda o stack trace daquele
+    ponto: é a linha que está fazendo N+1.
+    """
+
+    __slots__ = ("_lock", "counts", "duplicate_threshold", "queries", "stacks")
+
+    def __init__(self, duplicate_threshold: int | None = None) -> None:
+        self.duplicate_threshold = duplicate_threshold
+        self.queries: list[str] = []
+        self.counts: Counter[str] = Counter()
+        self.stacks: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def record(self, sql: str) -> None:
+        with self._lock:
+            self.queries.append(sql)
+            self.counts[sql] += 1
+            count = self.counts[sql]
+        if count == self.duplicate_threshold:
+            self.stacks[sql] = _app_stack()
+
+    def duplicates(self) -> dict[str, int]:
+        """SQL repetido pelo menos ``duplicate_threshold`` vezes -> contagem"""
+        if not self.duplicate_threshold:
+            return {}
+        return {sql: n for sql, n in self.counts.items() if n >= self.duplicate_threshold}
+
+
+def _record_query(execute: Callable[..., object], sql: str, params: object, *args: object) -> object:
+    for recorder in _active_recorders.get():
+        recorder.record(sql)
+    return execute(sql, params, *args)
+
+
+@contextmanager
+def recording(recorder: QueryRecorder) -> Iterator[QueryRecorder]:
+    """Ativa ``recorder`` no contexto atual (aninhável)"""
+    install_execute_wrapper(_record_query)
+    token = _active_recorders.set((*_active_recorders.get(), recorder))
+    try:
+        yield recorder
+    finally:
+        _active_recorders.reset(token)
+
+
+class QueryBudget:
+    """
+    Orçamento de queries para um bloco, view ou chamada de service, em testes.
+
+    Uso como context manager ou decorator (funções sync ou async)::
+
+        with QueryBudget(3):
+            DocumentService.list_documents(user)
+
+        @QueryBudget(2, max_duplicates=1)
+        async def test_ask(self): ...
+
+    Ao sair, levanta QueryBudgetExceededError (um AssertionError, então o teste
+    falha em vez de dar erro) se o bloco passou de ``max_queries`` ou se algum
+    SQL se repetiu mais de ``max_duplicates`` vezes. A mensagem lista as
+    queries e, para repetições, o stack trace de onde o N+1 acontece.
+    """
+
+    def __init__(self, max_queries: int | None = None, *, max_duplicates: int | None = None) -> None:
+        self.max_queries = max_queries
+        self.max_duplicates = max_duplicates
+        self.recorder: QueryRecorder | None = None
+        self._recording: Any = None
+
+    def __enter__(self) -> QueryRecorder:
+        threshold = self.max_duplicates + 1 if self.max_duplicates is not None else None
+        self._recording = recording(QueryRecorder(threshold))
+        self.recorder = self._recording.__enter__()
+        return self.recorder
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._recording.__exit__(exc_type, exc, tb)
+        if exc_type is None:
+            self.check(self.recorder)
+
+    def check(self, recorder: QueryRecorder) -> None:
+        """
+        Raises:
+            QueryBudgetExceededError: Se o orçamento foi ultrapassado
+        """
+        problems = []
+        if self.max_queries is not None and len(recorder.queries) > self.max_queries:
+            listing = "\n".join(f"  {n}. {sql}" for n, sql in enumerate(recorder.queries, start=1))
+            problems.append(
+                f"{len(recorder.queries)} queries executadas, orçamento de {self.max_queries}:\n{listing}",
+            )
+        for sql, count in recorder.duplicates().items():
+            problems.append(
+                f"Query repetida {count}x (máximo {self.max_duplicates}), possível N+1:\n"
+                f"  {sql}\n{recorder.stacks.get(sql, '')}",
+            )
+        if problems:
+            raise QueryBudgetExceededError("\n\n".join(problems))
+
+    def __call__[**P](self, func: Callable[P, object]) -> Callable[P, object]:
+        # Uma instância nova por chamada: o decorator pode rodar em paralelo
+        budget = (self.max_queries, self.max_duplicates)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> object:
+                with QueryBudget(budget[0], max_duplicates=budget[1]):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> object:
+            with QueryBudget(budget[0], max_duplicates=budget[1]):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+def log_duplicate_queries(recorder: QueryRecorder, label: str) -> None:
+    """Modo de runtime: registra em log os padrões repetidos, com stack trace"""
+    for sql, count in recorder.duplicates().items():
+        logger.warning(
+            f"Query repetida {count}x em {label} (possível N+1): {sql}\n{recorder.stacks.get(sql, '')}",
+        )
@@ -0,0 +1,82 @@
+import decimal
+
+from django.utils.functional import Promise
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # extra opcional 'orjson'
+    orjson = None
+
+# Mesmo formato do encoder do DRF: datetimes UTC terminam em "Z"
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+
+def _default(obj: object) -> object:
+    """Tipos que o orjson não serializa nativamente (UUID, datetime e dataclasses ele já trata)"""
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, Promise):
+        return str(obj)
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    msg = f"Object of type {type(obj).__name__} is not JSON serializable"
+    raise TypeError(msg)
+
+
+def dumps(data: object) -> bytes:
+    """
+    Serializa em JSON compacto (UTF-8). Usa orjson quando instalado, senão
+    o encoder do DRF.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS)
+    return JSONRenderer().render(data)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Renderer JSON padrão da API.
+
+    Com orjson (extra 'orjson') serializa direto para bytes, com UUID,
+    datetime, dataclasses e Decimal nativos ou via ``default``, sem passar
+    pelo ``json.JSONEncoder``: bem mais rápido e com menos alocações em
+    payloads grandes (chunks, citações). Sem orjson, ou quando o cliente pede
+    indentação (``Accept: application/json; indent=4``), cai no JSONRenderer
+    do DRF.
+    """
+
+    def render(self, data: object, accepted_media_type: str | None = None, renderer_context: dict | None = None) -> bytes:
+        if data is None:
+            return b""
+        if orjson is None or self.get_indent(accepted_media_type or "", renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+def format_sse(event: str, data: object) -> str:
+    """Formata um evento Server-Sent Events com payload JSON"""
+    return f"event: {event}\ndata: {dumps(data).decode()}\n\n"
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Aceita ``Accept: text/event-stream`` na negociação de conteúdo.
+
+    O corpo do streaming é um StreamingHttpResponse montado pela view; este
+    renderer só entra em respostas normais (ex.: erros antes do streaming),
+    que viram um único evento ``error``.
+    """
+
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = "utf-8"
+
+    def render(self, data: object, accepted_media_type: str | None = None, renderer_context: dict | None = None) -> bytes:
+        if data is None:
+            return b""
+        return format_sse("error", data).encode(self.charset)
@@ -12,8 +12,10 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 
 import os
 from datetime import timedelta
+from importlib.util import find_spec
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -54,15 +56,21 @@ INSTALLED_APPS = [
     'plans',
     'documents',
     'queries',
+    'benchmarks',
 ]
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.StatelessJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # JSON via orjson quando instalado (extra 'orjson'); senão, o encoder do DRF
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'EXCEPTION_HANDLER': 'core.exception_handler.custom_exception_handler',
 }
@@ -85,6 +93,8 @@ SIMPLE_JWT = {
 }
 
 MIDDLEWARE = [
+    'core.middleware.RequestProfilingMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -100,7 +110,7 @@ ROOT_URLCONF = 'core.urls'
 TEMPLATES = [ # type: ignore
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [],
+        'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
@@ -113,6 +123,7 @@ TEMPLATES = [ # type: ignore
 ]
 
 WSGI_APPLICATION = 'core.wsgi.application'
+ASGI_APPLICATION = 'core.asgi.application'
 
 
 # Database
@@ -120,17 +131,89 @@ WSGI_APPLICATION = 'core.wsgi.application'
 
 
 
-DATABASES = {
-    'default': {
+# Conexões: com DB_POOL=True (padrão) cada processo mantém um pool do psycopg
+# (psycopg[pool]) por alias; sem pool, conexões persistentes (CONN_MAX_AGE).
+# CONN_HEALTH_CHECKS vale nos dois modos (no pool vira o 'check' do psycopg).
+# 'ingestion' é o mesmo banco com um pool próprio, para que importações e
+# jobs em lote não esgotem as conexões da API (core.db.ingestion_db_alias).
+DB_POOL = os.getenv('DB_POOL', 'True') == 'True'
+
+
+def _database(prefix: str, min_size: str, max_size: str) -> dict:
+    options = {}
+    if DB_POOL:
+        options['pool'] = {
+            'min_size': int(os.getenv(f'{prefix}_POOL_MIN_SIZE', min_size)),
+            'max_size': int(os.getenv(f'{prefix}_POOL_MAX_SIZE', max_size)),
+            # Espera máxima por uma conexão livre antes de PoolTimeout
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+            # Recicla conexões antigas e fecha as ociosas acima de min_size
+            'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', '1800')),
+            'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', '300')),
+            'name': prefix.lower(),
+        }
+    return {
         'ENGINE': 'django.db.backends.postgresql',
         'NAME': os.getenv('DB_NAME'),
         'USER': os.getenv('DB_USER'),
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST', 'localhost'),
         'PORT': os.getenv('DB_PORT', '5432'),
+        # O pool não aceita conexões persistentes do Django
+        'CONN_MAX_AGE': 0 if DB_POOL else int(os.getenv('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
+        'OPTIONS': options,
+    }
+
+
+DATABASES = {
+    'default': _database('DB', '2', '10'),
+    'ingestion': {
+        **_database('DB_INGESTION', '0', '4'),
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+# Réplicas de leitura (core.db.ReplicaRouter): DB_REPLICA_HOSTS=host1,host2:5433
+# vira os aliases replica_0, replica_1... Depois de uma escrita o cliente lê do
+# primário por STICKY_SECONDS (cookie PIN_COOKIE); escritas nos models de
+# UNPINNED_MODELS (logs e agregados) não contam.
+for _n, _host in enumerate(filter(None, os.getenv('DB_REPLICA_HOSTS', '').split(','))):
+    _hostname, _, _port = _host.strip().partition(':')
+    DATABASES[f'replica_{_n}'] = {
+        **_database('DB_REPLICA', '0', '10'),
+        'HOST': _hostname,
+        'PORT': _port or os.getenv('DB_PORT', '5432'),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.db.ReplicaRouter']
+
+REPLICA_ROUTING = {
+    'STICKY_SECONDS': int(os.getenv('DB_REPLICA_STICKY_SECONDS', '5')),
+    'PIN_COOKIE': os.getenv('DB_REPLICA_PIN_COOKIE', 'db_primary'),
+    'UNPINNED_MODELS': ('queries.querylog', 'queries.auditlog', 'queries.queryaggregate'),
+}
+
+
+# Cache
+# Em produção use um backend compartilhado (ex.: Redis) para a denylist de JWT
+# e os demais caches valerem entre processos.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
     }
 }
 
+# Alias do cache com estado que precisa valer em todos os processos (denylist
+# e carimbos de revogação de JWT, papéis por organização, versão do catálogo
+# de planos). Em produção deve ser compartilhado (Redis, Memcached): com
+# LocMemCache cada worker teria a sua cópia, e o
+# `manage.py check --deploy` acusa erro (users.checks).
+SHARED_CACHE_ALIAS = os.getenv('SHARED_CACHE_ALIAS', 'default')
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -150,6 +233,42 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# PASSWORD_HASHER=argon2 (requer argon2-cffi) ou pbkdf2. Hashes gerados por
+# outro hasher/parâmetros continuam válidos e são regravados no próximo login.
+
+PASSWORD_HASHING = {
+    'ALGORITHM': os.getenv('PASSWORD_HASHER', 'pbkdf2'),
+    'PBKDF2_ITERATIONS': int(os.getenv('PBKDF2_ITERATIONS', '0')),  # 0 = padrão do Django
+    'ARGON2_TIME_COST': int(os.getenv('ARGON2_TIME_COST', '2')),
+    'ARGON2_MEMORY_COST': int(os.getenv('ARGON2_MEMORY_COST', '19456')),  # KiB
+    'ARGON2_PARALLELISM': int(os.getenv('ARGON2_PARALLELISM', '1')),
+    'VERIFY_WORKERS': int(os.getenv('PASSWORD_VERIFY_WORKERS', str(os.cpu_count() or 1))),
+    'VERIFY_MAX_PENDING': int(os.getenv('PASSWORD_VERIFY_MAX_PENDING', '64')),
+    'VERIFY_TIMEOUT': float(os.getenv('PASSWORD_VERIFY_TIMEOUT', '5.0')),
+}
+
+# O primeiro gera os hashes novos; os demais (todos os padrões do Django)
+# só verificam hashes antigos, regravados com o primeiro no login
+PASSWORD_HASHERS = [
+    'users.hashers.TunedPBKDF2PasswordHasher',
+    'users.hashers.TunedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+if PASSWORD_HASHING['ALGORITHM'] == 'argon2':
+    if find_spec('argon2') is None:
+        msg = "PASSWORD_HASHER=argon2 requer o pacote argon2-cffi"
+        raise ImproperlyConfigured(msg)
+    PASSWORD_HASHERS.insert(0, PASSWORD_HASHERS.pop(1))
+
+# Janela mínima entre duas escritas de last_login do mesmo usuário
+LAST_LOGIN_UPDATE_INTERVAL = timedelta(
+    seconds=int(os.getenv('LAST_LOGIN_UPDATE_INTERVAL', '900'))
+)
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/6.0/topics/i18n/
@@ -168,6 +287,171 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Armazenamento dos arquivos (core.storage). STORAGE_BACKEND=local grava em
+# MEDIA_ROOT (fora do git, ver .gitignore) e assina URLs servidas por /storage/<token>/; s3 fala com qualquer
+# API compatível com S3, como AWS ou MinIO (requer o extra 's3': boto3)
+_STORAGE_BACKENDS = {
+    'local': {'BACKEND': 'core.storage.LocalStorage'},
+    's3': {
+        'BACKEND': 'core.storage.S3Storage',
+        'OPTIONS': {
+            'bucket_name': os.getenv('S3_BUCKET', ''),
+            'endpoint_url': os.getenv('S3_ENDPOINT_URL') or None,
+            'region_name': os.getenv('S3_REGION') or None,
+            'access_key': os.getenv('S3_ACCESS_KEY') or None,
+            'secret_key': os.getenv('S3_SECRET_KEY') or None,
+            'addressing_style': os.getenv('S3_ADDRESSING_STYLE', 'auto'),
+        },
+    },
+}
+
+MEDIA_ROOT = os.getenv('MEDIA_ROOT', str(BASE_DIR / 'media'))
+
+STORAGES = {
+    'default': _STORAGE_BACKENDS[os.getenv('STORAGE_BACKEND', 'local')],
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+# PRESIGNED_EXPIRES: validade das URLs assinadas (s); PUBLIC_URL: prefixo das
+# URLs do backend local; RANGE_BLOCK_SIZE: bloco das leituras por intervalo
+STORAGE = {
+    'PRESIGNED_EXPIRES': int(os.getenv('STORAGE_PRESIGNED_EXPIRES', '900')),
+    'PUBLIC_URL': os.getenv('STORAGE_PUBLIC_URL', ''),
+    'MULTIPART_PART_SIZE': int(os.getenv('STORAGE_MULTIPART_PART_SIZE', str(8 * 1024 * 1024))),
+    'RANGE_BLOCK_SIZE': int(os.getenv('STORAGE_RANGE_BLOCK_SIZE', str(256 * 1024))),
+}
+
+
+# Gravação em lote de QueryLog/AuditLog (queries.log_writer); um lote de
+# QueryLog com erro transitório é repetido RETRIES vezes, com espera crescente
+# a partir de RETRY_DELAY segundos
+LOG_WRITER = {
+    'ASYNC': os.getenv('LOG_WRITER_ASYNC', 'True') == 'True',
+    'BATCH_SIZE': int(os.getenv('LOG_WRITER_BATCH_SIZE', '500')),
+    'FLUSH_INTERVAL': float(os.getenv('LOG_WRITER_FLUSH_INTERVAL', '1.0')),
+    'MAX_QUEUE_SIZE': int(os.getenv('LOG_WRITER_MAX_QUEUE_SIZE', '10000')),
+    'BLOCK_TIMEOUT': float(os.getenv('LOG_WRITER_BLOCK_TIMEOUT', '0.05')),
+    'RETRIES': int(os.getenv('LOG_WRITER_RETRIES', '2')),
+    'RETRY_DELAY': float(os.getenv('LOG_WRITER_RETRY_DELAY', '0.1')),
+}
+
+# Nos testes (manage.py test) os writers de log gravam de forma síncrona
+TEST_RUNNER = 'core.test_runner.TestRunner'
+
+# Catálogo de planos em memória (plans.catalog): a versão no cache é conferida
+# a cada CHECK_INTERVAL segundos; MAX_AGE força o recarregamento
+PLAN_CATALOG = {
+    'CHECK_INTERVAL': float(os.getenv('PLAN_CATALOG_CHECK_INTERVAL', '5')),
+    'MAX_AGE': float(os.getenv('PLAN_CATALOG_MAX_AGE', '300')),
+}
+
+# Papéis do usuário nas organizações em cache (organizations.cache), invalidados
+# pelos signals de OrganizationMember; CACHE_TIMEOUT cobre escritas sem signals
+ORGANIZATION_MEMBERSHIP = {
+    'CACHE_TIMEOUT': int(os.getenv('ORGANIZATION_MEMBERSHIP_CACHE_TIMEOUT', '300')),
+}
+
+# Exclusão em lotes (documents.deletion): linhas por DELETE, documentos por
+# lote e pausa entre lotes para não saturar o banco
+DELETION = {
+    'BATCH_SIZE': int(os.getenv('DELETION_BATCH_SIZE', '1000')),
+    'DOCUMENT_BATCH_SIZE': int(os.getenv('DELETION_DOCUMENT_BATCH_SIZE', '50')),
+    'PAUSE_SECONDS': float(os.getenv('DELETION_PAUSE_SECONDS', '0.05')),
+}
+
+# Ingestão (documents.ingestion): trechos de CHUNK_SIZE caracteres com
+# CHUNK_OVERLAP de sobreposição; BATCH_SIZE documentos por lote do worker.
+# Um documento em PROCESSING há mais de LEASE_SECONDS (worker que caiu) volta
+# a ser pego pela fila
+INGESTION = {
+    'CHUNK_SIZE': int(os.getenv('INGESTION_CHUNK_SIZE', '1000')),
+    'CHUNK_OVERLAP': int(os.getenv('INGESTION_CHUNK_OVERLAP', '200')),
+    'EMBED_BATCH_SIZE': int(os.getenv('INGESTION_EMBED_BATCH_SIZE', '64')),
+    'INSERT_BATCH_SIZE': int(os.getenv('INGESTION_INSERT_BATCH_SIZE', '500')),
+    'BATCH_SIZE': int(os.getenv('INGESTION_BATCH_SIZE', '10')),
+    'LEASE_SECONDS': int(os.getenv('INGESTION_LEASE_SECONDS', '900')),
+}
+
+# Upload direto ao storage (documents.uploads): a API só assina as URLs das
+# partes, válidas por URL_EXPIRES segundos; o arquivo não passa pelo Django
+DOCUMENT_UPLOAD = {
+    'MAX_SIZE_BYTES': int(os.getenv('DOCUMENT_UPLOAD_MAX_SIZE_BYTES', str(512 * 1024 * 1024))),
+    'URL_EXPIRES': int(os.getenv('DOCUMENT_UPLOAD_URL_EXPIRES', '3600')),
+}
+
+# Importação em lote (documents.imports): arquivos enviados ao storage por
+# UPLOAD_CONCURRENCY threads, BATCH_SIZE por lote. Pela API os caminhos do
+# manifesto são relativos a ROOT/<organization_id ou user_id>/, criado pelo
+# operador para cada tenant habilitado (ROOT vazio desativa a importação pela API)
+DOCUMENT_IMPORT = {
+    'ROOT': os.getenv('DOCUMENT_IMPORT_ROOT', ''),
+    'BATCH_SIZE': int(os.getenv('DOCUMENT_IMPORT_BATCH_SIZE', '200')),
+    'UPLOAD_CONCURRENCY': int(os.getenv('DOCUMENT_IMPORT_UPLOAD_CONCURRENCY', '8')),
+    'MAX_ITEMS': int(os.getenv('DOCUMENT_IMPORT_MAX_ITEMS', '50000')),
+}
+
+# Pipeline RAG (queries.clients, documents.repositories). O backend 'local' usa
+# embeddings determinísticos por hashing e um LLM extrativo, sem rede; 'openai'
+# fala com qualquer API compatível (requer o extra 'rag': httpx).
+# VECTOR_SEARCH: 'python' (varredura exata), 'pgvector' (operador <=>, exata)
+# ou 'ann' (índice HNSW/IVFFlat, ver VECTOR_INDEX)
+RAG = {
+    'EMBEDDING_BACKEND': os.getenv('RAG_EMBEDDING_BACKEND', 'local'),
+    'LLM_BACKEND': os.getenv('RAG_LLM_BACKEND', 'local'),
+    'API_BASE': os.getenv('RAG_API_BASE', 'https://api.openai.com/v1'),
+    'API_KEY': os.getenv('RAG_API_KEY', ''),
+    'EMBEDDING_MODEL': os.getenv('RAG_EMBEDDING_MODEL', 'text-embedding-3-small'),
+    'EMBEDDING_DIMENSIONS': int(os.getenv('RAG_EMBEDDING_DIMENSIONS', '1536')),
+    'LLM_MODEL': os.getenv('RAG_LLM_MODEL', 'gpt-4o-mini'),
+    'MAX_TOKENS': int(os.getenv('RAG_MAX_TOKENS', '512')),
+    'TIMEOUT': float(os.getenv('RAG_TIMEOUT', '60')),
+    'LOCAL_LATENCY_MS': int(os.getenv('RAG_LOCAL_LATENCY_MS', '0')),
+    'VECTOR_SEARCH': os.getenv('RAG_VECTOR_SEARCH', 'python'),
+    'TOP_K': int(os.getenv('RAG_TOP_K', '5')),
+}
+
+# Índice ANN de DocumentChunk.embedding (documents.vector_index, manage.py
+# maintain_vector_index). Os parâmetros de construção saem do número de linhas;
+# o índice é reconstruído quando a tabela muda REBUILD_GROWTH_FACTOR vezes ou o
+# recall (amostra de RECALL_SAMPLE consultas) fica abaixo de RECALL_TARGET.
+# SEARCH_PARAMS: ef_search (HNSW) e probes (IVFFlat) por User.plan
+VECTOR_INDEX = {
+    'METHOD': os.getenv('VECTOR_INDEX_METHOD', 'hnsw'),
+    'MAINTENANCE_WORK_MEM': os.getenv('VECTOR_INDEX_MAINTENANCE_WORK_MEM', '1GB'),
+    'DEAD_TUPLE_RATIO': float(os.getenv('VECTOR_INDEX_DEAD_TUPLE_RATIO', '0.1')),
+    'REBUILD_GROWTH_FACTOR': float(os.getenv('VECTOR_INDEX_REBUILD_GROWTH_FACTOR', '2')),
+    'RECALL_TARGET': float(os.getenv('VECTOR_INDEX_RECALL_TARGET', '0.9')),
+    'RECALL_SAMPLE': int(os.getenv('VECTOR_INDEX_RECALL_SAMPLE', '50')),
+    'ITERATIVE_SCAN': os.getenv('VECTOR_INDEX_ITERATIVE_SCAN', ''),
+    'SEARCH_PARAMS': {
+        'FREE': {'ef_search': 40, 'probes': 4},
+        'PRO': {'ef_search': 100, 'probes': 10},
+        'PREMIUM': {'ef_search': 200, 'probes': 20},
+        'ADMIN': {'ef_search': 200, 'probes': 20},
+    },
+}
+
+# Profiling por requisição (core.middleware.RequestProfilingMiddleware):
+# Server-Timing, métricas em /metrics e cProfile amostrado. SAMPLE_RATE é a
+# fração de requisições perfiladas (0 desliga); os .prof vão para PROFILE_DIR.
+# Server-Timing expõe as etapas internas ao cliente: por padrão só com DEBUG.
+# /metrics exige METRICS_TOKEN (vazio bloqueia o endpoint)
+PROFILING = {
+    'SERVER_TIMING': os.getenv('PROFILING_SERVER_TIMING', str(DEBUG)) == 'True',
+    'METRICS_SINK': os.getenv('PROFILING_METRICS_SINK', 'core.metrics.PrometheusMetricsSink'),
+    'METRICS_TOKEN': os.getenv('METRICS_TOKEN', ''),
+    'SAMPLE_RATE': float(os.getenv('PROFILING_SAMPLE_RATE', '0')),
+    'PROFILER': os.getenv('PROFILING_PROFILER', 'core.profiling.cprofile_hook'),
+    'PROFILE_DIR': os.getenv('PROFILING_PROFILE_DIR', str(BASE_DIR / 'profiles')),
+}
+
+# Detecção de N+1 em runtime (core.query_budget): registra em log, com stack
+# trace, o SQL repetido DUPLICATE_THRESHOLD vezes numa mesma requisição
+QUERY_BUDGET = {
+    'LOG_DUPLICATES': os.getenv('QUERY_BUDGET_LOG_DUPLICATES', str(DEBUG)) == 'True',
+    'DUPLICATE_THRESHOLD': int(os.getenv('QUERY_BUDGET_DUPLICATE_THRESHOLD', '5')),
+}
+
 
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -0,0 +1,484 @@
+import hashlib
+import io
+import mimetypes
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage, Storage, default_storage
+from django.http import (
+    FileResponse,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseForbidden,
+    HttpResponseNotAllowed,
+    HttpResponseNotFound,
+)
+from django.urls import reverse
+from django.views.decorators.csrf import csrf_exempt
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from datetime import datetime
+
+try:
+    import boto3
+    from boto3.s3.transfer import TransferConfig
+    from botocore.config import Config
+    from botocore.exceptions import ClientError
+except ImportError:  # extra opcional 's3'
+    boto3 = None
+
+SIGNING_SALT = "core.storage"
+MAX_PART_NUMBER = 10000
+
+_UPLOAD_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class PartTooLargeError(ValueError):
+    """Parte de upload multipart maior que o limite"""
+
+
+class ObjectStorage(ABC):
+    """
+    Operações de object storage além da API de Storage do Django: leituras
+    em streaming e por intervalo, URLs assinadas e upload multipart.
+
+    Os backends são Storages do Django (STORAGES['default']), então
+    ``Document.file_key`` continua funcionando igual. As leituras aqui
+    valem para qualquer Storage (os backends sobrescrevem o que têm de mais
+    eficiente); URLs assinadas e multipart são de cada backend.
+    """
+
+    def open_range(self, name: str, start: int, end: int) -> bytes:
+        """Bytes ``[start, end)`` do arquivo"""
+        with self.open(name, "rb") as file:
+            file.seek(start)
+            return file.read(end - start)
+
+    def iter_chunks(self, name: str, chunk_size: int = File.DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """Conteúdo do arquivo em blocos, sem carregá-lo inteiro na memória"""
+        with self.open(name, "rb") as file:
+            yield from file.chunks(chunk_size)
+
+    @abstractmethod
+    def presigned_url(self, name: str, expires: int | None = None) -> str:
+        """URL de download válida por ``expires`` segundos, sem passar pela API"""
+
+    @abstractmethod
+    def create_multipart(self, name: str, content_type: str | None = None) -> str:
+        """Inicia um upload multipart para ``name``; devolve o upload_id"""
+
+    @abstractmethod
+    def presigned_part_url(self, name: str, upload_id: str, part_number: int, expires: int | None = None) -> str:
+        """URL para o cliente enviar a parte ``part_number`` com PUT; o ETag vem na resposta"""
+
+    @abstractmethod
+    def upload_part(self, name: str, upload_id: str, part_number: int, data: bytes) -> str:
+        """Envia uma parte pelo servidor; devolve o ETag"""
+
+    @abstractmethod
+    def complete_multipart(self, name: str, upload_id: str, parts: list[tuple[int, str]]) -> str:
+        """
+        Junta as partes ``[(part_number, etag)]`` em ordem no arquivo ``name``.
+
+        Raises:
+            ValueError: Se o upload não existe, falta uma parte ou um ETag não confere
+        """
+
+    @abstractmethod
+    def abort_multipart(self, name: str, upload_id: str) -> None:
+        """Descarta as partes já enviadas"""
+
+
+def _expires(expires: int | None) -> int:
+    return expires or settings.STORAGE["PRESIGNED_EXPIRES"]
+
+
+def get_object_storage(storage: Storage | None = None) -> ObjectStorage:
+    """
+    O storage configurado (ou ``storage``) como ObjectStorage.
+
+    Raises:
+        ImproperlyConfigured: Se o backend não implementa ObjectStorage
+    """
+    storage = storage if storage is not None else default_storage
+    if not isinstance(storage, ObjectStorage):
+        msg = f"{type(storage).__name__} não implementa core.storage.ObjectStorage"
+        raise ImproperlyConfigured(msg)
+    return storage
+
+
+class LocalStorage(ObjectStorage, FileSystemStorage):
+    """
+    Storage em disco (MEDIA_ROOT), para desenvolvimento e testes.
+
+    As URLs assinadas apontam para ``signed_storage_view`` (/storage/<token>),
+    que serve downloads com Range e recebe partes de upload multipart com
+    PUT; as partes ficam em ``.multipart/<upload_id>/`` até o complete.
+    """
+
+    def presigned_url(self, name: str, expires: int | None = None) -> str:
+        return self._signed_url({"m": "GET", "k": name}, expires)
+
+    def create_multipart(self, name: str, content_type: str | None = None) -> str:
+        upload_id = uuid.uuid4().hex
+        os.makedirs(self._part_dir(upload_id), exist_ok=True)
+        return upload_id
+
+    def presigned_part_url(self, name: str, upload_id: str, part_number: int, expires: int | None = None) -> str:
+        self._part_path(upload_id, part_number)
+        return self._signed_url({"m": "PUT", "k": name, "u": upload_id, "p": part_number}, expires)
+
+    def upload_part(self, name: str, upload_id: str, part_number: int, data: bytes) -> str:
+        return self.write_part(upload_id, part_number, io.BytesIO(data))
+
+    def write_part(self, upload_id: str, part_number: int, stream: BinaryIO, max_size: int | None = None) -> str:
+        """
+        Grava uma parte a partir de um stream; devolve o ETag (MD5, como no S3).
+
+        Raises:
+            PartTooLargeError: Se o stream passa de ``max_size`` bytes (a parte é descartada)
+            ValueError: Se o upload não existe
+        """
+        path = self._part_path(upload_id, part_number)
+        if not os.path.isdir(os.path.dirname(path)):
+            msg = f"Upload multipart {upload_id} não existe"
+            raise ValueError(msg)
+        digest = hashlib.md5(usedforsecurity=False)
+        written = 0
+        with open(path, "wb") as file:
+            while chunk := stream.read(File.DEFAULT_CHUNK_SIZE):
+                written += len(chunk)
+                if max_size is not None and written > max_size:
+                    file.close()
+                    os.remove(path)
+                    msg = f"Parte {part_number} maior que {max_size} bytes"
+                    raise PartTooLargeError(msg)
+                digest.update(chunk)
+                file.write(chunk)
+        return f'"{digest.hexdigest()}"'
+
+    def complete_multipart(self, name: str, upload_id: str, parts: list[tuple[int, str]]) -> str:
+        if not parts:
+            msg = "Upload multipart sem partes"
+            raise ValueError(msg)
+        paths = []
+        for part_number, etag in sorted(parts):
+            path = self._part_path(upload_id, part_number)
+            if not os.path.exists(path) or _md5(path) != etag.strip('"'):
+                msg = f"Parte {part_number} ausente ou com ETag diferente"
+                raise ValueError(msg)
+            paths.append(path)
+
+        destination = self.path(name)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        # Junta num temporário e troca de uma vez: leitores nunca veem o arquivo pela metade
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(destination), delete=False) as output:
+            for path in paths:
+                with open(path, "rb") as part:
+                    shutil.copyfileobj(part, output)
+        os.replace(output.name, destination)
+        self.abort_multipart(name, upload_id)
+        return name
+
+    def abort_multipart(self, name: str, upload_id: str) -> None:
+        shutil.rmtree(self._part_dir(upload_id), ignore_errors=True)
+
+    def _part_dir(self, upload_id: str) -> str:
+        if not _UPLOAD_ID_RE.match(upload_id):
+            msg = f"upload_id inválido: {upload_id}"
+            raise ValueError(msg)
+        return self.path(f".multipart/{upload_id}")
+
+    def _part_path(self, upload_id: str, part_number: int) -> str:
+        if not 1 <= part_number <= MAX_PART_NUMBER:
+            msg = f"part_number deve estar entre 1 e {MAX_PART_NUMBER}"
+            raise ValueError(msg)
+        return os.path.join(self._part_dir(upload_id), f"{part_number:05d}")
+
+    @staticmethod
+    def _signed_url(payload: dict[str, Any], expires: int | None) -> str:
+        payload["e"] = int(time.time()) + _expires(expires)
+        token = signing.dumps(payload, salt=SIGNING_SALT, compress=True)
+        return settings.STORAGE["PUBLIC_URL"] + reverse("signed-storage", args=[token])
+
+
+def _md5(path: str) -> str:
+    digest = hashlib.md5(usedforsecurity=False)
+    with open(path, "rb") as file:
+        while chunk := file.read(File.DEFAULT_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@csrf_exempt
+def signed_storage_view(request: HttpRequest, token: str) -> HttpResponse:
+    """
+    Endpoint das URLs assinadas do LocalStorage: GET/HEAD baixa o arquivo
+    (com ``Range: bytes=...``), PUT envia uma parte de upload multipart de
+    até STORAGE['MULTIPART_PART_SIZE'] bytes (maior: 413). A assinatura é a
+    autorização.
+    """
+    try:
+        payload = signing.loads(token, salt=SIGNING_SALT)
+    except signing.BadSignature:
+        return HttpResponseForbidden()
+    if payload["e"] < time.time():
+        return HttpResponseForbidden()
+    storage = default_storage
+    if not isinstance(storage, LocalStorage):
+        return HttpResponseNotFound()
+
+    method = "GET" if request.method == "HEAD" else request.method
+    if method != payload["m"]:
+        return HttpResponseNotAllowed([payload["m"]])
+
+    if method == "PUT":
+        return _put_part(storage, payload, request)
+
+    name = payload["k"]
+    if not storage.exists(name):
+        return HttpResponseNotFound()
+    size = storage.size(name)
+    content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    requested = request.headers.get("Range")
+    if not requested:
+        response = FileResponse(storage.open(name, "rb"), content_type=content_type)
+        response["Accept-Ranges"] = "bytes"
+        return response
+
+    span = _parse_range(requested, size)
+    if span is None:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+    start, end = span
+    response = HttpResponse(storage.open_range(name, start, end), status=206, content_type=content_type)
+    response["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+    response["Accept-Ranges"] = "bytes"
+    return response
+
+
+def _put_part(storage: LocalStorage, payload: dict[str, Any], request: HttpRequest) -> HttpResponse:
+    try:
+        etag = storage.write_part(payload["u"], payload["p"], request, settings.STORAGE["MULTIPART_PART_SIZE"])
+    except PartTooLargeError:
+        return HttpResponse(status=413)
+    except ValueError:
+        return HttpResponseNotFound()
+    response = HttpResponse()
+    response["ETag"] = etag
+    return response
+
+
+def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Um intervalo ``bytes=a-b``, ``bytes=a-`` ou ``bytes=-n`` como [início, fim)"""
+    match = _RANGE_RE.match(header.strip())
+    if match is None or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if not first:
+        start, end = max(size - int(last), 0), size
+    else:
+        start = int(first)
+        end = min(int(last) + 1, size) if last else size
+    if start >= end:
+        return None
+    return start, end
+
+
+class _RangedReader(io.RawIOBase):
+    """Arquivo remoto lido sob demanda por intervalos (GET com Range)"""
+
+    def __init__(self, storage: ObjectStorage, name: str, size: int) -> None:
+        self._storage = storage
+        self._name = name
+        self._size = size
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: self._size}[whence]
+        self._position = max(base + offset, 0)
+        return self._position
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:
+        end = min(self._position + len(buffer), self._size)
+        if self._position >= end:
+            return 0
+        data = self._storage.open_range(self._name, self._position, end)
+        buffer[:len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def readall(self) -> bytes:
+        # read() sem tamanho: um único GET do restante, não um por bloco
+        if self._position >= self._size:
+            return b""
+        data = self._storage.open_range(self._name, self._position, self._size)
+        self._position += len(data)
+        return data
+
+
+class S3Storage(ObjectStorage, Storage):
+    """
+    Storage em qualquer API compatível com S3 (AWS, MinIO...). Requer o
+    extra 's3' (boto3).
+
+    Arquivos abertos são lidos por intervalos sob demanda (blocos de
+    STORAGE['RANGE_BLOCK_SIZE']): o pypdf, por exemplo, busca só o xref e os
+    objetos das páginas, sem baixar o PDF inteiro. Uploads acima de
+    STORAGE['MULTIPART_PART_SIZE'] viram multipart automaticamente.
+    """
+
+    def __init__(
+        self,
+        bucket_name: str = "",
+        endpoint_url: str | None = None,
+        region_name: str | None = None,
+        access_key: str | None = None,
+        secret_key: str | None = None,
+        addressing_style: str = "auto",
+    ) -> None:
+        if boto3 is None:
+            msg = "S3Storage requer boto3 (pip install django_api[s3])"
+            raise ImproperlyConfigured(msg)
+        if not bucket_name:
+            msg = "S3Storage requer bucket_name (S3_BUCKET)"
+            raise ImproperlyConfigured(msg)
+        self.bucket_name = bucket_name
+        # Clientes do boto3 são thread-safe; um por storage
+        self.client = boto3.session.Session().client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region_name,
+            aws_access_key_id=access_key,
+            aws_secret_access_key=secret_key,
+            config=Config(signature_version="s3v4", s3={"addressing_style": addressing_style}),
+        )
+
+    # API de Storage do Django
+
+    def _open(self, name: str, mode: str = "rb") -> File:
+        if "w" in mode or "a" in mode:
+            msg = "S3Storage só abre arquivos para leitura; use save()"
+            raise ValueError(msg)
+        raw = _RangedReader(self, name, self.size(name))
+        return File(io.BufferedReader(raw, buffer_size=settings.STORAGE["RANGE_BLOCK_SIZE"]), name=name)
+
+    def _save(self, name: str, content: File) -> str:
+        if hasattr(content, "seek"):
+            content.seek(0)
+        part_size = settings.STORAGE["MULTIPART_PART_SIZE"]
+        self.client.upload_fileobj(
+            content,
+            self.bucket_name,
+            name,
+            ExtraArgs={"ContentType": mimetypes.guess_type(name)[0] or "application/octet-stream"},
+            Config=TransferConfig(multipart_threshold=part_size, multipart_chunksize=part_size),
+        )
+        return name
+
+    def delete(self, name: str) -> None:
+        self.client.delete_object(Bucket=self.bucket_name, Key=name)
+
+    def exists(self, name: str) -> bool:
+        try:
+            self._head(name)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def size(self, name: str) -> int:
+        return self._head(name)["ContentLength"]
+
+    def url(self, name: str) -> str:
+        return self.presigned_url(name)
+
+    def get_modified_time(self, name: str) -> datetime:
+        return self._head(name)["LastModified"]
+
+    # ObjectStorage
+
+    def open_range(self, name: str, start: int, end: int) -> bytes:
+        if start >= end:
+            return b""
+        response = self.client.get_object(Bucket=self.bucket_name, Key=name, Range=f"bytes={start}-{end - 1}")
+        return response["Body"].read()
+
+    def iter_chunks(self, name: str, chunk_size: int = File.DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        body = self.client.get_object(Bucket=self.bucket_name, Key=name)["Body"]
+        try:
+            yield from body.iter_chunks(chunk_size)
+        finally:
+            body.close()
+
+    def presigned_url(self, name: str, expires: int | None = None) -> str:
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket_name, "Key": name},
+            ExpiresIn=_expires(expires),
+        )
+
+    def create_multipart(self, name: str, content_type: str | None = None) -> str:
+        response = self.client.create_multipart_upload(
+            Bucket=self.bucket_name,
+            Key=name,
+            ContentType=content_type or mimetypes.guess_type(name)[0] or "application/octet-stream",
+        )
+        return response["UploadId"]
+
+    def presigned_part_url(self, name: str, upload_id: str, part_number: int, expires: int | None = None) -> str:
+        return self.client.generate_presigned_url(
+            "upload_part",
+            Params={"Bucket": self.bucket_name, "Key": name, "UploadId": upload_id, "PartNumber": part_number},
+            ExpiresIn=_expires(expires),
+        )
+
+    def upload_part(self, name: str, upload_id: str, part_number: int, data: bytes) -> str:
+        response = self.client.upload_part(
+            Bucket=self.bucket_name, Key=name, UploadId=upload_id, PartNumber=part_number, Body=data,
+        )
+        return response["ETag"]
+
+    def complete_multipart(self, name: str, upload_id: str, parts: list[tuple[int, str]]) -> str:
+        try:
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=name,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": [{"PartNumber": number, "ETag": etag} for number, etag in sorted(parts)]},
+            )
+        except ClientError as err:
+            raise ValueError(str(err)) from err
+        return name
+
+    def abort_multipart(self, name: str, upload_id: str) -> None:
+        self.client.abort_multipart_upload(Bucket=self.bucket_name, Key=name, UploadId=upload_id)
+
+    def _head(self, name: str) -> dict[str, Any]:
+        try:
+            return self.client.head_object(Bucket=self.bucket_name, Key=name)
+        except ClientError as err:
+            if err.response.get("Error", {}).get("Code") in {"404", "NoSuchKey", "NotFound"}:
+                raise FileNotFoundError(name) from err
+            raise
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Runner dos testes: os writers de log gravam na thread chamadora.
+
+    Com a thread de fundo, um lote ainda pendente seria gravado depois que
+    o teste desfez a transação (ou durante o teardown do banco); síncrono,
+    cada teste vê os próprios logs e nada escreve fora dele.
+    """
+
+    def setup_test_environment(self, **kwargs: object) -> None:
+        super().setup_test_environment(**kwargs)
+        self._log_writer = override_settings(LOG_WRITER={**settings.LOG_WRITER, 'ASYNC': False})
+        self._log_writer.enable()
+
+    def teardown_test_environment(self, **kwargs: object) -> None:
+        self._log_writer.disable()
+        super().teardown_test_environment(**kwargs)
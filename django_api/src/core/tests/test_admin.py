@@ -0,0 +1,157 @@
+import json
+from unittest.mock import patch
+
+from django.contrib import admin
+from django.test import TestCase
+from django.urls import reverse
+
+from core.admin import EstimatedCountPaginator
+from core.query_budget import QueryBudget
+from documents.admin import DocumentChunkAdmin
+from documents.models import Document, DocumentChunk
+from documents.repositories import DocumentChunkRepository
+from organizations.models import Organization, OrganizationMember
+from plans.models import Plan, Subscription, Usage
+from queries.models import AuditLog, QueryLog
+from users.models import User
+
+
+class LargeTableChangelistTestCase(TestCase):
+    """Testes para as changelists do admin em tabelas grandes"""
+
+    CHANGELISTS = (
+        "admin:documents_document_changelist",
+        "admin:documents_documentchunk_changelist",
+        "admin:organizations_organizationmember_changelist",
+        "admin:plans_subscription_changelist",
+        "admin:plans_usage_changelist",
+        "admin:queries_querylog_changelist",
+        "admin:queries_auditlog_changelist",
+        "admin:users_user_changelist",
+    )
+
+    def setUp(self) -> None:
+        admin_user = User.objects.create_superuser(
+            email="admin@example.com", username="admin", password=None,
+        )
+        self.client.force_login(admin_user)
+        self.plan = Plan.objects.create(tier="FREE", name="Free Plan", max_documents=1, max_queries=1)
+
+    def create_rows(self, start: int, stop: int) -> None:
+        for n in range(start, stop):
+            user = User.objects.create_user(email=f"u{n}@example.com", username=f"u{n}", password=None)
+            organization = Organization.objects.create(name=f"Org {n}", slug=f"org-{n}")
+            OrganizationMember.objects.create(organization=organization, user=user)
+            Subscription.objects.create(user=user, plan=self.plan)
+            Usage.objects.create(user=user, period=f"2026-{n % 12 + 1:02d}-01")
+            document = Document.objects.create(user=user, organization=organization, title=f"Doc {n}")
+            DocumentChunk.objects.create(document=document, chunk_index=0, text=f"texto {n}")
+            QueryLog.objects.create(user=user, organization=organization, query_text="pergunta")
+            AuditLog.objects.create(user=user, organization=organization, action="LOGIN")
+
+    def test_constant_queries_per_page(self) -> None:
+        """
+        O que testa: Changelists com 1 e com 11 linhas
+        Resultado esperado [PASS]:
+        - Mesmo número de queries (colunas de FK via list_select_related)
+        - Uma única contagem por página (show_full_result_count = False)
+        """
+        self.create_rows(0, 1)
+        budgets = {}
+        for name in self.CHANGELISTS:
+            with QueryBudget() as recorder:
+                self.client.get(reverse(name))
+            budgets[name] = len(recorder.queries)
+
+        self.create_rows(1, 11)
+        for name in self.CHANGELISTS:
+            with self.subTest(name), QueryBudget(budgets[name], max_duplicates=1):
+                response = self.client.get(reverse(name))
+            self.assertEqual(response.status_code, 200)
+
+    def test_autocomplete_filter(self) -> None:
+        """
+        O que testa: Filtro de documento por autocomplete na changelist de chunks
+        Resultado esperado [PASS]:
+        - Widget de autocomplete renderizado, sem listar os documentos
+        - Filtro pelo id do documento aplicado
+        """
+        self.create_rows(0, 2)
+        document = Document.objects.get(title="Doc 1")
+        url = reverse("admin:documents_documentchunk_changelist")
+
+        response = self.client.get(url)
+        self.assertContains(response, 'class="admin-autocomplete')
+        self.assertContains(response, "admin/js/autocomplete.js")
+
+        response = self.client.get(url, {"document__id__exact": str(document.id)})
+        self.assertEqual(response.context["cl"].result_count, 1)
+        self.assertContains(response, "texto 1")
+        self.assertNotContains(response, "texto 0")
+
+
+class EstimatedCountPaginatorTestCase(TestCase):
+    """Testes para core.admin.EstimatedCountPaginator"""
+
+    def setUp(self) -> None:
+        for n in range(3):
+            User.objects.create_user(email=f"u{n}@example.com", username=f"u{n}", password=None)
+
+    def test_exact_count_outside_postgres(self) -> None:
+        """
+        O que testa: Paginação em banco que não é PostgreSQL
+        Resultado esperado [PASS]: COUNT(*) exato
+        """
+        paginator = EstimatedCountPaginator(User.objects.order_by("email"), 2)
+
+        self.assertEqual(paginator.count, 3)
+
+    def test_uses_planner_estimate(self) -> None:
+        """
+        O que testa: PostgreSQL com estimativa do EXPLAIN acima e abaixo do limiar
+        Resultado esperado [PASS]: Estimativa usada só acima de ESTIMATE_THRESHOLD
+        """
+        def explain(rows: int) -> str:
+            return json.dumps([{"Plan": {"Plan Rows": rows}}])
+
+        with patch("core.admin.connections") as connections:
+            connections.__getitem__.return_value.vendor = "postgresql"
+            with patch("django.db.models.QuerySet.explain", return_value=explain(2_000_000)):
+                large = EstimatedCountPaginator(User.objects.order_by("email"), 100)
+                self.assertEqual(large.count, 2_000_000)
+            with patch("django.db.models.QuerySet.explain", return_value=explain(50)):
+                small = EstimatedCountPaginator(User.objects.order_by("email"), 100)
+                self.assertEqual(small.count, 3)
+
+
+class FullTextSearchTestCase(TestCase):
+    """Testes para DocumentChunkRepository.filter_full_text()"""
+
+    def test_admin_search_keeps_document_title(self) -> None:
+        """
+        O que testa: Busca na changelist de chunks no PostgreSQL
+        Resultado esperado [PASS]: Índice full-text no texto OU título do documento
+        """
+        model_admin = DocumentChunkAdmin(DocumentChunk, admin.site)
+
+        with patch("documents.admin.connection") as connection:
+            connection.vendor = "postgresql"
+            queryset, may_have_duplicates = model_admin.get_search_results(
+                None, DocumentChunk.objects.all(), "manual",
+            )
+
+        sql = str(queryset.query)
+        self.assertIn("to_tsvector('simple'::regconfig, \"document_chunks\".\"text\")", sql)
+        self.assertIn(" OR ", sql)
+        self.assertIn('"documents"."title" LIKE', sql)
+        self.assertFalse(may_have_duplicates)
+
+    def test_query_matches_index_expression(self) -> None:
+        """
+        O que testa: SQL gerado para a busca no texto dos chunks
+        Resultado esperado [PASS]: Mesma expressão do índice GIN, sem LIKE
+        """
+        sql = str(DocumentChunkRepository.filter_full_text(DocumentChunk.objects.all(), "férias").query)
+
+        self.assertIn("to_tsvector('simple'::regconfig, \"document_chunks\".\"text\")", sql)
+        self.assertNotIn("LIKE", sql)
@@ -0,0 +1,58 @@
+import asyncio
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory, SimpleTestCase
+from rest_framework import generics
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+from core.async_views import AsyncAPIViewMixin
+
+
+class _View(AsyncAPIViewMixin, generics.GenericAPIView):
+    authentication_classes = ()
+    permission_classes = (AllowAny,)
+    error: BaseException | None = None
+
+    async def get(self, request: object) -> Response:
+        if self.error is not None:
+            raise self.error
+        return Response({"ok": True})
+
+
+class AsyncAPIViewMixinTestCase(SimpleTestCase):
+    """Testes para core.async_views.AsyncAPIViewMixin"""
+
+    def _get(self, error: BaseException | None = None) -> Response:
+        view = _View.as_view(error=error)
+        return async_to_sync(view)(RequestFactory().get("/"))
+
+    def test_awaits_async_handler(self) -> None:
+        """
+        O que testa: Handler ``async def``
+        Resultado esperado [PASS]: Resposta do handler finalizada pelo DRF
+        """
+        response = self._get()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"ok": True})
+
+    def test_unexpected_error_uses_exception_handler(self) -> None:
+        """
+        O que testa: Exceção inesperada no handler
+        Resultado esperado [PASS]: 500 montado pelo EXCEPTION_HANDLER, como no dispatch síncrono
+        """
+        with mock.patch("core.exception_handler.logger"):
+            response = self._get(RuntimeError("falhou"))
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.data["error"]["code"], "internal_error")
+
+    def test_cancellation_propagates(self) -> None:
+        """
+        O que testa: CancelledError (desconexão do cliente) no handler
+        Resultado esperado [PASS]: Propaga em vez de virar resposta
+        """
+        with self.assertRaises(asyncio.CancelledError):
+            self._get(asyncio.CancelledError())
@@ -0,0 +1,200 @@
+from typing import TYPE_CHECKING
+from unittest import mock
+
+from django.db import router, transaction
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.urls import reverse
+
+from core.batch_insert import insert_instances
+from core.db import RoutingState, current_routing, use_primary
+from core.middleware import ReplicaRoutingMiddleware
+from plans.models import Plan
+from queries.models import QueryLog
+from users.models import User
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+REPLICAS = mock.patch("core.db.replica_aliases", return_value=["replica_0"])
+MIDDLEWARE_REPLICAS = mock.patch("core.middleware.replica_aliases", return_value=["replica_0"])
+
+
+class ReplicaRouterTestCase(SimpleTestCase):
+    """Testes para core.db.ReplicaRouter (fora de transação)"""
+
+    def test_without_replicas(self) -> None:
+        """
+        O que testa: Leitura sem réplicas configuradas
+        Resultado esperado [PASS]: Tudo no 'default'
+        """
+        self.assertEqual(User.objects.all().db, "default")
+
+    @REPLICAS
+    def test_reads_go_to_replica(self, _: mock.MagicMock) -> None:
+        """
+        O que testa: Leitura e escrita fora de transação, sem escrita anterior
+        Resultado esperado [PASS]: Leitura na réplica, escrita no primário
+        """
+        self.assertEqual(User.objects.all().db, "replica_0")
+        self.assertEqual(router.db_for_write(User), "default")
+
+    @REPLICAS
+    def test_read_your_writes(self, _: mock.MagicMock) -> None:
+        """
+        O que testa: Leitura depois de uma escrita na mesma requisição
+        Resultado esperado [PASS]: Leitura fixada no primário e escrita registrada
+        """
+        state = RoutingState()
+        token = current_routing.set(state)
+        try:
+            self.assertEqual(User.objects.all().db, "replica_0")
+            router.db_for_write(User)
+            self.assertEqual(User.objects.all().db, "default")
+        finally:
+            current_routing.reset(token)
+
+        self.assertTrue(state.wrote)
+
+    @REPLICAS
+    def test_unpinned_models(self, _: mock.MagicMock) -> None:
+        """
+        O que testa: Escrita num model de UNPINNED_MODELS (QueryLog)
+        Resultado esperado [PASS]: Leituras continuam na réplica
+        """
+        state = RoutingState()
+        token = current_routing.set(state)
+        try:
+            router.db_for_write(QueryLog)
+            self.assertEqual(User.objects.all().db, "replica_0")
+        finally:
+            current_routing.reset(token)
+
+        self.assertFalse(state.wrote)
+
+    @REPLICAS
+    def test_use_primary(self, _: mock.MagicMock) -> None:
+        """
+        O que testa: Leitura dentro de use_primary()
+        Resultado esperado [PASS]: Primário
+        """
+        with use_primary():
+            self.assertEqual(User.objects.all().db, "default")
+
+    @REPLICAS
+    def test_batch_insert_pins(self, _: mock.MagicMock) -> None:
+        """
+        O que testa: insert_instances() no PostgreSQL (SQL direto, sem save())
+        Resultado esperado [PASS]: INSERT no primário e escrita registrada
+        """
+        state = RoutingState()
+        token = current_routing.set(state)
+        try:
+            with mock.patch("core.batch_insert.connections") as connections:
+                connection = connections.__getitem__.return_value
+                connection.vendor = "postgresql"
+                cursor = connection.cursor.return_value.__enter__.return_value
+                cursor.connection = None
+                insert_instances(User(email="novo@example.com", username="novo"))
+        finally:
+            current_routing.reset(token)
+
+        connections.__getitem__.assert_called_once_with("default")
+        [statement, params] = cursor.execute.call_args.args
+        self.assertTrue(statement.startswith('INSERT INTO "users" ("password", '))
+        self.assertIn("novo@example.com", params)
+        self.assertTrue(state.wrote)
+        self.assertTrue(state.pinned)
+
+
+class ReplicaRouterAtomicTestCase(TestCase):
+    """Testes para core.db.ReplicaRouter dentro de transação"""
+
+    @REPLICAS
+    def test_primary_in_atomic(self, _: mock.MagicMock) -> None:
+        """
+        O que testa: Leitura dentro de transaction.atomic (o TestCase já roda num atomic)
+        Resultado esperado [PASS]: Primário
+        """
+        with transaction.atomic():
+            self.assertEqual(User.objects.all().db, "default")
+
+
+class ReplicaRoutingMiddlewareTestCase(SimpleTestCase):
+    """Testes para core.middleware.ReplicaRoutingMiddleware"""
+
+    def setUp(self) -> None:
+        self.factory = RequestFactory()
+        self.seen = []
+
+    def view(self, *, write: bool) -> Callable[[HttpRequest], HttpResponse]:
+        def get_response(request: HttpRequest) -> HttpResponse:
+            if write:
+                router.db_for_write(User)
+            self.seen.append(current_routing.get().pinned)
+            return HttpResponse()
+        return get_response
+
+    @REPLICAS
+    @MIDDLEWARE_REPLICAS
+    def test_write_sets_pin_cookie(self, *_: object) -> None:
+        """
+        O que testa: Requisição que escreve no primário
+        Resultado esperado [PASS]: Cookie db_primary com max-age STICKY_SECONDS
+        """
+        response = ReplicaRoutingMiddleware(self.view(write=True))(self.factory.post("/"))
+
+        cookie = response.cookies["db_primary"]
+        self.assertEqual(cookie.value, "1")
+        self.assertEqual(cookie["max-age"], 5)
+
+    @REPLICAS
+    @MIDDLEWARE_REPLICAS
+    def test_pin_cookie_pins_reads(self, *_: object) -> None:
+        """
+        O que testa: Requisições de leitura com e sem o cookie
+        Resultado esperado [PASS]: Fixada no primário só com o cookie; nenhum cookie novo
+        """
+        middleware = ReplicaRoutingMiddleware(self.view(write=False))
+        request = self.factory.get("/")
+        request.COOKIES["db_primary"] = "1"
+
+        pinned_response = middleware(request)
+        middleware(self.factory.get("/"))
+
+        self.assertEqual(self.seen, [True, False])
+        self.assertNotIn("db_primary", pinned_response.cookies)
+
+
+class ReplicaRoutingRegistrationTestCase(TestCase):
+    """Testes para registro e login com réplicas configuradas"""
+
+    def setUp(self) -> None:
+        Plan.objects.create(tier="FREE", name="Free Plan", max_documents=10, max_queries=100)
+
+    @REPLICAS
+    @MIDDLEWARE_REPLICAS
+    def test_register_then_login(self, *_: object) -> None:
+        """
+        O que testa: Registro (insert em lote) seguido de login do mesmo cliente
+        Resultado esperado [PASS]:
+        - Registro devolve o cookie db_primary
+        - Login lê do primário (a réplica pode ainda não ter o usuário) e autentica
+        """
+        response = self.client.post(reverse("users:register"), {
+            "email": "novo@example.com",
+            "username": "novo",
+            "password": "senha12345",
+            "plan": "FREE",
+        }, content_type="application/json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.cookies["db_primary"].value, "1")
+
+        with mock.patch("core.db._balancer.choice", side_effect=AssertionError("leitura na réplica")):
+            response = self.client.post(reverse("users:login"), {
+                "email": "novo@example.com",
+                "password": "senha12345",
+            }, content_type="application/json")
+
+        self.assertEqual(response.status_code, 200)
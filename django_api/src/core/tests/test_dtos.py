@@ -0,0 +1,35 @@
+from dataclasses import FrozenInstanceError
+from uuid import uuid4
+
+from django.test import SimpleTestCase
+
+from documents.dtos import ChunkSearchHit
+from queries.dtos import RAGAnswer
+
+
+class DTOTestCase(SimpleTestCase):
+    """Testes para core.dtos.DTO"""
+
+    def test_slotted_and_frozen(self) -> None:
+        """
+        O que testa: Instância de um DTO com slots e frozen
+        Resultado esperado [FAIL]: Sem __dict__ e atribuição levanta FrozenInstanceError
+        """
+        hit = ChunkSearchHit(uuid4(), uuid4(), "Manual", 0, "texto", 0.9)
+
+        self.assertFalse(hasattr(hit, "__dict__"))
+        with self.assertRaises(FrozenInstanceError):
+            hit.score = 1.0
+
+    def test_to_dict_shares_values(self) -> None:
+        """
+        O que testa: to_dict de um DTO
+        Resultado esperado [PASS]: Dict com os campos na ordem declarada, sem copiar os valores
+        """
+        citations = [{"chunk_index": 0}]
+        answer = RAGAnswer(answer="ok", citations=citations, latency_ms=10, tokens_used=3)
+
+        data = answer.to_dict()
+
+        self.assertEqual(list(data), ["answer", "citations", "latency_ms", "tokens_used"])
+        self.assertIs(data["citations"], citations)
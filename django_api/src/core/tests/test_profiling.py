@@ -0,0 +1,177 @@
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.metrics import PrometheusMetricsSink, get_metrics_sink
+from queries.tests.test_rag import SYNC_LOG_WRITER, RAGTestMixin
+from users.models import User
+
+if TYPE_CHECKING:
+    from django.http import HttpResponseBase
+
+
+def server_timing(response: HttpResponseBase) -> dict[str, dict[str, str]]:
+    """{etapa: {"dur": ..., "desc": ...}} a partir do header Server-Timing"""
+    stages = {}
+    for entry in response["Server-Timing"].split(", "):
+        name, *params = entry.split(";")
+        stages[name] = dict(param.split("=", 1) for param in params)
+    return stages
+
+
+@override_settings(LOG_WRITER=SYNC_LOG_WRITER, PROFILING={**settings.PROFILING, "SERVER_TIMING": True})
+class RequestProfilingMiddlewareTestCase(RAGTestMixin, TestCase):
+    """Testes para core.middleware.RequestProfilingMiddleware"""
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            username="testuser",
+            password=None,
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_server_timing_for_sync_view(self) -> None:
+        """
+        O que testa: GET /api/queries/analytics/ (view síncrona)
+        Resultado esperado [PASS]:
+        - Header X-Trace-Id presente
+        - Server-Timing com queries (db), serialização e total
+        """
+        response = self.client.get(reverse("queries:analytics"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response["X-Trace-Id"]), 32)
+        stages = server_timing(response)
+        self.assertGreaterEqual(int(stages["db"]["desc"].strip('"x')), 1)
+        self.assertIn("serialize", stages)
+        self.assertIn("total", stages)
+
+    def test_server_timing_for_async_view(self) -> None:
+        """
+        O que testa: POST /api/queries/ask/ (view async, ORM em sync_to_async)
+        Resultado esperado [PASS]: Server-Timing com db, embedding, search, llm e serialize
+        """
+        self.create_document(self.user, ["política de férias: trinta dias por ano"])
+
+        response = self.client.post(reverse("queries:ask"), {"query": "férias"}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(
+            {"db", "embedding", "search", "llm", "serialize", "total"},
+            set(server_timing(response)),
+        )
+
+    def test_error_uses_request_trace_id(self) -> None:
+        """
+        O que testa: X-Trace-Id enviado pelo cliente numa requisição com erro
+        Resultado esperado [FAIL]:
+        - Status HTTP: 422
+        - Mesmo trace id no header e no corpo do erro
+        """
+        trace_id = "abc123-trace-id"
+
+        response = self.client.post(
+            reverse("queries:ask"), {"query": ""}, format="json", headers={"X-Trace-Id": trace_id},
+        )
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response["X-Trace-Id"], trace_id)
+        self.assertEqual(response.json()["trace_id"], trace_id)
+
+    def test_invalid_trace_id_is_replaced(self) -> None:
+        """
+        O que testa: X-Trace-Id com caracteres não permitidos
+        Resultado esperado [PASS]: Header recebido é ignorado e um novo id é gerado
+        """
+        response = self.client.get(
+            reverse("queries:analytics"), headers={"X-Trace-Id": 'x" injected'},
+        )
+
+        self.assertNotEqual(response["X-Trace-Id"], 'x" injected')
+
+    def test_sampled_profiler_writes_profile(self) -> None:
+        """
+        O que testa: PROFILING['SAMPLE_RATE'] = 1
+        Resultado esperado [PASS]: Arquivo <trace_id>.prof gravado em PROFILE_DIR
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            profiling = {**settings.PROFILING, "SAMPLE_RATE": 1.0, "PROFILE_DIR": directory}
+            with override_settings(PROFILING=profiling):
+                response = self.client.get(reverse("queries:analytics"))
+
+            self.assertTrue((Path(directory) / f"{response['X-Trace-Id']}.prof").exists())
+
+
+@override_settings(PROFILING={**settings.PROFILING, "METRICS_TOKEN": "segredo"})
+class MetricsViewTestCase(TestCase):
+    """Testes para GET /metrics"""
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer segredo")
+
+    def test_prometheus_exposition(self) -> None:
+        """
+        O que testa: Requisições contadas por rota e expostas no formato texto
+        Resultado esperado [PASS]:
+        - Content-Type text/plain version=0.0.4
+        - Contador e histograma com a rota da requisição anterior
+        """
+        self.client.get(reverse("queries:analytics"))
+
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = response.content.decode()
+        self.assertIn('http_requests_total{method="GET",route="api/queries/analytics/",status="401"}', body)
+        self.assertIn(
+            'http_request_duration_seconds_count{method="GET",route="api/queries/analytics/"}', body,
+        )
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        """
+        O que testa: PrometheusMetricsSink.observe_request() com durações diferentes
+        Resultado esperado [PASS]: Buckets acumulados e +Inf igual ao total
+        """
+        sink = PrometheusMetricsSink()
+        for duration_ms in (3, 40, 2000):
+            sink.observe_request(method="GET", route="r/", status=200, duration_ms=duration_ms, stages={})
+
+        body = sink.render()
+
+        self.assertIn('http_request_duration_seconds_bucket{method="GET",route="r/",le="0.005"} 1', body)
+        self.assertIn('http_request_duration_seconds_bucket{method="GET",route="r/",le="0.05"} 2', body)
+        self.assertIn('http_request_duration_seconds_bucket{method="GET",route="r/",le="+Inf"} 3', body)
+
+    def test_token_required(self) -> None:
+        """
+        O que testa: PROFILING['METRICS_TOKEN'] definido
+        Resultado esperado [FAIL]: Status HTTP 403 sem o token ou com outro; 200 com o token
+        """
+        allowed = self.client.get(reverse("metrics"))
+        self.client.credentials()
+        denied = self.client.get(reverse("metrics"))
+        wrong = self.client.get(reverse("metrics"), headers={"Authorization": "Bearer outro"})
+
+        self.assertEqual(allowed.status_code, 200)
+        self.assertEqual(denied.status_code, 403)
+        self.assertEqual(wrong.status_code, 403)
+        self.assertIsInstance(get_metrics_sink(), PrometheusMetricsSink)
+
+    def test_denied_without_configured_token(self) -> None:
+        """
+        O que testa: PROFILING['METRICS_TOKEN'] vazio
+        Resultado esperado [FAIL]: Status HTTP 403 mesmo com "Bearer " vazio
+        """
+        with override_settings(PROFILING={**settings.PROFILING, "METRICS_TOKEN": ""}):
+            response = self.client.get(reverse("metrics"), headers={"Authorization": "Bearer "})
+
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,158 @@
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.query_budget import (
+    QueryBudget,
+    QueryBudgetExceededError,
+    QueryRecorder,
+    log_duplicate_queries,
+    recording,
+)
+from documents.models import Document, DocumentChunk
+from organizations.models import Organization, OrganizationMember
+from plans.models import Plan, Subscription
+from users.models import User
+
+
+class QueryBudgetTestCase(TestCase):
+    """Testes para core.query_budget.QueryBudget"""
+
+    def setUp(self) -> None:
+        self.users = [
+            User.objects.create_user(email=f"u{n}@example.com", username=f"u{n}", password=None)
+            for n in range(3)
+        ]
+        organization = Organization.objects.create(name="Acme", slug="acme")
+        for user in self.users:
+            OrganizationMember.objects.create(organization=organization, user=user)
+
+    def test_within_budget(self) -> None:
+        """
+        O que testa: Bloco com menos queries que o orçamento
+        Resultado esperado [PASS]: Nenhuma exceção e queries registradas
+        """
+        with QueryBudget(1) as recorder:
+            list(User.objects.all())
+
+        self.assertEqual(len(recorder.queries), 1)
+
+    def test_exceeded_lists_queries(self) -> None:
+        """
+        O que testa: Bloco com mais queries que o orçamento
+        Resultado esperado [FAIL]: QueryBudgetExceededError (AssertionError) listando as queries
+        """
+        with self.assertRaises(QueryBudgetExceededError) as ctx, QueryBudget(1):
+            User.objects.count()
+            Organization.objects.count()
+
+        self.assertIsInstance(ctx.exception, AssertionError)
+        self.assertIn("2 queries executadas, orçamento de 1", str(ctx.exception))
+
+    def test_duplicate_reports_stack_trace(self) -> None:
+        """
+        O que testa: Acesso lazy a relacionado dentro de um loop (N+1)
+        Resultado esperado [FAIL]: QueryBudgetExceededError com o stack trace da linha do loop
+        """
+        with self.assertRaises(QueryBudgetExceededError) as ctx, QueryBudget(max_duplicates=1):
+            for member in OrganizationMember.objects.all():
+                _ = member.user.email
+
+        message = str(ctx.exception)
+        self.assertIn("Query repetida 3x (máximo 1)", message)
+        self.assertIn("test_query_budget.py", message)
+        self.assertIn("member.user.email", message)
+
+    def test_decorator_counts_async_queries(self) -> None:
+        """
+        O que testa: Decorator numa corrotina com ORM em sync_to_async
+        Resultado esperado [FAIL]: Queries da thread do sync_to_async contadas
+        """
+        @QueryBudget(0)
+        async def load_users() -> list[User]:
+            return await sync_to_async(list)(User.objects.all())
+
+        with self.assertRaises(QueryBudgetExceededError):
+            async_to_sync(load_users)()
+
+    def test_runtime_logs_duplicates(self) -> None:
+        """
+        O que testa: Modo de runtime (recording + log_duplicate_queries) com N+1
+        Resultado esperado [PASS]: Warning com a contagem e o stack trace
+        """
+        with recording(QueryRecorder(duplicate_threshold=2)) as recorder:
+            for member in OrganizationMember.objects.all():
+                _ = member.user.email
+
+        with self.assertLogs("core.query_budget", "WARNING") as logs:
+            log_duplicate_queries(recorder, "GET /teste/")
+
+        self.assertIn("Query repetida 3x em GET /teste/", logs.output[0])
+        self.assertIn("test_query_budget.py", logs.output[0])
+
+
+class RelatedStrTestCase(TestCase):
+    """Testes para __str__ com os objetos relacionados carregados"""
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(email="test@example.com", username="test", password=None)
+        organization = Organization.objects.create(name="Acme", slug="acme")
+        OrganizationMember.objects.create(organization=organization, user=self.user)
+        plan = Plan.objects.create(tier="FREE", name="Free Plan", max_documents=1, max_queries=1)
+        Subscription.objects.create(user=self.user, plan=plan)
+        document = Document.objects.create(user=self.user, title="Manual")
+        DocumentChunk.objects.create(document=document, chunk_index=0, text="texto")
+
+    def test_str_uses_loaded_related(self) -> None:
+        """
+        O que testa: __str__ com select_related
+        Resultado esperado [PASS]: Nenhuma query extra; email, nome do plano,
+        da organização e título do documento
+        """
+        subscription = Subscription.objects.select_related("user", "organization", "plan").get()
+        member = OrganizationMember.objects.select_related("user", "organization").get()
+        chunk = DocumentChunk.objects.select_related("document").get()
+
+        with QueryBudget(0):
+            labels = [str(subscription), str(member), str(chunk)]
+
+        self.assertEqual(labels, [
+            "test@example.com - Free Plan (ACTIVE)",
+            "test@example.com in Acme as MEMBER",
+            "Chunk 0 of Document Manual",
+        ])
+
+
+class OrganizationAdminQueryBudgetTestCase(TestCase):
+    """Testes para a listagem de organizações no admin"""
+
+    def setUp(self) -> None:
+        admin_user = get_user_model().objects.create_superuser(
+            email="admin@example.com", username="admin", password=None,
+        )
+        self.client.force_login(admin_user)
+
+    def create_organizations(self, start: int, stop: int) -> None:
+        for n in range(start, stop):
+            organization = Organization.objects.create(name=f"Org {n}", slug=f"org-{n}")
+            user = User.objects.create_user(email=f"m{n}@example.com", username=f"m{n}", password=None)
+            OrganizationMember.objects.create(organization=organization, user=user)
+
+    @override_settings(QUERY_BUDGET={"LOG_DUPLICATES": False, "DUPLICATE_THRESHOLD": 5})
+    def test_members_count_constant_queries(self) -> None:
+        """
+        O que testa: Coluna members_count com várias organizações
+        Resultado esperado [PASS]: Mesmo número de queries para 1 e 10 linhas; contagem exibida
+        """
+        url = reverse("admin:organizations_organization_changelist")
+        self.create_organizations(0, 1)
+        with QueryBudget() as few:
+            self.client.get(url)
+
+        self.create_organizations(1, 11)
+        with QueryBudget(len(few.queries)):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '<td class="field-members_count">1</td>', count=11)
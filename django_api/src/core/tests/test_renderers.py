@@ -0,0 +1,104 @@
+import json
+from datetime import UTC, datetime
+from decimal import Decimal
+from unittest import mock
+from uuid import UUID
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from core import renderers
+from core.renderers import FastJSONRenderer, format_sse
+from users.response_handler import APIResponse, ErroreDtail
+
+PAYLOAD = {
+    "id": UUID("12345678-1234-5678-1234-567812345678"),
+    "created_at": datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC),
+    "score": Decimal("0.5"),
+    "label": gettext_lazy("texto"),
+    "tags": ("a", "b"),
+    "nested": [{"n": 1}, None, True],
+}
+
+
+class FastJSONRendererTestCase(SimpleTestCase):
+    """Testes para core.renderers.FastJSONRenderer"""
+
+    def test_matches_drf_output(self) -> None:
+        """
+        O que testa: Payload com UUID, datetime UTC, Decimal, lazy string e tupla
+        Resultado esperado [PASS]: Mesmo JSON (decodificado) do JSONRenderer do DRF, datetime com "Z"
+        """
+        fast = json.loads(FastJSONRenderer().render(PAYLOAD))
+        drf = json.loads(JSONRenderer().render(PAYLOAD))
+
+        self.assertEqual(fast, drf)
+        self.assertEqual(fast["created_at"], "2026-01-02T03:04:05Z")
+
+    def test_envelope(self) -> None:
+        """
+        O que testa: APIResponse com dataclass aninhada em data
+        Resultado esperado [PASS]: Envelope serializado direto, sem as chaves None
+        """
+        body = APIResponse(status_code=200, data=ErroreDtail(code="x")).to_dict()
+
+        self.assertEqual(
+            json.loads(FastJSONRenderer().render(body)),
+            {"status_code": 200, "data": {"code": "x", "details": None}},
+        )
+
+    def test_indent_uses_drf(self) -> None:
+        """
+        O que testa: Cliente pedindo indentação (Accept: application/json; indent=2)
+        Resultado esperado [PASS]: Saída indentada pelo renderer do DRF
+        """
+        output = FastJSONRenderer().render({"a": 1}, "application/json; indent=2")
+
+        self.assertEqual(output, b'{\n  "a": 1\n}')
+
+    def test_fallback_without_orjson(self) -> None:
+        """
+        O que testa: Renderer e format_sse sem o orjson instalado
+        Resultado esperado [PASS]: Mesmo JSON via encoder do DRF
+        """
+        with mock.patch.object(renderers, "orjson", None):
+            output = FastJSONRenderer().render(PAYLOAD)
+            event = format_sse("done", {"score": Decimal("1.5")})
+
+        self.assertEqual(json.loads(output), json.loads(JSONRenderer().render(PAYLOAD)))
+        self.assertEqual(event, 'event: done\ndata: {"score":1.5}\n\n')
+
+    def test_unsupported_type(self) -> None:
+        """
+        O que testa: Objeto sem representação JSON
+        Resultado esperado [FAIL]: TypeError
+        """
+        with self.assertRaises(TypeError):
+            FastJSONRenderer().render({"x": object()})
+
+
+class APIResponseTestCase(SimpleTestCase):
+    """Testes para users.response_handler.APIResponse"""
+
+    def test_to_dict(self) -> None:
+        """
+        O que testa: Envelope com erro e timestamp datetime
+        Resultado esperado [PASS]: Chaves None omitidas, timestamp em ISO 8601 e instância inalterada
+        """
+        timestamp = datetime(2026, 1, 2, tzinfo=UTC)
+        response = APIResponse(
+            status_code=400, message="Erro", error=ErroreDtail(code="bad"), timestamp=timestamp,
+        )
+
+        self.assertEqual(
+            response.to_dict(),
+            {
+                "status_code": 400,
+                "message": "Erro",
+                "timestamp": "2026-01-02T00:00:00+00:00",
+                "error": {"code": "bad", "details": None},
+            },
+        )
+        self.assertIs(response.timestamp, timestamp)
+        self.assertFalse(hasattr(response, "__dict__"))
@@ -0,0 +1,190 @@
+import contextlib
+import os
+import shutil
+import tempfile
+import unittest
+import uuid
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import SimpleTestCase, override_settings
+
+from core.storage import LocalStorage, S3Storage, boto3
+
+CONTENT = bytes(range(256)) * 40  # 10240 bytes
+PART = 5 * 1024 * 1024  # mínimo do S3 para partes que não são a última
+
+
+class StorageContractMixin:
+    """Comportamento comum a todos os backends de core.storage"""
+
+    storage = None
+
+    def save(self, content: bytes = CONTENT) -> str:
+        return self.storage.save(f"tests/{uuid.uuid4().hex}/arquivo.bin", ContentFile(content))
+
+    def test_range_and_streaming_reads(self) -> None:
+        """
+        O que testa: Leitura por intervalo, em blocos e arquivo aberto com seek
+        Resultado esperado [PASS]: Mesmos bytes do conteúdo original
+        """
+        name = self.save()
+
+        self.assertEqual(self.storage.open_range(name, 100, 300), CONTENT[100:300])
+        self.assertEqual(b"".join(self.storage.iter_chunks(name, chunk_size=4096)), CONTENT)
+        with self.storage.open(name, "rb") as file:
+            file.seek(-10, os.SEEK_END)
+            self.assertEqual(file.read(), CONTENT[-10:])
+            file.seek(0)
+            self.assertEqual(file.read(), CONTENT)
+
+    def test_multipart_upload(self) -> None:
+        """
+        O que testa: Upload multipart em duas partes enviadas fora de ordem
+        Resultado esperado [PASS]: Arquivo final com as partes em ordem
+        """
+        name = f"tests/{uuid.uuid4().hex}/grande.bin"
+        first, second = b"a" * PART, b"b" * 10
+        upload_id = self.storage.create_multipart(name)
+
+        etag2 = self.storage.upload_part(name, upload_id, 2, second)
+        etag1 = self.storage.upload_part(name, upload_id, 1, first)
+        self.storage.complete_multipart(name, upload_id, [(2, etag2), (1, etag1)])
+
+        self.assertEqual(self.storage.size(name), PART + 10)
+        self.assertEqual(self.storage.open_range(name, PART - 2, PART + 2), b"aabb")
+
+    def test_complete_with_wrong_etag(self) -> None:
+        """
+        O que testa: Complete com ETag que não confere com a parte enviada
+        Resultado esperado [FAIL]: ValueError
+        """
+        name = f"tests/{uuid.uuid4().hex}/grande.bin"
+        upload_id = self.storage.create_multipart(name)
+        self.storage.upload_part(name, upload_id, 1, b"conteudo")
+
+        with self.assertRaises(ValueError):
+            self.storage.complete_multipart(name, upload_id, [(1, '"00000000000000000000000000000000"')])
+        self.storage.abort_multipart(name, upload_id)
+
+
+class LocalStorageTestCase(StorageContractMixin, SimpleTestCase):
+    """Testes para core.storage.LocalStorage e as URLs assinadas"""
+
+    def setUp(self) -> None:
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.storage = default_storage
+        self.assertIsInstance(self.storage, LocalStorage)
+
+    def test_presigned_download_with_range(self) -> None:
+        """
+        O que testa: Download pela URL assinada, inteiro e com Range
+        Resultado esperado [PASS]: 200 com o arquivo; 206 com Content-Range
+        """
+        name = self.save()
+        url = self.storage.presigned_url(name)
+
+        full = self.client.get(url)
+        partial = self.client.get(url, headers={"Range": "bytes=10-19"})
+
+        self.assertEqual(full.status_code, 200)
+        self.assertEqual(b"".join(full.streaming_content), CONTENT)
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(partial.content, CONTENT[10:20])
+        self.assertEqual(partial["Content-Range"], f"bytes 10-19/{len(CONTENT)}")
+
+    def test_presigned_part_upload(self) -> None:
+        """
+        O que testa: Cliente envia partes com PUT nas URLs assinadas e o servidor completa
+        Resultado esperado [PASS]: ETag na resposta do PUT; arquivo montado
+        """
+        name = "tests/cliente.bin"
+        upload_id = self.storage.create_multipart(name)
+        parts = []
+        for number, data in ((1, b"primeira-"), (2, b"segunda")):
+            url = self.storage.presigned_part_url(name, upload_id, number)
+            response = self.client.put(url, data, content_type="application/octet-stream")
+            self.assertEqual(response.status_code, 200)
+            parts.append((number, response["ETag"]))
+
+        self.storage.complete_multipart(name, upload_id, parts)
+
+        self.assertEqual(self.storage.open_range(name, 0, 100), b"primeira-segunda")
+
+    def test_part_larger_than_part_size(self) -> None:
+        """
+        O que testa: PUT de uma parte maior que STORAGE['MULTIPART_PART_SIZE']
+        Resultado esperado [FAIL]: 413 e nenhuma parte gravada
+        """
+        name = "tests/grande.bin"
+        upload_id = self.storage.create_multipart(name)
+        url = self.storage.presigned_part_url(name, upload_id, 1)
+
+        with override_settings(STORAGE={**settings.STORAGE, "MULTIPART_PART_SIZE": 10}):
+            response = self.client.put(url, b"x" * 11, content_type="application/octet-stream")
+
+        self.assertEqual(response.status_code, 413)
+        with self.assertRaises(ValueError):
+            self.storage.complete_multipart(name, upload_id, [(1, response.get("ETag", ""))])
+
+    def test_invalid_or_expired_url(self) -> None:
+        """
+        O que testa: Token adulterado, expirado e método diferente do assinado
+        Resultado esperado [FAIL]: 403, 403 e 405
+        """
+        name = self.save()
+        url = self.storage.presigned_url(name)
+
+        self.assertEqual(self.client.get(url.replace("/storage/", "/storage/x")).status_code, 403)
+        with override_settings(STORAGE={**settings.STORAGE, "PRESIGNED_EXPIRES": -1}):
+            self.assertEqual(self.client.get(self.storage.presigned_url(name)).status_code, 403)
+        self.assertEqual(self.client.put(url, b"x").status_code, 405)
+
+    def test_part_path_traversal(self) -> None:
+        """
+        O que testa: upload_id que tenta sair do diretório de partes
+        Resultado esperado [FAIL]: ValueError
+        """
+        with self.assertRaises(ValueError):
+            self.storage.upload_part("a.bin", "../../etc", 1, b"x")
+
+
+@unittest.skipUnless(
+    boto3 is not None and os.getenv("S3_TEST_ENDPOINT_URL"),
+    "Requer boto3 e um S3 local (ex.: MinIO) em S3_TEST_ENDPOINT_URL",
+)
+class S3StorageTestCase(StorageContractMixin, SimpleTestCase):
+    """
+    Testes para core.storage.S3Storage contra um S3 local, ex.:
+    docker run -p 9000:9000 minio/minio server /data
+    S3_TEST_ENDPOINT_URL=http://localhost:9000 (credenciais minioadmin)
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.storage = S3Storage(
+            bucket_name=os.getenv("S3_TEST_BUCKET", "django-api-tests"),
+            endpoint_url=os.getenv("S3_TEST_ENDPOINT_URL"),
+            region_name="us-east-1",
+            access_key=os.getenv("S3_TEST_ACCESS_KEY", "minioadmin"),
+            secret_key=os.getenv("S3_TEST_SECRET_KEY", "minioadmin"),
+            addressing_style="path",
+        )
+        with contextlib.suppress(cls.storage.client.exceptions.BucketAlreadyOwnedByYou):
+            cls.storage.client.create_bucket(Bucket=cls.storage.bucket_name)
+
+    def test_presigned_url(self) -> None:
+        """
+        O que testa: URL assinada de download gerada pelo S3
+        Resultado esperado [PASS]: URL do bucket com assinatura v4
+        """
+        url = self.storage.presigned_url(self.save())
+
+        self.assertIn(self.storage.bucket_name, url)
+        self.assertIn("X-Amz-Signature", url)
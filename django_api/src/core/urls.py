@@ -6,9 +6,18 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+from core.metrics import metrics_view
+from core.storage import signed_storage_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
 
+    # Métricas no formato do Prometheus
+    path("metrics", metrics_view, name="metrics"),
+
+    # URLs assinadas do storage local (download com Range e partes de upload)
+    path("storage/<str:token>/", signed_storage_view, name="signed-storage"),
+
 
     # Schema OpenAPI (JSON)
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
@@ -29,4 +38,10 @@ urlpatterns = [
 
     # Aqui inclui as rotas de autenticação
     path("api/auth/", include("users.api_urls")),
+
+    # Listagem de documentos e chunks
+    path("api/documents/", include("documents.api_urls")),
+
+    # Histórico e analytics de queries RAG
+    path("api/queries/", include("queries.api_urls")),
 ]
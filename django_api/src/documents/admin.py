@@ -1,18 +1,29 @@
+from typing import TYPE_CHECKING
+
 from django.contrib import admin
+from django.db import connection
+
+from core.admin import AutocompleteFilter, LargeTableAdmin
+from documents.models import DeletionJob, Document, DocumentChunk, ImportJob
+from documents.repositories import DocumentChunkRepository
 
-from documents.models import Document, DocumentChunk
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+    from django.http import HttpRequest
 
 
 @admin.register(Document)
-class DocumentAdmin(admin.ModelAdmin):
+class DocumentAdmin(LargeTableAdmin):
     list_display = ('title', 'user_email', 'organization_name', 'status', 'scope', 'created_at')
     list_filter = ('status', 'scope', 'created_at')
+    list_select_related = ('user', 'organization')
     search_fields = ('title', 'user__email', 'organization__name')
+    autocomplete_fields = ('user', 'organization')
     ordering = ('-created_at',)
     readonly_fields = ('id', 'created_at', 'updated_at')
     fieldsets = (
         ('Informações Básicas', {'fields': ('id', 'title', 'user', 'organization', 'scope')}),
-        ('Arquivo', {'fields': ('file_key', 'file_url', 'mime_type')}),
+        ('Arquivo', {'fields': ('file_key', 'file_url', 'mime_type', 'size_bytes')}),
         ('Status', {'fields': ('status', 'metadata')}),
         ('Data e Hora', {'fields': ('created_at', 'updated_at')}),
     )
@@ -27,11 +38,15 @@ class DocumentAdmin(admin.ModelAdmin):
 
 
 @admin.register(DocumentChunk)
-class DocumentChunkAdmin(admin.ModelAdmin):
+class DocumentChunkAdmin(LargeTableAdmin):
     list_display = ('document_title', 'chunk_index', 'text_preview')
-    list_filter = ('document', 'metadata')
+    list_filter = (('document', AutocompleteFilter),)
+    list_select_related = ('document',)
+    # No PostgreSQL a busca no texto usa o índice full-text (get_search_results),
+    # somada ao título do documento
     search_fields = ('text', 'document__title')
-    ordering = ('document', 'chunk_index')
+    autocomplete_fields = ('document',)
+    ordering = ('document_id', 'chunk_index')
     readonly_fields = ('id', 'text_preview')
     fieldsets = (
         ('Informações', {'fields': ('id', 'document', 'chunk_index')}),
@@ -39,6 +54,14 @@ class DocumentChunkAdmin(admin.ModelAdmin):
         ('Metadados', {'fields': ('metadata',)}),
     )
 
+    def get_search_results(
+        self, request: HttpRequest, queryset: QuerySet[DocumentChunk], search_term: str,
+    ) -> tuple[QuerySet[DocumentChunk], bool]:
+        if search_term and connection.vendor == 'postgresql':
+            matches = DocumentChunkRepository.filter_full_text(queryset, search_term)
+            return matches | queryset.filter(document__title__icontains=search_term), False
+        return super().get_search_results(request, queryset, search_term)
+
     def document_title(self, obj):
         return obj.document.title
     document_title.short_description = 'Documento'
@@ -46,3 +69,45 @@ class DocumentChunkAdmin(admin.ModelAdmin):
     def text_preview(self, obj):
         return obj.text[:100] + '...' if len(obj.text) > 100 else obj.text
     text_preview.short_description = 'Prévia do Texto'
+
+
+@admin.register(DeletionJob)
+class DeletionJobAdmin(admin.ModelAdmin):
+    list_display = ('target_type', 'target_id', 'status', 'documents_deleted', 'chunks_deleted', 'bytes_freed', 'created_at', 'finished_at')
+    list_filter = ('status', 'target_type')
+    search_fields = ('target_id',)
+    ordering = ('-created_at',)
+    readonly_fields = (
+        'id', 'target_type', 'target_id', 'requested_by', 'status', 'documents_deleted', 'chunks_deleted',
+        'bytes_freed', 'progress', 'error', 'created_at', 'started_at', 'finished_at', 'updated_at',
+    )
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        # Jobs são criados pelo DeletionService (API ou run_deletion_jobs)
+        return False
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'organization', 'status', 'progress', 'imported', 'failed', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    list_select_related = ('user', 'organization')
+    search_fields = ('user__email', 'organization__name')
+    ordering = ('-created_at',)
+    exclude = ('manifest',)
+    readonly_fields = (
+        'id', 'user', 'organization', 'status', 'source_root', 'total', 'next_index', 'imported', 'failed',
+        'bytes_imported', 'errors', 'error', 'created_at', 'started_at', 'finished_at', 'updated_at',
+    )
+
+    def get_queryset(self, request: HttpRequest) -> QuerySet[ImportJob]:
+        # O manifesto pode ter dezenas de milhares de itens
+        return super().get_queryset(request).defer('manifest')
+
+    def progress(self, obj: ImportJob) -> str:
+        return f"{obj.next_index}/{obj.total}"
+    progress.short_description = 'Progresso'
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        # Jobs são criados pelo ImportService (API ou import_documents)
+        return False
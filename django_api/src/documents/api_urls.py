@@ -0,0 +1,25 @@
+from django.urls import path
+
+from .views import (
+    DocumentChunkListView,
+    DocumentDetailView,
+    DocumentDownloadView,
+    DocumentImportDetailView,
+    DocumentImportView,
+    DocumentListView,
+    DocumentUploadCompleteView,
+    DocumentUploadView,
+)
+
+app_name = "documents"
+
+urlpatterns = [
+    path("", DocumentListView.as_view(), name="list"),
+    path("uploads/", DocumentUploadView.as_view(), name="uploads"),
+    path("imports/", DocumentImportView.as_view(), name="imports"),
+    path("imports/<uuid:job_id>/", DocumentImportDetailView.as_view(), name="import-detail"),
+    path("<uuid:document_id>/", DocumentDetailView.as_view(), name="detail"),
+    path("<uuid:document_id>/download/", DocumentDownloadView.as_view(), name="download"),
+    path("<uuid:document_id>/upload/complete/", DocumentUploadCompleteView.as_view(), name="upload-complete"),
+    path("<uuid:document_id>/chunks/", DocumentChunkListView.as_view(), name="chunks"),
+]
@@ -0,0 +1,238 @@
+import logging
+import math
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import ProtectedError, RestrictedError
+from django.utils import timezone
+
+from documents.models import DeletionJob, Document, DocumentChunk
+from organizations.models import Organization
+from users.models import User
+from users.repositories import UsageRepository
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+TARGET_MODELS: dict[str, type[models.Model]] = {
+    DeletionJob.TargetChoices.DOCUMENT: Document,
+    DeletionJob.TargetChoices.USER: User,
+    DeletionJob.TargetChoices.ORGANIZATION: Organization,
+}
+
+
+class DeletionService:
+    """
+    Exclusão em lotes de documentos e tenants (usuário ou organização).
+
+    O ``delete()`` do Django carrega na memória cada linha relacionada antes
+    de excluir (Collector) e faz tudo numa transação só: com milhões de
+    chunks isso estoura a memória do worker e segura locks por minutos. Aqui
+    cada lote é um DELETE curto por ids, com pausa entre lotes
+    (DELETION['PAUSE_SECONDS']) para não saturar o banco:
+
+    1. chunks de cada documento, depois o arquivo no storage e o documento,
+       descontando o tamanho de Usage.storage_used_mb do dono
+       (UsageRepository.adjust_storage);
+    2. para tenants, as demais tabelas que apontam para ele (descobertas pelo
+       ``_meta``), conforme o ``on_delete`` de cada FK: CASCADE é excluído e
+       SET_NULL, SET_DEFAULT e SET(...) desvinculados, em lotes; DO_NOTHING
+       fica a cargo do banco; PROTECT e RESTRICT com linhas impedem o job
+       (conferido antes de excluir qualquer coisa);
+    3. por fim a própria linha do tenant, já sem dependentes grandes.
+
+    O progresso fica no DeletionJob a cada lote; um job interrompido pode
+    ser executado de novo e continua do que falta.
+    """
+
+    @staticmethod
+    def request(target_type: str, target_id: UUID | str, requested_by: User | None = None) -> DeletionJob:
+        """
+        Agenda a exclusão. Documentos saem na hora das listagens e da busca
+        (status DELETING); o trabalho pesado fica para run_deletion_jobs.
+        """
+        with transaction.atomic():
+            if target_type == DeletionJob.TargetChoices.DOCUMENT:
+                Document.objects.filter(id=target_id).update(status=Document.StatusChoices.DELETING)
+            return DeletionJob.objects.create(
+                target_type=target_type, target_id=target_id, requested_by=requested_by,
+            )
+
+    @staticmethod
+    def claim_next() -> DeletionJob | None:
+        """Pega o próximo job pendente, sem disputar com outros workers"""
+        with transaction.atomic():
+            job = (
+                DeletionJob.objects.select_for_update(skip_locked=True)
+                .filter(status=DeletionJob.StatusChoices.PENDING)
+                .order_by("created_at")
+                .first()
+            )
+            if job is not None:
+                job.status = DeletionJob.StatusChoices.RUNNING
+                job.started_at = timezone.now()
+                job.save(update_fields=["status", "started_at", "updated_at"])
+            return job
+
+    @staticmethod
+    def run(job: DeletionJob) -> DeletionJob:
+        """Executa o job até o fim; erros marcam FAILED e são registrados em log"""
+        runner = _DeletionRunner(job)
+        try:
+            runner.run()
+        except Exception as err:
+            logger.exception("Falha na exclusão %s", job.id)
+            job.status = DeletionJob.StatusChoices.FAILED
+            job.error = str(err)
+        else:
+            job.status = DeletionJob.StatusChoices.COMPLETED
+            job.error = ""
+        job.finished_at = timezone.now()
+        # update_fields: requested_by pode ter sido anulado pela exclusão do próprio usuário
+        job.save(update_fields=[
+            "status", "error", "finished_at", "documents_deleted", "chunks_deleted",
+            "bytes_freed", "progress", "updated_at",
+        ])
+        return job
+
+
+class _DeletionRunner:
+    """Estado de uma execução de DeletionService.run()"""
+
+    def __init__(self, job: DeletionJob) -> None:
+        config = settings.DELETION
+        self.job = job
+        self.batch_size = config["BATCH_SIZE"]
+        self.document_batch_size = config["DOCUMENT_BATCH_SIZE"]
+        self.pause = config["PAUSE_SECONDS"]
+        self.storage = Document._meta.get_field("file_key").storage
+
+    def run(self) -> None:
+        job = self.job
+        target = TARGET_MODELS[job.target_type]
+        if target is Document:
+            self._delete_documents(Document.objects.filter(id=job.target_id))
+            return
+
+        field = "user_id" if target is User else "organization_id"
+        relations = [relation for relation in target._meta.related_objects if relation.related_model is not Document]
+        for relation in relations:
+            self._check_protected(relation, job.target_id)
+        self._delete_documents(Document.objects.filter(**{field: job.target_id}))
+        for relation in relations:
+            self._purge_relation(relation, job.target_id)
+        target._base_manager.filter(pk=job.target_id).delete()
+        self._count(target, 1)
+
+    def _delete_documents(self, documents: models.QuerySet) -> None:
+        while True:
+            batch = list(
+                documents.values_list("id", "user_id", "organization_id", "file_key", "size_bytes")
+                [:self.document_batch_size]
+            )
+            if not batch:
+                return
+            freed: dict[tuple[UUID | None, UUID | None], int] = defaultdict(int)
+            for document_id, user_id, organization_id, file_key, size_bytes in batch:
+                self._delete_chunks(document_id)
+                size = self._delete_file(file_key, size_bytes)
+                freed[(None if organization_id else user_id, organization_id)] += size
+                self.job.bytes_freed += size
+
+            with transaction.atomic():
+                Document.objects.filter(id__in=[row[0] for row in batch]).delete()
+                # Arredondado para cima em MB, como na importação
+                for (user_id, organization_id), size in freed.items():
+                    UsageRepository.adjust_storage(user_id, organization_id, -math.ceil(size / MB))
+            self.job.documents_deleted += len(batch)
+            self._count(Document, len(batch))
+
+    def _delete_chunks(self, document_id: UUID) -> None:
+        chunks = DocumentChunk.objects.filter(document_id=document_id)
+        while True:
+            ids = list(chunks.values_list("id", flat=True)[:self.batch_size])
+            if not ids:
+                return
+            # Sem relações nem signals: fast delete, um DELETE ... WHERE id IN (...)
+            DocumentChunk.objects.filter(id__in=ids).delete()
+            self.job.chunks_deleted += len(ids)
+            self._count(DocumentChunk, len(ids))
+
+    def _delete_file(self, file_key: str, size_bytes: int) -> int:
+        """Remove o arquivo do storage; devolve o tamanho liberado (bytes)"""
+        if not file_key:
+            return size_bytes
+        if not size_bytes and self.storage.exists(file_key):
+            size_bytes = self.storage.size(file_key)
+        self.storage.delete(file_key)
+        return size_bytes
+
+    def _check_protected(self, relation: models.ForeignObjectRel, target_id: UUID) -> None:
+        """
+        Raises:
+            ProtectedError, RestrictedError: Se a FK é PROTECT/RESTRICT e ainda
+                há linhas apontando para o alvo
+        """
+        if relation.on_delete not in (models.PROTECT, models.RESTRICT):
+            return
+        rows = list(relation.related_model._base_manager.filter(**{relation.field.name: target_id})[:self.batch_size])
+        if not rows:
+            return
+        msg = (
+            f"{relation.related_model._meta.db_table}.{relation.field.column} ainda referencia "
+            f"{target_id} ({relation.on_delete.__name__})"
+        )
+        if relation.on_delete is models.PROTECT:
+            raise ProtectedError(msg, set(rows))
+        raise RestrictedError(msg, set(rows))
+
+    def _purge_relation(self, relation: models.ForeignObjectRel, target_id: UUID) -> None:
+        model = relation.related_model
+        field = relation.field
+        on_delete = relation.on_delete
+        if on_delete is models.DO_NOTHING:
+            # Como no delete() do Django: a constraint do banco decide
+            return
+        # Linhas criadas depois da conferência inicial
+        self._check_protected(relation, target_id)
+
+        if on_delete is models.SET_NULL:
+            values = {field.name: None}
+        elif on_delete is models.SET_DEFAULT:
+            values = {field.name: field.get_default()}
+        elif hasattr(on_delete, "deconstruct"):
+            # models.SET(valor ou função)
+            value = on_delete.deconstruct()[1][0]
+            values = {field.name: value() if callable(value) else value}
+        else:
+            values = None
+
+        rows = model._base_manager.filter(**{field.name: target_id})
+        while True:
+            ids = list(rows.values_list("pk", flat=True)[:self.batch_size])
+            if not ids:
+                return
+            batch = model._base_manager.filter(pk__in=ids)
+            if values is not None:
+                batch.update(**values)
+            else:
+                # CASCADE: dependentes do lote (se houver) vão junto, no mesmo delete()
+                batch.delete()
+            self._count(model, len(ids))
+
+    def _count(self, model: type[models.Model], rows: int) -> None:
+        """Registra o progresso do lote e pausa antes do próximo"""
+        progress = self.job.progress
+        progress[model._meta.db_table] = progress.get(model._meta.db_table, 0) + rows
+        self.job.save(update_fields=[
+            "documents_deleted", "chunks_deleted", "bytes_freed", "progress", "updated_at",
+        ])
+        if self.pause:
+            time.sleep(self.pause)
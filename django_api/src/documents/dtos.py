@@ -0,0 +1,51 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from core.dtos import DTO
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+
+@dataclass(frozen=True, slots=True)
+class UploadSession(DTO):
+    """Upload multipart iniciado: o cliente envia cada parte com PUT na URL dela"""
+    document_id: UUID
+    upload_id: str
+    part_size: int
+    parts: list[dict[str, Any]]
+    expires_in: int
+
+
+@dataclass(frozen=True, slots=True)
+class ChunkSearchHit(DTO):
+    """Trecho recuperado pela busca vetorial"""
+    chunk_id: UUID
+    document_id: UUID
+    document_title: str
+    chunk_index: int
+    text: str
+    score: float
+
+    def to_citation(self) -> dict[str, Any]:
+        """Formato gravado em QueryLog.citations"""
+        return {
+            "document_id": str(self.document_id),
+            "document_title": self.document_title,
+            "chunk_id": str(self.chunk_id),
+            "chunk_index": self.chunk_index,
+            "score": round(self.score, 4),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class VectorIndexStatus(DTO):
+    """Estado do índice ANN de DocumentChunk.embedding (documents.vector_index)"""
+    exists: bool
+    valid: bool
+    rows: int
+    dead_ratio: float
+    method: str = ""
+    size_bytes: int = 0
+    params: dict[str, int] = field(default_factory=dict)
+    built_rows: int = 0
@@ -0,0 +1,67 @@
+from rest_framework import status
+
+from users import exceptions
+
+
+class DocumentNotFoundException(exceptions.BaseException):
+    """Exception raised when a document does not exist or is not visible to the user."""
+
+    def __init__(self, message: str | None = None, document_id: str | None = None) -> None:
+        if message is None:
+            message = f"Document with ID {document_id} not found." if document_id else "Document not found."
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_404_NOT_FOUND,
+            error_code="document_not_found",
+        )
+
+
+class UploadNotPendingException(exceptions.BaseException):
+    """Exception raised when completing an upload for a document that is not awaiting one."""
+
+    def __init__(self, message: str | None = None, document_id: str | None = None) -> None:
+        if message is None:
+            message = (
+                f"Document {document_id} is not awaiting an upload."
+                if document_id else "Document is not awaiting an upload."
+            )
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_409_CONFLICT,
+            error_code="upload_not_pending",
+        )
+
+
+class UploadVerificationException(exceptions.BaseException):
+    """Exception raised when an uploaded file does not match its parts or declared size."""
+
+    def __init__(self, message: str = "Uploaded file could not be verified.") -> None:
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_400_BAD_REQUEST,
+            error_code="upload_verification_failed",
+        )
+
+
+class ImportJobNotFoundException(exceptions.BaseException):
+    """Exception raised when an import job does not exist or belongs to another user."""
+
+    def __init__(self, message: str | None = None, job_id: str | None = None) -> None:
+        if message is None:
+            message = f"Import job with ID {job_id} not found." if job_id else "Import job not found."
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_404_NOT_FOUND,
+            error_code="import_job_not_found",
+        )
+
+
+class DocumentImportDisabledException(exceptions.BaseException):
+    """Exception raised when bulk import is requested but DOCUMENT_IMPORT['ROOT'] is not configured."""
+
+    def __init__(self, message: str = "Bulk document import is not enabled.") -> None:
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_400_BAD_REQUEST,
+            error_code="document_import_disabled",
+        )
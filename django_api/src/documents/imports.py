@@ -0,0 +1,294 @@
+import csv
+import json
+import logging
+import math
+import mimetypes
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.core.files import File
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils import timezone
+
+from documents.exceptions import (
+    DocumentImportDisabledException,
+    ImportJobNotFoundException,
+)
+from documents.models import Document, ImportJob
+from organizations.cache import has_role
+from organizations.exceptions import OrganizationAccessDeniedException
+from organizations.models import OrganizationMember
+from users.repositories import UsageRepository
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from users.models import User
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+# Falhas guardadas no job; as demais só contam em ``failed``
+MAX_RECORDED_ERRORS = 100
+
+
+def read_manifest(path: Path) -> list[dict[str, Any]]:
+    """
+    Lê um manifesto .csv (colunas path, title, mime_type), .jsonl (um objeto
+    por linha) ou .json (lista de objetos).
+
+    Raises:
+        ValueError: Se o formato não é suportado ou falta ``path`` num item
+    """
+    if path.suffix == ".csv":
+        with path.open(newline="", encoding="utf-8") as file:
+            items = [dict(row) for row in csv.DictReader(file)]
+    elif path.suffix == ".jsonl":
+        with path.open(encoding="utf-8") as file:
+            items = [json.loads(line) for line in file if line.strip()]
+    elif path.suffix == ".json":
+        items = json.loads(path.read_text(encoding="utf-8"))
+    else:
+        msg = f"Manifesto não suportado: {path.name} (use .csv, .jsonl ou .json)"
+        raise ValueError(msg)
+    for number, item in enumerate(items, start=1):
+        if not isinstance(item, dict) or not item.get("path"):
+            msg = f"Item {number} do manifesto sem 'path'"
+            raise ValueError(msg)
+    return items
+
+
+def scan_directory(root: Path) -> list[dict[str, Any]]:
+    """Itens de importação para todos os arquivos do diretório (recursivo, sem ocultos)"""
+    return [
+        {"path": str(path.relative_to(root))}
+        for path in sorted(root.rglob("*"))
+        if path.is_file() and not any(part.startswith(".") for part in path.relative_to(root).parts)
+    ]
+
+
+class ImportService:
+    """
+    Importação em lote de documentos (onboarding de organizações).
+
+    Cada lote de DOCUMENT_IMPORT['BATCH_SIZE'] itens:
+
+    1. envia os arquivos ao storage em paralelo (UPLOAD_CONCURRENCY threads,
+       em streaming, sem carregar o arquivo inteiro na memória);
+    2. cria os Documents num único INSERT já como UPLOADED, ou seja, na fila
+       da ingestão (documents.ingestion), que começa a processar o lote
+       enquanto os próximos são enviados;
+    3. soma o uso em Usage e grava o checkpoint (``next_index``) na mesma
+       transação do INSERT.
+
+    Ids e chaves no storage são derivados do job e da posição no manifesto,
+    então retomar um job interrompido não duplica documentos nem reenvia
+    arquivos que já estão no storage.
+    """
+
+    @staticmethod
+    def request_import(
+        user: User,
+        items: list[dict[str, Any]],
+        organization_id: uuid.UUID | str | None = None,
+    ) -> ImportJob:
+        """
+        Agenda a importação pela API; os caminhos são relativos ao
+        diretório do tenant, ``DOCUMENT_IMPORT['ROOT']/<organization_id ou
+        user_id>/`` (staff: a raiz inteira). Em organizações exige papel
+        ADMIN/OWNER.
+
+        Raises:
+            DocumentImportDisabledException: Se DOCUMENT_IMPORT['ROOT'] não está configurado
+                ou o tenant não tem diretório de importação
+            OrganizationAccessDeniedException: Se o usuário não é ADMIN da organização
+        """
+        root = settings.DOCUMENT_IMPORT["ROOT"]
+        if not root:
+            raise DocumentImportDisabledException
+        if (
+            organization_id is not None
+            and not user.is_staff
+            and not has_role(user, organization_id, OrganizationMember.RoleChoices.ADMIN)
+        ):
+            raise OrganizationAccessDeniedException(organization_id=str(organization_id))
+        source_root = ImportService.tenant_root(Path(root), user, organization_id)
+        return ImportService.create_job(user.id, items, source_root, organization_id)
+
+    @staticmethod
+    def tenant_root(root: Path, user: User, organization_id: uuid.UUID | str | None = None) -> Path:
+        """
+        Diretório de origem do tenant dentro de ``root``, já com symlinks e
+        ``..`` resolvidos: a raiz é compartilhada, e um tenant não pode ler
+        os arquivos de outro. Os caminhos do manifesto são verificados contra
+        ele de novo na execução (_ImportRunner._upload).
+
+        Raises:
+            DocumentImportDisabledException: Se o diretório não existe ou
+                resolve para fora de ``root``
+        """
+        root = root.resolve()
+        if user.is_staff:
+            return root
+        tenant = (root / str(organization_id or user.id)).resolve()
+        if tenant == root or not tenant.is_relative_to(root) or not tenant.is_dir():
+            msg = "Bulk document import is not enabled for this account."
+            raise DocumentImportDisabledException(msg)
+        return tenant
+
+    @staticmethod
+    def get_job(user: User, job_id: uuid.UUID | str) -> ImportJob:
+        """
+        Raises:
+            ImportJobNotFoundException: Se o job não existe ou é de outro usuário
+        """
+        jobs = ImportJob.objects.defer("manifest")
+        if not user.is_staff:
+            jobs = jobs.filter(user=user)
+        job = jobs.filter(id=job_id).first()
+        if job is None:
+            raise ImportJobNotFoundException(job_id=str(job_id))
+        return job
+
+    @staticmethod
+    def create_job(
+        user_id: uuid.UUID | str,
+        items: list[dict[str, Any]],
+        source_root: Path | str,
+        organization_id: uuid.UUID | str | None = None,
+        using: str = DEFAULT_DB_ALIAS,
+    ) -> ImportJob:
+        return ImportJob.objects.using(using).create(
+            user_id=user_id,
+            organization_id=organization_id,
+            source_root=str(source_root),
+            manifest=items,
+            total=len(items),
+        )
+
+    @staticmethod
+    def claim_next(using: str = DEFAULT_DB_ALIAS) -> ImportJob | None:
+        """Pega o próximo job pendente, sem disputar com outros workers"""
+        with transaction.atomic(using=using):
+            job = (
+                ImportJob.objects.using(using)
+                .select_for_update(skip_locked=True)
+                .filter(status=ImportJob.StatusChoices.PENDING)
+                .order_by("created_at")
+                .first()
+            )
+            if job is not None:
+                ImportService._mark_running(job, using)
+            return job
+
+    @staticmethod
+    def run(job: ImportJob, using: str = DEFAULT_DB_ALIAS) -> ImportJob:
+        """Executa (ou retoma) o job até o fim; erros do job marcam FAILED"""
+        if job.status != ImportJob.StatusChoices.RUNNING:
+            ImportService._mark_running(job, using)
+        try:
+            _ImportRunner(job, using).run()
+        except Exception as err:
+            logger.exception("Falha na importação %s", job.id)
+            job.status = ImportJob.StatusChoices.FAILED
+            job.error = str(err)
+        else:
+            job.status = ImportJob.StatusChoices.COMPLETED
+            job.error = ""
+        job.finished_at = timezone.now()
+        job.save(using=using, update_fields=["status", "error", "finished_at", "updated_at"])
+        return job
+
+    @staticmethod
+    def _mark_running(job: ImportJob, using: str) -> None:
+        job.status = ImportJob.StatusChoices.RUNNING
+        job.started_at = job.started_at or timezone.now()
+        job.save(using=using, update_fields=["status", "started_at", "updated_at"])
+
+
+class _ImportRunner:
+    """Estado de uma execução de ImportService.run()"""
+
+    def __init__(self, job: ImportJob, using: str) -> None:
+        self.job = job
+        self.using = using
+        self.root = Path(job.source_root).resolve()
+        self.storage = Document._meta.get_field("file_key").storage
+        self.scope = Document.ScopeChoices.ORGANIZATION if job.organization_id else Document.ScopeChoices.USER
+
+    def run(self) -> None:
+        config = settings.DOCUMENT_IMPORT
+        with ThreadPoolExecutor(max_workers=config["UPLOAD_CONCURRENCY"]) as executor:
+            for start, items in self._batches(config["BATCH_SIZE"]):
+                results = list(executor.map(self._upload, range(start, start + len(items)), items))
+                self._commit(start + len(items), results)
+
+    def _batches(self, size: int) -> Iterator[tuple[int, list[dict[str, Any]]]]:
+        manifest = self.job.manifest
+        for start in range(self.job.next_index, len(manifest), size):
+            yield start, manifest[start:start + size]
+
+    def _source_path(self, item: dict[str, Any]) -> Path:
+        """Caminho do arquivo, que precisa ficar dentro do diretório de importação"""
+        path = (self.root / item["path"]).resolve()
+        if not path.is_relative_to(self.root):
+            msg = "Caminho fora do diretório de importação"
+            raise ValueError(msg)
+        return path
+
+    def _upload(self, index: int, item: dict[str, Any]) -> Document | tuple[int, str, str]:
+        """Envia um arquivo; devolve o Document (não salvo) ou (índice, caminho, erro)"""
+        try:
+            path = self._source_path(item)
+            document_id = uuid.uuid5(self.job.id, str(index))
+            key = self.storage.generate_filename(f"documents/{document_id}/{path.name}")
+            if self.storage.exists(key):
+                size = self.storage.size(key)
+            else:
+                with path.open("rb") as file:
+                    key = self.storage.save(key, File(file, name=path.name))
+                size = path.stat().st_size
+        except (OSError, ValueError) as err:
+            return index, str(item.get("path")), str(err)
+
+        return Document(
+            id=document_id,
+            user_id=self.job.user_id,
+            organization_id=self.job.organization_id,
+            scope=self.scope,
+            title=(item.get("title") or path.stem)[:255],
+            file_key=key,
+            mime_type=item.get("mime_type") or mimetypes.guess_type(path.name)[0] or "application/octet-stream",
+            size_bytes=size,
+            status=Document.StatusChoices.UPLOADED,
+            metadata={"import_job": str(self.job.id), "source_path": str(item["path"])},
+        )
+
+    def _commit(self, next_index: int, results: list[Document | tuple[int, str, str]]) -> None:
+        job = self.job
+        documents = [result for result in results if isinstance(result, Document)]
+        for result in results:
+            if not isinstance(result, Document):
+                index, path, error = result
+                job.failed += 1
+                if len(job.errors) < MAX_RECORDED_ERRORS:
+                    job.errors.append({"index": index, "path": path, "error": error})
+
+        size = sum(document.size_bytes for document in documents)
+        with transaction.atomic(using=self.using):
+            # ignore_conflicts: ao retomar, documentos do lote já criados ficam como estão
+            Document.objects.using(self.using).bulk_create(documents, ignore_conflicts=True)
+            if documents:
+                UsageRepository.adjust_storage(
+                    job.user_id, job.organization_id, math.ceil(size / MB),
+                    documents_uploaded=len(documents), using=self.using,
+                )
+            job.imported += len(documents)
+            job.bytes_imported += size
+            job.next_index = next_index
+            job.save(using=self.using, update_fields=[
+                "imported", "failed", "bytes_imported", "errors", "next_index", "updated_at",
+            ])
@@ -0,0 +1,232 @@
+import hashlib
+import logging
+import re
+from datetime import timedelta
+from typing import TYPE_CHECKING, BinaryIO
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from core.profiling import span
+from core.storage import get_object_storage
+from documents.models import ChunkMetadata, Document, DocumentChunk
+from documents.vectors import format_embedding
+from queries.clients import get_embedding_client
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from uuid import UUID
+
+try:
+    import pypdf
+except ImportError:  # extra opcional 'pdf'
+    pypdf = None
+
+logger = logging.getLogger(__name__)
+
+TEXT_MIME_TYPES = {"application/json", "application/xml", "application/csv"}
+HTML_MIME_TYPES = {"text/html", "application/xhtml+xml"}
+PDF_MIME_TYPE = "application/pdf"
+
+_WHITESPACE_RE = re.compile(r"[ \t\r\f\v]+")
+
+
+def extract_pages(file: BinaryIO, mime_type: str) -> list[tuple[int | None, str]]:
+    """
+    Texto do arquivo como [(página, texto)]; página é None fora de PDFs.
+    PDFs são lidos com seek (no S3, só os intervalos que o pypdf pede).
+
+    Raises:
+        ValueError: Se o tipo não é suportado (ou é PDF sem o extra 'pdf')
+    """
+    if mime_type == PDF_MIME_TYPE:
+        if pypdf is None:
+            msg = "Extração de PDF requer pypdf (pip install django_api[pdf])"
+            raise ValueError(msg)
+        reader = pypdf.PdfReader(file)
+        return [(number, page.extract_text() or "") for number, page in enumerate(reader.pages, start=1)]
+    text = file.read().decode("utf-8", errors="replace")
+    if mime_type in HTML_MIME_TYPES:
+        return [(None, strip_tags(text))]
+    if mime_type.startswith("text/") or mime_type in TEXT_MIME_TYPES:
+        return [(None, text)]
+    msg = f"Tipo de arquivo não suportado: {mime_type}"
+    raise ValueError(msg)
+
+
+def chunk_text(text: str, size: int, overlap: int) -> list[tuple[int, int]]:
+    """
+    Divide ``text`` em trechos de até ``size`` caracteres com ``overlap`` de
+    sobreposição, cortando no último espaço antes do limite quando houver.
+    Devolve os intervalos (início, fim).
+    """
+    spans = []
+    start, length = 0, len(text)
+    while start < length:
+        end = min(start + size, length)
+        if end < length:
+            cut = text.rfind(" ", start + size // 2, end)
+            if cut != -1:
+                end = cut
+        if text[start:end].strip():
+            spans.append((start, end))
+        if end >= length:
+            break
+        start = max(end - overlap, start + 1)
+    return spans
+
+
+def _verify_sha256(document: Document, expected: str) -> None:
+    """
+    Confere o SHA-256 informado no upload direto (documents.uploads): o
+    arquivo não passou pela API, então a conferência fica com o worker.
+
+    Raises:
+        ValueError: Se o hash não confere
+    """
+    digest = hashlib.sha256()
+    for chunk in get_object_storage(document.file_key.storage).iter_chunks(document.file_key.name):
+        digest.update(chunk)
+    if digest.hexdigest() != expected.lower():
+        msg = "SHA-256 do arquivo não confere com o informado no upload"
+        raise ValueError(msg)
+
+
+class IngestionService:
+    """
+    Ingestão de documentos: extração do texto, chunking, embeddings e
+    gravação dos DocumentChunk.
+
+    A fila é o próprio status: documentos UPLOADED estão pendentes. Workers
+    (manage.py run_ingestion) pegam lotes com SKIP LOCKED, marcam PROCESSING
+    e terminam em INDEXED ou FAILED (erro em metadata['ingestion_error']).
+    A posse vale por INGESTION['LEASE_SECONDS'] (``claimed_at``): depois
+    disso o documento volta a ser pego, e o resultado do worker antigo é
+    descartado.
+    As etapas são medidas com core.profiling.span (extract, chunk,
+    embedding, persist).
+    """
+
+    @staticmethod
+    def enqueue(document_ids: Iterable[UUID | str], using: str = DEFAULT_DB_ALIAS) -> int:
+        """
+        Coloca os documentos na fila (UPLOADED); devolve quantos entraram.
+        Os que aguardam upload ou estão sendo excluídos ficam de fora.
+        """
+        return (
+            Document.objects.using(using)
+            .filter(id__in=list(document_ids))
+            .exclude(status__in=[Document.StatusChoices.DELETING, Document.StatusChoices.PENDING_UPLOAD])
+            .update(status=Document.StatusChoices.UPLOADED)
+        )
+
+    @staticmethod
+    def claim(limit: int, using: str = DEFAULT_DB_ALIAS) -> list[UUID]:
+        """
+        Pega até ``limit`` documentos pendentes, sem disputar com outros
+        workers; inclui os em PROCESSING com a posse vencida.
+        """
+        now = timezone.now()
+        expired = now - timedelta(seconds=settings.INGESTION["LEASE_SECONDS"])
+        with transaction.atomic(using=using):
+            ids = list(
+                Document.objects.using(using)
+                .select_for_update(skip_locked=True)
+                .filter(
+                    Q(status=Document.StatusChoices.UPLOADED)
+                    | Q(status=Document.StatusChoices.PROCESSING, claimed_at__lt=expired),
+                )
+                .order_by("created_at")
+                .values_list("id", flat=True)[:limit]
+            )
+            Document.objects.using(using).filter(id__in=ids).update(
+                status=Document.StatusChoices.PROCESSING, claimed_at=now,
+            )
+        return ids
+
+    @staticmethod
+    def ingest(document_id: UUID | str, using: str = DEFAULT_DB_ALIAS) -> int:
+        """
+        Processa um documento e devolve quantos chunks foram gravados.
+        Falhas marcam o documento como FAILED e devolvem 0; documentos
+        removidos depois do claim são ignorados.
+        """
+        document = Document.objects.using(using).filter(id=document_id).first()
+        if document is None:
+            return 0
+        # Só termina se ninguém mudou o status no meio (ex.: exclusão pedida)
+        # nem pegou o documento de novo depois de vencida a posse
+        pending = Document.objects.using(using).filter(
+            id=document.id,
+            status__in=[Document.StatusChoices.UPLOADED, Document.StatusChoices.PROCESSING],
+            claimed_at=document.claimed_at,
+        )
+        metadata = {key: value for key, value in document.metadata.items() if key != "ingestion_error"}
+        try:
+            chunks = IngestionService._build_chunks(document)
+        except Exception as err:
+            logger.exception("Falha na ingestão do documento %s", document.id)
+            pending.update(
+                status=Document.StatusChoices.FAILED,
+                metadata={**metadata, "ingestion_error": str(err)},
+                updated_at=timezone.now(),
+            )
+            return 0
+
+        with span("persist"), transaction.atomic(using=using):
+            if not pending.update(status=Document.StatusChoices.INDEXED, metadata=metadata, updated_at=timezone.now()):
+                return 0
+            # Reprocessar substitui os chunks anteriores
+            DocumentChunk.objects.using(using).filter(document_id=document.id).delete()
+            DocumentChunk.objects.using(using).bulk_create(chunks, batch_size=settings.INGESTION["INSERT_BATCH_SIZE"])
+        return len(chunks)
+
+    @staticmethod
+    def run_pending(limit: int | None = None, using: str = DEFAULT_DB_ALIAS) -> tuple[int, int]:
+        """Processa um lote da fila; devolve (documentos, chunks)"""
+        ids = IngestionService.claim(limit or settings.INGESTION["BATCH_SIZE"], using)
+        chunks = sum(IngestionService.ingest(document_id, using) for document_id in ids)
+        return len(ids), chunks
+
+    @staticmethod
+    def _build_chunks(document: Document) -> list[DocumentChunk]:
+        config = settings.INGESTION
+        with span("extract"):
+            if expected := document.metadata.get("sha256"):
+                _verify_sha256(document, expected)
+            with document.file_key.open("rb") as file:
+                pages = extract_pages(file, document.mime_type)
+
+        with span("chunk"):
+            texts: list[str] = []
+            metadata: list[ChunkMetadata] = []
+            for page_number, page_text in pages:
+                page_text = _WHITESPACE_RE.sub(" ", page_text)
+                for start, end in chunk_text(page_text, config["CHUNK_SIZE"], config["CHUNK_OVERLAP"]):
+                    texts.append(page_text[start:end].strip())
+                    item: ChunkMetadata = {"char_start": start, "char_end": end}
+                    if page_number is not None:
+                        item["page_number"] = page_number
+                    metadata.append(item)
+
+        client = get_embedding_client()
+        embeddings: list[list[float]] = []
+        batch_size = config["EMBED_BATCH_SIZE"]
+        with span("embedding"):
+            for offset in range(0, len(texts), batch_size):
+                embeddings += async_to_sync(client.embed)(texts[offset:offset + batch_size])
+
+        return [
+            DocumentChunk(
+                document_id=document.id,
+                chunk_index=index,
+                text=text,
+                embedding=format_embedding(embedding),
+                metadata=item,
+            )
+            for index, (text, embedding, item) in enumerate(zip(texts, embeddings, metadata, strict=True))
+        ]
@@ -0,0 +1,93 @@
+import time
+from pathlib import Path
+from typing import TypedDict, Unpack
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from core.db import ingestion_db_alias
+from documents.imports import ImportService, read_manifest, scan_directory
+from documents.models import ImportJob
+from users.models import User
+
+
+class ImportOptions(TypedDict):
+    manifest: Path | None
+    directory: Path | None
+    resume: str | None
+    user: str | None
+    organization: str | None
+    database: str | None
+    watch: float
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa arquivos em lote como Documents (enviados ao storage e postos "
+        "na fila de ingestão). Com --manifest ou --directory cria o job antes; "
+        "--resume retoma um job interrompido; sem eles processa os pendentes."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        source = parser.add_mutually_exclusive_group()
+        source.add_argument("--manifest", type=Path, help="Manifesto .csv, .jsonl ou .json (caminhos relativos a ele).")
+        source.add_argument("--directory", type=Path, help="Importa todos os arquivos do diretório.")
+        source.add_argument("--resume", help="Id de um ImportJob a retomar do checkpoint.")
+        parser.add_argument("--user", help="Id ou e-mail do dono dos documentos (obrigatório ao criar o job).")
+        parser.add_argument("--organization", help="Id da organização dos documentos.")
+        parser.add_argument("--database", default=None, help="Alias do banco (padrão: o de ingestão).")
+        parser.add_argument(
+            "--watch",
+            type=float,
+            default=0,
+            help="Segundos entre verificações de novos jobs (0 = processa os pendentes e sai).",
+        )
+
+    def handle(self, *args: object, **options: Unpack[ImportOptions]) -> None:
+        using = options["database"] or ingestion_db_alias()
+
+        if options["resume"]:
+            job = ImportJob.objects.using(using).filter(id=options["resume"]).first()
+            if job is None:
+                msg = f"ImportJob {options['resume']} não encontrado"
+                raise CommandError(msg)
+            self._run(job, using)
+            return
+
+        if options["manifest"] or options["directory"]:
+            self._create(options, using)
+
+        while True:
+            job = ImportService.claim_next(using)
+            if job is None:
+                if not options["watch"]:
+                    return
+                time.sleep(options["watch"])
+                continue
+            self._run(job, using)
+
+    def _create(self, options: ImportOptions, using: str) -> None:
+        if not options["user"]:
+            msg = "--user é obrigatório com --manifest/--directory"
+            raise CommandError(msg)
+        key = "email" if "@" in options["user"] else "id"
+        user = User.objects.using(using).filter(**{key: options["user"]}).first()
+        if user is None:
+            msg = f"Usuário {options['user']} não encontrado"
+            raise CommandError(msg)
+
+        try:
+            if options["manifest"]:
+                root, items = options["manifest"].parent, read_manifest(options["manifest"])
+            else:
+                root, items = options["directory"], scan_directory(options["directory"])
+        except (OSError, ValueError) as err:
+            raise CommandError(str(err)) from err
+
+        job = ImportService.create_job(user.id, items, root.resolve(), options["organization"], using=using)
+        self.stdout.write(f"Agendado: {job}")
+
+    def _run(self, job: ImportJob, using: str) -> None:
+        job = ImportService.run(job, using)
+        self.stdout.write(
+            f"{job}: {job.imported} importados, {job.failed} falhas, {job.bytes_imported} bytes"
+        )
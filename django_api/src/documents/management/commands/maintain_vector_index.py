@@ -0,0 +1,98 @@
+import time
+from typing import TypedDict, Unpack
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from benchmarks.reporting import latency_summary, write_report
+from documents.vector_index import METHODS, RebuildInProgressError, VectorIndexService
+
+ACTIONS = ("auto", "status", "rebuild", "vacuum", "recall")
+
+
+class VectorIndexOptions(TypedDict):
+    action: str
+    method: str | None
+    m: int | None
+    ef_construction: int | None
+    lists: int | None
+    k: int
+    sample: int | None
+    plan: str | None
+    database: str
+    output: str | None
+    watch: float
+
+
+class Command(BaseCommand):
+    help = (
+        "Manutenção do índice ANN (pgvector) dos chunks: 'auto' reconstrói ou "
+        "roda VACUUM quando preciso; 'rebuild' reconstrói online (CREATE INDEX "
+        "CONCURRENTLY + troca); 'recall' mede recall@k contra a busca exata."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("action", nargs="?", default="auto", choices=ACTIONS)
+        parser.add_argument("--method", choices=METHODS, help="Método do índice (padrão: VECTOR_INDEX['METHOD']).")
+        parser.add_argument("--m", type=int, help="HNSW: conexões por nó (padrão: pelo número de linhas).")
+        parser.add_argument("--ef-construction", type=int, help="HNSW: tamanho da lista na construção.")
+        parser.add_argument("--lists", type=int, help="IVFFlat: número de listas.")
+        parser.add_argument("--k", type=int, default=10, help="Vizinhos na medição de recall.")
+        parser.add_argument("--sample", type=int, help="Consultas na medição (padrão: VECTOR_INDEX['RECALL_SAMPLE']).")
+        parser.add_argument("--plan", help="Plano cujos ef_search/probes entram na medição (padrão: FREE).")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS, help="Alias do banco.")
+        parser.add_argument("--output", help="Arquivo JSON de saída.")
+        parser.add_argument(
+            "--watch",
+            type=float,
+            default=0,
+            help="Segundos entre execuções (0 = executa uma vez e sai).",
+        )
+
+    def handle(self, *args: object, **options: Unpack[VectorIndexOptions]) -> None:
+        using = options["database"]
+        if connections[using].vendor != "postgresql":
+            msg = "O índice vetorial requer PostgreSQL com a extensão vector (pgvector)"
+            raise CommandError(msg)
+
+        while True:
+            result = self._run(options, using)
+            self.stdout.write(write_report("vector_index", result, options["output"]))
+            if not options["watch"]:
+                return
+            time.sleep(options["watch"])
+
+    def _run(self, options: VectorIndexOptions, using: str) -> dict:
+        action = options["action"]
+        if action == "status":
+            return {"status": VectorIndexService.status(using).to_dict()}
+        if action == "vacuum":
+            VectorIndexService.vacuum(using)
+            return {"status": VectorIndexService.status(using).to_dict()}
+        if action == "rebuild":
+            params = {
+                key: options[option]
+                for key, option in (("m", "m"), ("ef_construction", "ef_construction"), ("lists", "lists"))
+                if options[option]
+            }
+            try:
+                status = VectorIndexService.rebuild(options["method"], params, using)
+            except RebuildInProgressError as err:
+                raise CommandError(str(err)) from err
+            return {"status": status.to_dict()}
+        if action == "recall":
+            return self._summarize(VectorIndexService.measure_recall(
+                options["k"], options["sample"], options["plan"], using,
+            ))
+        result = VectorIndexService.maintain(using)
+        if result["recall"]:
+            result["recall"] = self._summarize(result["recall"])
+        return result
+
+    @staticmethod
+    def _summarize(recall: dict) -> dict:
+        return {
+            **recall,
+            "ann_ms": latency_summary(recall["ann_ms"]),
+            "exact_ms": latency_summary(recall["exact_ms"]),
+        }
@@ -0,0 +1,56 @@
+import time
+from typing import TypedDict, Unpack
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from documents.deletion import DeletionService
+from documents.models import DeletionJob
+
+
+class DeletionJobsOptions(TypedDict):
+    user: str | None
+    organization: str | None
+    document: str | None
+    watch: float
+
+
+class Command(BaseCommand):
+    help = (
+        "Executa as exclusões em lote pendentes (DeletionJob). Com --user, "
+        "--organization ou --document agenda a exclusão antes."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        target = parser.add_mutually_exclusive_group()
+        target.add_argument("--user", help="Id do usuário a excluir com todos os dados.")
+        target.add_argument("--organization", help="Id da organização a excluir com todos os dados.")
+        target.add_argument("--document", help="Id do documento a excluir.")
+        parser.add_argument(
+            "--watch",
+            type=float,
+            default=0,
+            help="Segundos entre verificações de novos jobs (0 = processa os pendentes e sai).",
+        )
+
+    def handle(self, *args: object, **options: Unpack[DeletionJobsOptions]) -> None:
+        for target_type, key in (
+            (DeletionJob.TargetChoices.USER, "user"),
+            (DeletionJob.TargetChoices.ORGANIZATION, "organization"),
+            (DeletionJob.TargetChoices.DOCUMENT, "document"),
+        ):
+            if options[key]:
+                job = DeletionService.request(target_type, options[key])
+                self.stdout.write(f"Agendado: {job}")
+
+        while True:
+            job = DeletionService.claim_next()
+            if job is None:
+                if not options["watch"]:
+                    return
+                time.sleep(options["watch"])
+                continue
+            job = DeletionService.run(job)
+            self.stdout.write(
+                f"{job}: {job.documents_deleted} documentos, {job.chunks_deleted} chunks, "
+                f"{job.bytes_freed} bytes"
+            )
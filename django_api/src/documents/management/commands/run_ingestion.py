@@ -0,0 +1,41 @@
+import time
+from typing import TypedDict, Unpack
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from core.db import ingestion_db_alias
+from documents.ingestion import IngestionService
+
+
+class IngestionOptions(TypedDict):
+    batch_size: int | None
+    database: str | None
+    watch: float
+
+
+class Command(BaseCommand):
+    help = (
+        "Processa a fila de ingestão: documentos UPLOADED viram chunks com "
+        "embeddings (INDEXED) ou FAILED."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=None, help="Documentos por lote (padrão: INGESTION['BATCH_SIZE']).")
+        parser.add_argument("--database", default=None, help="Alias do banco (padrão: o de ingestão).")
+        parser.add_argument(
+            "--watch",
+            type=float,
+            default=0,
+            help="Segundos entre verificações da fila vazia (0 = esvazia a fila e sai).",
+        )
+
+    def handle(self, *args: object, **options: Unpack[IngestionOptions]) -> None:
+        using = options["database"] or ingestion_db_alias()
+        while True:
+            documents, chunks = IngestionService.run_pending(options["batch_size"], using)
+            if documents:
+                self.stdout.write(f"{documents} documentos processados, {chunks} chunks")
+                continue
+            if not options["watch"]:
+                return
+            time.sleep(options["watch"])
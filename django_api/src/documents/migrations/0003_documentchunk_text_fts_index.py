@@ -0,0 +1,33 @@
+from django.db import migrations
+
+INDEX_NAME = 'document_chunks_text_fts'
+
+
+def create_index(apps, schema_editor):
+    # Índice GIN de expressão, só no PostgreSQL; CONCURRENTLY para não
+    # bloquear escritas em tabelas grandes
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{INDEX_NAME}" ON "document_chunks" '
+        "USING gin (to_tsvector('simple'::regconfig, \"text\"))"
+    )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{INDEX_NAME}"')
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('documents', '0002_alter_document_scope_alter_document_status'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
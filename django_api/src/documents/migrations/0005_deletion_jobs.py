@@ -0,0 +1,52 @@
+# Generated by Django 6.0 on 2026-10-19 01:51
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0004_document_listing_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='size_bytes',
+            field=models.BigIntegerField(default=0, help_text='Tamanho do arquivo em bytes (usado no Usage.storage_used_mb).'),
+        ),
+        migrations.AlterField(
+            model_name='document',
+            name='status',
+            field=models.CharField(choices=[('UPLOADED', 'Carregado'), ('PROCESSING', 'Processando'), ('INDEXED', 'Indexado'), ('FAILED', 'Falhou'), ('DELETING', 'Excluindo')], default='UPLOADED', help_text='Status atual do documento no fluxo de processamento.', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='DeletionJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('target_type', models.CharField(choices=[('DOCUMENT', 'Documento'), ('USER', 'Usuário'), ('ORGANIZATION', 'Organização')], max_length=20)),
+                ('target_id', models.UUIDField(help_text='Id do documento, usuário ou organização a excluir.')),
+                ('status', models.CharField(choices=[('PENDING', 'Pendente'), ('RUNNING', 'Em execução'), ('COMPLETED', 'Concluído'), ('FAILED', 'Falhou')], default='PENDING', max_length=20)),
+                ('documents_deleted', models.IntegerField(default=0)),
+                ('chunks_deleted', models.BigIntegerField(default=0)),
+                ('bytes_freed', models.BigIntegerField(default=0)),
+                ('progress', models.JSONField(blank=True, default=dict, help_text='Linhas excluídas (ou desvinculadas) por tabela.')),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Exclusão em Lote',
+                'verbose_name_plural': 'Exclusões em Lote',
+                'db_table': 'deletion_jobs',
+                'indexes': [models.Index(fields=['status', 'created_at'], name='deletion_jo_status_055a2e_idx'), models.Index(fields=['target_type', 'target_id'], name='deletion_jo_target__07e548_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 6.0 on 2026-10-19 01:58
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0005_deletion_jobs'),
+        ('organizations', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('PENDING', 'Pendente'), ('RUNNING', 'Em execução'), ('COMPLETED', 'Concluído'), ('FAILED', 'Falhou')], default='PENDING', max_length=20)),
+                ('source_root', models.CharField(help_text='Diretório base dos caminhos do manifesto.', max_length=1024)),
+                ('manifest', models.JSONField(default=list, help_text='Itens a importar: {path, title?, mime_type?}.')),
+                ('total', models.IntegerField(default=0)),
+                ('next_index', models.IntegerField(default=0, help_text='Próximo item do manifesto a processar.')),
+                ('imported', models.IntegerField(default=0)),
+                ('failed', models.IntegerField(default=0)),
+                ('bytes_imported', models.BigIntegerField(default=0)),
+                ('errors', models.JSONField(blank=True, default=list, help_text='Primeiras falhas por item.')),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('organization', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='import_jobs', to='organizations.organization')),
+                ('user', models.ForeignKey(help_text='Dono dos documentos importados.', on_delete=django.db.models.deletion.CASCADE, related_name='import_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Importação em Lote',
+                'verbose_name_plural': 'Importações em Lote',
+                'db_table': 'import_jobs',
+                'indexes': [models.Index(fields=['status', 'created_at'], name='import_jobs_status_aedc42_idx')],
+            },
+        ),
+    ]
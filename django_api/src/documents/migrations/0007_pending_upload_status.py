@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 02:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0006_import_jobs'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='document',
+            name='status',
+            field=models.CharField(choices=[('PENDING_UPLOAD', 'Aguardando upload'), ('UPLOADED', 'Carregado'), ('PROCESSING', 'Processando'), ('INDEXED', 'Indexado'), ('FAILED', 'Falhou'), ('DELETING', 'Excluindo')], default='UPLOADED', help_text='Status atual do documento no fluxo de processamento.', max_length=20),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 02:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0007_pending_upload_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, help_text="Quando um worker de ingestão pegou o documento (lease de INGESTION['LEASE_SECONDS']).", null=True),
+        ),
+    ]
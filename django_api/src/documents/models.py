@@ -29,10 +29,12 @@ class Document(models.Model):
         USER = "USER", "Usuário"
         ORGANIZATION = "ORGANIZATION", "Organização"
     class StatusChoices(models.TextChoices):
+        PENDING_UPLOAD = "PENDING_UPLOAD", "Aguardando upload"
         UPLOADED = "UPLOADED", "Carregado"
         PROCESSING = "PROCESSING", "Processando"
         INDEXED = "INDEXED", "Indexado"
         FAILED = "FAILED", "Falhou"
+        DELETING = "DELETING", "Excluindo"
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='documents', help_text="Usuário que carregou o documento.")
@@ -42,8 +44,10 @@ class Document(models.Model):
     file_key = models.FileField(upload_to='documents/', help_text="Chave no MinIO onde o documento está armazenado.")
     file_url = models.URLField(max_length=2048, blank=True, help_text="URL acessível publicamente para o documento armazenado.")
     mime_type = models.CharField(max_length=100, help_text="Tipo MIME do documento.", default="application/pdf")
+    size_bytes = models.BigIntegerField(default=0, help_text="Tamanho do arquivo em bytes (usado no Usage.storage_used_mb).")
     status = models.CharField(max_length=20, choices=StatusChoices, default=StatusChoices.UPLOADED, help_text="Status atual do documento no fluxo de processamento.")
     metadata = models.JSONField(blank=True, default=dict, help_text="Metadados adicionais relacionados ao documento.") # type: ignore
+    claimed_at = models.DateTimeField(null=True, blank=True, help_text="Quando um worker de ingestão pegou o documento (lease de INGESTION['LEASE_SECONDS']).")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -54,6 +58,8 @@ class Document(models.Model):
         indexes = [
             models.Index(fields=['user', 'status']),
             models.Index(fields=['organization', 'status']),
+            models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['organization', '-created_at']),
             models.Index(fields=['-created_at']),
             models.Index(fields=['status']),
         ]
@@ -83,3 +89,88 @@ class DocumentChunk(models.Model):
         ]
     def __str__(self) -> str:
         return f"Chunk {self.chunk_index} of Document {self.document.title}"
+
+
+class DeletionJob(models.Model):
+    """
+    Exclusão em segundo plano de um documento ou de um tenant (usuário ou
+    organização), em lotes. Guarda o progresso para acompanhar e retomar.
+    """
+    class TargetChoices(models.TextChoices):
+        DOCUMENT = "DOCUMENT", "Documento"
+        USER = "USER", "Usuário"
+        ORGANIZATION = "ORGANIZATION", "Organização"
+    class StatusChoices(models.TextChoices):
+        PENDING = "PENDING", "Pendente"
+        RUNNING = "RUNNING", "Em execução"
+        COMPLETED = "COMPLETED", "Concluído"
+        FAILED = "FAILED", "Falhou"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    target_type = models.CharField(max_length=20, choices=TargetChoices)
+    target_id = models.UUIDField(help_text="Id do documento, usuário ou organização a excluir.")
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    status = models.CharField(max_length=20, choices=StatusChoices, default=StatusChoices.PENDING)
+    documents_deleted = models.IntegerField(default=0)
+    chunks_deleted = models.BigIntegerField(default=0)
+    bytes_freed = models.BigIntegerField(default=0)
+    progress = models.JSONField(blank=True, default=dict, help_text="Linhas excluídas (ou desvinculadas) por tabela.")
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'deletion_jobs'
+        verbose_name = 'Exclusão em Lote'
+        verbose_name_plural = 'Exclusões em Lote'
+        indexes = (
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['target_type', 'target_id']),
+        )
+
+    def __str__(self) -> str:
+        return f"{self.target_type} {self.target_id} ({self.status})"
+
+
+class ImportJob(models.Model):
+    """
+    Importação em lote de arquivos (manifesto ou diretório) para Documents.
+    ``next_index`` é o checkpoint no manifesto: um job interrompido continua
+    dali.
+    """
+    class StatusChoices(models.TextChoices):
+        PENDING = "PENDING", "Pendente"
+        RUNNING = "RUNNING", "Em execução"
+        COMPLETED = "COMPLETED", "Concluído"
+        FAILED = "FAILED", "Falhou"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='import_jobs', help_text="Dono dos documentos importados.")
+    organization = models.ForeignKey('organizations.Organization', on_delete=models.CASCADE, related_name='import_jobs', null=True, blank=True)
+    status = models.CharField(max_length=20, choices=StatusChoices, default=StatusChoices.PENDING)
+    source_root = models.CharField(max_length=1024, help_text="Diretório base dos caminhos do manifesto.")
+    manifest = models.JSONField(default=list, help_text="Itens a importar: {path, title?, mime_type?}.")  # type: ignore
+    total = models.IntegerField(default=0)
+    next_index = models.IntegerField(default=0, help_text="Próximo item do manifesto a processar.")
+    imported = models.IntegerField(default=0)
+    failed = models.IntegerField(default=0)
+    bytes_imported = models.BigIntegerField(default=0)
+    errors = models.JSONField(blank=True, default=list, help_text="Primeiras falhas por item.")  # type: ignore
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'import_jobs'
+        verbose_name = 'Importação em Lote'
+        verbose_name_plural = 'Importações em Lote'
+        indexes = (
+            models.Index(fields=['status', 'created_at']),
+        )
+
+    def __str__(self) -> str:
+        return f"Import {self.id} ({self.status}, {self.next_index}/{self.total})"
@@ -0,0 +1,178 @@
+import heapq
+from operator import itemgetter
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchVectorExact,
+    SearchVectorField,
+)
+from django.db import connections, router, transaction
+from django.db.models import F, Func, QuerySet
+
+from documents.dtos import ChunkSearchHit
+from documents.models import Document, DocumentChunk
+from documents.vector_index import CosineDistance, set_search_params
+from documents.vectors import cosine_similarity, parse_embedding
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+HIT_FIELDS = ("id", "document_id", "document__title", "chunk_index", "text")
+
+DOCUMENT_LIST_FIELDS = ("id", "title", "status", "scope", "mime_type", "organization_id", "created_at")
+CHUNK_LIST_FIELDS = ("id", "chunk_index", "text")
+
+
+class SimpleTsVector(Func):
+    """
+    ``to_tsvector('simple'::regconfig, <coluna>)``: mesma expressão do índice
+    GIN document_chunks_text_fts (migration 0003). O Postgres só usa o índice
+    se a consulta repetir a expressão, e o SearchVector do Django acrescenta
+    um COALESCE.
+    """
+
+    function = "to_tsvector"
+    template = "%(function)s('simple'::regconfig, %(expressions)s)"
+    output_field = SearchVectorField()
+
+
+class DocumentRepository:
+    """Repository para operações de Document"""
+
+    @staticmethod
+    def visible(user_id: UUID | str, organization_id: UUID | str | None = None) -> QuerySet[Document]:
+        """
+        Documentos pessoais do usuário ou, com organization_id, os da
+        organização (mesmo escopo da busca RAG). Os que estão sendo excluídos
+        (DELETING) ficam de fora.
+        """
+        documents = Document.objects.exclude(status=Document.StatusChoices.DELETING)
+        if organization_id is not None:
+            return documents.filter(organization_id=organization_id)
+        return documents.filter(user_id=user_id, organization__isnull=True)
+
+    @staticmethod
+    def list_rows(user_id: UUID | str, organization_id: UUID | str | None = None) -> QuerySet:
+        """
+        Linhas da listagem (dicts), servidas pelos índices (user, -created_at)
+        e (organization, -created_at)
+        """
+        return DocumentRepository.visible(user_id, organization_id).values(*DOCUMENT_LIST_FIELDS)
+
+    @staticmethod
+    def get_owner(document_id: UUID | str) -> tuple[UUID, UUID | None] | None:
+        """(user_id, organization_id) do documento, ou None se não existir ou estiver sendo excluído"""
+        return (
+            Document.objects.filter(id=document_id)
+            .exclude(status=Document.StatusChoices.DELETING)
+            .values_list("user_id", "organization_id")
+            .first()
+        )
+
+    @staticmethod
+    def get_file_key(document_id: UUID | str) -> str | None:
+        """Chave do arquivo no storage"""
+        return Document.objects.filter(id=document_id).values_list("file_key", flat=True).first()
+
+
+class DocumentChunkRepository:
+    """Repository para operações de DocumentChunk"""
+
+    @staticmethod
+    def searchable(
+        user_id: UUID | str,
+        organization_id: UUID | str | None = None,
+    ) -> QuerySet[DocumentChunk]:
+        """
+        Chunks indexados visíveis na consulta: os documentos pessoais do
+        usuário ou, com organization_id, os da organização.
+        """
+        chunks = DocumentChunk.objects.filter(
+            document__status=Document.StatusChoices.INDEXED,
+        ).exclude(embedding="")
+        if organization_id is not None:
+            return chunks.filter(document__organization_id=organization_id)
+        return chunks.filter(document__user_id=user_id, document__organization__isnull=True)
+
+    @staticmethod
+    def list_rows(document_id: UUID | str) -> QuerySet:
+        """Chunks do documento (dicts), servidos pelo índice (document, chunk_index)"""
+        return DocumentChunk.objects.filter(document_id=document_id).values(*CHUNK_LIST_FIELDS)
+
+    @staticmethod
+    def filter_full_text(chunks: QuerySet[DocumentChunk], term: str) -> QuerySet[DocumentChunk]:
+        """
+        Chunks cujo texto contém todas as palavras de ``term``, pelo índice
+        full-text (só PostgreSQL). Ao contrário de ``text__icontains``, não
+        varre a tabela.
+        """
+        return chunks.filter(
+            SearchVectorExact(SimpleTsVector(F("text")), SearchQuery(term, config="simple")),
+        )
+
+    @staticmethod
+    def search_exact(
+        embedding: list[float],
+        user_id: UUID | str,
+        organization_id: UUID | str | None = None,
+        top_k: int = 5,
+    ) -> list[ChunkSearchHit]:
+        """
+        Busca exata (k vizinhos mais próximos por cosseno).
+
+        Com RAG['VECTOR_SEARCH'] = 'pgvector' a ordenação roda no Postgres
+        (operador <=>); senão os vetores são varridos em Python e só os
+        textos do top-k são carregados.
+        """
+        chunks = DocumentChunkRepository.searchable(user_id, organization_id)
+
+        if settings.RAG["VECTOR_SEARCH"] == "pgvector":
+            rows = (
+                chunks.annotate(distance=CosineDistance(embedding))
+                .order_by("distance")
+                .values_list(*HIT_FIELDS, "distance")[:top_k]
+            )
+            return [ChunkSearchHit(*row[:-1], score=1 - row[-1]) for row in rows]
+
+        scored = (
+            (cosine_similarity(embedding, parse_embedding(raw)), chunk_id)
+            for chunk_id, raw in chunks.values_list("id", "embedding").iterator(chunk_size=2000)
+        )
+        top = heapq.nlargest(top_k, scored, key=itemgetter(0))
+        rows = {
+            row[0]: row
+            for row in DocumentChunk.objects.filter(id__in=[chunk_id for _, chunk_id in top])
+            .values_list(*HIT_FIELDS)
+        }
+        return [ChunkSearchHit(*rows[chunk_id], score=score) for score, chunk_id in top]
+
+    @staticmethod
+    def search_ann(
+        embedding: list[float],
+        user_id: UUID | str,
+        organization_id: UUID | str | None = None,
+        top_k: int = 5,
+        plan: str | None = None,
+    ) -> list[ChunkSearchHit]:
+        """
+        Busca aproximada pelo índice ANN (documents.vector_index), com
+        ``ef_search``/``probes`` do plano do usuário. Fora do PostgreSQL cai
+        na busca exata.
+        """
+        alias = router.db_for_read(DocumentChunk)
+        if connections[alias].vendor != "postgresql":
+            return DocumentChunkRepository.search_exact(embedding, user_id, organization_id, top_k)
+
+        distance = CosineDistance(embedding, settings.RAG["EMBEDDING_DIMENSIONS"])
+        chunks = DocumentChunkRepository.searchable(user_id, organization_id).using(alias)
+        # Os parâmetros valem só nesta transação (SET LOCAL)
+        with transaction.atomic(using=alias), connections[alias].cursor() as cursor:
+            set_search_params(cursor, plan)
+            rows = list(
+                chunks.annotate(distance=distance)
+                .order_by("distance")
+                .values_list(*HIT_FIELDS, "distance")[:top_k]
+            )
+        return [ChunkSearchHit(*row[:-1], score=1 - row[-1]) for row in rows]
@@ -0,0 +1,64 @@
+from django.conf import settings
+from rest_framework import serializers
+
+from core.pagination import CursorPageSerializer
+from core.storage import MAX_PART_NUMBER
+
+
+class DocumentListSerializer(CursorPageSerializer):
+    """Parâmetros da listagem de documentos"""
+
+    organization_id = serializers.UUIDField(required=False)
+
+
+class ImportItemSerializer(serializers.Serializer):
+    """Item do manifesto de importação"""
+
+    path = serializers.CharField(max_length=1024)
+    title = serializers.CharField(max_length=255, required=False)
+    mime_type = serializers.CharField(max_length=100, required=False)
+
+
+class DocumentImportSerializer(serializers.Serializer):
+    """Pedido de importação em lote (caminhos relativos a DOCUMENT_IMPORT['ROOT']/<tenant>/)"""
+
+    organization_id = serializers.UUIDField(required=False)
+    items = ImportItemSerializer(many=True, allow_empty=False)
+
+    def validate_items(self, items: list[dict]) -> list[dict]:
+        limit = settings.DOCUMENT_IMPORT["MAX_ITEMS"]
+        if len(items) > limit:
+            msg = f"At most {limit} items per import."
+            raise serializers.ValidationError(msg)
+        return items
+
+
+class DocumentUploadSerializer(serializers.Serializer):
+    """Início de um upload direto ao storage"""
+
+    filename = serializers.CharField(max_length=255)
+    size_bytes = serializers.IntegerField(min_value=1)
+    title = serializers.CharField(max_length=255, required=False)
+    mime_type = serializers.CharField(max_length=100, required=False)
+    sha256 = serializers.RegexField(r"^[0-9a-fA-F]{64}$", required=False)
+    organization_id = serializers.UUIDField(required=False)
+
+    def validate_size_bytes(self, size_bytes: int) -> int:
+        limit = settings.DOCUMENT_UPLOAD["MAX_SIZE_BYTES"]
+        if size_bytes > limit:
+            msg = f"Files are limited to {limit} bytes."
+            raise serializers.ValidationError(msg)
+        return size_bytes
+
+
+class UploadPartSerializer(serializers.Serializer):
+    """Parte enviada: número e ETag devolvido pelo storage"""
+
+    part_number = serializers.IntegerField(min_value=1, max_value=MAX_PART_NUMBER)
+    etag = serializers.CharField(max_length=128)
+
+
+class DocumentUploadCompleteSerializer(serializers.Serializer):
+    """Conclusão de um upload direto"""
+
+    parts = UploadPartSerializer(many=True, allow_empty=False)
@@ -0,0 +1,147 @@
+from typing import TYPE_CHECKING
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from core.pagination import CursorPage, KeysetPaginator
+from core.storage import get_object_storage
+from documents.deletion import DeletionService
+from documents.exceptions import DocumentNotFoundException
+from documents.models import DeletionJob
+from documents.repositories import DocumentChunkRepository, DocumentRepository
+from organizations.cache import has_role
+from organizations.exceptions import OrganizationAccessDeniedException
+from organizations.models import OrganizationMember
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from documents.dtos import ChunkSearchHit
+    from users.models import User
+
+# Keyset alinhado aos índices (user|organization, -created_at) e (document, chunk_index)
+DOCUMENT_PAGINATOR = KeysetPaginator(("-created_at", "-id"))
+CHUNK_PAGINATOR = KeysetPaginator(("chunk_index",))
+
+
+class DocumentService:
+    """Service de listagem de documentos e chunks"""
+
+    @staticmethod
+    def list_documents(
+        user: User,
+        organization_id: UUID | str | None = None,
+        cursor: str | None = None,
+        page_size: int = 20,
+    ) -> CursorPage:
+        """
+        Documentos pessoais (ou da organização), do mais recente ao mais antigo.
+
+        Raises:
+            OrganizationAccessDeniedException: Se o usuário não pertence à organização
+            InvalidCursorException: Se o cursor for inválido
+        """
+        if organization_id is not None and not user.is_staff and not has_role(user, organization_id):
+            raise OrganizationAccessDeniedException(organization_id=str(organization_id)) from None
+
+        rows = DocumentRepository.list_rows(user.id, organization_id)
+        return DOCUMENT_PAGINATOR.paginate(rows, cursor, page_size)
+
+    @staticmethod
+    def list_chunks(
+        user: User,
+        document_id: UUID | str,
+        cursor: str | None = None,
+        page_size: int = 20,
+    ) -> CursorPage:
+        """
+        Chunks do documento em ordem de chunk_index.
+
+        Raises:
+            DocumentNotFoundException: Se o documento não existe ou não é visível ao usuário
+            InvalidCursorException: Se o cursor for inválido
+        """
+        DocumentService._check_visible(user, document_id)
+
+        rows = DocumentChunkRepository.list_rows(document_id)
+        return CHUNK_PAGINATOR.paginate(rows, cursor, page_size)
+
+    @staticmethod
+    def download_url(user: User, document_id: UUID | str) -> str:
+        """
+        URL assinada para baixar o arquivo direto do storage, válida por
+        STORAGE['PRESIGNED_EXPIRES'] segundos.
+
+        Raises:
+            DocumentNotFoundException: Se o documento não existe ou não é visível ao usuário
+        """
+        DocumentService._check_visible(user, document_id)
+        file_key = DocumentRepository.get_file_key(document_id)
+        if not file_key:
+            raise DocumentNotFoundException(document_id=str(document_id))
+        return get_object_storage().presigned_url(file_key)
+
+    @staticmethod
+    def delete_document(user: User, document_id: UUID | str) -> DeletionJob:
+        """
+        Agenda a exclusão do documento (chunks, arquivo e uso de storage)
+        em segundo plano. Pode excluir quem enviou o documento ou, em
+        documentos de organização, um ADMIN/OWNER dela.
+
+        Raises:
+            DocumentNotFoundException: Se o documento não existe ou não é visível ao usuário
+            OrganizationAccessDeniedException: Se é membro da organização, mas sem papel para excluir
+        """
+        owner = DocumentRepository.get_owner(document_id)
+        if owner is None:
+            raise DocumentNotFoundException(document_id=str(document_id))
+
+        owner_id, organization_id = owner
+        if not (owner_id == user.id or user.is_staff):
+            if organization_id is None or not has_role(user, organization_id):
+                raise DocumentNotFoundException(document_id=str(document_id))
+            if not has_role(user, organization_id, OrganizationMember.RoleChoices.ADMIN):
+                raise OrganizationAccessDeniedException(organization_id=str(organization_id))
+
+        return DeletionService.request(DeletionJob.TargetChoices.DOCUMENT, document_id, requested_by=user)
+
+
+    @staticmethod
+    def _check_visible(user: User, document_id: UUID | str) -> None:
+        """Documentos pessoais só para o dono; de organização, para os membros"""
+        owner = DocumentRepository.get_owner(document_id)
+        if owner is None:
+            raise DocumentNotFoundException(document_id=str(document_id))
+
+        owner_id, organization_id = owner
+        if organization_id is not None:
+            visible = has_role(user, organization_id)
+        else:
+            visible = owner_id == user.id
+        if not (visible or user.is_staff):
+            raise DocumentNotFoundException(document_id=str(document_id))
+
+
+class DocumentSearchService:
+    """Service de busca vetorial nos chunks dos documentos"""
+
+    @staticmethod
+    async def asearch(
+        embedding: list[float],
+        user_id: UUID | str,
+        organization_id: UUID | str | None = None,
+        top_k: int = 5,
+        plan: str | None = None,
+    ) -> list[ChunkSearchHit]:
+        """
+        Busca fora do event loop (a consulta/varredura é bloqueante). Com
+        RAG['VECTOR_SEARCH'] = 'ann' usa o índice ANN com os parâmetros do
+        plano; senão, a busca exata.
+        """
+        if settings.RAG["VECTOR_SEARCH"] == "ann":
+            return await sync_to_async(DocumentChunkRepository.search_ann)(
+                embedding, user_id, organization_id, top_k, plan,
+            )
+        return await sync_to_async(DocumentChunkRepository.search_exact)(
+            embedding, user_id, organization_id, top_k,
+        )
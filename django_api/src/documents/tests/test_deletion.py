@@ -0,0 +1,248 @@
+import shutil
+import tempfile
+from datetime import date
+from io import StringIO
+from typing import TYPE_CHECKING
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import models
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from documents.deletion import MB, DeletionService
+from documents.models import DeletionJob, Document, DocumentChunk
+from organizations.cache import has_role
+from organizations.models import Organization, OrganizationMember
+from plans.models import Usage
+from queries.models import AuditLog, QueryLog
+from users.models import User
+
+if TYPE_CHECKING:
+    from rest_framework.response import Response
+
+DELETION = {"BATCH_SIZE": 2, "DOCUMENT_BATCH_SIZE": 1, "PAUSE_SECONDS": 0}
+
+
+class DeletionTestMixin:
+    """Storage temporário e documentos com arquivo e chunks"""
+
+    def setUp(self) -> None:
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root, DELETION=DELETION)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.user = User.objects.create_user(email="owner@example.com", username="owner", password=None)
+
+    def make_document(self, chunks: int = 3, size_bytes: int = 3 * MB, **kwargs: object) -> Document:
+        name = default_storage.save("documents/file.pdf", ContentFile(b"%PDF"))
+        document = Document.objects.create(
+            user=kwargs.pop("user", self.user), title="Doc", file_key=name, size_bytes=size_bytes, **kwargs,
+        )
+        DocumentChunk.objects.bulk_create(
+            DocumentChunk(document=document, chunk_index=n, text=f"trecho {n}") for n in range(chunks)
+        )
+        return document
+
+
+class DeletionServiceTestCase(DeletionTestMixin, TestCase):
+    """Testes para documents.deletion.DeletionService"""
+
+    def test_document_in_batches(self) -> None:
+        """
+        O que testa: Exclusão de um documento com 5 chunks em lotes de 2
+        Resultado esperado [PASS]:
+        - Chunks, arquivo e documento removidos; outro documento intacto
+        - Usage.storage_used_mb descontado (3 MB)
+        - Job COMPLETED com contadores e progresso por tabela
+        """
+        document = self.make_document(chunks=5)
+        other = self.make_document(chunks=1)
+        usage = Usage.objects.create(user=self.user, period=date(2026, 1, 1), storage_used_mb=10)
+
+        job = DeletionService.request(DeletionJob.TargetChoices.DOCUMENT, document.id, requested_by=self.user)
+        self.assertEqual(Document.objects.get(id=document.id).status, Document.StatusChoices.DELETING)
+        job = DeletionService.run(DeletionService.claim_next())
+
+        self.assertEqual(job.status, DeletionJob.StatusChoices.COMPLETED)
+        self.assertFalse(Document.objects.filter(id=document.id).exists())
+        self.assertFalse(default_storage.exists(document.file_key.name))
+        self.assertTrue(default_storage.exists(other.file_key.name))
+        self.assertEqual(DocumentChunk.objects.count(), 1)
+        usage.refresh_from_db()
+        self.assertEqual(usage.storage_used_mb, 7)
+        self.assertEqual((job.documents_deleted, job.chunks_deleted, job.bytes_freed), (1, 5, 3 * MB))
+        self.assertEqual(job.progress, {"document_chunks": 5, "documents": 1})
+
+    def test_organization_tenant(self) -> None:
+        """
+        O que testa: Exclusão de uma organização com documentos, membros, logs e uso
+        Resultado esperado [PASS]:
+        - Organização e dependentes (CASCADE) removidos
+        - AuditLog preservado com a organização anulada (SET_NULL)
+        - Cache de papéis invalidado; usuário e documentos pessoais intactos
+        """
+        organization = Organization.objects.create(name="Acme", slug="acme")
+        OrganizationMember.objects.create(organization=organization, user=self.user)
+        self.assertTrue(has_role(self.user, organization.id))
+        for _ in range(2):
+            self.make_document(chunks=3, organization=organization)
+        personal = self.make_document(chunks=1)
+        Usage.objects.create(organization=organization, period=date(2026, 1, 1))
+        QueryLog.objects.bulk_create(QueryLog(user=self.user, organization=organization, query_text="q") for _ in range(3))
+        audit = AuditLog.objects.create(user=self.user, organization=organization, action="QUERY_RAG")
+
+        DeletionService.request(DeletionJob.TargetChoices.ORGANIZATION, organization.id)
+        job = DeletionService.run(DeletionService.claim_next())
+
+        self.assertEqual(job.status, DeletionJob.StatusChoices.COMPLETED, job.error)
+        self.assertFalse(Organization.objects.filter(id=organization.id).exists())
+        self.assertEqual(list(Document.objects.values_list("id", flat=True)), [personal.id])
+        self.assertFalse(QueryLog.objects.exists())
+        self.assertFalse(Usage.objects.exists())
+        audit.refresh_from_db()
+        self.assertIsNone(audit.organization_id)
+        self.assertFalse(has_role(self.user, organization.id))
+        self.assertEqual(job.progress["query_logs"], 3)
+        self.assertEqual(job.progress["organizations"], 1)
+
+    def test_protected_relation_blocks_deletion(self) -> None:
+        """
+        O que testa: Tenant referenciado por uma FK PROTECT
+        Resultado esperado [FAIL]: Job FAILED antes de excluir qualquer coisa
+        """
+        organization = Organization.objects.create(name="Acme", slug="acme")
+        document = self.make_document(chunks=1, organization=organization)
+        Usage.objects.create(organization=organization, period=date(2026, 1, 1))
+        relation = Usage._meta.get_field("organization").remote_field
+
+        DeletionService.request(DeletionJob.TargetChoices.ORGANIZATION, organization.id)
+        with mock.patch.object(relation, "on_delete", models.PROTECT):
+            job = DeletionService.run(DeletionService.claim_next())
+
+        self.assertEqual(job.status, DeletionJob.StatusChoices.FAILED)
+        self.assertIn("PROTECT", job.error)
+        self.assertTrue(Document.objects.filter(id=document.id).exists())
+        self.assertTrue(Usage.objects.filter(organization=organization).exists())
+
+    def test_do_nothing_relation_is_left_alone(self) -> None:
+        """
+        O que testa: Tenant referenciado por uma FK DO_NOTHING
+        Resultado esperado [PASS]: Linhas dependentes nem excluídas nem anuladas
+        """
+        organization = Organization.objects.create(name="Acme", slug="acme")
+        audit = AuditLog.objects.create(user=self.user, organization=organization, action="QUERY_RAG")
+        relation = AuditLog._meta.get_field("organization").remote_field
+
+        DeletionService.request(DeletionJob.TargetChoices.ORGANIZATION, organization.id)
+        with mock.patch.object(relation, "on_delete", models.DO_NOTHING):
+            job = DeletionService.run(DeletionService.claim_next())
+
+        self.assertEqual(job.status, DeletionJob.StatusChoices.COMPLETED, job.error)
+        audit.refresh_from_db()
+        self.assertEqual(audit.organization_id, organization.id)
+        self.assertNotIn("audit_logs", job.progress)
+        # Sem ON DELETE no banco a linha ficou órfã; removida para a checagem de FKs do TestCase
+        audit.delete()
+
+    def test_user_deleting_itself(self) -> None:
+        """
+        O que testa: Exclusão do usuário que pediu o próprio job
+        Resultado esperado [PASS]: Usuário removido, job COMPLETED com requested_by anulado
+        """
+        self.make_document(chunks=2)
+
+        DeletionService.request(DeletionJob.TargetChoices.USER, self.user.id, requested_by=self.user)
+        job = DeletionService.run(DeletionService.claim_next())
+
+        self.assertEqual(job.status, DeletionJob.StatusChoices.COMPLETED, job.error)
+        self.assertFalse(User.objects.filter(id=self.user.id).exists())
+        job.refresh_from_db()
+        self.assertIsNone(job.requested_by_id)
+
+    def test_failure_can_be_retried(self) -> None:
+        """
+        O que testa: Falha no storage no meio do job e nova execução
+        Resultado esperado [FAIL]: Job FAILED com o erro; a nova execução conclui o que faltou
+        """
+        document = self.make_document(chunks=3)
+        job = DeletionService.request(DeletionJob.TargetChoices.DOCUMENT, document.id)
+        storage = Document._meta.get_field("file_key").storage
+
+        with mock.patch.object(storage, "delete", side_effect=OSError("storage offline")):
+            job = DeletionService.run(DeletionService.claim_next())
+
+        self.assertEqual(job.status, DeletionJob.StatusChoices.FAILED)
+        self.assertIn("storage offline", job.error)
+        self.assertTrue(Document.objects.filter(id=document.id).exists())
+
+        job = DeletionService.run(job)
+        self.assertEqual(job.status, DeletionJob.StatusChoices.COMPLETED)
+        self.assertFalse(Document.objects.filter(id=document.id).exists())
+
+
+class RunDeletionJobsCommandTestCase(DeletionTestMixin, TestCase):
+    """Testes para manage.py run_deletion_jobs"""
+
+    def test_schedules_and_runs(self) -> None:
+        """
+        O que testa: Comando com --document
+        Resultado esperado [PASS]: Job agendado e concluído na mesma execução
+        """
+        document = self.make_document()
+
+        call_command("run_deletion_jobs", f"--document={document.id}", stdout=StringIO())
+
+        self.assertFalse(Document.objects.filter(id=document.id).exists())
+        self.assertEqual(DeletionJob.objects.get().status, DeletionJob.StatusChoices.COMPLETED)
+
+
+class DocumentDetailViewTestCase(DeletionTestMixin, TestCase):
+    """Testes para DELETE /api/documents/<uuid>/"""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.client = APIClient()
+        self.organization = Organization.objects.create(name="Acme", slug="acme")
+
+    def delete(self, user: User, document: Document) -> Response:
+        self.client.force_authenticate(user)
+        return self.client.delete(reverse("documents:detail", args=[document.id]))
+
+    def test_owner_schedules_deletion(self) -> None:
+        """
+        O que testa: Dono excluindo o próprio documento
+        Resultado esperado [PASS]: 202 com o job; documento some da listagem na hora
+        """
+        document = self.make_document()
+
+        response = self.delete(self.user, document)
+
+        self.assertEqual(response.status_code, 202, response.content)
+        self.assertEqual(response.json()["data"]["status"], DeletionJob.StatusChoices.PENDING)
+        listing = self.client.get(reverse("documents:list")).json()["data"]["results"]
+        self.assertEqual(listing, [])
+
+    def test_organization_roles(self) -> None:
+        """
+        O que testa: Documento de organização excluído por MEMBER, ADMIN e por quem não é membro
+        Resultado esperado [PASS]/[FAIL]: 403 para MEMBER, 404 para não membro, 202 para ADMIN
+        """
+        document = self.make_document(organization=self.organization)
+        member, admin, outsider = (
+            User.objects.create_user(email=f"{name}@example.com", username=name, password=None)
+            for name in ("member", "admin", "outsider")
+        )
+        OrganizationMember.objects.create(organization=self.organization, user=member)
+        OrganizationMember.objects.create(
+            organization=self.organization, user=admin, role=OrganizationMember.RoleChoices.ADMIN,
+        )
+
+        self.assertEqual(self.delete(member, document).status_code, 403)
+        self.assertEqual(self.delete(outsider, document).status_code, 404)
+        self.assertEqual(self.delete(admin, document).status_code, 202)
+        self.assertEqual(self.delete(admin, document).status_code, 404)
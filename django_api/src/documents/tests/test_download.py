@@ -0,0 +1,54 @@
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from documents.models import Document
+from users.models import User
+
+
+class DocumentDownloadViewTestCase(TestCase):
+    """Testes para GET /api/documents/<id>/download/"""
+
+    def setUp(self) -> None:
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.client = APIClient()
+        self.user = User.objects.create_user(email="test@example.com", username="test", password=None)
+        name = default_storage.save("documents/contrato.pdf", ContentFile(b"%PDF-1.7 conteudo"))
+        self.document = Document.objects.create(user=self.user, title="Contrato", file_key=name)
+
+    def test_presigned_url_serves_file(self) -> None:
+        """
+        O que testa: Dono pede a URL de download e baixa o arquivo por ela, sem autenticação
+        Resultado esperado [PASS]: 200 com url e expires_in; a URL devolve o arquivo
+        """
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get(reverse("documents:download", args=[self.document.id]))
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertGreater(data["expires_in"], 0)
+        self.client.force_authenticate(None)
+        download = self.client.get(data["url"])
+        self.assertEqual(b"".join(download.streaming_content), b"%PDF-1.7 conteudo")
+
+    def test_other_user_not_found(self) -> None:
+        """
+        O que testa: Outro usuário pede a URL de download
+        Resultado esperado [FAIL]: 404 document_not_found
+        """
+        other = User.objects.create_user(email="other@example.com", username="other", password=None)
+        self.client.force_authenticate(other)
+
+        response = self.client.get(reverse("documents:download", args=[self.document.id]))
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,230 @@
+import json
+import shutil
+import tempfile
+from datetime import date
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from documents.imports import MB, ImportService, read_manifest
+from documents.models import Document, ImportJob
+from organizations.models import Organization, OrganizationMember
+from plans.models import Usage
+from users.models import User
+from users.repositories import UsageRepository
+
+DOCUMENT_IMPORT = {"ROOT": "", "BATCH_SIZE": 2, "UPLOAD_CONCURRENCY": 2, "MAX_ITEMS": 10}
+
+
+class ImportTestMixin:
+    """Storage temporário e um diretório de origem com arquivos"""
+
+    def setUp(self) -> None:
+        media_root = tempfile.mkdtemp()
+        self.source = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, self.source, ignore_errors=True)
+        overrides = override_settings(
+            MEDIA_ROOT=media_root, DOCUMENT_IMPORT={**DOCUMENT_IMPORT, "ROOT": str(self.source)},
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.user = User.objects.create_user(email="owner@example.com", username="owner", password=None)
+
+    def make_files(self, count: int, base: Path | None = None) -> list[dict]:
+        docs = (base or self.source) / "docs"
+        docs.mkdir(parents=True, exist_ok=True)
+        for n in range(count):
+            (docs / f"arquivo{n}.txt").write_bytes(b"x" * MB)
+        return [{"path": f"docs/arquivo{n}.txt"} for n in range(count)]
+
+
+class ImportServiceTestCase(ImportTestMixin, TestCase):
+    """Testes para documents.imports.ImportService"""
+
+    def test_imports_in_batches(self) -> None:
+        """
+        O que testa: Importação de 5 arquivos em lotes de 2, com um caminho inexistente e um fora da raiz
+        Resultado esperado [PASS]:
+        - 5 Documents UPLOADED (fila de ingestão), com arquivo no storage e MIME pelo nome
+        - Falhas registradas no job sem interromper os demais
+        - Usage soma 5 MB e 5 documentos
+        """
+        usage = Usage.objects.create(user=self.user, period=date(2026, 1, 1))
+        items = [*self.make_files(5), {"path": "docs/faltando.txt"}, {"path": "../etc/passwd"}]
+        job = ImportService.create_job(self.user.id, items, self.source)
+
+        job = ImportService.run(ImportService.claim_next())
+
+        self.assertEqual(job.status, ImportJob.StatusChoices.COMPLETED)
+        self.assertEqual((job.next_index, job.imported, job.failed), (7, 5, 2))
+        self.assertEqual([error["index"] for error in job.errors], [5, 6])
+        documents = Document.objects.filter(metadata__import_job=str(job.id))
+        self.assertEqual(documents.count(), 5)
+        document = documents.get(title="arquivo0")
+        self.assertEqual((document.status, document.mime_type, document.size_bytes), ("UPLOADED", "text/plain", MB))
+        self.assertTrue(default_storage.exists(document.file_key.name))
+        usage.refresh_from_db()
+        self.assertEqual((usage.storage_used_mb, usage.documents_uploaded), (5, 5))
+
+    def test_resume_does_not_duplicate(self) -> None:
+        """
+        O que testa: Retomar um job que parou depois de enviar o primeiro lote
+        Resultado esperado [PASS]:
+        - Continua do checkpoint; nenhum Document nem arquivo duplicado
+        """
+        job = ImportService.create_job(self.user.id, self.make_files(3), self.source)
+        adjust_storage = UsageRepository.adjust_storage
+        calls = []
+
+        def fail_second_batch(*args: object, **kwargs: object) -> None:
+            # Falha dentro da transação do segundo lote, depois do bulk_create
+            calls.append(args)
+            if len(calls) == 2:
+                msg = "conexão perdida"
+                raise OSError(msg)
+            adjust_storage(*args, **kwargs)
+
+        with mock.patch.object(UsageRepository, "adjust_storage", side_effect=fail_second_batch):
+            job = ImportService.run(job)
+        self.assertEqual((job.status, job.next_index), (ImportJob.StatusChoices.FAILED, 2))
+
+        job = ImportService.run(job)
+
+        self.assertEqual((job.status, job.next_index, job.imported), (ImportJob.StatusChoices.COMPLETED, 3, 3))
+        self.assertEqual(Document.objects.count(), 3)
+        stored = [path for path in Path(default_storage.location, "documents").rglob("*") if path.is_file()]
+        self.assertEqual(len(stored), 3)
+
+    def test_read_manifest_formats(self) -> None:
+        """
+        O que testa: Leitura de manifestos .jsonl e .csv, e .txt não suportado
+        Resultado esperado [PASS]: Mesmos itens nos dois formatos; ValueError no .txt
+        """
+        (self.source / "m.jsonl").write_text(json.dumps({"path": "a.pdf", "title": "A"}) + "\n")
+        (self.source / "m.csv").write_text("path,title\na.pdf,A\n")
+
+        self.assertEqual(read_manifest(self.source / "m.jsonl"), read_manifest(self.source / "m.csv"))
+        with self.assertRaises(ValueError):
+            read_manifest(self.source / "m.txt")
+
+    def test_command_imports_directory(self) -> None:
+        """
+        O que testa: manage.py import_documents --directory --user <email>
+        Resultado esperado [PASS]: Job criado e executado; um Document por arquivo
+        """
+        self.make_files(3)
+
+        call_command(
+            "import_documents", f"--directory={self.source}", f"--user={self.user.email}",
+            "--database=default", stdout=StringIO(),
+        )
+
+        job = ImportJob.objects.get()
+        self.assertEqual((job.status, job.imported), (ImportJob.StatusChoices.COMPLETED, 3))
+        self.assertEqual(Document.objects.filter(user=self.user).count(), 3)
+
+
+class DocumentImportViewTestCase(ImportTestMixin, TestCase):
+    """Testes para POST /api/documents/imports/ e GET /api/documents/imports/<id>/"""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.organization = Organization.objects.create(name="Acme", slug="acme")
+
+    def test_admin_schedules_import(self) -> None:
+        """
+        O que testa: ADMIN da organização agenda uma importação e consulta o progresso
+        Resultado esperado [PASS]: 202 com job_id; GET devolve status e total
+        """
+        OrganizationMember.objects.create(
+            organization=self.organization, user=self.user, role=OrganizationMember.RoleChoices.ADMIN,
+        )
+        tenant = self.source / str(self.organization.id)
+
+        response = self.client.post(
+            reverse("documents:imports"),
+            {"organization_id": str(self.organization.id), "items": self.make_files(2, tenant)},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()["data"]["job_id"]
+        self.assertEqual(ImportJob.objects.get(id=job_id).source_root, str(tenant.resolve()))
+        detail = self.client.get(reverse("documents:import-detail", args=[job_id]))
+        self.assertEqual(detail.status_code, 200)
+        self.assertEqual(detail.json()["data"]["status"], ImportJob.StatusChoices.PENDING)
+        self.assertEqual(detail.json()["data"]["total"], 2)
+
+    def test_member_is_denied(self) -> None:
+        """
+        O que testa: Membro comum tenta importar para a organização
+        Resultado esperado [FAIL]: 403 organization_access_denied, nenhum job criado
+        """
+        OrganizationMember.objects.create(organization=self.organization, user=self.user)
+
+        response = self.client.post(
+            reverse("documents:imports"),
+            {"organization_id": str(self.organization.id), "items": [{"path": "a.pdf"}]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(ImportJob.objects.exists())
+
+    def test_paths_are_scoped_to_tenant(self) -> None:
+        """
+        O que testa: Usuário importa caminhos da raiz compartilhada e do diretório de outro tenant
+        Resultado esperado [FAIL]:
+        - Sem diretório próprio: 400 document_import_disabled
+        - Com diretório: job criado, mas os caminhos de fora dele falham na execução
+        """
+        other = self.source / "outro-tenant"
+        items = [{"path": "docs/arquivo0.txt"}, {"path": "../outro-tenant/docs/arquivo0.txt"}]
+        self.make_files(1)
+        self.make_files(1, other)
+
+        response = self.client.post(reverse("documents:imports"), {"items": items}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"]["code"], "document_import_disabled")
+
+        tenant = self.source / str(self.user.id)
+        tenant.mkdir()
+        (tenant / "docs").symlink_to(other / "docs")
+        response = self.client.post(reverse("documents:imports"), {"items": items}, format="json")
+        self.assertEqual(response.status_code, 202)
+
+        job = ImportService.run(ImportJob.objects.get(id=response.json()["data"]["job_id"]))
+        self.assertEqual((job.imported, job.failed), (0, 2))
+        self.assertFalse(Document.objects.exists())
+
+    def test_too_many_items(self) -> None:
+        """
+        O que testa: Pedido com mais itens que DOCUMENT_IMPORT['MAX_ITEMS']
+        Resultado esperado [FAIL]: 422 (erro de validação)
+        """
+        response = self.client.post(
+            reverse("documents:imports"), {"items": [{"path": f"{n}.pdf"} for n in range(11)]}, format="json",
+        )
+
+        self.assertEqual(response.status_code, 422)
+
+    def test_other_users_job_is_hidden(self) -> None:
+        """
+        O que testa: Consulta do job de outro usuário
+        Resultado esperado [FAIL]: 404 import_job_not_found
+        """
+        other = User.objects.create_user(email="other@example.com", username="other", password=None)
+        job = ImportService.create_job(other.id, [{"path": "a.pdf"}], self.source)
+
+        response = self.client.get(reverse("documents:import-detail", args=[job.id]))
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,154 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+from itertools import pairwise
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from documents.ingestion import IngestionService, chunk_text, extract_pages
+from documents.models import Document, DocumentChunk
+from users.models import User
+
+INGESTION = {
+    "CHUNK_SIZE": 40, "CHUNK_OVERLAP": 10, "EMBED_BATCH_SIZE": 2, "INSERT_BATCH_SIZE": 3, "BATCH_SIZE": 2,
+    "LEASE_SECONDS": 60,
+}
+
+TEXT = "Contrato de prestação de serviços entre as partes abaixo assinadas. " * 4
+
+
+class ChunkTextTestCase(SimpleTestCase):
+    """Testes para documents.ingestion.chunk_text e extract_pages"""
+
+    def test_spans_overlap_and_cover_text(self) -> None:
+        """
+        O que testa: Chunking com tamanho 40 e sobreposição 10
+        Resultado esperado [PASS]:
+        - Nenhum trecho passa de 40 caracteres; o último termina no fim do texto
+        - Cada trecho começa antes do fim do anterior (sobreposição)
+        """
+        spans = chunk_text(TEXT, 40, 10)
+
+        self.assertTrue(all(end - start <= 40 for start, end in spans))
+        self.assertEqual(spans[-1][1], len(TEXT))
+        self.assertTrue(all(nxt[0] < prev[1] for prev, nxt in pairwise(spans)))
+
+    def test_extract_pages(self) -> None:
+        """
+        O que testa: Extração de texto simples, HTML e tipo não suportado
+        Resultado esperado [PASS]: Texto sem tags; ValueError para image/png
+        """
+        self.assertEqual(extract_pages(BytesIO(b"ola"), "text/plain"), [(None, "ola")])
+        self.assertEqual(extract_pages(BytesIO(b"<p>ola</p>"), "text/html"), [(None, "ola")])
+        with self.assertRaises(ValueError):
+            extract_pages(BytesIO(b"\x89PNG"), "image/png")
+
+
+class IngestionServiceTestCase(TestCase):
+    """Testes para documents.ingestion.IngestionService"""
+
+    def setUp(self) -> None:
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        overrides = override_settings(MEDIA_ROOT=media_root, INGESTION=INGESTION)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.user = User.objects.create_user(email="owner@example.com", username="owner", password=None)
+
+    def make_document(self, content: bytes, mime_type: str = "text/plain") -> Document:
+        name = default_storage.save("documents/file.txt", ContentFile(content))
+        return Document.objects.create(user=self.user, title="Doc", file_key=name, mime_type=mime_type)
+
+    def test_run_pending_indexes_documents(self) -> None:
+        """
+        O que testa: Processamento da fila com um documento de texto e um não suportado
+        Resultado esperado [PASS]:
+        - Texto INDEXED com chunks em ordem, embeddings e offsets nos metadados
+        - Não suportado FAILED com o erro em metadata['ingestion_error']
+        """
+        document = self.make_document(TEXT.encode())
+        image = self.make_document(b"\x89PNG", mime_type="image/png")
+
+        documents, chunks = IngestionService.run_pending()
+
+        self.assertEqual(documents, 2)
+        document.refresh_from_db()
+        image.refresh_from_db()
+        self.assertEqual(document.status, Document.StatusChoices.INDEXED)
+        self.assertEqual(image.status, Document.StatusChoices.FAILED)
+        self.assertIn("image/png", image.metadata["ingestion_error"])
+        rows = list(DocumentChunk.objects.filter(document=document).order_by("chunk_index"))
+        self.assertEqual(len(rows), chunks)
+        self.assertEqual([row.chunk_index for row in rows], list(range(chunks)))
+        self.assertTrue(all(row.embedding for row in rows))
+        self.assertIn("char_start", rows[0].metadata)
+
+    def test_deleting_document_is_not_indexed(self) -> None:
+        """
+        O que testa: Documento marcado para exclusão durante a ingestão
+        Resultado esperado [PASS]: Continua DELETING, sem chunks gravados
+        """
+        document = self.make_document(TEXT.encode())
+        IngestionService.claim(1)
+        Document.objects.filter(id=document.id).update(status=Document.StatusChoices.DELETING)
+
+        self.assertEqual(IngestionService.ingest(document.id), 0)
+
+        document.refresh_from_db()
+        self.assertEqual(document.status, Document.StatusChoices.DELETING)
+        self.assertFalse(DocumentChunk.objects.filter(document=document).exists())
+
+    def test_expired_lease_is_reclaimed(self) -> None:
+        """
+        O que testa: Documento em PROCESSING de um worker que travou
+        Resultado esperado [PASS]:
+        - Com a posse válida, não é pego de novo
+        - Vencida a posse, outro worker o pega; o resultado do antigo é descartado
+        """
+        document = self.make_document(TEXT.encode())
+        self.assertEqual(IngestionService.claim(10), [document.id])
+        self.assertEqual(IngestionService.claim(10), [])
+
+        def reclaimed_meanwhile(document: Document) -> list[DocumentChunk]:
+            expired = timezone.now() - timedelta(seconds=INGESTION["LEASE_SECONDS"] + 1)
+            Document.objects.filter(id=document.id).update(claimed_at=expired)
+            self.assertEqual(IngestionService.claim(10), [document.id])
+            return []
+
+        with mock.patch.object(IngestionService, "_build_chunks", side_effect=reclaimed_meanwhile):
+            self.assertEqual(IngestionService.ingest(document.id), 0)
+
+        document.refresh_from_db()
+        self.assertEqual(document.status, Document.StatusChoices.PROCESSING)
+        self.assertGreater(IngestionService.ingest(document.id), 0)
+
+    def test_document_deleted_after_claim_is_skipped(self) -> None:
+        """
+        O que testa: Documento removido entre o claim e a ingestão
+        Resultado esperado [PASS]: ingest devolve 0 sem lançar DoesNotExist
+        """
+        document = self.make_document(TEXT.encode())
+        ids = IngestionService.claim(10)
+        Document.objects.filter(id=document.id).delete()
+
+        self.assertEqual(ids, [document.id])
+        self.assertEqual(IngestionService.ingest(document.id), 0)
+
+    def test_command_drains_queue(self) -> None:
+        """
+        O que testa: manage.py run_ingestion sem --watch
+        Resultado esperado [PASS]: Todos os documentos pendentes processados (lotes de 2)
+        """
+        for _ in range(3):
+            self.make_document(TEXT.encode())
+
+        call_command("run_ingestion", "--database=default", stdout=StringIO())
+
+        self.assertFalse(Document.objects.filter(status=Document.StatusChoices.UPLOADED).exists())
+        self.assertEqual(Document.objects.filter(status=Document.StatusChoices.INDEXED).count(), 3)
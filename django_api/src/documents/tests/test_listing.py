@@ -0,0 +1,196 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.pagination import KeysetPaginator
+from core.query_budget import QueryBudget
+from documents.models import Document, DocumentChunk
+from organizations.models import Organization, OrganizationMember
+from queries.models import QueryLog
+from users.models import User
+
+
+class CursorListingMixin:
+    """Percorre todas as páginas de uma listagem seguindo next_cursor"""
+
+    def collect(self, url: str, params: dict | None = None, page_size: int = 2) -> list[dict]:
+        items, cursor = [], None
+        while True:
+            query = {**(params or {}), "page_size": page_size}
+            if cursor:
+                query["cursor"] = cursor
+            response = self.client.get(url, query)
+            self.assertEqual(response.status_code, 200, response.content)
+            data = response.json()["data"]
+            items += data["results"]
+            cursor = data["next_cursor"]
+            if cursor is None:
+                return items
+
+
+class DocumentListViewTestCase(CursorListingMixin, TestCase):
+    """Testes para GET /api/documents/"""
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.url = reverse("documents:list")
+        self.user = User.objects.create_user(email="test@example.com", username="test", password=None)
+        self.client.force_authenticate(self.user)
+        self.organization = Organization.objects.create(name="Acme", slug="acme")
+
+        # Mesmo created_at em pares: o desempate por id não pode pular nem repetir
+        base = timezone.now()
+        self.documents = []
+        for n in range(7):
+            document = Document.objects.create(user=self.user, title=f"Doc {n}")
+            Document.objects.filter(id=document.id).update(created_at=base - timedelta(minutes=n // 2))
+            self.documents.append(document)
+        Document.objects.create(user=self.user, organization=self.organization, title="Da org")
+
+    def test_pages_cover_all_documents_in_order(self) -> None:
+        """
+        O que testa: Paginação por cursor até o fim, com created_at empatados
+        Resultado esperado [PASS]:
+        - Todos os documentos pessoais, sem repetição
+        - Ordem -created_at, -id
+        - Documento da organização fora do escopo pessoal
+        """
+        items = self.collect(self.url)
+
+        expected = sorted(
+            Document.objects.filter(organization__isnull=True),
+            key=lambda d: (d.created_at, d.id),
+            reverse=True,
+        )
+        self.assertEqual([item["id"] for item in items], [str(d.id) for d in expected])
+
+    def test_deep_page_costs_same_as_first(self) -> None:
+        """
+        O que testa: Página profunda vs. primeira página
+        Resultado esperado [PASS]: Mesmo número de queries e nenhuma com OFFSET
+        """
+        first = self.client.get(self.url, {"page_size": 2}).json()["data"]
+        with QueryBudget() as recorder:
+            self.client.get(self.url, {"page_size": 2, "cursor": first["next_cursor"]})
+
+        self.assertTrue(all("OFFSET" not in sql for sql in recorder.queries))
+        self.assertEqual(len(recorder.queries), 1)
+
+    def test_organization_requires_membership(self) -> None:
+        """
+        O que testa: Listagem dos documentos de uma organização
+        Resultado esperado [FAIL]: 403 sem ser membro; [PASS] só o documento da org sendo membro
+        """
+        params = {"organization_id": str(self.organization.id)}
+        self.assertEqual(self.client.get(self.url, params).status_code, 403)
+
+        OrganizationMember.objects.create(organization=self.organization, user=self.user)
+        items = self.collect(self.url, params)
+        self.assertEqual([item["title"] for item in items], ["Da org"])
+
+    def test_invalid_cursor(self) -> None:
+        """
+        O que testa: Cursor adulterado
+        Resultado esperado [FAIL]: Status HTTP 422 com invalid_cursor
+        """
+        response = self.client.get(self.url, {"cursor": "nao-e-um-cursor"})
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.json()["error"]["code"], "invalid_cursor")
+
+    def test_cursor_from_other_listing_rejected(self) -> None:
+        """
+        O que testa: Cursor de uma listagem usado em outra ordering
+        Resultado esperado [FAIL]: InvalidCursorException (assinatura com outra ordering)
+        """
+        cursor = self.client.get(self.url, {"page_size": 1}).json()["data"]["next_cursor"]
+
+        response = self.client.get(
+            reverse("documents:chunks", args=[self.documents[0].id]), {"cursor": cursor},
+        )
+
+        self.assertEqual(response.status_code, 422)
+
+
+class DocumentChunkListViewTestCase(CursorListingMixin, TestCase):
+    """Testes para GET /api/documents/<id>/chunks/"""
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = User.objects.create_user(email="test@example.com", username="test", password=None)
+        self.client.force_authenticate(self.user)
+        self.document = Document.objects.create(user=self.user, title="Manual")
+        DocumentChunk.objects.bulk_create([
+            DocumentChunk(document=self.document, chunk_index=n, text=f"trecho {n}") for n in (4, 0, 2, 1, 3)
+        ])
+
+    def test_chunks_in_order(self) -> None:
+        """
+        O que testa: Chunks paginados por chunk_index
+        Resultado esperado [PASS]: Índices 0..4 em ordem
+        """
+        items = self.collect(reverse("documents:chunks", args=[self.document.id]))
+
+        self.assertEqual([item["chunk_index"] for item in items], [0, 1, 2, 3, 4])
+
+    def test_other_user_document_not_found(self) -> None:
+        """
+        O que testa: Chunks de documento pessoal de outro usuário
+        Resultado esperado [FAIL]: Status HTTP 404 (não revela que existe)
+        """
+        other = User.objects.create_user(email="o@example.com", username="o", password=None)
+        self.client.force_authenticate(other)
+
+        response = self.client.get(reverse("documents:chunks", args=[self.document.id]))
+
+        self.assertEqual(response.status_code, 404)
+
+
+class QueryHistoryViewTestCase(CursorListingMixin, TestCase):
+    """Testes para GET /api/queries/history/"""
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = User.objects.create_user(email="test@example.com", username="test", password=None)
+        self.client.force_authenticate(self.user)
+        for n in range(5):
+            QueryLog.objects.create(user=self.user, query_text=f"pergunta {n}")
+
+    def test_history_newest_first(self) -> None:
+        """
+        O que testa: Histórico paginado por cursor
+        Resultado esperado [PASS]: As 5 consultas, da mais recente à mais antiga
+        """
+        items = self.collect(reverse("queries:history"))
+
+        self.assertEqual(len(items), 5)
+        created = [item["created_at"] for item in items]
+        self.assertEqual(created, sorted(created, reverse=True))
+
+
+class KeysetPaginatorTestCase(TestCase):
+    """Testes para core.pagination.KeysetPaginator"""
+
+    def test_mixed_directions(self) -> None:
+        """
+        O que testa: Ordering com direções diferentes (title asc, created_at desc, id)
+        Resultado esperado [PASS]: Mesma sequência que a consulta sem paginação
+        """
+        user = User.objects.create_user(email="test@example.com", username="test", password=None)
+        for n in range(6):
+            Document.objects.create(user=user, title=f"T{n % 3}")
+        paginator = KeysetPaginator(("title", "-created_at", "id"))
+
+        seen, cursor = [], None
+        while True:
+            page = paginator.paginate(Document.objects.values("id", "title", "created_at"), cursor, 4)
+            seen += [row["id"] for row in page.results]
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        expected = list(Document.objects.order_by("title", "-created_at", "id").values_list("id", flat=True))
+        self.assertEqual(seen, expected)
@@ -0,0 +1,157 @@
+import hashlib
+import shutil
+import tempfile
+from datetime import date
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from documents.ingestion import IngestionService
+from documents.models import Document
+from plans.models import Usage
+from users.models import User
+
+if TYPE_CHECKING:
+    from rest_framework.response import Response
+
+CONTENT = b"Contrato de prestacao de servicos entre as partes."
+
+
+class DocumentUploadTestCase(TestCase):
+    """Testes para o upload direto: POST /api/documents/uploads/ e .../upload/complete/"""
+
+    def setUp(self) -> None:
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        overrides = override_settings(
+            MEDIA_ROOT=media_root, STORAGE={**settings.STORAGE, "MULTIPART_PART_SIZE": 20},
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.client = APIClient()
+        self.user = User.objects.create_user(email="test@example.com", username="test", password=None)
+        self.client.force_authenticate(self.user)
+
+    def start(self, content: bytes = CONTENT, **extra: object) -> dict:
+        response = self.client.post(
+            reverse("documents:uploads"),
+            {"filename": "contrato.txt", "size_bytes": len(content), **extra},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()["data"]
+
+    def upload_parts(self, session: dict, content: bytes = CONTENT) -> list[dict]:
+        """Envia as partes direto nas URLs assinadas, como o cliente faria"""
+        parts, size = [], session["part_size"]
+        uploader = APIClient()
+        for part in session["parts"]:
+            offset = (part["part_number"] - 1) * size
+            response = uploader.put(part["url"], content[offset:offset + size], content_type="application/octet-stream")
+            self.assertEqual(response.status_code, 200)
+            parts.append({"part_number": part["part_number"], "etag": response["ETag"]})
+        return parts
+
+    def complete(self, session: dict, parts: list[dict]) -> Response:
+        return self.client.post(
+            reverse("documents:upload-complete", args=[session["document_id"]]), {"parts": parts}, format="json",
+        )
+
+    def test_upload_and_ingest(self) -> None:
+        """
+        O que testa: Fluxo completo com 3 partes, SHA-256 correto e ingestão
+        Resultado esperado [PASS]:
+        - Documento PENDING_UPLOAD até o complete, depois UPLOADED (fila) e INDEXED
+        - Arquivo montado no storage; Usage com 1 documento
+        """
+        usage = Usage.objects.create(user=self.user, period=date(2026, 1, 1))
+        session = self.start(sha256=hashlib.sha256(CONTENT).hexdigest())
+        self.assertEqual(len(session["parts"]), 3)
+        document = Document.objects.get(id=session["document_id"])
+        self.assertEqual(document.status, Document.StatusChoices.PENDING_UPLOAD)
+        self.assertEqual(IngestionService.run_pending(), (0, 0))
+
+        response = self.complete(session, self.upload_parts(session))
+
+        self.assertEqual(response.status_code, 202, response.content)
+        document.refresh_from_db()
+        self.assertEqual(document.status, Document.StatusChoices.UPLOADED)
+        self.assertNotIn("upload_id", document.metadata)
+        with default_storage.open(document.file_key.name) as file:
+            self.assertEqual(file.read(), CONTENT)
+        usage.refresh_from_db()
+        self.assertEqual((usage.storage_used_mb, usage.documents_uploaded), (1, 1))
+        IngestionService.run_pending()
+        document.refresh_from_db()
+        self.assertEqual(document.status, Document.StatusChoices.INDEXED)
+
+    def test_size_mismatch(self) -> None:
+        """
+        O que testa: Cliente envia menos bytes que o declarado
+        Resultado esperado [FAIL]: 400 upload_verification_failed; documento FAILED e arquivo removido
+        """
+        session = self.start()
+
+        response = self.complete(session, self.upload_parts(session, CONTENT[:-5]))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"]["code"], "upload_verification_failed")
+        document = Document.objects.get(id=session["document_id"])
+        self.assertEqual(document.status, Document.StatusChoices.FAILED)
+        self.assertFalse(default_storage.exists(document.file_key.name))
+
+    def test_checksum_mismatch_fails_ingestion(self) -> None:
+        """
+        O que testa: SHA-256 declarado diferente do arquivo enviado
+        Resultado esperado [FAIL]: Ingestão marca FAILED com o erro de checksum
+        """
+        session = self.start(sha256="0" * 64)
+        self.complete(session, self.upload_parts(session))
+
+        IngestionService.run_pending()
+
+        document = Document.objects.get(id=session["document_id"])
+        self.assertEqual(document.status, Document.StatusChoices.FAILED)
+        self.assertIn("SHA-256", document.metadata["ingestion_error"])
+
+    def test_complete_twice(self) -> None:
+        """
+        O que testa: Segundo complete do mesmo upload
+        Resultado esperado [FAIL]: 409 upload_not_pending
+        """
+        session = self.start()
+        parts = self.upload_parts(session)
+        self.assertEqual(self.complete(session, parts).status_code, 202)
+
+        response = self.complete(session, parts)
+
+        self.assertEqual(response.status_code, 409)
+
+    def test_other_user_cannot_complete(self) -> None:
+        """
+        O que testa: Outro usuário tenta completar o upload
+        Resultado esperado [FAIL]: 404 document_not_found
+        """
+        session = self.start()
+        parts = self.upload_parts(session)
+        self.client.force_authenticate(User.objects.create_user(email="o@example.com", username="o", password=None))
+
+        self.assertEqual(self.complete(session, parts).status_code, 404)
+
+    def test_too_large(self) -> None:
+        """
+        O que testa: Arquivo maior que DOCUMENT_UPLOAD['MAX_SIZE_BYTES']
+        Resultado esperado [FAIL]: 422, nenhum documento criado
+        """
+        response = self.client.post(
+            reverse("documents:uploads"),
+            {"filename": "grande.pdf", "size_bytes": settings.DOCUMENT_UPLOAD["MAX_SIZE_BYTES"] + 1},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 422)
+        self.assertFalse(Document.objects.exists())
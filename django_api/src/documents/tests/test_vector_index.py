@@ -0,0 +1,212 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from documents.dtos import VectorIndexStatus
+from documents.models import Document, DocumentChunk
+from documents.services import DocumentSearchService
+from documents.vector_index import (
+    ANN_DISTANCE_SQL,
+    INDEX_NAME,
+    CosineDistance,
+    RebuildInProgressError,
+    VectorIndexService,
+    create_index_sql,
+    recall_at_k,
+    search_params,
+    tuned_params,
+)
+from documents.vectors import format_embedding
+from users.models import User
+
+
+class VectorIndexParamsTestCase(SimpleTestCase):
+    """Testes para os parâmetros de documents.vector_index"""
+
+    def test_tuned_params_follow_row_count(self) -> None:
+        """
+        O que testa: Parâmetros de construção por número de linhas
+        Resultado esperado [PASS]:
+        - HNSW com m/ef_construction crescentes (ef_construction >= 2*m)
+        - IVFFlat com lists = linhas/1000 até 1M e sqrt(linhas) acima
+        """
+        small, large = tuned_params("hnsw", 50_000), tuned_params("hnsw", 20_000_000)
+        self.assertLess(small["m"], large["m"])
+        self.assertTrue(all(p["ef_construction"] >= 2 * p["m"] for p in (small, large)))
+        self.assertEqual(tuned_params("ivfflat", 500), {"lists": 1})
+        self.assertEqual(tuned_params("ivfflat", 500_000), {"lists": 500})
+        self.assertEqual(tuned_params("ivfflat", 4_000_000), {"lists": 2000})
+        with self.assertRaises(ValueError):
+            tuned_params("diskann", 10)
+
+    def test_index_matches_search_expression(self) -> None:
+        """
+        O que testa: Expressão do índice x expressão da busca ANN
+        Resultado esperado [PASS]: Mesma dimensão e índice parcial sem embeddings vazios
+        """
+        sql = create_index_sql(INDEX_NAME, "hnsw", {"m": 16, "ef_construction": 64}, 1536).as_string()
+
+        self.assertIn(f'CREATE INDEX CONCURRENTLY "{INDEX_NAME}" ON "document_chunks" USING "hnsw"', sql)
+        self.assertIn("(embedding::vector(1536)) vector_cosine_ops", sql)
+        self.assertIn('WITH ("m" = 16, "ef_construction" = 64)', sql)
+        self.assertTrue(sql.endswith("WHERE embedding <> ''"))
+        self.assertIn("::vector(1536) <=> %s::vector(1536)", ANN_DISTANCE_SQL.format(dimensions=1536))
+
+    def test_distance_expressions(self) -> None:
+        """
+        O que testa: SQL de CosineDistance com e sem dimensão
+        Resultado esperado [PASS]: As mesmas expressões de ANN_DISTANCE_SQL e EXACT_DISTANCE_SQL
+        """
+        def distance_sql(dimensions: int | None) -> str:
+            chunks = DocumentChunk.objects.annotate(distance=CosineDistance([0.5, 1.0], dimensions))
+            sql, params = chunks.values_list("distance").query.sql_with_params()
+            self.assertEqual(params, (format_embedding([0.5, 1.0]),))
+            return sql
+
+        self.assertIn('"document_chunks"."embedding"::vector(1536) <=> %s::vector(1536)', distance_sql(1536))
+        self.assertIn('"document_chunks"."embedding"::vector <=> %s::vector', distance_sql(None))
+
+    def test_search_params_per_plan(self) -> None:
+        """
+        O que testa: ef_search/probes por plano do usuário
+        Resultado esperado [PASS]: PRO acima do FREE; plano desconhecido usa os do FREE
+        """
+        self.assertGreater(search_params("PRO")["ef_search"], search_params("FREE")["ef_search"])
+        self.assertEqual(search_params("DESCONHECIDO"), search_params("FREE"))
+        self.assertEqual(search_params(None), search_params("FREE"))
+
+    def test_recall_at_k(self) -> None:
+        """
+        O que testa: Cálculo de recall@k
+        Resultado esperado [PASS]: Fração dos vizinhos exatos encontrados
+        """
+        self.assertEqual(recall_at_k([1, 2, 3, 4], [4, 3, 9, 8]), 0.5)
+        self.assertEqual(recall_at_k([], [1]), 1.0)
+
+
+class VectorIndexMaintenanceTestCase(SimpleTestCase):
+    """Testes para VectorIndexService.maintain (decisões, sem PostgreSQL)"""
+
+    def status(self, **kwargs: object) -> VectorIndexStatus:
+        defaults = {"exists": True, "valid": True, "rows": 1000, "dead_ratio": 0.0, "built_rows": 1000}
+        return VectorIndexStatus(**{**defaults, **kwargs})
+
+    def maintain(
+        self, status: VectorIndexStatus, recall: float = 1.0, rebuild_error: type[Exception] | None = None,
+    ) -> tuple[list[str], mock.MagicMock, mock.MagicMock]:
+        with (
+            mock.patch.object(VectorIndexService, "status", return_value=status),
+            mock.patch.object(VectorIndexService, "rebuild", return_value=status, side_effect=rebuild_error) as rebuild,
+            mock.patch.object(VectorIndexService, "vacuum") as vacuum,
+            mock.patch.object(VectorIndexService, "measure_recall", return_value={"recall": recall}),
+        ):
+            result = VectorIndexService.maintain()
+        return result["actions"], rebuild, vacuum
+
+    def test_rebuild_reasons(self) -> None:
+        """
+        O que testa: Índice ausente, inválido, tabela 3x maior e recall baixo
+        Resultado esperado [PASS]: Reconstrução com o motivo correspondente
+        """
+        self.assertEqual(self.maintain(self.status(exists=False))[0], ["rebuild:missing"])
+        self.assertEqual(self.maintain(self.status(valid=False))[0], ["rebuild:invalid"])
+        self.assertEqual(self.maintain(self.status(rows=3000))[0], ["rebuild:row_count_changed"])
+        self.assertEqual(self.maintain(self.status(), recall=0.5)[0], ["rebuild:low_recall"])
+
+    def test_vacuum_when_dead_tuples(self) -> None:
+        """
+        O que testa: Índice saudável com 30% de linhas mortas
+        Resultado esperado [PASS]: Só VACUUM, sem reconstrução
+        """
+        actions, rebuild, vacuum = self.maintain(self.status(dead_ratio=0.3))
+
+        self.assertEqual(actions, ["vacuum"])
+        vacuum.assert_called_once()
+        rebuild.assert_not_called()
+
+    def test_rebuild_in_progress(self) -> None:
+        """
+        O que testa: Reconstrução necessária com outra em andamento
+        Resultado esperado [PASS]: Registrada como em andamento, sem erro
+        """
+        actions, _, _ = self.maintain(self.status(exists=False), rebuild_error=RebuildInProgressError)
+
+        self.assertEqual(actions, ["rebuild_in_progress:missing"])
+
+
+class VectorIndexRebuildTestCase(SimpleTestCase):
+    """Testes para o SQL de VectorIndexService.rebuild (cursor simulado, sem PostgreSQL)"""
+
+    def rebuild(self, *rows: tuple | None) -> list[str]:
+        with (
+            mock.patch("documents.vector_index.connections") as connections,
+            mock.patch("documents.vector_index.transaction"),
+            mock.patch.object(VectorIndexService, "status"),
+        ):
+            cursor = connections.__getitem__.return_value.cursor.return_value.__enter__.return_value
+            cursor.connection = None
+            cursor.fetchone.side_effect = rows
+            try:
+                VectorIndexService.rebuild("hnsw", {"m": 16, "ef_construction": 64})
+            finally:
+                statements = [call.args[0] for call in cursor.execute.call_args_list]
+        return statements
+
+    def test_rebuild_holds_advisory_lock(self) -> None:
+        """
+        O que testa: Reconstrução com o lock livre
+        Resultado esperado [PASS]:
+        - pg_try_advisory_lock antes do primeiro DROP e pg_advisory_unlock no fim
+        - Comentário com os parâmetros como literal escapado
+        """
+        statements = self.rebuild((True,), (1000,))
+
+        self.assertIn("pg_try_advisory_lock", statements[0])
+        self.assertIn("pg_advisory_unlock", statements[-1])
+        comment = next(s for s in statements if s.startswith("COMMENT ON INDEX"))
+        self.assertEqual(
+            comment,
+            f'COMMENT ON INDEX "{INDEX_NAME}_new" IS '
+            "'{\"method\": \"hnsw\", \"params\": {\"m\": 16, \"ef_construction\": 64}, \"rows\": 1000}'",
+        )
+
+    def test_rebuild_skips_when_locked(self) -> None:
+        """
+        O que testa: Reconstrução com outro processo segurando o lock
+        Resultado esperado [FAIL]: RebuildInProgressError sem tocar nos índices
+        """
+        with self.assertRaises(RebuildInProgressError):
+            self.rebuild((False,))
+
+
+class VectorIndexSearchTestCase(TestCase):
+    """Testes para a busca 'ann' fora do PostgreSQL e o comando"""
+
+    def test_ann_falls_back_to_exact(self) -> None:
+        """
+        O que testa: RAG['VECTOR_SEARCH'] = 'ann' no SQLite
+        Resultado esperado [PASS]: Mesmos resultados da busca exata
+        """
+        user = User.objects.create_user(email="test@example.com", username="test", password=None)
+        document = Document.objects.create(user=user, title="Doc", status=Document.StatusChoices.INDEXED)
+        for n, vector in enumerate(([1.0, 0.0], [0.0, 1.0], [0.7, 0.7])):
+            DocumentChunk.objects.create(
+                document=document, chunk_index=n, text=f"t{n}", embedding=format_embedding(vector),
+            )
+
+        exact = async_to_sync(DocumentSearchService.asearch)([1.0, 0.1], user.id, top_k=2)
+        with override_settings(RAG={"VECTOR_SEARCH": "ann", "EMBEDDING_DIMENSIONS": 2}):
+            ann = async_to_sync(DocumentSearchService.asearch)([1.0, 0.1], user.id, top_k=2, plan="PRO")
+
+        self.assertEqual([hit.chunk_index for hit in ann], [0, 2])
+        self.assertEqual(ann, exact)
+
+    def test_command_requires_postgresql(self) -> None:
+        """
+        O que testa: manage.py maintain_vector_index no SQLite
+        Resultado esperado [FAIL]: CommandError
+        """
+        with self.assertRaises(CommandError):
+            call_command("maintain_vector_index", "status")
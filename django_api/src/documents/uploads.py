@@ -0,0 +1,141 @@
+import math
+import mimetypes
+import os
+import uuid
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core.storage import MAX_PART_NUMBER, get_object_storage
+from documents.dtos import UploadSession
+from documents.exceptions import (
+    DocumentNotFoundException,
+    UploadNotPendingException,
+    UploadVerificationException,
+)
+from documents.models import Document
+from organizations.cache import has_role
+from organizations.exceptions import OrganizationAccessDeniedException
+from users.repositories import UsageRepository
+
+if TYPE_CHECKING:
+    from users.models import User
+
+MB = 1024 * 1024
+
+
+class UploadService:
+    """
+    Upload direto ao storage, em duas fases, sem o arquivo passar pela API:
+
+    1. ``start`` cria o Document em PENDING_UPLOAD, inicia um upload multipart
+       e devolve uma URL assinada por parte;
+    2. o cliente envia as partes (PUT) direto ao storage;
+    3. ``complete`` junta as partes, confere o tamanho (HEAD, sem ler o
+       arquivo) e põe o documento na fila da ingestão (UPLOADED), que confere
+       o SHA-256, se informado, antes de extrair o texto.
+    """
+
+    @staticmethod
+    def start(
+        user: User,
+        filename: str,
+        size_bytes: int,
+        title: str = "",
+        mime_type: str = "",
+        sha256: str = "",
+        organization_id: uuid.UUID | str | None = None,
+    ) -> UploadSession:
+        """
+        Raises:
+            OrganizationAccessDeniedException: Se o usuário não pertence à organização
+        """
+        if organization_id is not None and not user.is_staff and not has_role(user, organization_id):
+            raise OrganizationAccessDeniedException(organization_id=str(organization_id))
+
+        storage = get_object_storage()
+        document_id = uuid.uuid4()
+        filename = os.path.basename(filename)
+        key = storage.generate_filename(f"documents/{document_id}/{filename}")
+        mime_type = mime_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        upload_id = storage.create_multipart(key, mime_type)
+
+        metadata = {"upload_id": upload_id}
+        if sha256:
+            metadata["sha256"] = sha256.lower()
+        Document.objects.create(
+            id=document_id,
+            user=user,
+            organization_id=organization_id,
+            scope=Document.ScopeChoices.ORGANIZATION if organization_id else Document.ScopeChoices.USER,
+            title=title or os.path.splitext(filename)[0],
+            file_key=key,
+            mime_type=mime_type,
+            size_bytes=size_bytes,
+            status=Document.StatusChoices.PENDING_UPLOAD,
+            metadata=metadata,
+        )
+
+        # Partes do tamanho configurado, aumentadas se passariam do limite de partes
+        part_size = max(settings.STORAGE["MULTIPART_PART_SIZE"], math.ceil(size_bytes / MAX_PART_NUMBER))
+        expires = settings.DOCUMENT_UPLOAD["URL_EXPIRES"]
+        parts = [
+            {"part_number": number, "url": storage.presigned_part_url(key, upload_id, number, expires)}
+            for number in range(1, math.ceil(size_bytes / part_size) + 1)
+        ]
+        return UploadSession(
+            document_id=document_id,
+            upload_id=upload_id,
+            part_size=part_size,
+            parts=parts,
+            expires_in=expires,
+        )
+
+    @staticmethod
+    def complete(user: User, document_id: uuid.UUID | str, parts: list[tuple[int, str]]) -> Document:
+        """
+        Finaliza o upload e coloca o documento na fila da ingestão.
+
+        Raises:
+            DocumentNotFoundException: Se o documento não existe ou foi enviado por outro usuário
+            UploadNotPendingException: Se o documento não aguarda upload (ex.: já completado)
+            UploadVerificationException: Se as partes não conferem ou o tamanho difere do informado
+        """
+        document = Document.objects.filter(id=document_id, user=user).first()
+        if document is None:
+            raise DocumentNotFoundException(document_id=str(document_id))
+        if document.status != Document.StatusChoices.PENDING_UPLOAD:
+            raise UploadNotPendingException(document_id=str(document_id))
+
+        storage = get_object_storage()
+        name = document.file_key.name
+        pending = Document.objects.filter(id=document.id, status=Document.StatusChoices.PENDING_UPLOAD)
+        metadata = {key: value for key, value in document.metadata.items() if key != "upload_id"}
+        try:
+            storage.complete_multipart(name, document.metadata["upload_id"], parts)
+        except ValueError as err:
+            message = f"Upload parts could not be assembled: {err}"
+            raise UploadVerificationException(message) from err
+
+        size = storage.size(name)
+        if size != document.size_bytes:
+            storage.delete(name)
+            message = f"Uploaded size {size} does not match the declared {document.size_bytes} bytes."
+            pending.update(
+                status=Document.StatusChoices.FAILED,
+                metadata={**metadata, "upload_error": message},
+                updated_at=timezone.now(),
+            )
+            raise UploadVerificationException(message)
+
+        with transaction.atomic():
+            # UPLOADED é a fila da ingestão (documents.ingestion)
+            if not pending.update(status=Document.StatusChoices.UPLOADED, metadata=metadata, updated_at=timezone.now()):
+                raise UploadNotPendingException(document_id=str(document_id))
+            UsageRepository.adjust_storage(
+                user.id, document.organization_id, math.ceil(size / MB), documents_uploaded=1,
+            )
+        document.status = Document.StatusChoices.UPLOADED
+        return document
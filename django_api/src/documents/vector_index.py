@@ -0,0 +1,333 @@
+import json
+import math
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import FloatField, Func, Value
+from psycopg import sql
+
+from documents.dtos import VectorIndexStatus
+from documents.vectors import format_embedding
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from django.db.backends.utils import CursorWrapper
+    from django.db.models import Expression
+
+INDEX_NAME = "document_chunks_embedding_ann"
+METHODS = ("hnsw", "ivfflat")
+TABLE = sql.Identifier("document_chunks")
+
+# Chave do pg_try_advisory_lock que serializa as reconstruções entre processos
+REBUILD_LOCK_KEY = 0x7665_6374_6F72  # "vector"
+
+# O índice é de expressão (a coluna é texto) e parcial (sem embeddings vazios).
+# O Postgres só usa o índice se a consulta repetir a expressão com a dimensão;
+# a busca exata usa ::vector sem dimensão e por isso nunca cai no índice.
+# CosineDistance monta as mesmas expressões no ORM
+ANN_DISTANCE_SQL = '"document_chunks"."embedding"::vector({dimensions}) <=> %s::vector({dimensions})'
+EXACT_DISTANCE_SQL = '"document_chunks"."embedding"::vector <=> %s::vector'
+
+
+class AsVector(Func):
+    """``<expressão>::vector(<dimensions>)``, ou ``::vector`` sem dimensions"""
+
+    template = "%(expressions)s::vector%(dimensions)s"
+
+    def __init__(self, expression: str | Expression, dimensions: int | None = None) -> None:
+        super().__init__(expression, dimensions=f"({dimensions:d})" if dimensions else "")
+
+
+class CosineDistance(Func):
+    """
+    Distância de cosseno (``<=>``) entre o embedding do chunk e ``embedding``.
+    Com ``dimensions`` é ANN_DISTANCE_SQL (usa o índice); sem, EXACT_DISTANCE_SQL.
+    """
+
+    template = "%(expressions)s"
+    arg_joiner = " <=> "
+    output_field = FloatField()
+
+    def __init__(self, embedding: list[float], dimensions: int | None = None) -> None:
+        super().__init__(
+            AsVector("embedding", dimensions), AsVector(Value(format_embedding(embedding)), dimensions),
+        )
+
+
+def tuned_params(method: str, rows: int) -> dict[str, int]:
+    """
+    Parâmetros de construção pelo número de linhas, seguindo as
+    recomendações do pgvector: HNSW com ``m``/``ef_construction`` maiores
+    em tabelas maiores; IVFFlat com ``lists`` = linhas/1000 até 1M e
+    sqrt(linhas) acima disso.
+    """
+    if method == "hnsw":
+        if rows < 1_000_000:
+            return {"m": 16, "ef_construction": 64}
+        if rows < 10_000_000:
+            return {"m": 24, "ef_construction": 128}
+        return {"m": 32, "ef_construction": 200}
+    if method == "ivfflat":
+        lists = rows // 1000 if rows <= 1_000_000 else math.isqrt(rows)
+        return {"lists": max(lists, 1)}
+    msg = f"Método de índice inválido: {method} (use {', '.join(METHODS)})"
+    raise ValueError(msg)
+
+
+def search_params(plan: str | None = None) -> dict[str, int]:
+    """``ef_search``/``probes`` do plano (User.plan); planos sem entrada usam os do FREE"""
+    params = settings.VECTOR_INDEX["SEARCH_PARAMS"]
+    return params.get(plan or "", params["FREE"])
+
+
+class RebuildInProgressError(RuntimeError):
+    """Outro processo está reconstruindo o índice (lock de REBUILD_LOCK_KEY)"""
+
+
+def create_index_sql(name: str, method: str, params: dict[str, int], dimensions: int) -> sql.Composed:
+    options = sql.SQL(", ").join(
+        sql.SQL("{} = {}").format(sql.Identifier(key), sql.Literal(int(value))) for key, value in params.items()
+    )
+    return sql.SQL(
+        "CREATE INDEX CONCURRENTLY {name} ON {table} "
+        "USING {method} ((embedding::vector({dimensions})) vector_cosine_ops) "
+        "WITH ({options}) WHERE embedding <> ''",
+    ).format(
+        name=sql.Identifier(name),
+        table=TABLE,
+        method=sql.Identifier(method),
+        dimensions=sql.Literal(int(dimensions)),
+        options=options,
+    )
+
+
+def execute_sql(cursor: CursorWrapper, statement: sql.Composable, params: list | None = None) -> None:
+    """Executa SQL montado com psycopg.sql (identificadores e literais escapados pelo driver)"""
+    cursor.execute(statement.as_string(cursor.connection), params)
+
+
+@contextmanager
+def rebuild_lock(cursor: CursorWrapper) -> Iterator[None]:
+    """
+    Lock de sessão (pg_try_advisory_lock) durante a reconstrução: duas
+    execuções simultâneas (ex.: ``maintain_vector_index --watch`` em mais de
+    um host) derrubariam o índice ``_new`` uma da outra.
+    """
+    cursor.execute("SELECT pg_try_advisory_lock(%s)", [REBUILD_LOCK_KEY])
+    [acquired] = cursor.fetchone()
+    if not acquired:
+        msg = "Outra reconstrução do índice vetorial está em andamento"
+        raise RebuildInProgressError(msg)
+    try:
+        yield
+    finally:
+        cursor.execute("SELECT pg_advisory_unlock(%s)", [REBUILD_LOCK_KEY])
+
+
+def set_search_params(cursor: CursorWrapper, plan: str | None = None) -> None:
+    """
+    Aplica ``ef_search``/``probes`` do plano só na transação corrente
+    (set_config local = SET LOCAL), sem vazar para a conexão do pool.
+    """
+    params = search_params(plan)
+    cursor.execute(
+        "SELECT set_config('hnsw.ef_search', %s, true), set_config('ivfflat.probes', %s, true)",
+        [str(params["ef_search"]), str(params["probes"])],
+    )
+    if iterative_scan := settings.VECTOR_INDEX["ITERATIVE_SCAN"]:
+        # pgvector >= 0.8: continua varrendo o índice quando os filtros de escopo descartam vizinhos
+        cursor.execute("SELECT set_config('hnsw.iterative_scan', %s, true)", [iterative_scan])
+
+
+def recall_at_k(exact_ids: list[Any], ann_ids: list[Any]) -> float:
+    """Fração dos vizinhos exatos que a busca aproximada encontrou"""
+    if not exact_ids:
+        return 1.0
+    return len(set(exact_ids) & set(ann_ids)) / len(exact_ids)
+
+
+class VectorIndexService:
+    """
+    Manutenção do índice ANN (pgvector) de DocumentChunk.embedding: estado,
+    reconstrução online, VACUUM e medição de recall contra a busca exata.
+    Só PostgreSQL com a extensão vector.
+    """
+
+    @staticmethod
+    def status(using: str = DEFAULT_DB_ALIAS) -> VectorIndexStatus:
+        """Estado do índice e da tabela (contagens estimadas pelas estatísticas do Postgres)"""
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                "SELECT i.indisvalid, am.amname, pg_relation_size(c.oid), obj_description(c.oid, 'pg_class') "
+                "FROM pg_class c "
+                "JOIN pg_index i ON i.indexrelid = c.oid "
+                "JOIN pg_am am ON am.oid = c.relam "
+                "WHERE c.relname = %s AND c.relnamespace = current_schema()::regnamespace",
+                [INDEX_NAME],
+            )
+            index = cursor.fetchone()
+            cursor.execute(
+                "SELECT n_live_tup, n_dead_tup FROM pg_stat_user_tables "
+                "WHERE relname = 'document_chunks' AND schemaname = current_schema()",
+            )
+            live, dead = cursor.fetchone() or (0, 0)
+
+        dead_ratio = round(dead / (live + dead), 4) if live + dead else 0.0
+        if index is None:
+            return VectorIndexStatus(exists=False, valid=False, rows=live, dead_ratio=dead_ratio)
+        valid, method, size_bytes, comment = index
+        built = json.loads(comment) if comment else {}
+        return VectorIndexStatus(
+            exists=True,
+            valid=valid,
+            rows=live,
+            dead_ratio=dead_ratio,
+            method=method,
+            size_bytes=size_bytes,
+            params=built.get("params", {}),
+            built_rows=built.get("rows", 0),
+        )
+
+    @staticmethod
+    def rebuild(
+        method: str | None = None,
+        params: dict[str, int] | None = None,
+        using: str = DEFAULT_DB_ALIAS,
+    ) -> VectorIndexStatus:
+        """
+        Reconstrução online: CREATE INDEX CONCURRENTLY de um índice novo, troca
+        de nomes numa transação curta e DROP INDEX CONCURRENTLY do antigo.
+        A busca continua usando o índice antigo enquanto o novo é construído.
+        Parâmetros omitidos saem de ``tuned_params`` pelo número de linhas.
+        Levanta RebuildInProgressError se outro processo está reconstruindo.
+        """
+        config = settings.VECTOR_INDEX
+        method = method or config["METHOD"]
+        connection = connections[using]
+        new_name = f"{INDEX_NAME}_new"
+        index, new, old = (sql.Identifier(name) for name in (INDEX_NAME, new_name, f"{INDEX_NAME}_old"))
+
+        with connection.cursor() as cursor, rebuild_lock(cursor):
+            execute_sql(cursor, sql.SQL("SELECT count(*) FROM {} WHERE embedding <> ''").format(TABLE))
+            [rows] = cursor.fetchone()
+            params = {**tuned_params(method, rows), **(params or {})}
+            built = json.dumps({"method": method, "params": params, "rows": rows})
+
+            # Sobras de uma execução interrompida (um CONCURRENTLY que falha deixa o índice inválido)
+            execute_sql(cursor, sql.SQL("DROP INDEX CONCURRENTLY IF EXISTS {}").format(new))
+            execute_sql(cursor, sql.SQL("DROP INDEX CONCURRENTLY IF EXISTS {}").format(old))
+            cursor.execute("SELECT set_config('maintenance_work_mem', %s, false)", [config["MAINTENANCE_WORK_MEM"]])
+            try:
+                execute_sql(cursor, create_index_sql(new_name, method, params, settings.RAG["EMBEDDING_DIMENSIONS"]))
+            finally:
+                cursor.execute("RESET maintenance_work_mem")
+            execute_sql(cursor, sql.SQL("COMMENT ON INDEX {} IS {}").format(new, sql.Literal(built)))
+
+            with transaction.atomic(using=using):
+                execute_sql(cursor, sql.SQL("ALTER INDEX IF EXISTS {} RENAME TO {}").format(index, old))
+                execute_sql(cursor, sql.SQL("ALTER INDEX {} RENAME TO {}").format(new, index))
+            execute_sql(cursor, sql.SQL("DROP INDEX CONCURRENTLY IF EXISTS {}").format(old))
+            execute_sql(cursor, sql.SQL("ANALYZE {}").format(TABLE))
+        return VectorIndexService.status(using)
+
+    @staticmethod
+    def vacuum(using: str = DEFAULT_DB_ALIAS) -> None:
+        """VACUUM (ANALYZE): tira do índice as linhas excluídas e atualiza as estatísticas"""
+        with connections[using].cursor() as cursor:
+            cursor.execute('VACUUM (ANALYZE) "document_chunks"')
+
+    @staticmethod
+    def measure_recall(
+        k: int = 10,
+        sample: int | None = None,
+        plan: str | None = None,
+        using: str = DEFAULT_DB_ALIAS,
+    ) -> dict[str, Any]:
+        """
+        recall@k do índice contra a busca exata, usando embeddings de chunks
+        sorteados como consultas, sem filtro de escopo. Devolve o recall
+        médio e as latências (ms) de cada busca.
+        """
+        sample = sample or settings.VECTOR_INDEX["RECALL_SAMPLE"]
+        dimensions = settings.RAG["EMBEDDING_DIMENSIONS"]
+        nearest = sql.SQL("SELECT id FROM {} WHERE embedding <> '' ORDER BY {} LIMIT %s")
+        ann_sql = nearest.format(TABLE, sql.SQL(ANN_DISTANCE_SQL.format(dimensions=dimensions)))
+        exact_sql = nearest.format(TABLE, sql.SQL(EXACT_DISTANCE_SQL))
+        connection = connections[using]
+        recalls: list[float] = []
+        ann_ms: list[float] = []
+        exact_ms: list[float] = []
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT embedding FROM \"document_chunks\" WHERE embedding <> '' ORDER BY random() LIMIT %s",
+                [sample],
+            )
+            queries = [row[0] for row in cursor.fetchall()]
+
+        for query in queries:
+            with transaction.atomic(using=using), connection.cursor() as cursor:
+                set_search_params(cursor, plan)
+                started = time.perf_counter()
+                execute_sql(cursor, ann_sql, [query, k])
+                ann_ids = [row[0] for row in cursor.fetchall()]
+                ann_ms.append((time.perf_counter() - started) * 1000)
+
+            with transaction.atomic(using=using), connection.cursor() as cursor:
+                cursor.execute("SELECT set_config('enable_indexscan', 'off', true)")
+                started = time.perf_counter()
+                execute_sql(cursor, exact_sql, [query, k])
+                exact_ids = [row[0] for row in cursor.fetchall()]
+                exact_ms.append((time.perf_counter() - started) * 1000)
+            recalls.append(recall_at_k(exact_ids, ann_ids))
+
+        return {
+            "k": k,
+            "queries": len(queries),
+            "recall": round(sum(recalls) / len(recalls), 4) if recalls else None,
+            "ann_ms": ann_ms,
+            "exact_ms": exact_ms,
+        }
+
+    @staticmethod
+    def maintain(using: str = DEFAULT_DB_ALIAS) -> dict[str, Any]:
+        """
+        Rotina agendada: reconstrói o índice se não existe, é inválido, a
+        tabela cresceu ou encolheu REBUILD_GROWTH_FACTOR vezes desde a
+        construção (parâmetros defasados) ou o recall ficou abaixo de
+        RECALL_TARGET; senão roda VACUUM quando há linhas mortas demais.
+        Se outro processo já está reconstruindo, registra e não espera.
+        """
+        config = settings.VECTOR_INDEX
+        status = VectorIndexService.status(using)
+        actions: list[str] = []
+        recall = None
+
+        reason = None
+        growth = config["REBUILD_GROWTH_FACTOR"]
+        if not status.exists:
+            reason = "missing"
+        elif not status.valid:
+            reason = "invalid"
+        elif status.built_rows and not status.built_rows / growth <= status.rows <= status.built_rows * growth:
+            reason = "row_count_changed"
+        else:
+            if status.dead_ratio > config["DEAD_TUPLE_RATIO"]:
+                VectorIndexService.vacuum(using)
+                actions.append("vacuum")
+            recall = VectorIndexService.measure_recall(using=using)
+            if recall["recall"] is not None and recall["recall"] < config["RECALL_TARGET"]:
+                reason = "low_recall"
+
+        if reason:
+            try:
+                status = VectorIndexService.rebuild(using=using)
+            except RebuildInProgressError:
+                actions.append(f"rebuild_in_progress:{reason}")
+            else:
+                actions.append(f"rebuild:{reason}")
+        return {"actions": actions, "status": status.to_dict(), "recall": recall}
@@ -0,0 +1,25 @@
+import json
+import math
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def format_embedding(vector: Sequence[float]) -> str:
+    """Serializa no formato texto do pgvector ('[0.1,0.2,...]'), que também é JSON"""
+    return "[" + ",".join(repr(float(v)) for v in vector) + "]"
+
+
+def parse_embedding(text: str) -> list[float] | None:
+    """Lê o embedding gravado em DocumentChunk.embedding; None se vazio"""
+    if not text:
+        return None
+    return json.loads(text)
+
+
+def cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
+    """Similaridade de cosseno (0 se algum vetor for nulo)"""
+    dot = sum(x * y for x, y in zip(a, b, strict=True))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
@@ -1,3 +1,259 @@
-from django.shortcuts import render
+from typing import TYPE_CHECKING
 
-# Create your views here.
+from django.conf import settings
+from rest_framework import generics, status
+from rest_framework.response import Response
+
+from core.pagination import CursorPageSerializer
+from documents.imports import ImportService
+from documents.serializers import (
+    DocumentImportSerializer,
+    DocumentListSerializer,
+    DocumentUploadCompleteSerializer,
+    DocumentUploadSerializer,
+)
+from documents.services import DocumentService
+from documents.uploads import UploadService
+from users.response_handler import APIResponse
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from rest_framework.request import Request
+
+
+class DocumentListView(generics.GenericAPIView):
+    """
+    API endpoint for listing documents, newest first, with cursor pagination.
+
+    GET /api/documents/?page_size=20
+    GET /api/documents/?organization_id=<uuid>&cursor=<next_cursor>
+    """
+
+    serializer_class = DocumentListSerializer
+
+    def get(self, request: Request) -> Response:
+        """Retorna uma página de documentos e o cursor da próxima"""
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        page = DocumentService.list_documents(
+            user=request.user,
+            organization_id=params.get("organization_id"),
+            cursor=params.get("cursor"),
+            page_size=params["page_size"],
+        )
+
+        response = APIResponse(
+            status_code=status.HTTP_200_OK,
+            message="Documents retrieved successfully",
+            data=page.to_dict(),
+        )
+
+        return Response(
+            data=response.to_dict(),
+            status=status.HTTP_200_OK,
+        )
+
+
+class DocumentChunkListView(generics.GenericAPIView):
+    """
+    API endpoint for listing the chunks of a document in order.
+
+    GET /api/documents/<uuid>/chunks/?cursor=<next_cursor>
+    """
+
+    serializer_class = CursorPageSerializer
+
+    def get(self, request: Request, document_id: UUID) -> Response:
+        """Retorna uma página de chunks e o cursor da próxima"""
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        page = DocumentService.list_chunks(
+            user=request.user,
+            document_id=document_id,
+            cursor=params.get("cursor"),
+            page_size=params["page_size"],
+        )
+
+        response = APIResponse(
+            status_code=status.HTTP_200_OK,
+            message="Document chunks retrieved successfully",
+            data=page.to_dict(),
+        )
+
+        return Response(
+            data=response.to_dict(),
+            status=status.HTTP_200_OK,
+        )
+
+
+class DocumentDetailView(generics.GenericAPIView):
+    """
+    API endpoint for deleting a document in the background.
+
+    DELETE /api/documents/<uuid>/
+    """
+
+    def delete(self, request: Request, document_id: UUID) -> Response:
+        """Agenda a exclusão e devolve o job (202)"""
+        job = DocumentService.delete_document(user=request.user, document_id=document_id)
+
+        response = APIResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            message="Document deletion scheduled",
+            data={"job_id": job.id, "status": job.status},
+        )
+
+        return Response(
+            data=response.to_dict(),
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class DocumentDownloadView(generics.GenericAPIView):
+    """
+    API endpoint for a presigned download URL; the file is served by the
+    storage, not by the API.
+
+    GET /api/documents/<uuid>/download/
+    """
+
+    def get(self, request: Request, document_id: UUID) -> Response:
+        """Retorna a URL assinada e a validade em segundos"""
+        url = DocumentService.download_url(user=request.user, document_id=document_id)
+
+        response = APIResponse(
+            status_code=status.HTTP_200_OK,
+            message="Document download URL generated",
+            data={"url": url, "expires_in": settings.STORAGE["PRESIGNED_EXPIRES"]},
+        )
+
+        return Response(
+            data=response.to_dict(),
+            status=status.HTTP_200_OK,
+        )
+
+
+class DocumentUploadView(generics.GenericAPIView):
+    """
+    API endpoint for starting a direct-to-storage upload. The client PUTs
+    each part to its presigned URL and then calls the completion endpoint.
+
+    POST /api/documents/uploads/
+    {"filename": "contrato.pdf", "size_bytes": 10485760, "sha256": "<hex>"}
+    """
+
+    serializer_class = DocumentUploadSerializer
+
+    def post(self, request: Request) -> Response:
+        """Cria o documento aguardando upload e devolve as URLs das partes (201)"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        session = UploadService.start(user=request.user, **serializer.validated_data)
+
+        response = APIResponse(
+            status_code=status.HTTP_201_CREATED,
+            message="Document upload started",
+            data=session.to_dict(),
+        )
+
+        return Response(
+            data=response.to_dict(),
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class DocumentUploadCompleteView(generics.GenericAPIView):
+    """
+    API endpoint for completing a direct-to-storage upload and queueing
+    the document for ingestion.
+
+    POST /api/documents/<uuid>/upload/complete/
+    {"parts": [{"part_number": 1, "etag": "\"<etag>\""}]}
+    """
+
+    serializer_class = DocumentUploadCompleteSerializer
+
+    def post(self, request: Request, document_id: UUID) -> Response:
+        """Junta e confere as partes; a ingestão segue em segundo plano (202)"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        parts = [(part["part_number"], part["etag"]) for part in serializer.validated_data["parts"]]
+
+        document = UploadService.complete(user=request.user, document_id=document_id, parts=parts)
+
+        response = APIResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            message="Document upload completed",
+            data={"document_id": document.id, "status": document.status},
+        )
+
+        return Response(
+            data=response.to_dict(),
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+IMPORT_JOB_FIELDS = ("id", "status", "total", "next_index", "imported", "failed", "bytes_imported", "errors", "error")
+
+
+class DocumentImportView(generics.GenericAPIView):
+    """
+    API endpoint for scheduling a bulk import of files already on the server.
+
+    POST /api/documents/imports/
+    {"organization_id": "<uuid>", "items": [{"path": "contratos/a.pdf", "title": "Contrato A"}]}
+    """
+
+    serializer_class = DocumentImportSerializer
+
+    def post(self, request: Request) -> Response:
+        """Cria o job de importação e devolve o id (202)"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        job = ImportService.request_import(
+            user=request.user,
+            items=params["items"],
+            organization_id=params.get("organization_id"),
+        )
+
+        response = APIResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            message="Document import scheduled",
+            data={"job_id": job.id, "status": job.status, "total": job.total},
+        )
+
+        return Response(
+            data=response.to_dict(),
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class DocumentImportDetailView(generics.GenericAPIView):
+    """
+    API endpoint for the progress of a bulk import.
+
+    GET /api/documents/imports/<uuid>/
+    """
+
+    def get(self, request: Request, job_id: UUID) -> Response:
+        """Retorna status e contadores do job"""
+        job = ImportService.get_job(user=request.user, job_id=job_id)
+
+        response = APIResponse(
+            status_code=status.HTTP_200_OK,
+            message="Document import retrieved successfully",
+            data={field: getattr(job, field) for field in IMPORT_JOB_FIELDS},
+        )
+
+        return Response(
+            data=response.to_dict(),
+            status=status.HTTP_200_OK,
+        )
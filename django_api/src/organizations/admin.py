@@ -1,7 +1,15 @@
+from typing import TYPE_CHECKING
+
 from django.contrib import admin
+from django.db.models import Count, IntegerField, OuterRef, QuerySet, Subquery
+from django.db.models.functions import Coalesce
 
+from core.admin import LargeTableAdmin
 from organizations.models import Organization, OrganizationMember
 
+if TYPE_CHECKING:
+    from django.http import HttpRequest
+
 
 @admin.register(Organization)
 class OrganizationAdmin(admin.ModelAdmin):
@@ -15,16 +23,34 @@ class OrganizationAdmin(admin.ModelAdmin):
         ('Data e Hora', {'fields': ('created_at', 'updated_at')}),
     )
 
+    def get_queryset(self, request: HttpRequest) -> QuerySet[Organization]:
+        # Contagem numa única query com a listagem, em vez de um COUNT por
+        # linha. Subquery (e não JOIN + GROUP BY) para o COUNT da paginação
+        # poder descartar a anotação
+        members = (
+            OrganizationMember.objects.filter(organization=OuterRef('pk'))
+            .order_by()
+            .values('organization')
+            .annotate(total=Count('*'))
+            .values('total')
+        )
+        return super().get_queryset(request).annotate(
+            members_total=Coalesce(Subquery(members, output_field=IntegerField()), 0),
+        )
+
     def members_count(self, obj):
-        return obj.members.count()
+        return obj.members_total
     members_count.short_description = 'Quantidade de Membros'
+    members_count.admin_order_field = 'members_total'
 
 
 @admin.register(OrganizationMember)
-class OrganizationMemberAdmin(admin.ModelAdmin):
+class OrganizationMemberAdmin(LargeTableAdmin):
     list_display = ('user_email', 'organization_name', 'role', 'created_at')
     list_filter = ('role', 'created_at')
+    list_select_related = ('user', 'organization')
     search_fields = ('user__email', 'organization__name')
+    autocomplete_fields = ('user', 'organization')
     ordering = ('-created_at',)
     readonly_fields = ('id', 'created_at')
     fieldsets = (
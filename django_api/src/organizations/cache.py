@@ -0,0 +1,104 @@
+import uuid
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core.cache import caches
+
+from core.profiling import record_cache, span
+from organizations.models import OrganizationMember
+from organizations.repositories import OrganizationMemberRepository
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from django.core.cache.backends.base import BaseCache
+
+    from users.models import User
+
+KEY_PREFIX = "org:memberships:"
+
+# Quanto maior, mais permissões: quem é ADMIN também passa em has_role(..., MEMBER)
+ROLE_RANK = {
+    OrganizationMember.RoleChoices.MEMBER: 1,
+    OrganizationMember.RoleChoices.ADMIN: 2,
+    OrganizationMember.RoleChoices.OWNER: 3,
+}
+
+
+def _cache() -> BaseCache:
+    return caches[settings.SHARED_CACHE_ALIAS]
+
+
+class MembershipCache:
+    """
+    Papéis do usuário em cada organização ({organization_id: role}) guardados
+    no cache compartilhado (SHARED_CACHE_ALIAS), um item por usuário.
+
+    Checagens de acesso viram uma leitura de cache e um lookup em dict, em vez
+    de uma query em organization_members por requisição. Os signals de
+    OrganizationMember (organizations.signals) invalidam a entrada do usuário,
+    o que só vale para todos os processos com um cache compartilhado
+    (``check --deploy`` acusa cache local, ver users.checks). Escritas que
+    não disparam signals (``update()``, SQL direto) só aparecem depois de
+    ORGANIZATION_MEMBERSHIP['CACHE_TIMEOUT'].
+    """
+
+    @staticmethod
+    def get_roles(user_id: uuid.UUID | str) -> Mapping[str, str]:
+        """Papéis do usuário por organization_id (str); carrega do banco no miss"""
+        key = f"{KEY_PREFIX}{user_id}"
+        with span("cache"):
+            roles = _cache().get(key)
+        record_cache(hit=roles is not None)
+        if roles is None:
+            roles = dict(OrganizationMemberRepository.list_roles(user_id))
+            _cache().set(key, roles, timeout=settings.ORGANIZATION_MEMBERSHIP["CACHE_TIMEOUT"])
+        return MappingProxyType(roles)
+
+    @staticmethod
+    async def aget_roles(user_id: uuid.UUID | str) -> Mapping[str, str]:
+        """Versão async de get_roles()"""
+        key = f"{KEY_PREFIX}{user_id}"
+        with span("cache"):
+            roles = await _cache().aget(key)
+        record_cache(hit=roles is not None)
+        if roles is None:
+            roles = dict(await OrganizationMemberRepository.alist_roles(user_id))
+            await _cache().aset(key, roles, timeout=settings.ORGANIZATION_MEMBERSHIP["CACHE_TIMEOUT"])
+        return MappingProxyType(roles)
+
+    @staticmethod
+    def invalidate(user_id: uuid.UUID | str) -> None:
+        """Descarta a entrada do usuário; a próxima checagem recarrega do banco"""
+        _cache().delete(f"{KEY_PREFIX}{user_id}")
+
+
+def _role_allows(roles: Mapping[str, str], organization_id: uuid.UUID | str, role: str) -> bool:
+    try:
+        key = str(uuid.UUID(str(organization_id)))
+    except ValueError:
+        return False
+    current = roles.get(key)
+    return current is not None and ROLE_RANK[current] >= ROLE_RANK[role]
+
+
+def has_role(
+    user: User,
+    organization_id: uuid.UUID | str,
+    role: str = OrganizationMember.RoleChoices.MEMBER,
+) -> bool:
+    """
+    Verifica se o usuário tem ao menos ``role`` na organização (OWNER >
+    ADMIN > MEMBER). O padrão (MEMBER) equivale a "pertence à organização".
+    """
+    return _role_allows(MembershipCache.get_roles(user.id), organization_id, role)
+
+
+async def ahas_role(
+    user: User,
+    organization_id: uuid.UUID | str,
+    role: str = OrganizationMember.RoleChoices.MEMBER,
+) -> bool:
+    """Versão async de has_role()"""
+    return _role_allows(await MembershipCache.aget_roles(user.id), organization_id, role)
@@ -0,0 +1,19 @@
+from rest_framework import status
+
+from users import exceptions
+
+
+class OrganizationAccessDeniedException(exceptions.BaseException):
+    """Exception raised when a user acts on an organization they don't belong to."""
+
+    def __init__(self, message: str | None = None, organization_id: str | None = None) -> None:
+        if message is None:
+            message = (
+                f"Access denied to organization {organization_id}."
+                if organization_id else "Access denied to organization."
+            )
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_403_FORBIDDEN,
+            error_code="organization_access_denied",
+        )
@@ -0,0 +1,46 @@
+from typing import TYPE_CHECKING
+
+from organizations.models import OrganizationMember
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+
+class OrganizationMemberRepository:
+    """Repository para operações de OrganizationMember"""
+
+    @staticmethod
+    def is_member(user_id: UUID | str, organization_id: UUID | str) -> bool:
+        """Verifica se o usuário pertence à organização"""
+        return OrganizationMember.objects.filter(
+            user_id=user_id,
+            organization_id=organization_id,
+        ).exists()
+
+    @staticmethod
+    def list_roles(user_id: UUID | str) -> list[tuple[str, str]]:
+        """Lista (organization_id, role) de todas as organizações do usuário"""
+        return [
+            (str(organization_id), role)
+            for organization_id, role in OrganizationMember.objects.filter(
+                user_id=user_id,
+            ).values_list('organization_id', 'role')
+        ]
+
+    @staticmethod
+    async def ais_member(user_id: UUID | str, organization_id: UUID | str) -> bool:
+        """Versão async de is_member()"""
+        return await OrganizationMember.objects.filter(
+            user_id=user_id,
+            organization_id=organization_id,
+        ).aexists()
+
+    @staticmethod
+    async def alist_roles(user_id: UUID | str) -> list[tuple[str, str]]:
+        """Versão async de list_roles()"""
+        return [
+            (str(organization_id), role)
+            async for organization_id, role in OrganizationMember.objects.filter(
+                user_id=user_id,
+            ).values_list('organization_id', 'role')
+        ]
@@ -0,0 +1,22 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from organizations.cache import MembershipCache
+from organizations.models import OrganizationMember
+
+
+@receiver([post_save, post_delete], sender=OrganizationMember)
+def refresh_membership_cache(
+    sender: type[OrganizationMember], instance: OrganizationMember, **kwargs: object,
+) -> None:
+    """
+    Invalida os papéis em cache do usuário quando a associação muda
+    (inclusive em cascata, ao remover a organização ou o usuário).
+
+    Invalida de novo depois do commit: uma leitura concorrente antes dele
+    pode ter recolocado no cache o estado antigo.
+    """
+    user_id = instance.user_id
+    MembershipCache.invalidate(user_id)
+    transaction.on_commit(lambda: MembershipCache.invalidate(user_id))
@@ -0,0 +1,94 @@
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+
+from organizations.cache import KEY_PREFIX, MembershipCache, ahas_role, has_role
+from organizations.models import Organization, OrganizationMember
+from users.models import User
+
+Role = OrganizationMember.RoleChoices
+
+
+class MembershipCacheTestCase(TestCase):
+    """Testes para organizations.cache (has_role e invalidação por signals)"""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(email="member@example.com", username="member", password=None)
+        self.organization = Organization.objects.create(name="Acme", slug="acme")
+        self.membership = OrganizationMember.objects.create(
+            organization=self.organization, user=self.user, role=Role.ADMIN,
+        )
+
+    def test_role_hierarchy(self) -> None:
+        """
+        O que testa: has_role de um ADMIN para cada papel
+        Resultado esperado [PASS]: True para MEMBER e ADMIN, False para OWNER
+        """
+        self.assertTrue(has_role(self.user, self.organization.id))
+        self.assertTrue(has_role(self.user, str(self.organization.id), Role.ADMIN))
+        self.assertFalse(has_role(self.user, self.organization.id, Role.OWNER))
+
+    def test_non_member(self) -> None:
+        """
+        O que testa: has_role em outra organização e com id inválido
+        Resultado esperado [FAIL]: False nos dois casos
+        """
+        other = Organization.objects.create(name="Other", slug="other")
+
+        self.assertFalse(has_role(self.user, other.id))
+        self.assertFalse(has_role(self.user, "not-a-uuid"))
+
+    def test_cached_after_first_check(self) -> None:
+        """
+        O que testa: Checagens repetidas (sync e async) para o mesmo usuário
+        Resultado esperado [PASS]: Só a primeira consulta organization_members
+        """
+        with self.assertNumQueries(1):
+            has_role(self.user, self.organization.id)
+            has_role(self.user, self.organization.id, Role.ADMIN)
+        with self.assertNumQueries(0):
+            self.assertTrue(async_to_sync(ahas_role)(self.user, self.organization.id))
+
+    def test_invalidated_on_role_change(self) -> None:
+        """
+        O que testa: Mudança de papel pelo save() depois de o cache estar preenchido
+        Resultado esperado [PASS]: has_role reflete o papel novo
+        """
+        self.assertFalse(has_role(self.user, self.organization.id, Role.OWNER))
+
+        self.membership.role = Role.OWNER
+        self.membership.save()
+
+        self.assertTrue(has_role(self.user, self.organization.id, Role.OWNER))
+
+    def test_invalidated_on_cascade_delete(self) -> None:
+        """
+        O que testa: Remoção da organização (associação removida em cascata)
+        Resultado esperado [FAIL]: has_role passa a negar o acesso
+        """
+        organization_id = self.organization.id
+        self.assertTrue(has_role(self.user, organization_id))
+
+        self.organization.delete()
+
+        self.assertFalse(has_role(self.user, organization_id))
+        self.assertNotIn(str(organization_id), MembershipCache.get_roles(self.user.id))
+
+    def test_uses_shared_cache_alias(self) -> None:
+        """
+        O que testa: Entrada do usuário gravada e invalidada no alias SHARED_CACHE_ALIAS
+        Resultado esperado [PASS]: Papéis em caches["shared"], removidos após a mudança de papel
+        """
+        shared = {**settings.CACHES, "shared": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "shared"}}
+        with override_settings(CACHES=shared, SHARED_CACHE_ALIAS="shared"):
+            has_role(self.user, self.organization.id)
+            key = f"{KEY_PREFIX}{self.user.id}"
+            self.assertEqual(caches["shared"].get(key), {str(self.organization.id): Role.ADMIN})
+            self.assertIsNone(cache.get(key))
+
+            self.membership.role = Role.MEMBER
+            self.membership.save()
+
+            self.assertIsNone(caches["shared"].get(key))
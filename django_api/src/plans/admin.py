@@ -1,5 +1,6 @@
 from django.contrib import admin
 
+from core.admin import LargeTableAdmin
 from plans.models import Plan, Subscription, Usage
 
 
@@ -19,10 +20,12 @@ class PlanAdmin(admin.ModelAdmin):
 
 
 @admin.register(Subscription)
-class SubscriptionAdmin(admin.ModelAdmin):
+class SubscriptionAdmin(LargeTableAdmin):
     list_display = ('user_display', 'organization_display', 'plan', 'status', 'created_at')
     list_filter = ('status', 'plan', 'created_at')
+    list_select_related = ('user', 'organization', 'plan')
     search_fields = ('user__email', 'organization__name')
+    autocomplete_fields = ('user', 'organization')
     ordering = ('-created_at',)
     readonly_fields = ('id', 'created_at', 'current_period_start')
     fieldsets = (
@@ -41,10 +44,12 @@ class SubscriptionAdmin(admin.ModelAdmin):
 
 
 @admin.register(Usage)
-class UsageAdmin(admin.ModelAdmin):
+class UsageAdmin(LargeTableAdmin):
     list_display = ('user_display', 'organization_display', 'period', 'documents_uploaded', 'queries_executed', 'storage_used_mb')
     list_filter = ('period', 'updated_at')
+    list_select_related = ('user', 'organization')
     search_fields = ('user__email', 'organization__name')
+    autocomplete_fields = ('user', 'organization')
     ordering = ('-period',)
     readonly_fields = ('id', 'updated_at')
     fieldsets = (
@@ -0,0 +1,171 @@
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+
+from core.profiling import record_cache, span
+from plans.models import Plan
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from decimal import Decimal
+
+    from django.core.cache.backends.base import BaseCache
+
+# Chave no cache compartilhado (SHARED_CACHE_ALIAS) com a versão atual do catálogo
+CATALOG_VERSION_KEY = "plans:catalog:version"
+
+
+@dataclass(frozen=True, slots=True)
+class PlanSnapshot:
+    """Cópia imutável de um Plan, segura para compartilhar entre threads"""
+
+    id: uuid.UUID
+    name: str
+    tier: str
+    plan_type: str
+    max_documents: int
+    max_storage_mb: int
+    max_queries: int
+    max_members: int | None
+    price_monthly: Decimal
+    description: str
+
+    @classmethod
+    def from_model(cls, plan: Plan) -> PlanSnapshot:
+        return cls(
+            id=plan.id,
+            name=plan.name,
+            tier=plan.tier,
+            plan_type=plan.plan_type,
+            max_documents=plan.max_documents,
+            max_storage_mb=plan.max_storage_mb,
+            max_queries=plan.max_queries,
+            max_members=plan.max_members,
+            price_monthly=plan.price_monthly,
+            description=plan.description,
+        )
+
+
+class PlanCatalog:
+    """
+    Índice imutável dos planos por (tier, plan_type) e por id.
+
+    Se houver mais de um plano com o mesmo (tier, plan_type), vale o mais
+    antigo.
+    """
+
+    __slots__ = ("_by_id", "_by_key", "version")
+
+    def __init__(self, plans: Iterable[PlanSnapshot], version: str | None = None) -> None:
+        by_key: dict[tuple[str, str], PlanSnapshot] = {}
+        by_id: dict[uuid.UUID, PlanSnapshot] = {}
+        for plan in plans:
+            by_key.setdefault((plan.tier, plan.plan_type), plan)
+            by_id[plan.id] = plan
+        self._by_key = MappingProxyType(by_key)
+        self._by_id = MappingProxyType(by_id)
+        self.version = version
+
+    @classmethod
+    def load(cls, version: str | None = None) -> PlanCatalog:
+        """Lê todos os planos do banco (uma query)"""
+        plans = Plan.objects.order_by("created_at", "id")
+        return cls((PlanSnapshot.from_model(plan) for plan in plans), version)
+
+    def get(self, tier: str, plan_type: str = Plan.UserChoices.INDIVIDUAL) -> PlanSnapshot | None:
+        return self._by_key.get((tier, plan_type))
+
+    def get_by_id(self, plan_id: uuid.UUID | str) -> PlanSnapshot | None:
+        if isinstance(plan_id, str):
+            try:
+                plan_id = uuid.UUID(plan_id)
+            except ValueError:
+                return None
+        return self._by_id.get(plan_id)
+
+    def __iter__(self) -> Iterator[PlanSnapshot]:
+        return iter(self._by_id.values())
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+
+def _cache() -> BaseCache:
+    return caches[settings.SHARED_CACHE_ALIAS]
+
+
+class _CatalogState:
+    """Catálogo corrente do processo e quando ele foi carregado/conferido"""
+
+    lock = threading.Lock()
+    catalog: PlanCatalog | None = None
+    loaded_at = 0.0
+    checked_at = 0.0
+
+
+def get_catalog() -> PlanCatalog:
+    """
+    Retorna o catálogo do processo, recarregando quando necessário.
+
+    Leituras normais são um acesso a atributo, sem round trip. A cada
+    PLAN_CATALOG['CHECK_INTERVAL'] segundos a versão no cache compartilhado é
+    conferida (uma leitura de cache); se outro processo publicou mudança, o
+    catálogo é recarregado. PLAN_CATALOG['MAX_AGE'] força o recarregamento
+    para cobrir escritas que não passam pelos signals (SQL direto, migrations).
+    """
+    config = settings.PLAN_CATALOG
+    catalog = _CatalogState.catalog
+    now = time.monotonic()
+
+    if catalog is not None and now - _CatalogState.checked_at < config["CHECK_INTERVAL"]:
+        record_cache(hit=True)
+        return catalog
+
+    with _CatalogState.lock:
+        catalog = _CatalogState.catalog
+        if catalog is not None and now - _CatalogState.checked_at < config["CHECK_INTERVAL"]:
+            record_cache(hit=True)
+            return catalog
+
+        with span("cache"):
+            version = _cache().get(CATALOG_VERSION_KEY)
+        expired = now - _CatalogState.loaded_at >= config["MAX_AGE"]
+        reload = catalog is None or expired or catalog.version != version
+        record_cache(hit=not reload)
+        if reload:
+            catalog = PlanCatalog.load(version)
+            _CatalogState.catalog = catalog
+            _CatalogState.loaded_at = now
+        _CatalogState.checked_at = now
+        return catalog
+
+
+async def aget_catalog() -> PlanCatalog:
+    """Versão async de get_catalog(); só sai do event loop para recarregar"""
+    catalog = _CatalogState.catalog
+    if (
+        catalog is not None
+        and time.monotonic() - _CatalogState.checked_at < settings.PLAN_CATALOG["CHECK_INTERVAL"]
+    ):
+        record_cache(hit=True)
+        return catalog
+    return await sync_to_async(get_catalog)()
+
+
+def invalidate_catalog() -> None:
+    """Descarta o catálogo deste processo; o próximo acesso recarrega do banco"""
+    with _CatalogState.lock:
+        _CatalogState.catalog = None
+
+
+def publish_catalog_change() -> None:
+    """Publica uma nova versão para que os outros processos recarreguem"""
+    _cache().set(CATALOG_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+    invalidate_catalog()
@@ -0,0 +1,18 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from plans.catalog import invalidate_catalog, publish_catalog_change
+from plans.models import Plan
+
+
+@receiver([post_save, post_delete], sender=Plan)
+def refresh_plan_catalog(sender: type[Plan], **kwargs: object) -> None:
+    """
+    Descarta o catálogo quando um Plan muda (ex.: pelo admin).
+
+    O processo atual recarrega na hora; os demais só depois do commit, para
+    não lerem a versão nova antes de ela estar visível no banco.
+    """
+    invalidate_catalog()
+    transaction.on_commit(publish_catalog_change)
@@ -0,0 +1,122 @@
+import dataclasses
+import uuid
+
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+
+from plans.catalog import (
+    CATALOG_VERSION_KEY,
+    PlanCatalog,
+    PlanSnapshot,
+    get_catalog,
+    invalidate_catalog,
+)
+from plans.models import Plan
+
+
+class PlanCatalogTestCase(TestCase):
+    """Testes para plans.catalog"""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.plan = Plan.objects.create(
+            tier="ENTERPRISE",
+            name="Enterprise Org",
+            plan_type=Plan.UserChoices.ORGANIZATION,
+            max_members=50,
+        )
+        invalidate_catalog()
+
+    def test_lookups_without_queries(self) -> None:
+        """
+        O que testa: Busca por (tier, plan_type) e por id após o carregamento
+        Resultado esperado [PASS]:
+        - 1 query no primeiro acesso, 0 nos seguintes
+        - Mesmo snapshot pelos dois índices
+        """
+        with self.assertNumQueries(1):
+            get_catalog()
+
+        with self.assertNumQueries(0):
+            catalog = get_catalog()
+            by_key = catalog.get("ENTERPRISE", Plan.UserChoices.ORGANIZATION)
+            self.assertEqual(by_key.max_members, 50)
+            self.assertIs(catalog.get_by_id(self.plan.id), by_key)
+            self.assertIs(catalog.get_by_id(str(self.plan.id)), by_key)
+            self.assertIsNone(catalog.get_by_id("invalido"))
+            self.assertIsNone(catalog.get("ENTERPRISE"))
+
+    def test_snapshot_is_immutable(self) -> None:
+        """
+        O que testa: Snapshots não podem ser alterados
+        Resultado esperado [FAIL]: FrozenInstanceError ao atribuir campo
+        """
+        snapshot = get_catalog().get_by_id(self.plan.id)
+
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            snapshot.max_documents = 1
+
+    def test_plan_change_refreshes_catalog(self) -> None:
+        """
+        O que testa: Alteração de Plan (ex.: admin) invalida o catálogo local
+        e publica nova versão após o commit
+        Resultado esperado [PASS]: novo limite visível e versão no cache
+        """
+        get_catalog()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.plan.max_documents = 999
+            self.plan.save()
+
+        self.assertEqual(get_catalog().get_by_id(self.plan.id).max_documents, 999)
+        self.assertIsNotNone(cache.get(CATALOG_VERSION_KEY))
+
+    @override_settings(PLAN_CATALOG={"CHECK_INTERVAL": 0, "MAX_AGE": 300})
+    def test_reloads_when_other_process_publishes(self) -> None:
+        """
+        O que testa: Versão publicada por outro processo no cache compartilhado
+        Resultado esperado [PASS]: catálogo recarregado com a nova versão
+        """
+        first = get_catalog()
+        with self.assertNumQueries(0):
+            self.assertIs(get_catalog(), first)
+
+        cache.set(CATALOG_VERSION_KEY, "outra-versao")
+
+        second = get_catalog()
+        self.assertIsNot(second, first)
+        self.assertEqual(second.version, "outra-versao")
+
+    @override_settings(
+        CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+            "shared": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "shared"},
+        },
+        SHARED_CACHE_ALIAS="shared",
+    )
+    def test_version_lives_in_shared_cache(self) -> None:
+        """
+        O que testa: Versão do catálogo publicada com SHARED_CACHE_ALIAS
+        diferente de 'default'
+        Resultado esperado [PASS]: versão gravada no cache compartilhado,
+        não no default
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            self.plan.max_documents = 999
+            self.plan.save()
+
+        self.assertIsNotNone(caches["shared"].get(CATALOG_VERSION_KEY))
+        self.assertIsNone(caches["default"].get(CATALOG_VERSION_KEY))
+
+    def test_duplicate_tier_keeps_oldest(self) -> None:
+        """
+        O que testa: Dois planos com o mesmo (tier, plan_type)
+        Resultado esperado [PASS]: o primeiro da lista é o indexado
+        """
+        a = dataclasses.replace(PlanSnapshot.from_model(self.plan), name="A")
+        b = dataclasses.replace(a, id=uuid.UUID(int=1), name="B")
+
+        catalog = PlanCatalog([a, b])
+
+        self.assertEqual(catalog.get("ENTERPRISE", Plan.UserChoices.ORGANIZATION).name, "A")
+        self.assertEqual(len(catalog), 2)
@@ -1,19 +1,22 @@
 from django.contrib import admin
 
-from queries.models import AuditLog, QueryLog
+from core.admin import LargeTableAdmin
+from queries.models import AuditLog, QueryAggregate, QueryLog
 
 
 @admin.register(QueryLog)
-class QueryLogAdmin(admin.ModelAdmin):
-    list_display = ('user_email', 'organization_name', 'query_preview', 'latency_ms', 'tokens_used', 'created_at')
-    list_filter = ('created_at', 'latency_ms')
+class QueryLogAdmin(LargeTableAdmin):
+    list_display = ('user_email', 'organization_name', 'query_preview', 'latency_ms', 'ttft_ms', 'tokens_used', 'created_at')
+    list_filter = ('created_at',)
+    list_select_related = ('user', 'organization')
     search_fields = ('user__email', 'organization__name', 'query_text')
+    autocomplete_fields = ('user', 'organization')
     ordering = ('-created_at',)
     readonly_fields = ('id', 'created_at')
     fieldsets = (
         ('Informações Básicas', {'fields': ('id', 'user', 'organization')}),
         ('Conteúdo', {'fields': ('query_text', 'answer_text')}),
-        ('Métricas', {'fields': ('latency_ms', 'tokens_used', 'citations')}),
+        ('Métricas', {'fields': ('latency_ms', 'ttft_ms', 'tokens_used', 'citations')}),
         ('Data e Hora', {'fields': ('created_at',)}),
     )
 
@@ -31,10 +34,12 @@ class QueryLogAdmin(admin.ModelAdmin):
 
 
 @admin.register(AuditLog)
-class AuditLogAdmin(admin.ModelAdmin):
+class AuditLogAdmin(LargeTableAdmin):
     list_display = ('user_display', 'organization_display', 'action', 'resource_type', 'ip_address', 'created_at')
     list_filter = ('action', 'resource_type', 'created_at')
+    list_select_related = ('user', 'organization')
     search_fields = ('user__email', 'organization__name', 'action')
+    autocomplete_fields = ('user', 'organization')
     ordering = ('-created_at',)
     readonly_fields = ('id', 'created_at')
     fieldsets = (
@@ -51,3 +56,28 @@ class AuditLogAdmin(admin.ModelAdmin):
     def organization_display(self, obj):
         return obj.organization.name if obj.organization else '-'
     organization_display.short_description = 'Organização'
+
+
+@admin.register(QueryAggregate)
+class QueryAggregateAdmin(LargeTableAdmin):
+    list_display = ('user_display', 'organization_display', 'granularity', 'bucket_start', 'query_count', 'tokens_used')
+    list_filter = ('granularity', 'bucket_start')
+    list_select_related = ('user', 'organization')
+    search_fields = ('user__email', 'organization__name')
+    autocomplete_fields = ('user', 'organization')
+    ordering = ('-bucket_start',)
+    readonly_fields = ('id', 'updated_at')
+    fieldsets = (
+        ('Informações', {'fields': ('id', 'user', 'organization', 'granularity', 'bucket_start')}),
+        ('Métricas', {'fields': ('query_count', 'total_latency_ms', 'max_latency_ms', 'tokens_used')}),
+        ('Distribuição', {'fields': ('latency_sketch', 'top_queries')}),
+        ('Data', {'fields': ('updated_at',)}),
+    )
+
+    def user_display(self, obj: QueryAggregate) -> str:
+        return obj.user.email if obj.user else '-'
+    user_display.short_description = 'Usuário'
+
+    def organization_display(self, obj: QueryAggregate) -> str:
+        return obj.organization.name if obj.organization else '-'
+    organization_display.short_description = 'Organização'
@@ -0,0 +1,152 @@
+from datetime import date, datetime, time, timedelta
+from typing import TYPE_CHECKING, Any
+
+from django.utils import timezone
+
+from organizations.cache import has_role
+from organizations.exceptions import OrganizationAccessDeniedException
+from queries.dtos import QueryAggregateDelta
+from queries.models import QueryAggregate
+from queries.repositories import QueryAggregateRepository
+from queries.sketches import LatencyHistogram
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from queries.models import QueryLog
+    from users.models import User
+
+TOP_QUERIES_IN_REPORT = 10
+QUERY_TEXT_MAX_LENGTH = 200
+
+
+def normalize_query(text: str) -> str:
+    """Normaliza o texto para agrupar queries equivalentes no top-N"""
+    return " ".join(text.lower().split())[:QUERY_TEXT_MAX_LENGTH]
+
+
+def bucket_starts(moment: datetime) -> dict[str, datetime]:
+    """Início da hora e do dia (no TIME_ZONE do projeto) que contêm ``moment``"""
+    hour = timezone.localtime(moment).replace(minute=0, second=0, microsecond=0)
+    return {
+        QueryAggregate.GranularityChoices.HOUR: hour,
+        QueryAggregate.GranularityChoices.DAY: hour.replace(hour=0),
+    }
+
+
+class QueryAnalyticsService:
+    """Service para manutenção e leitura dos agregados de queries"""
+
+    @staticmethod
+    def apply_batch(logs: list[QueryLog]) -> int:
+        """
+        Atualiza incrementalmente os agregados com um lote de QueryLog.
+
+        Args:
+            logs: Lote recém gravado pelo writer de logs
+
+        Returns:
+            int: Quantidade de buckets atualizados
+        """
+        deltas: dict[tuple, QueryAggregateDelta] = {}
+        for log in logs:
+            user_id = None if log.organization_id else log.user_id
+            for granularity, start in bucket_starts(log.created_at or timezone.now()).items():
+                key = (str(user_id), str(log.organization_id), granularity, start)
+                delta = deltas.get(key)
+                if delta is None:
+                    delta = QueryAggregateDelta(
+                        user_id=user_id,
+                        organization_id=log.organization_id,
+                        granularity=granularity,
+                        bucket_start=start,
+                    )
+                    deltas[key] = delta
+                delta.query_count += 1
+                delta.total_latency_ms += log.latency_ms
+                delta.max_latency_ms = max(delta.max_latency_ms, log.latency_ms)
+                delta.tokens_used += log.tokens_used
+                delta.latency_sketch.record(log.latency_ms)
+                text = normalize_query(log.query_text)
+                delta.top_queries[text] = delta.top_queries.get(text, 0) + 1
+
+        # Ordem determinística de lock evita deadlock entre writers concorrentes
+        for key in sorted(deltas):
+            QueryAggregateRepository.apply_delta(deltas[key])
+        return len(deltas)
+
+    @staticmethod
+    def get_report(
+        user: User,
+        granularity: str,
+        start: date,
+        end: date,
+        organization_id: UUID | str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Monta o relatório de analytics a partir dos agregados.
+
+        Args:
+            user: Usuário autenticado
+            granularity: HOUR ou DAY
+            start: Primeiro dia do intervalo
+            end: Último dia do intervalo (inclusivo)
+            organization_id: Organização consultada (None = escopo pessoal)
+
+        Raises:
+            OrganizationAccessDeniedException: Se o usuário não pertence à organização
+        """
+        if organization_id is not None and not user.is_staff and not has_role(user, organization_id):
+            raise OrganizationAccessDeniedException(organization_id=str(organization_id)) from None
+
+        tz = timezone.get_current_timezone()
+        buckets = QueryAggregateRepository.list_buckets(
+            granularity=granularity,
+            start=datetime.combine(start, time.min, tzinfo=tz),
+            end=datetime.combine(end + timedelta(days=1), time.min, tzinfo=tz),
+            user_id=user.id,
+            organization_id=organization_id,
+        )
+
+        summary_sketch = LatencyHistogram()
+        summary_top: dict[str, int] = {}
+        rows = []
+        for bucket in buckets:
+            sketch = LatencyHistogram.from_dict(bucket.latency_sketch)
+            summary_sketch.merge(sketch)
+            for text, count in bucket.top_queries.items():
+                summary_top[text] = summary_top.get(text, 0) + count
+            rows.append(QueryAnalyticsService._bucket_payload(bucket, sketch))
+
+        return {
+            "granularity": granularity,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "summary": {
+                "query_count": sum(b.query_count for b in buckets),
+                "tokens_used": sum(b.tokens_used for b in buckets),
+                "p50_latency_ms": summary_sketch.percentile(50),
+                "p95_latency_ms": summary_sketch.percentile(95),
+                "p99_latency_ms": summary_sketch.percentile(99),
+                "top_queries": QueryAnalyticsService._top(summary_top),
+            },
+            "buckets": rows,
+        }
+
+    @staticmethod
+    def _bucket_payload(bucket: QueryAggregate, sketch: LatencyHistogram) -> dict[str, Any]:
+        return {
+            "bucket_start": bucket.bucket_start.isoformat(),
+            "query_count": bucket.query_count,
+            "tokens_used": bucket.tokens_used,
+            "avg_latency_ms": bucket.total_latency_ms // bucket.query_count if bucket.query_count else 0,
+            "max_latency_ms": bucket.max_latency_ms,
+            "p50_latency_ms": sketch.percentile(50),
+            "p95_latency_ms": sketch.percentile(95),
+            "top_queries": QueryAnalyticsService._top(bucket.top_queries),
+        }
+
+    @staticmethod
+    def _top(counts: dict[str, int]) -> list[dict[str, Any]]:
+        ranked = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+        return [{"query": text, "count": count} for text, count in ranked[:TOP_QUERIES_IN_REPORT]]
@@ -0,0 +1,17 @@
+from django.urls import path
+
+from .views import (
+    QueryAnalyticsView,
+    QueryAskStreamView,
+    QueryAskView,
+    QueryHistoryView,
+)
+
+app_name = "queries"
+
+urlpatterns = [
+    path("analytics/", QueryAnalyticsView.as_view(), name="analytics"),
+    path("history/", QueryHistoryView.as_view(), name="history"),
+    path("ask/", QueryAskView.as_view(), name="ask"),
+    path("ask/stream/", QueryAskStreamView.as_view(), name="ask-stream"),
+]
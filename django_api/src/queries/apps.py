@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class QueriesConfig(AppConfig):
     name = 'queries'
+
+    def ready(self) -> None:
+        from queries import signals
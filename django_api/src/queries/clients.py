@@ -0,0 +1,253 @@
+import asyncio
+import hashlib
+import json
+import math
+import re
+import weakref
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    import httpx
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# Marca o início dos trechos recuperados no prompt (ver queries.rag)
+CONTEXT_MARKER = "Contexto:"
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimativa barata de tokens (~4 caracteres por token)"""
+    return max(1, len(text) // 4) if text else 0
+
+
+@dataclass(frozen=True, slots=True)
+class Completion:
+    """Resposta do LLM"""
+    text: str
+    tokens_used: int
+
+
+@dataclass(frozen=True, slots=True)
+class CompletionChunk:
+    """Pedaço de uma resposta em streaming; tokens_used vem no último, se o provedor informar"""
+    text: str
+    tokens_used: int | None = None
+
+
+class EmbeddingClient(ABC):
+    """Cliente assíncrono de embeddings"""
+
+    @abstractmethod
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """Um vetor por texto, na mesma ordem"""
+
+
+class LLMClient(ABC):
+    """Cliente assíncrono de geração de texto"""
+
+    @abstractmethod
+    async def complete(self, prompt: str, *, max_tokens: int) -> Completion:
+        """Gera a resposta completa para o prompt"""
+
+    @abstractmethod
+    def stream(self, prompt: str, *, max_tokens: int) -> AsyncIterator[CompletionChunk]:
+        """
+        Gera a resposta em pedaços, à medida que o provedor produz.
+
+        Fechar o iterador (``aclose``) encerra a requisição ao provedor, o que
+        interrompe a geração e a cobrança de tokens.
+        """
+
+
+class LocalEmbeddingClient(EmbeddingClient):
+    """
+    Embeddings determinísticos por feature hashing (sem rede).
+
+    Textos com palavras em comum ficam próximos no cosseno, o que basta para
+    desenvolvimento, testes e benchmarks.
+    """
+
+    def __init__(self, dimensions: int) -> None:
+        self.dimensions = dimensions
+
+    def embed_one(self, text: str) -> list[float]:
+        vector = [0.0] * self.dimensions
+        for word in _WORD_RE.findall(text.lower()):
+            digest = hashlib.blake2b(word.encode(), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            vector[value % self.dimensions] += 1.0 if value >> 63 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm:
+            vector = [v / norm for v in vector]
+        return vector
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_one(text) for text in texts]
+
+
+class LocalLLMClient(LLMClient):
+    """
+    LLM extrativo local: devolve o início do contexto do prompt (após
+    CONTEXT_MARKER).
+
+    LOCAL_LATENCY_MS simula a espera de um provedor real (só ``await``, sem
+    ocupar thread), útil para medir concorrência sob ASGI.
+    """
+
+    def __init__(self, latency_ms: int = 0) -> None:
+        self.latency_ms = latency_ms
+
+    @staticmethod
+    def _answer(prompt: str, max_tokens: int) -> str:
+        words = prompt.split(CONTEXT_MARKER, 1)[-1].split()
+        return " ".join(words[:max_tokens]) or "Não encontrei informações nos documentos."
+
+    async def complete(self, prompt: str, *, max_tokens: int) -> Completion:
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        text = self._answer(prompt, max_tokens)
+        return Completion(text=text, tokens_used=estimate_tokens(prompt) + estimate_tokens(text))
+
+    async def stream(self, prompt: str, *, max_tokens: int) -> AsyncIterator[CompletionChunk]:
+        # A latência simulada vira o tempo até o primeiro token
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        text = self._answer(prompt, max_tokens)
+        words = text.split(" ")
+        for n, word in enumerate(words):
+            last = n == len(words) - 1
+            yield CompletionChunk(
+                text=word if n == 0 else f" {word}",
+                tokens_used=estimate_tokens(prompt) + estimate_tokens(text) if last else None,
+            )
+            await asyncio.sleep(0)
+
+
+class OpenAICompatibleClient(EmbeddingClient, LLMClient):
+    """
+    Cliente HTTP para APIs compatíveis com a da OpenAI (/embeddings e
+    /chat/completions).
+
+    Mantém um ``httpx.AsyncClient`` (pool de conexões keep-alive) por event
+    loop, já que o client não pode ser compartilhado entre loops.
+    """
+
+    def __init__(self, config: dict[str, Any]) -> None:
+        try:
+            import httpx
+        except ImportError as err:
+            msg = "RAG com backend 'openai' requer httpx (pip install django_api[rag])"
+            raise ImproperlyConfigured(msg) from err
+        self._httpx = httpx
+        self.config = config
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._httpx.AsyncClient(
+                base_url=self.config["API_BASE"],
+                headers={"Authorization": f"Bearer {self.config['API_KEY']}"},
+                timeout=self.config["TIMEOUT"],
+            )
+            self._clients[loop] = client
+        return client
+
+    async def _post(self, path: str, payload: dict[str, Any]) -> dict[str, Any]:
+        response = await self._client().post(path, json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        data = await self._post("/embeddings", {
+            "model": self.config["EMBEDDING_MODEL"],
+            "input": texts,
+            "dimensions": self.config["EMBEDDING_DIMENSIONS"],
+        })
+        return [item["embedding"] for item in sorted(data["data"], key=lambda item: item["index"])]
+
+    async def complete(self, prompt: str, *, max_tokens: int) -> Completion:
+        data = await self._post("/chat/completions", {
+            "model": self.config["LLM_MODEL"],
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+        })
+        text = data["choices"][0]["message"]["content"] or ""
+        usage = data.get("usage") or {}
+        return Completion(
+            text=text,
+            tokens_used=usage.get("total_tokens") or estimate_tokens(prompt) + estimate_tokens(text),
+        )
+
+    async def stream(self, prompt: str, *, max_tokens: int) -> AsyncIterator[CompletionChunk]:
+        payload = {
+            "model": self.config["LLM_MODEL"],
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+            "stream": True,
+            "stream_options": {"include_usage": True},
+        }
+        # Sair do ``async with`` (fim, erro ou aclose) fecha a conexão
+        async with self._client().stream("POST", "/chat/completions", json=payload) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line.removeprefix("data:").strip()
+                if data == "[DONE]":
+                    break
+                event = json.loads(data)
+                usage = event.get("usage") or {}
+                yield CompletionChunk(
+                    text="".join(
+                        choice.get("delta", {}).get("content") or ""
+                        for choice in event.get("choices") or []
+                    ),
+                    tokens_used=usage.get("total_tokens"),
+                )
+
+
+def get_embedding_client() -> EmbeddingClient:
+    """Cliente de embeddings configurado em RAG['EMBEDDING_BACKEND']"""
+    config = settings.RAG
+    backend = config["EMBEDDING_BACKEND"]
+    if backend == "local":
+        return LocalEmbeddingClient(config["EMBEDDING_DIMENSIONS"])
+    if backend == "openai":
+        return _get_openai_client(config)
+    msg = f"RAG_EMBEDDING_BACKEND inválido: '{backend}'"
+    raise ImproperlyConfigured(msg)
+
+
+def get_llm_client() -> LLMClient:
+    """Cliente de LLM configurado em RAG['LLM_BACKEND']"""
+    config = settings.RAG
+    backend = config["LLM_BACKEND"]
+    if backend == "local":
+        return LocalLLMClient(config["LOCAL_LATENCY_MS"])
+    if backend == "openai":
+        return _get_openai_client(config)
+    msg = f"RAG_LLM_BACKEND inválido: '{backend}'"
+    raise ImproperlyConfigured(msg)
+
+
+_openai_clients: dict[tuple, OpenAICompatibleClient] = {}
+
+
+def _get_openai_client(config: dict[str, Any]) -> OpenAICompatibleClient:
+    # Reaproveita o client (e seus pools de conexão) enquanto a config não muda
+    key = tuple(sorted(config.items()))
+    client = _openai_clients.get(key)
+    if client is None:
+        client = _openai_clients[key] = OpenAICompatibleClient(config)
+    return client
@@ -0,0 +1,33 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from core.dtos import DTO
+from queries.sketches import LatencyHistogram
+
+if TYPE_CHECKING:
+    from datetime import datetime
+    from uuid import UUID
+
+
+@dataclass(slots=True)
+class QueryAggregateDelta(DTO):
+    """Contribuição de um lote de QueryLog para um bucket de agregados"""
+    user_id: UUID | None
+    organization_id: UUID | None
+    granularity: str
+    bucket_start: datetime
+    query_count: int = 0
+    total_latency_ms: int = 0
+    max_latency_ms: int = 0
+    tokens_used: int = 0
+    latency_sketch: LatencyHistogram = field(default_factory=LatencyHistogram)
+    top_queries: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class RAGAnswer(DTO):
+    """Resposta de uma consulta RAG"""
+    answer: str
+    citations: list[dict[str, Any]]
+    latency_ms: int
+    tokens_used: int
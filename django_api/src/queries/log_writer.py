@@ -0,0 +1,101 @@
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.db import OperationalError, close_old_connections, transaction
+
+from core.buffered_writer import BufferedWriter
+from queries.analytics import QueryAnalyticsService
+from queries.models import AuditLog, QueryLog
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_writers: dict[str, BufferedWriter] = {}
+
+
+def write_query_logs(records: list[QueryLog]) -> None:
+    """
+    Grava um lote de QueryLog com um único INSERT multi-linha e atualiza os
+    agregados de analytics com o mesmo lote, na mesma transação: o lote
+    entra inteiro ou não entra, sem logs fora dos agregados.
+
+    Erros transitórios (deadlock nos agregados, lock, conexão) repetem o
+    lote até LOG_WRITER['RETRIES'] vezes; depois a exceção sobe e o
+    BufferedWriter registra a perda do lote.
+    """
+    retries = settings.LOG_WRITER['RETRIES']
+    for attempt in range(retries + 1):
+        try:
+            with transaction.atomic():
+                QueryLog.objects.bulk_create(records)
+                QueryAnalyticsService.apply_batch(records)
+        except OperationalError:
+            if attempt == retries:
+                raise
+            logger.warning("Falha ao gravar lote de %d QueryLog, tentativa %d", len(records), attempt + 1, exc_info=True)
+            time.sleep(settings.LOG_WRITER['RETRY_DELAY'] * (attempt + 1))
+        else:
+            return
+
+
+def write_audit_logs(records: list[AuditLog]) -> None:
+    """Grava um lote de AuditLog com um único INSERT multi-linha."""
+    AuditLog.objects.bulk_create(records)
+
+
+def _with_fresh_connection(flush_func: Callable[[list], None]) -> Callable[[list], None]:
+    # A thread de fundo mantém a própria conexão; descarta-a se caiu ou expirou
+    # (CONN_MAX_AGE) antes de cada lote, como o Django faz por requisição.
+    def flush(records: list) -> None:
+        close_old_connections()
+        flush_func(records)
+    return flush
+
+
+def _build_writer(name: str, flush_func: Callable[[list], None]) -> BufferedWriter:
+    config = settings.LOG_WRITER
+    return BufferedWriter(
+        _with_fresh_connection(flush_func) if config['ASYNC'] else flush_func,
+        name=name,
+        batch_size=config['BATCH_SIZE'],
+        flush_interval=config['FLUSH_INTERVAL'],
+        max_queue_size=config['MAX_QUEUE_SIZE'],
+        block_timeout=config['BLOCK_TIMEOUT'],
+        async_mode=config['ASYNC'],
+    )
+
+
+def _get_writer(name: str, flush_func: Callable[[list], None]) -> BufferedWriter:
+    writer = _writers.get(name)
+    if writer is None:
+        with _lock:
+            writer = _writers.get(name)
+            if writer is None:
+                writer = _build_writer(name, flush_func)
+                _writers[name] = writer
+    return writer
+
+
+def get_query_log_writer() -> BufferedWriter[QueryLog]:
+    """Writer compartilhado do processo para QueryLog."""
+    return _get_writer('query-log-writer', write_query_logs)
+
+
+def get_audit_log_writer() -> BufferedWriter[AuditLog]:
+    """Writer compartilhado do processo para AuditLog."""
+    return _get_writer('audit-log-writer', write_audit_logs)
+
+
+def shutdown_log_writers() -> None:
+    """Para todos os writers e grava o que ainda estiver na fila."""
+    with _lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.stop()
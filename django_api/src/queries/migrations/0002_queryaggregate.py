@@ -0,0 +1,42 @@
+# Generated by Django 6.0 on 2026-10-19 00:41
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0001_initial'),
+        ('queries', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueryAggregate',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('granularity', models.CharField(choices=[('HOUR', 'Hora'), ('DAY', 'Dia')], max_length=10)),
+                ('bucket_start', models.DateTimeField(help_text='Início da janela (hora ou dia)')),
+                ('query_count', models.IntegerField(default=0)),
+                ('total_latency_ms', models.BigIntegerField(default=0)),
+                ('max_latency_ms', models.IntegerField(default=0)),
+                ('tokens_used', models.BigIntegerField(default=0)),
+                ('latency_sketch', models.JSONField(blank=True, default=dict, help_text='Histograma log-linear {bucket: contagem}')),
+                ('top_queries', models.JSONField(blank=True, default=dict, help_text='Queries mais frequentes {texto: contagem}')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('organization', models.ForeignKey(blank=True, help_text='NULL se for agregado individual', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='query_aggregates', to='organizations.organization')),
+                ('user', models.ForeignKey(blank=True, help_text='NULL se for agregado da org', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='query_aggregates', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Agregado de Queries',
+                'verbose_name_plural': 'Agregados de Queries',
+                'db_table': 'query_aggregates',
+                'indexes': [models.Index(fields=['user', 'granularity', '-bucket_start'], name='query_aggre_user_id_b09c03_idx'), models.Index(fields=['organization', 'granularity', '-bucket_start'], name='query_aggre_organiz_3ce735_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('organization__isnull', True)), fields=('user', 'granularity', 'bucket_start'), name='unique_user_query_bucket'), models.UniqueConstraint(condition=models.Q(('organization__isnull', False)), fields=('organization', 'granularity', 'bucket_start'), name='unique_org_query_bucket')],
+            },
+        ),
+    ]
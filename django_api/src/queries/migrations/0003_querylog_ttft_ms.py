@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 01:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('queries', '0002_queryaggregate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='querylog',
+            name='ttft_ms',
+            field=models.IntegerField(blank=True, help_text='Tempo até o primeiro token (só respostas em streaming)', null=True),
+        ),
+    ]
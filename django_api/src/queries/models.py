@@ -26,6 +26,7 @@ class QueryLog(models.Model):
     answer_text = models.TextField(blank=True)
     citations = models.JSONField(default=list, blank=True, help_text='Lista de fontes/trechos usados') # type: ignore
     latency_ms = models.IntegerField(default=0)
+    ttft_ms = models.IntegerField(null=True, blank=True, help_text='Tempo até o primeiro token (só respostas em streaming)')
     tokens_used = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -82,3 +83,66 @@ class AuditLog(models.Model):
     def __str__(self):
         user_email = self.user.email if self.user else 'Sistema'
         return f"{user_email} - {self.action}"
+
+
+class QueryAggregate(models.Model):
+    """
+    Agregados pré-calculados de QueryLog por tenant e janela de tempo.
+
+    Mantidos incrementalmente pelo writer de logs; o tenant é a organização
+    quando a query é de organização, senão o usuário.
+    """
+    class GranularityChoices(models.TextChoices):
+        HOUR = 'HOUR', 'Hora'
+        DAY = 'DAY', 'Dia'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='query_aggregates',
+        help_text='NULL se for agregado da org'
+    )
+    organization = models.ForeignKey(
+        'organizations.Organization',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='query_aggregates',
+        help_text='NULL se for agregado individual'
+    )
+    granularity = models.CharField(max_length=10, choices=GranularityChoices)
+    bucket_start = models.DateTimeField(help_text='Início da janela (hora ou dia)')
+    query_count = models.IntegerField(default=0)
+    total_latency_ms = models.BigIntegerField(default=0)
+    max_latency_ms = models.IntegerField(default=0)
+    tokens_used = models.BigIntegerField(default=0)
+    latency_sketch = models.JSONField(default=dict, blank=True, help_text='Histograma log-linear {bucket: contagem}') # type: ignore
+    top_queries = models.JSONField(default=dict, blank=True, help_text='Queries mais frequentes {texto: contagem}') # type: ignore
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'query_aggregates'
+        verbose_name = 'Agregado de Queries'
+        verbose_name_plural = 'Agregados de Queries'
+        constraints = (
+            models.UniqueConstraint(
+                fields=['user', 'granularity', 'bucket_start'],
+                condition=models.Q(organization__isnull=True),
+                name='unique_user_query_bucket',
+            ),
+            models.UniqueConstraint(
+                fields=['organization', 'granularity', 'bucket_start'],
+                condition=models.Q(organization__isnull=False),
+                name='unique_org_query_bucket',
+            ),
+        )
+        indexes = (
+            models.Index(fields=['user', 'granularity', '-bucket_start']),
+            models.Index(fields=['organization', 'granularity', '-bucket_start']),
+        )
+
+    def __str__(self) -> str:
+        return f"{self.granularity} {self.bucket_start:%Y-%m-%d %H:%M} ({self.query_count} queries)"
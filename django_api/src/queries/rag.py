@@ -0,0 +1,178 @@
+import logging
+import time
+from contextlib import aclosing
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+
+from core.profiling import span
+from documents.services import DocumentSearchService
+from organizations.cache import ahas_role
+from organizations.exceptions import OrganizationAccessDeniedException
+from queries.clients import (
+    CONTEXT_MARKER,
+    estimate_tokens,
+    get_embedding_client,
+    get_llm_client,
+)
+from queries.dtos import RAGAnswer
+from queries.services import QueryLogService
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from uuid import UUID
+
+    from documents.dtos import ChunkSearchHit
+    from users.models import User
+
+logger = logging.getLogger(__name__)
+
+
+def build_prompt(query_text: str, hits: list[ChunkSearchHit]) -> str:
+    """Prompt com a pergunta e os trechos recuperados, numerados para citação"""
+    context = "\n\n".join(
+        f"[{n}] {hit.document_title} (trecho {hit.chunk_index}):\n{hit.text}"
+        for n, hit in enumerate(hits, start=1)
+    )
+    return (
+        "Responda à pergunta usando apenas o contexto abaixo e cite as fontes "
+        "pelo número entre colchetes.\n\n"
+        f"Pergunta: {query_text}\n\n"
+        f"{CONTEXT_MARKER}\n{context}"
+    )
+
+
+class RAGService:
+    """Service do fluxo RAG: embedding da pergunta, busca, geração e log"""
+
+    @staticmethod
+    async def acheck_access(user: User, organization_id: UUID | str | None) -> None:
+        """
+        Raises:
+            OrganizationAccessDeniedException: Se o usuário não pertence à organização
+        """
+        if organization_id is not None and not user.is_staff and not await ahas_role(user, organization_id):
+            raise OrganizationAccessDeniedException(organization_id=str(organization_id)) from None
+
+    @staticmethod
+    async def aanswer(
+        user: User,
+        query_text: str,
+        organization_id: UUID | str | None = None,
+        top_k: int | None = None,
+    ) -> RAGAnswer:
+        """
+        Responde a pergunta com base nos documentos do usuário/organização.
+
+        Todo o I/O (embedding, busca, LLM) é aguardado com ``await``: sob ASGI
+        a requisição não ocupa uma thread enquanto o provedor responde. O
+        QueryLog é enfileirado para gravação em lote.
+
+        Raises:
+            OrganizationAccessDeniedException: Se o usuário não pertence à organização
+        """
+        await RAGService.acheck_access(user, organization_id)
+
+        started = time.perf_counter()
+        hits, prompt = await RAGService._aretrieve(user, query_text, organization_id, top_k)
+        with span("llm"):
+            completion = await get_llm_client().complete(prompt, max_tokens=settings.RAG["MAX_TOKENS"])
+
+        answer = RAGAnswer(
+            answer=completion.text,
+            citations=[hit.to_citation() for hit in hits],
+            latency_ms=int((time.perf_counter() - started) * 1000),
+            tokens_used=completion.tokens_used,
+        )
+        await QueryLogService.arecord_query(
+            user_id=user.id,
+            organization_id=organization_id,
+            query_text=query_text,
+            answer_text=answer.answer,
+            citations=answer.citations,
+            latency_ms=answer.latency_ms,
+            tokens_used=answer.tokens_used,
+        )
+        return answer
+
+    @staticmethod
+    async def astream_answer(
+        user: User,
+        query_text: str,
+        organization_id: UUID | str | None = None,
+        top_k: int | None = None,
+    ) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+        """
+        Versão em streaming de aanswer(): gera eventos ``("token", {...})`` à
+        medida que o LLM produz e um ``("done", {...})`` final com citações e
+        métricas.
+
+        O acesso à organização deve ser verificado antes (acheck_access), para
+        que o erro saia como resposta normal e não no meio do stream.
+
+        Se o cliente desconectar, o iterador é fechado/cancelado: o stream do
+        provedor é encerrado junto (aclosing) e o QueryLog registra a resposta
+        parcial, com time-to-first-token separado da latência total.
+        """
+        started = time.perf_counter()
+        parts: list[str] = []
+        hits: list[ChunkSearchHit] = []
+        prompt = ""
+        ttft_ms: int | None = None
+        tokens_used: int | None = None
+        completed = False
+
+        def elapsed_ms() -> int:
+            return int((time.perf_counter() - started) * 1000)
+
+        try:
+            hits, prompt = await RAGService._aretrieve(user, query_text, organization_id, top_k)
+            llm_stream = get_llm_client().stream(prompt, max_tokens=settings.RAG["MAX_TOKENS"])
+            async with aclosing(llm_stream) as chunks:
+                async for chunk in chunks:
+                    if chunk.tokens_used is not None:
+                        tokens_used = chunk.tokens_used
+                    if not chunk.text:
+                        continue
+                    if ttft_ms is None:
+                        ttft_ms = elapsed_ms()
+                    parts.append(chunk.text)
+                    yield "token", {"text": chunk.text}
+
+            completed = True
+            yield "done", {
+                "citations": [hit.to_citation() for hit in hits],
+                "latency_ms": elapsed_ms(),
+                "ttft_ms": ttft_ms,
+                "tokens_used": tokens_used or estimate_tokens(prompt) + estimate_tokens("".join(parts)),
+            }
+        finally:
+            if not completed:
+                logger.info(f"Streaming RAG interrompido após {len(parts)} pedaços")
+            answer_text = "".join(parts)
+            await QueryLogService.arecord_query(
+                user_id=user.id,
+                organization_id=organization_id,
+                query_text=query_text,
+                answer_text=answer_text,
+                citations=[hit.to_citation() for hit in hits],
+                latency_ms=elapsed_ms(),
+                ttft_ms=ttft_ms,
+                tokens_used=tokens_used or estimate_tokens(prompt) + estimate_tokens(answer_text),
+            )
+
+    @staticmethod
+    async def _aretrieve(
+        user: User,
+        query_text: str,
+        organization_id: UUID | str | None,
+        top_k: int | None,
+    ) -> tuple[list[ChunkSearchHit], str]:
+        """Embedding da pergunta e busca dos trechos; devolve (hits, prompt)"""
+        with span("embedding"):
+            [embedding] = await get_embedding_client().embed([query_text])
+        with span("search"):
+            hits = await DocumentSearchService.asearch(
+                embedding, user.id, organization_id, top_k or settings.RAG["TOP_K"], plan=user.plan,
+            )
+        return hits, build_prompt(query_text, hits)
@@ -0,0 +1,92 @@
+from typing import TYPE_CHECKING
+
+from django.db import transaction
+
+from queries.models import QueryAggregate, QueryLog
+from queries.sketches import LatencyHistogram
+
+if TYPE_CHECKING:
+    from datetime import datetime
+    from uuid import UUID
+
+    from django.db.models import QuerySet
+
+    from queries.dtos import QueryAggregateDelta
+
+TOP_QUERIES_LIMIT = 50
+
+QUERY_LOG_LIST_FIELDS = (
+    "id", "organization_id", "query_text", "answer_text", "citations",
+    "latency_ms", "ttft_ms", "tokens_used", "created_at",
+)
+
+
+class QueryLogRepository:
+    """Repository para leitura do histórico de QueryLog"""
+
+    @staticmethod
+    def list_rows(user_id: UUID | str, organization_id: UUID | str | None = None) -> QuerySet:
+        """
+        Histórico (dicts): as consultas do usuário ou, com organization_id, as
+        da organização. Servido pelos índices (user|organization, -created_at)
+        """
+        if organization_id is not None:
+            logs = QueryLog.objects.filter(organization_id=organization_id)
+        else:
+            logs = QueryLog.objects.filter(user_id=user_id)
+        return logs.values(*QUERY_LOG_LIST_FIELDS)
+
+
+class QueryAggregateRepository:
+    """Repository para operações de QueryAggregate"""
+
+    @staticmethod
+    @transaction.atomic
+    def apply_delta(delta: QueryAggregateDelta) -> QueryAggregate:
+        """Soma a contribuição de um lote ao bucket (cria se não existir)"""
+        aggregate, _ = QueryAggregate.objects.select_for_update().get_or_create(
+            user_id=delta.user_id,
+            organization_id=delta.organization_id,
+            granularity=delta.granularity,
+            bucket_start=delta.bucket_start,
+        )
+
+        sketch = LatencyHistogram.from_dict(aggregate.latency_sketch)
+        sketch.merge(delta.latency_sketch)
+
+        top_queries = dict(aggregate.top_queries)
+        for text, count in delta.top_queries.items():
+            top_queries[text] = top_queries.get(text, 0) + count
+        # Mantém só as mais frequentes para o JSON não crescer sem limite
+        top_queries = dict(
+            sorted(top_queries.items(), key=lambda item: item[1], reverse=True)[:TOP_QUERIES_LIMIT]
+        )
+
+        aggregate.query_count += delta.query_count
+        aggregate.total_latency_ms += delta.total_latency_ms
+        aggregate.max_latency_ms = max(aggregate.max_latency_ms, delta.max_latency_ms)
+        aggregate.tokens_used += delta.tokens_used
+        aggregate.latency_sketch = sketch.to_dict()
+        aggregate.top_queries = top_queries
+        aggregate.save()
+        return aggregate
+
+    @staticmethod
+    def list_buckets(
+        granularity: str,
+        start: datetime,
+        end: datetime,
+        user_id: UUID | str | None = None,
+        organization_id: UUID | str | None = None,
+    ) -> list[QueryAggregate]:
+        """Lista os buckets do tenant no intervalo [start, end)"""
+        queryset = QueryAggregate.objects.filter(
+            granularity=granularity,
+            bucket_start__gte=start,
+            bucket_start__lt=end,
+        )
+        if organization_id is not None:
+            queryset = queryset.filter(organization_id=organization_id)
+        else:
+            queryset = queryset.filter(user_id=user_id, organization__isnull=True)
+        return list(queryset.order_by('bucket_start'))
@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import serializers
+
+from core.pagination import CursorPageSerializer
+from queries.models import QueryAggregate
+
+MAX_RANGE_DAYS = 366
+MAX_TOP_K = 20
+
+
+class QueryAnalyticsSerializer(serializers.Serializer):
+    """Serializer para os parâmetros do relatório de analytics"""
+
+    granularity = serializers.ChoiceField(
+        choices=QueryAggregate.GranularityChoices.choices,
+        default=QueryAggregate.GranularityChoices.DAY,
+    )
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    organization_id = serializers.UUIDField(required=False)
+
+    def validate(self, data: dict) -> dict: #type: ignore
+        """Validação global: intervalo padrão dos últimos 7 dias e limite de tamanho"""
+        end = data.get("end") or timezone.localdate()
+        start = data.get("start") or end - timedelta(days=6)
+        if start > end:
+            raise serializers.ValidationError({"start": "start deve ser anterior a end"})
+        if (end - start).days > MAX_RANGE_DAYS:
+            raise serializers.ValidationError({"start": f"Intervalo máximo de {MAX_RANGE_DAYS} dias"})
+        data["start"] = start
+        data["end"] = end
+        return data
+
+
+class QueryAskSerializer(serializers.Serializer):
+    """Serializer para uma pergunta ao RAG"""
+
+    query = serializers.CharField(max_length=4000)
+    organization_id = serializers.UUIDField(required=False)
+    top_k = serializers.IntegerField(min_value=1, max_value=MAX_TOP_K, required=False)
+
+
+class QueryHistorySerializer(CursorPageSerializer):
+    """Parâmetros do histórico de consultas"""
+
+    organization_id = serializers.UUIDField(required=False)
@@ -0,0 +1,130 @@
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from asgiref.sync import sync_to_async
+
+from core.pagination import CursorPage, KeysetPaginator
+from organizations.cache import has_role
+from organizations.exceptions import OrganizationAccessDeniedException
+from queries.log_writer import get_audit_log_writer, get_query_log_writer
+from queries.models import AuditLog, QueryLog
+from queries.repositories import QueryLogRepository
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from users.models import User
+
+HISTORY_PAGINATOR = KeysetPaginator(("-created_at", "-id"))
+
+
+class QueryLogService:
+    """Service para registro do histórico de consultas RAG"""
+
+    @staticmethod
+    def record_query(
+        user_id: UUID | str,
+        query_text: str,
+        answer_text: str = "",
+        citations: list[dict[str, Any]] | None = None,
+        latency_ms: int = 0,
+        tokens_used: int = 0,
+        organization_id: UUID | str | None = None,
+        ttft_ms: int | None = None,
+    ) -> bool:
+        """
+        Enfileira um QueryLog para gravação em lote, fora da requisição.
+
+        Returns:
+            bool: False se o registro foi descartado por backpressure
+        """
+        log = QueryLog(
+            user_id=user_id,
+            organization_id=organization_id,
+            query_text=query_text,
+            answer_text=answer_text,
+            citations=citations or [],
+            latency_ms=latency_ms,
+            ttft_ms=ttft_ms,
+            tokens_used=tokens_used,
+        )
+        return get_query_log_writer().submit(log)
+
+    @staticmethod
+    async def arecord_query(
+        user_id: UUID | str,
+        query_text: str,
+        answer_text: str = "",
+        citations: list[dict[str, Any]] | None = None,
+        latency_ms: int = 0,
+        tokens_used: int = 0,
+        organization_id: UUID | str | None = None,
+        ttft_ms: int | None = None,
+    ) -> bool:
+        """
+        Versão async de record_query(). Com o writer em background o submit
+        só enfileira; no modo síncrono a gravação sai do event loop.
+        """
+        record = partial(
+            QueryLogService.record_query,
+            user_id=user_id,
+            query_text=query_text,
+            answer_text=answer_text,
+            citations=citations,
+            latency_ms=latency_ms,
+            tokens_used=tokens_used,
+            organization_id=organization_id,
+            ttft_ms=ttft_ms,
+        )
+        if get_query_log_writer().async_mode:
+            return record()
+        return await sync_to_async(record)()
+
+    @staticmethod
+    def list_history(
+        user: User,
+        organization_id: UUID | str | None = None,
+        cursor: str | None = None,
+        page_size: int = 20,
+    ) -> CursorPage:
+        """
+        Histórico de consultas, da mais recente à mais antiga.
+
+        Raises:
+            OrganizationAccessDeniedException: Se o usuário não pertence à organização
+            InvalidCursorException: Se o cursor for inválido
+        """
+        if organization_id is not None and not user.is_staff and not has_role(user, organization_id):
+            raise OrganizationAccessDeniedException(organization_id=str(organization_id)) from None
+
+        rows = QueryLogRepository.list_rows(user.id, organization_id)
+        return HISTORY_PAGINATOR.paginate(rows, cursor, page_size)
+
+
+class AuditLogService:
+    """Service para registro de ações de auditoria"""
+
+    @staticmethod
+    def record_action(
+        action: str,
+        user_id: UUID | str | None = None,
+        organization_id: UUID | str | None = None,
+        resource_type: str = "",
+        resource_id: UUID | str | None = None,
+        ip_address: str | None = None,
+    ) -> bool:
+        """
+        Enfileira um AuditLog para gravação em lote, fora da requisição.
+
+        Returns:
+            bool: False se o registro foi descartado por backpressure
+        """
+        log = AuditLog(
+            user_id=user_id,
+            organization_id=organization_id,
+            action=action,
+            resource_type=resource_type,
+            resource_id=resource_id,
+            ip_address=ip_address,
+        )
+        return get_audit_log_writer().submit(log)
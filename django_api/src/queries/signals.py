@@ -0,0 +1,14 @@
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from queries.log_writer import shutdown_log_writers
+
+
+@receiver(setting_changed)
+def reset_log_writers(setting: str, **kwargs: object) -> None:
+    """
+    Recria os writers quando LOG_WRITER muda (override_settings): o writer
+    do processo guarda a configuração com que foi criado.
+    """
+    if setting == 'LOG_WRITER':
+        shutdown_log_writers()
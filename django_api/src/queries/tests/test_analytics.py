@@ -0,0 +1,184 @@
+import math
+from statistics import NormalDist
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from organizations.models import Organization, OrganizationMember
+from queries.analytics import QueryAnalyticsService
+from queries.models import QueryAggregate, QueryLog
+from queries.sketches import LatencyHistogram, bucket_bounds, bucket_index
+from users.models import User
+
+
+class LatencyHistogramTestCase(TestCase):
+    """Testes para queries.sketches.LatencyHistogram"""
+
+    def test_bucket_bounds_contain_value(self) -> None:
+        """
+        O que testa: Todo valor cai num bucket cujos limites o contêm
+        Resultado esperado [PASS]: low <= valor <= high para 0..100000
+        """
+        for value in [*range(2000), 10_000, 65_535, 100_000]:
+            low, high = bucket_bounds(bucket_index(value))
+            self.assertLessEqual(low, value)
+            self.assertGreaterEqual(high, value)
+
+    def test_percentiles_within_relative_error(self) -> None:
+        """
+        O que testa: Percentis do sketch ficam próximos dos percentis exatos
+        Resultado esperado [PASS]: erro relativo de p50/p95 abaixo de 5%
+        """
+        # Amostra log-normal determinística: quantis igualmente espaçados
+        normal = NormalDist(5, 1)
+        values = [int(math.exp(normal.inv_cdf((n + 0.5) / 10_000))) for n in range(10_000)]
+        sketch = LatencyHistogram()
+        sketch.record_many(values)
+
+        for q in (50, 95):
+            exact = values[round(len(values) * q / 100) - 1]
+            self.assertAlmostEqual(sketch.percentile(q), exact, delta=exact * 0.05)
+
+    def test_merge_and_roundtrip(self) -> None:
+        """
+        O que testa: Mesclar sketches e serializar para JSON preserva contagens
+        Resultado esperado [PASS]: total 4 e mesmo p50 após from_dict(to_dict())
+        """
+        a = LatencyHistogram()
+        a.record_many([10, 20])
+        b = LatencyHistogram()
+        b.record_many([30, 400])
+
+        merged = LatencyHistogram.from_dict(a.merge(b).to_dict())
+
+        self.assertEqual(merged.total, 4)
+        self.assertEqual(merged.percentile(50), a.percentile(50))
+        self.assertIsNone(LatencyHistogram().percentile(50))
+
+
+class QueryAnalyticsServiceTestCase(TestCase):
+    """Testes para QueryAnalyticsService"""
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            username="testuser",
+            password=None,
+        )
+        self.organization = Organization.objects.create(name="Acme", slug="acme")
+
+    def _log(
+        self, query_text: str, latency_ms: int, tokens_used: int = 10, organization: Organization | None = None,
+    ) -> QueryLog:
+        return QueryLog(
+            user=self.user,
+            organization=organization,
+            query_text=query_text,
+            latency_ms=latency_ms,
+            tokens_used=tokens_used,
+            created_at=timezone.now(),
+        )
+
+    def test_apply_batch_builds_hour_and_day_buckets(self) -> None:
+        """
+        O que testa: Um lote gera buckets HOUR e DAY por tenant
+        Resultado esperado [PASS]:
+        - 4 agregados (usuário e organização x HOUR e DAY)
+        - Contagens e tokens somados por tenant
+        """
+        logs = [
+            self._log("O que é RAG?", 100),
+            self._log("o que é   rag?", 300),
+            self._log("Política de férias", 50, organization=self.organization),
+        ]
+
+        updated = QueryAnalyticsService.apply_batch(logs)
+
+        self.assertEqual(updated, 4)
+        day = QueryAggregate.objects.get(
+            user=self.user,
+            organization__isnull=True,
+            granularity=QueryAggregate.GranularityChoices.DAY,
+        )
+        self.assertEqual(day.query_count, 2)
+        self.assertEqual(day.tokens_used, 20)
+        self.assertEqual(day.max_latency_ms, 300)
+        self.assertEqual(day.top_queries, {"o que é rag?": 2})
+        self.assertTrue(
+            QueryAggregate.objects.filter(organization=self.organization, user__isnull=True).exists()
+        )
+
+    def test_apply_batch_is_incremental(self) -> None:
+        """
+        O que testa: Lotes sucessivos somam no mesmo bucket
+        Resultado esperado [PASS]: query_count acumulado e sketch mesclado
+        """
+        QueryAnalyticsService.apply_batch([self._log("a", 100)])
+        QueryAnalyticsService.apply_batch([self._log("a", 200), self._log("b", 300)])
+
+        hour = QueryAggregate.objects.get(granularity=QueryAggregate.GranularityChoices.HOUR)
+        self.assertEqual(hour.query_count, 3)
+        self.assertEqual(LatencyHistogram.from_dict(hour.latency_sketch).total, 3)
+        self.assertEqual(hour.top_queries["a"], 2)
+
+
+class QueryAnalyticsViewTestCase(TestCase):
+    """Testes para GET /api/queries/analytics/"""
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.url = reverse("queries:analytics")
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            username="testuser",
+            password=None,
+        )
+        self.organization = Organization.objects.create(name="Acme", slug="acme")
+        self.client.force_authenticate(self.user)
+
+    def test_report_success(self) -> None:
+        """
+        O que testa: Relatório diário com p50/p95 e top queries
+        Resultado esperado [PASS]:
+        - Status HTTP: 200
+        - summary.query_count == 2 e top query 'rag'
+        """
+        QueryAnalyticsService.apply_batch([
+            QueryLog(user=self.user, query_text="rag", latency_ms=100, created_at=timezone.now()),
+            QueryLog(user=self.user, query_text="rag", latency_ms=200, created_at=timezone.now()),
+        ])
+
+        response = self.client.get(self.url, {"granularity": "DAY"})
+
+        self.assertEqual(response.status_code, 200)
+        summary = response.json()["data"]["summary"]
+        self.assertEqual(summary["query_count"], 2)
+        self.assertEqual(summary["top_queries"][0], {"query": "rag", "count": 2})
+        self.assertIsNotNone(summary["p95_latency_ms"])
+
+    def test_report_organization_requires_membership(self) -> None:
+        """
+        O que testa: Relatório de organização sem ser membro
+        Resultado esperado [FAIL]: Status HTTP 403 até o usuário virar membro
+        """
+        params = {"organization_id": str(self.organization.id)}
+
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 403)
+
+        OrganizationMember.objects.create(organization=self.organization, user=self.user)
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+
+    def test_report_unauthenticated(self) -> None:
+        """
+        O que testa: Acesso sem autenticação
+        Resultado esperado [FAIL]: Status HTTP 401
+        """
+        self.client.force_authenticate(None)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 401)
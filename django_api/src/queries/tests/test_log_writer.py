@@ -0,0 +1,194 @@
+import threading
+from unittest import mock
+
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+
+from core.buffered_writer import BufferedWriter
+from queries import log_writer
+from queries.analytics import QueryAnalyticsService
+from queries.models import AuditLog, QueryAggregate, QueryLog
+from queries.services import AuditLogService, QueryLogService
+from users.models import User
+
+
+class BufferedWriterTestCase(TestCase):
+    """Testes para core.buffered_writer.BufferedWriter"""
+
+    def test_flush_on_batch_size(self) -> None:
+        """
+        O que testa: Thread de fundo grava quando o lote atinge batch_size
+        Resultado esperado [PASS]:
+        - flush_func chamada com lotes de no máximo 2 registros
+        - Todos os 4 registros gravados
+        """
+        batches = []
+        done = threading.Event()
+
+        def flush(batch: list) -> None:
+            batches.append(list(batch))
+            if sum(len(b) for b in batches) == 4:
+                done.set()
+
+        writer = BufferedWriter(flush, batch_size=2, flush_interval=5.0)
+        for i in range(4):
+            writer.submit(i)
+
+        self.assertTrue(done.wait(2))
+        writer.stop()
+        self.assertTrue(all(len(b) <= 2 for b in batches))
+        self.assertEqual(sorted(r for b in batches for r in b), [0, 1, 2, 3])
+
+    def test_stop_flushes_pending_records(self) -> None:
+        """
+        O que testa: Graceful shutdown grava o que ainda está na fila
+        Resultado esperado [PASS]: stop() entrega todos os registros pendentes
+        """
+        written = []
+        writer = BufferedWriter(written.extend, batch_size=100, flush_interval=60.0)
+        for i in range(10):
+            writer.submit(i)
+
+        writer.stop()
+
+        self.assertEqual(sorted(written), list(range(10)))
+        self.assertEqual(writer.pending, 0)
+
+    def test_backpressure_drops_when_queue_full(self) -> None:
+        """
+        O que testa: Fila limitada descarta registros quando está cheia
+        Resultado esperado [PASS]:
+        - submit retorna False para o excedente
+        - dropped contabiliza os descartes
+        """
+        release = threading.Event()
+        writer = BufferedWriter(
+            lambda batch: release.wait(2),
+            batch_size=1,
+            flush_interval=0.01,
+            max_queue_size=1,
+            block_timeout=0.01,
+        )
+
+        with self.assertLogs("core.buffered_writer", level="WARNING"):
+            results = [writer.submit(i) for i in range(5)]
+        release.set()
+        writer.stop()
+
+        self.assertFalse(all(results))
+        self.assertEqual(writer.dropped, results.count(False))
+
+    def test_sync_mode_writes_inline(self) -> None:
+        """
+        O que testa: async_mode=False grava na thread chamadora
+        Resultado esperado [PASS]: registro gravado antes de submit retornar
+        """
+        written = []
+        writer = BufferedWriter(written.extend, async_mode=False)
+
+        writer.submit("a")
+
+        self.assertEqual(written, ["a"])
+
+    def test_flush_errors_are_logged_not_raised(self) -> None:
+        """
+        O que testa: Falha na gravação não propaga para quem enfileira
+        Resultado esperado [PASS]: nenhuma exceção lançada
+        """
+        def broken(batch: list) -> None:
+            msg = "db down"
+            raise RuntimeError(msg)
+
+        writer = BufferedWriter(broken, async_mode=False)
+
+        with self.assertLogs("core.buffered_writer", level="ERROR"):
+            self.assertTrue(writer.submit("a"))
+
+
+@override_settings(LOG_WRITER={
+    'ASYNC': False,
+    'BATCH_SIZE': 500,
+    'FLUSH_INTERVAL': 1.0,
+    'MAX_QUEUE_SIZE': 100,
+    'BLOCK_TIMEOUT': 0.01,
+    'RETRIES': 1,
+    'RETRY_DELAY': 0,
+})
+class LogServiceTestCase(TestCase):
+    """Testes para QueryLogService e AuditLogService"""
+
+    def setUp(self) -> None:
+        log_writer.shutdown_log_writers()
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            username="testuser",
+            password=None,
+        )
+
+    def tearDown(self) -> None:
+        log_writer.shutdown_log_writers()
+
+    def test_record_query_persists_log(self) -> None:
+        """
+        O que testa: QueryLogService.record_query grava QueryLog via writer
+        Resultado esperado [PASS]: QueryLog criado com latência e tokens
+        """
+        QueryLogService.record_query(
+            user_id=self.user.id,
+            query_text="O que é RAG?",
+            answer_text="Retrieval-Augmented Generation",
+            latency_ms=120,
+            tokens_used=42,
+        )
+
+        log = QueryLog.objects.get(user=self.user)
+        self.assertEqual(log.latency_ms, 120)
+        self.assertEqual(log.tokens_used, 42)
+        self.assertEqual(log.citations, [])
+
+    def test_record_action_persists_audit_log(self) -> None:
+        """
+        O que testa: AuditLogService.record_action grava AuditLog via writer
+        Resultado esperado [PASS]: AuditLog criado com action 'LOGIN'
+        """
+        AuditLogService.record_action("LOGIN", user_id=self.user.id, ip_address="127.0.0.1")
+
+        log = AuditLog.objects.get(user=self.user)
+        self.assertEqual(log.action, "LOGIN")
+        self.assertEqual(log.ip_address, "127.0.0.1")
+
+    def test_query_log_batch_is_atomic(self) -> None:
+        """
+        O que testa: Falha ao atualizar os agregados depois do INSERT dos logs
+        Resultado esperado [FAIL]: Lote inteiro desfeito (nem QueryLog nem agregados), erro registrado
+        """
+        with mock.patch.object(QueryAnalyticsService, "apply_batch", side_effect=ValueError("falhou")), \
+                self.assertLogs("core.buffered_writer", level="ERROR"):
+            QueryLogService.record_query(user_id=self.user.id, query_text="Pergunta", latency_ms=10)
+
+        self.assertFalse(QueryLog.objects.exists())
+        self.assertFalse(QueryAggregate.objects.exists())
+
+    def test_query_log_batch_is_retried(self) -> None:
+        """
+        O que testa: Erro transitório (deadlock/lock) na primeira tentativa
+        Resultado esperado [PASS]: Lote gravado uma vez na segunda tentativa, com os agregados
+        """
+        apply_batch = QueryAnalyticsService.apply_batch
+        attempts = []
+
+        def flaky(records: list) -> None:
+            attempts.append(len(records))
+            if len(attempts) == 1:
+                msg = "deadlock"
+                raise OperationalError(msg)
+            return apply_batch(records)
+
+        with mock.patch.object(QueryAnalyticsService, "apply_batch", side_effect=flaky), \
+                self.assertLogs("queries.log_writer", level="WARNING"):
+            QueryLogService.record_query(user_id=self.user.id, query_text="Pergunta", latency_ms=10)
+
+        self.assertEqual(attempts, [1, 1])
+        self.assertEqual(QueryLog.objects.count(), 1)
+        self.assertTrue(QueryAggregate.objects.filter(user=self.user).exists())
+
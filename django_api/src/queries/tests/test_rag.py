@@ -0,0 +1,259 @@
+import asyncio
+import json
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from documents.models import Document, DocumentChunk
+from documents.repositories import DocumentChunkRepository
+from documents.vectors import format_embedding
+from organizations.models import Organization
+from queries.clients import Completion, CompletionChunk, LLMClient, LocalEmbeddingClient
+from queries.models import QueryLog
+from queries.rag import RAGService
+from queries.views import QueryAskView
+from users.models import User
+from users.services import TokenService
+from users.views import LoginView, RefreshTokenView, SignUpView
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+SYNC_LOG_WRITER = {**settings.LOG_WRITER, "ASYNC": False}
+
+
+class RAGTestMixin:
+    """Cria um documento indexado com embeddings do backend local"""
+
+    def create_document(
+        self, user: User, texts: list[str], organization: Organization | None = None,
+    ) -> Document:
+        client = LocalEmbeddingClient(settings.RAG["EMBEDDING_DIMENSIONS"])
+        document = Document.objects.create(
+            user=user,
+            organization=organization,
+            title="Manual",
+            status=Document.StatusChoices.INDEXED,
+        )
+        DocumentChunk.objects.bulk_create([
+            DocumentChunk(
+                document=document,
+                chunk_index=index,
+                text=text,
+                embedding=format_embedding(client.embed_one(text)),
+            )
+            for index, text in enumerate(texts)
+        ])
+        return document
+
+
+class DocumentChunkSearchTestCase(RAGTestMixin, TestCase):
+    """Testes para DocumentChunkRepository.search_exact()"""
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            username="testuser",
+            password=None,
+        )
+        self.client_embeddings = LocalEmbeddingClient(settings.RAG["EMBEDDING_DIMENSIONS"])
+
+    def test_returns_most_similar_chunks_in_scope(self) -> None:
+        """
+        O que testa: Busca exata ordenada por cosseno, só nos documentos do usuário
+        Resultado esperado [PASS]:
+        - Trecho sobre férias em primeiro
+        - Documento de outro usuário não aparece
+        """
+        self.create_document(self.user, [
+            "política de férias: trinta dias por ano",
+            "horário de almoço das 12h às 13h",
+        ])
+        other = User.objects.create_user(email="o@example.com", username="o", password=None)
+        self.create_document(other, ["política de férias de outra empresa"])
+
+        hits = DocumentChunkRepository.search_exact(
+            self.client_embeddings.embed_one("qual a política de férias"),
+            self.user.id,
+            top_k=5,
+        )
+
+        self.assertEqual(len(hits), 2)
+        self.assertEqual(hits[0].chunk_index, 0)
+        self.assertGreater(hits[0].score, hits[1].score)
+
+
+class QueryAskViewTestCase(RAGTestMixin, TestCase):
+    """Testes para POST /api/queries/ask/"""
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.url = reverse("queries:ask")
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            username="testuser",
+            password=None,
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_views_are_async(self) -> None:
+        """
+        O que testa: Endpoints de auth e RAG despachados como corrotinas
+        Resultado esperado [PASS]: as_view() é coroutine function
+        """
+        for view in (SignUpView, LoginView, RefreshTokenView, QueryAskView):
+            self.assertTrue(iscoroutinefunction(view.as_view()), view.__name__)
+
+    @override_settings(LOG_WRITER=SYNC_LOG_WRITER)
+    def test_ask_success(self) -> None:
+        """
+        O que testa: Pergunta respondida com citações e registrada no QueryLog
+        Resultado esperado [PASS]:
+        - Status HTTP: 200
+        - Citação do trecho relevante
+        - QueryLog com resposta e tokens
+        """
+        document = self.create_document(self.user, ["política de férias: trinta dias por ano"])
+
+        response = self.client.post(self.url, {"query": "política de férias"}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertIn("trinta dias", data["answer"])
+        self.assertEqual(data["citations"][0]["document_id"], str(document.id))
+
+        log = QueryLog.objects.get(user=self.user)
+        self.assertEqual(log.answer_text, data["answer"])
+        self.assertEqual(log.tokens_used, data["tokens_used"])
+
+    def test_ask_organization_requires_membership(self) -> None:
+        """
+        O que testa: Pergunta nos documentos de uma organização sem ser membro
+        Resultado esperado [FAIL]: Status HTTP 403
+        """
+        organization = Organization.objects.create(name="Acme", slug="acme")
+
+        response = self.client.post(
+            self.url,
+            {"query": "férias", "organization_id": str(organization.id)},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_ask_validation_error(self) -> None:
+        """
+        O que testa: Pergunta vazia
+        Resultado esperado [FAIL]: Status HTTP 422
+        """
+        response = self.client.post(self.url, {"query": ""}, format="json")
+
+        self.assertEqual(response.status_code, 422)
+
+
+class FakeStreamingLLM(LLMClient):
+    """LLM que gera tokens sem fim e registra se o stream foi encerrado"""
+
+    def __init__(self) -> None:
+        self.closed = False
+
+    async def complete(self, prompt: str, *, max_tokens: int) -> Completion:
+        raise NotImplementedError
+
+    async def stream(self, prompt: str, *, max_tokens: int) -> AsyncIterator[CompletionChunk]:
+        try:
+            while True:
+                yield CompletionChunk(text="token ")
+                await asyncio.sleep(0)
+        finally:
+            self.closed = True
+
+
+@override_settings(LOG_WRITER=SYNC_LOG_WRITER)
+class QueryAskStreamTestCase(RAGTestMixin, TestCase):
+    """Testes para POST /api/queries/ask/stream/ e RAGService.astream_answer()"""
+
+    def setUp(self) -> None:
+        self.url = reverse("queries:ask-stream")
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            username="testuser",
+            password=None,
+        )
+        self.create_document(self.user, ["política de férias: trinta dias por ano"])
+        self.token = TokenService.generate_tokens_for_user(self.user)["jwt-access"]
+
+    async def test_stream_success(self) -> None:
+        """
+        O que testa: Resposta em SSE com tokens e evento final
+        Resultado esperado [PASS]:
+        - Content-Type text/event-stream
+        - Eventos token e um done com ttft_ms <= latency_ms
+        - QueryLog com a resposta completa e ttft_ms
+        """
+        response = await self.async_client.post(
+            self.url,
+            {"query": "política de férias"},
+            content_type="application/json",
+            headers={"Authorization": f"Bearer {self.token}", "Accept": "text/event-stream"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/event-stream"))
+        body = b"".join([chunk async for chunk in response.streaming_content]).decode()
+        events = [block.split("\n") for block in body.strip().split("\n\n")]
+        names = [lines[0].removeprefix("event: ") for lines in events]
+        self.assertEqual(names[-1], "done")
+        self.assertIn("token", names)
+
+        done = json.loads(events[-1][1].removeprefix("data: "))
+        self.assertLessEqual(done["ttft_ms"], done["latency_ms"])
+        answer = "".join(
+            json.loads(lines[1].removeprefix("data: "))["text"]
+            for lines in events if lines[0] == "event: token"
+        )
+
+        log = await QueryLog.objects.aget(user=self.user)
+        self.assertEqual(log.answer_text, answer)
+        self.assertEqual(log.ttft_ms, done["ttft_ms"])
+
+    async def test_stream_error_before_streaming(self) -> None:
+        """
+        O que testa: Organização sem acesso com Accept text/event-stream
+        Resultado esperado [FAIL]: Status HTTP 403 com um evento error
+        """
+        organization = await Organization.objects.acreate(name="Acme", slug="acme")
+
+        response = await self.async_client.post(
+            self.url,
+            {"query": "férias", "organization_id": str(organization.id)},
+            content_type="application/json",
+            headers={"Authorization": f"Bearer {self.token}", "Accept": "text/event-stream"},
+        )
+
+        self.assertEqual(response.status_code, 403)
+        self.assertTrue(response.content.startswith(b"event: error\n"))
+
+    async def test_disconnect_cancels_upstream(self) -> None:
+        """
+        O que testa: Cliente desconecta no meio da resposta
+        Resultado esperado [PASS]:
+        - Stream do LLM encerrado (geração cancelada)
+        - QueryLog com a resposta parcial
+        """
+        llm = FakeStreamingLLM()
+        with patch("queries.rag.get_llm_client", return_value=llm):
+            events = RAGService.astream_answer(self.user, "política de férias")
+            for _ in range(3):
+                await anext(events)
+            await events.aclose()
+
+        self.assertTrue(llm.closed)
+        log = await QueryLog.objects.aget(user=self.user)
+        self.assertEqual(log.answer_text, "token token token ")
+        self.assertIsNotNone(log.ttft_ms)
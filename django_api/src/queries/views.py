@@ -1,3 +1,191 @@
-from django.shortcuts import render
+import logging
+from contextlib import aclosing
+from typing import TYPE_CHECKING
 
-# Create your views here.
+from django.http import StreamingHttpResponse
+from rest_framework import generics, status
+from rest_framework.response import Response
+
+from core.async_views import AsyncAPIViewMixin
+from core.renderers import EventStreamRenderer, FastJSONRenderer, format_sse
+from queries.analytics import QueryAnalyticsService
+from queries.rag import RAGService
+from queries.serializers import (
+    QueryAnalyticsSerializer,
+    QueryAskSerializer,
+    QueryHistorySerializer,
+)
+from queries.services import QueryLogService
+from users.response_handler import APIResponse
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from rest_framework.request import Request
+
+logger = logging.getLogger(__name__)
+
+
+class QueryAnalyticsView(generics.GenericAPIView):
+    """
+    API endpoint for query analytics (p50/p95 latency, tokens, top queries).
+
+    GET /api/queries/analytics/?granularity=DAY&start=2025-12-01&end=2025-12-07
+    GET /api/queries/analytics/?organization_id=<uuid>
+    """
+
+    serializer_class = QueryAnalyticsSerializer
+
+    def get(self, request: Request) -> Response:
+        """Retorna o relatório a partir dos agregados pré-calculados"""
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        report = QueryAnalyticsService.get_report(
+            user=request.user,
+            granularity=params["granularity"],
+            start=params["start"],
+            end=params["end"],
+            organization_id=params.get("organization_id"),
+        )
+
+        response = APIResponse(
+            status_code=status.HTTP_200_OK,
+            message="Query analytics retrieved successfully",
+            data=report,
+        )
+
+        return Response(
+            data=response.to_dict(),
+            status=status.HTTP_200_OK,
+        )
+
+
+class QueryHistoryView(generics.GenericAPIView):
+    """
+    API endpoint for the query history, newest first, with cursor pagination.
+
+    GET /api/queries/history/?page_size=20
+    GET /api/queries/history/?organization_id=<uuid>&cursor=<next_cursor>
+    """
+
+    serializer_class = QueryHistorySerializer
+
+    def get(self, request: Request) -> Response:
+        """Retorna uma página do histórico e o cursor da próxima"""
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        page = QueryLogService.list_history(
+            user=request.user,
+            organization_id=params.get("organization_id"),
+            cursor=params.get("cursor"),
+            page_size=params["page_size"],
+        )
+
+        response = APIResponse(
+            status_code=status.HTTP_200_OK,
+            message="Query history retrieved successfully",
+            data=page.to_dict(),
+        )
+
+        return Response(
+            data=response.to_dict(),
+            status=status.HTTP_200_OK,
+        )
+
+
+class QueryAskView(AsyncAPIViewMixin, generics.GenericAPIView):
+    """
+    API endpoint for RAG questions (async: does not hold a worker while the
+    LLM answers).
+
+    POST /api/queries/ask/
+    {
+        "query": "Qual é a política de férias?",
+        "organization_id": "<uuid>",
+        "top_k": 5
+    }
+    """
+
+    serializer_class = QueryAskSerializer
+
+    async def post(self, request: Request) -> Response:
+        """Responde a pergunta com base nos documentos"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        answer = await RAGService.aanswer(
+            user=request.user,
+            query_text=params["query"],
+            organization_id=params.get("organization_id"),
+            top_k=params.get("top_k"),
+        )
+
+        response = APIResponse(
+            status_code=status.HTTP_200_OK,
+            message="Query answered successfully",
+            data=answer.to_dict(),
+        )
+
+        return Response(
+            data=response.to_dict(),
+            status=status.HTTP_200_OK,
+        )
+
+
+class QueryAskStreamView(AsyncAPIViewMixin, generics.GenericAPIView):
+    """
+    API endpoint for RAG questions answered as Server-Sent Events.
+
+    POST /api/queries/ask/stream/  (Accept: text/event-stream)
+    {
+        "query": "Qual é a política de férias?",
+        "organization_id": "<uuid>",
+        "top_k": 5
+    }
+
+    Eventos: ``token`` ({"text"}) a cada pedaço gerado, ``done`` com
+    citations, latency_ms, ttft_ms e tokens_used, ou ``error``.
+    """
+
+    serializer_class = QueryAskSerializer
+    renderer_classes = (FastJSONRenderer, EventStreamRenderer)
+
+    async def post(self, request: Request) -> StreamingHttpResponse:
+        """Valida e abre o stream; erros até aqui saem como resposta normal"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        await RAGService.acheck_access(request.user, params.get("organization_id"))
+
+        events = RAGService.astream_answer(
+            user=request.user,
+            query_text=params["query"],
+            organization_id=params.get("organization_id"),
+            top_k=params.get("top_k"),
+        )
+        response = StreamingHttpResponse(
+            self._to_sse(events),
+            content_type="text/event-stream; charset=utf-8",
+        )
+        response["Cache-Control"] = "no-cache"
+        # Desliga o buffering de proxies (nginx) para os tokens saírem na hora
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    @staticmethod
+    async def _to_sse(events: AsyncIterator[tuple[str, dict]]) -> AsyncIterator[str]:
+        # Em desconexão o Django cancela este iterador; fechar ``events``
+        # encerra o stream do provedor e grava o QueryLog parcial
+        async with aclosing(events):
+            try:
+                async for event, data in events:
+                    yield format_sse(event, data)
+            except Exception:
+                logger.exception("Falha no streaming RAG")
+                yield format_sse("error", {"code": "stream_error", "message": "Erro ao gerar a resposta"})
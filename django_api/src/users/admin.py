@@ -1,10 +1,11 @@
 from django.contrib import admin
 
+from core.admin import LargeTableAdmin
 from users.models import User
 
 
 @admin.register(User)
-class UserAdmin(admin.ModelAdmin):
+class UserAdmin(LargeTableAdmin):
     list_display = ('email', 'username', 'plan', 'user_type', 'is_active', 'created_at')
     list_filter = ('is_active', 'plan', 'user_type', 'created_at')
     search_fields = ('email', 'username')
@@ -0,0 +1,87 @@
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from users.models import User
+from users.token_denylist import TokenDenylist
+
+if TYPE_CHECKING:
+    from rest_framework_simplejwt.tokens import Token
+
+
+class ClaimsUser(TokenUser):
+    """
+    Usuário leve construído apenas com as claims assinadas do JWT.
+
+    Expõe id, email, username, plan, user_type, is_staff e as organizações
+    ({org_id: role}) sem tocar no banco. Qualquer outro atributo cai no model
+    completo, buscado uma única vez sob demanda em ``instance``.
+    """
+
+    def __str__(self) -> str:
+        return self.email
+
+    @cached_property
+    def id(self) -> UUID:  # type: ignore[override]
+        return UUID(str(self.token[api_settings.USER_ID_CLAIM]))
+
+    @cached_property
+    def email(self) -> str:
+        return self.token.get("email", "")
+
+    @cached_property
+    def plan(self) -> str:
+        return self.token.get("plan", User.PlanChoices.FREE)
+
+    @cached_property
+    def user_type(self) -> str | None:
+        return self.token.get("user_type")
+
+    @cached_property
+    def organizations(self) -> dict[str, str]:
+        return dict(self.token.get("orgs", []))
+
+    @cached_property
+    def instance(self) -> User:
+        """Model completo do usuário (1 query, só quando necessário)"""
+        user = User.objects.filter(id=self.id, is_active=True).first()
+        if user is None:
+            msg = "Usuário não encontrado ou inativo"
+            raise AuthenticationFailed(msg, code="user_not_found")
+        return user
+
+    def __getattr__(self, attr: str) -> object:
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        if attr in self.token:
+            return self.token[attr]
+        return getattr(self.instance, attr)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Autenticação JWT sem consulta ao banco por requisição.
+
+    Confia nas claims assinadas por TokenService.generate_tokens_for_user e só
+    consulta o cache para saber se o token foi revogado: pelo jti (logout) ou
+    por ter sido emitido antes do carimbo do usuário (desativação, mudança de
+    is_staff ou de plano; ver TokenDenylist).
+    """
+
+    def get_user(self, validated_token: Token) -> ClaimsUser:  # type: ignore[override]
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            msg = "Token sem identificação de usuário"
+            raise InvalidToken(msg)
+
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        if TokenDenylist.is_revoked(jti, user_id, validated_token.get("iat")):
+            msg = "Token revogado"
+            raise InvalidToken(msg)
+
+        return ClaimsUser(validated_token)
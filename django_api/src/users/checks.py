@@ -0,0 +1,37 @@
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# Backends cujo conteúdo não é visto pelos outros processos
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from django.apps import AppConfig
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs: Sequence[AppConfig] | None, **kwargs: object) -> list[Error]:
+    """
+    SHARED_CACHE_ALIAS guarda a revogação de tokens, os papéis por
+    organização (organizations.cache) e a versão do catálogo de planos
+    (plans.catalog): num cache local ao processo, um logout, um usuário
+    desativado, um papel removido ou um plano alterado só valeria no worker
+    que tratou a mudança.
+    """
+    alias = settings.SHARED_CACHE_ALIAS
+    backend = settings.CACHES.get(alias, {}).get("BACKEND")
+    if backend is None:
+        return [Error(f"SHARED_CACHE_ALIAS '{alias}' não está em CACHES.", id="users.E001")]
+    if backend in PROCESS_LOCAL_CACHES:
+        return [Error(
+            f"O cache '{alias}' (SHARED_CACHE_ALIAS) usa {backend}, que não é compartilhado entre processos.",
+            hint="Configure CACHE_BACKEND/CACHE_LOCATION com Redis ou Memcached, ou aponte SHARED_CACHE_ALIAS para um.",
+            id="users.E002",
+        )]
+    return []
@@ -1,10 +1,10 @@
 from dataclasses import dataclass
-from os import access
-from venv import create
 
+from core.dtos import DTO
 
-@dataclass(frozen=True)
-class UserRegistrationDTO:
+
+@dataclass(frozen=True, slots=True)
+class UserRegistrationDTO(DTO):
     """DTO para registro de novo usuário"""
     email: str
     username: str
@@ -12,15 +12,15 @@ class UserRegistrationDTO:
     plan: str = "FREE"
     user_type: str = "INDIVIDUAL"
 
-@dataclass(frozen=True)
-class UserLoginDTO:
+@dataclass(frozen=True, slots=True)
+class UserLoginDTO(DTO):
     """DTO para autenticação de usuário"""
     email: str
     password: str
     remember_me: bool = False
 
-@dataclass(frozen=True)
-class UserResponseDTO:
+@dataclass(frozen=True, slots=True)
+class UserResponseDTO(DTO):
     """DTO de resposta com dados de usuário autenticado"""
     id: str
     email: str
@@ -114,3 +114,16 @@ class PlanNotFoundException(BaseException):
             status_code=status.HTTP_404_NOT_FOUND,
             error_code="plan_not_found",
         )
+
+
+class LoginThrottledException(BaseException):
+    """Exception raised when too many logins are being verified at once."""
+
+    def __init__(self, message: str | None = None) -> None:
+        if message is None:
+            message = "Too many login attempts in progress. Try again shortly."
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            error_code="login_throttled",
+        )
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2 com número de iterações configurável (PASSWORD_HASHING).
+
+    Mantém o mesmo ``algorithm`` do Django, então hashes existentes continuam
+    válidos; se as iterações mudarem, o hash é regravado no próximo login.
+    """
+
+    def __init__(self) -> None:
+        iterations = settings.PASSWORD_HASHING['PBKDF2_ITERATIONS']
+        if iterations:
+            self.iterations = iterations
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2 com custo de tempo, memória e paralelismo configuráveis
+    (PASSWORD_HASHING). Requer a dependência opcional argon2-cffi.
+    """
+
+    def __init__(self) -> None:
+        config = settings.PASSWORD_HASHING
+        self.time_cost = config['ARGON2_TIME_COST']
+        self.memory_cost = config['ARGON2_MEMORY_COST']
+        self.parallelism = config['ARGON2_PARALLELISM']
@@ -68,6 +68,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     user_type = models.CharField(max_length=50, choices=UserTypeChoices, blank=True, null=True)
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
+    # Tokens emitidos antes disto são inválidos (users.token_denylist)
+    tokens_valid_after = models.DateTimeField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -0,0 +1,137 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+
+from users.exceptions import LoginThrottledException
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from users.models import User
+
+
+class PasswordVerifier:
+    """
+    Verificação de senha num pool de threads dedicado.
+
+    O hash (PBKDF2/Argon2) é CPU-bound e libera o GIL, então um pool do tamanho
+    dos núcleos disponíveis aproveita a máquina sem deixar uma rajada de logins
+    saturar todos os workers. O número de verificações em andamento ou na fila
+    é limitado; acima disso o login falha rápido com 503 em vez de empilhar.
+
+    As variantes ``a*`` aguardam o pool sem bloquear o event loop (ASGI).
+    """
+
+    _lock = threading.Lock()
+    _executor: ThreadPoolExecutor | None = None
+    _slots: threading.BoundedSemaphore | None = None
+
+    @classmethod
+    def get_pool(cls) -> tuple[ThreadPoolExecutor, threading.BoundedSemaphore]:
+        """Pool do processo e o semáforo de slots (em andamento + na fila), criados sob demanda"""
+        if cls._executor is None or cls._slots is None:
+            with cls._lock:
+                if cls._executor is None or cls._slots is None:
+                    config = settings.PASSWORD_HASHING
+                    workers = config['VERIFY_WORKERS']
+                    cls._executor = ThreadPoolExecutor(
+                        max_workers=workers,
+                        thread_name_prefix='password-verifier',
+                    )
+                    cls._slots = threading.BoundedSemaphore(workers + config['VERIFY_MAX_PENDING'])
+        return cls._executor, cls._slots
+
+    @classmethod
+    def _run[T](cls, func: Callable[..., T], *args: object) -> T:
+        """Executa func no pool, ocupando um slot até terminar"""
+        executor, slots = cls.get_pool()
+        if not slots.acquire(timeout=settings.PASSWORD_HASHING['VERIFY_TIMEOUT']):
+            raise LoginThrottledException from None
+        try:
+            return executor.submit(func, *args).result()
+        finally:
+            slots.release()
+
+    @classmethod
+    def check(cls, raw_password: str, encoded: str) -> tuple[bool, bool]:
+        """
+        Executa verify_password no pool.
+
+        Returns:
+            tuple: (senha correta, hash precisa ser regravado)
+
+        Raises:
+            LoginThrottledException: Se o pool estiver saturado
+        """
+        return cls._run(verify_password, raw_password, encoded)
+
+    @classmethod
+    def hash(cls, raw_password: str) -> str:
+        """Gera o hash da senha no pool (upgrade de hash no login síncrono)"""
+        return cls._run(make_password, raw_password)
+
+    @classmethod
+    def verify(cls, user: User, raw_password: str) -> bool:
+        """
+        Verifica a senha do usuário e, se correta, faz o upgrade transparente
+        do hash para o hasher/parâmetros preferidos. O novo hash também é
+        calculado no pool, dentro do limite de slots.
+        """
+        is_correct, must_update = cls.check(raw_password, user.password)
+        if is_correct and must_update:
+            user.password = cls.hash(raw_password)
+            user.save(update_fields=['password'])
+        return is_correct
+
+    @classmethod
+    async def _arun[T](cls, func: Callable[..., T], *args: object) -> T:
+        """
+        Executa func no pool aguardando com await, sob o mesmo limite de slots.
+
+        O slot é devolvido quando o trabalho termina, não quando a task
+        acaba: se a requisição for cancelada (cliente desconectou, timeout),
+        a thread que ainda espera o slot ou calcula o hash o libera sozinha.
+        """
+        executor, slots = cls.get_pool()
+        # Caminho rápido sem thread extra; só espera o timeout fora do loop
+        if not slots.acquire(blocking=False):
+            waiting = asyncio.ensure_future(
+                asyncio.to_thread(slots.acquire, timeout=settings.PASSWORD_HASHING['VERIFY_TIMEOUT']),
+            )
+            try:
+                acquired = await asyncio.shield(waiting)
+            except asyncio.CancelledError:
+                waiting.add_done_callback(lambda done: not done.cancelled() and done.result() and slots.release())
+                raise
+            if not acquired:
+                raise LoginThrottledException from None
+        try:
+            future = executor.submit(func, *args)
+        except BaseException:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        return await asyncio.wrap_future(future)
+
+    @classmethod
+    async def acheck(cls, raw_password: str, encoded: str) -> tuple[bool, bool]:
+        """Versão async de check()"""
+        return await cls._arun(verify_password, raw_password, encoded)
+
+    @classmethod
+    async def ahash(cls, raw_password: str) -> str:
+        """Gera o hash da senha no pool (cadastro e upgrade de hash)"""
+        return await cls._arun(make_password, raw_password)
+
+    @classmethod
+    async def averify(cls, user: User, raw_password: str) -> bool:
+        """Versão async de verify()"""
+        is_correct, must_update = await cls.acheck(raw_password, user.password)
+        if is_correct and must_update:
+            user.password = await cls.ahash(raw_password)
+            await user.asave(update_fields=['password'])
+        return is_correct
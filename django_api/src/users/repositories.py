@@ -1,8 +1,20 @@
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Optional
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from core.batch_insert import insert_instances
+from plans.catalog import PlanSnapshot, aget_catalog, get_catalog
 from plans.models import Plan, Subscription, Usage
 from users.models import User
 
+if TYPE_CHECKING:
+    from uuid import UUID
+
 
 class UserRepository:
     """Repository para operações de User"""
@@ -18,31 +30,130 @@ class UserRepository:
         return User.objects.filter(username=username).first()
 
     @staticmethod
-    def email_exists(email: str) -> bool:
-        """Verifica se email já existe"""
-        return User.objects.filter(email=email).exists()
+    def _build_registration(
+        email: str,
+        username: str,
+        plan: PlanSnapshot,
+        now: datetime,
+        user_type: str,
+        subscription_days: int,
+    ) -> tuple[User, Subscription, Usage]:
+        """Monta (sem salvar) usuário, subscription ativa e usage inicial"""
+        user = User(
+            email=User.objects.normalize_email(email),
+            username=username,
+            plan=plan.tier,
+            user_type=user_type,
+        )
+        subscription = Subscription(
+            user=user,
+            plan_id=plan.id,
+            status=Subscription.StatusChoices.ACTIVE,
+            organization=None,
+            current_period_start=now,
+            current_period_end=now + timedelta(days=subscription_days),
+        )
+        usage = Usage(user=user, organization=None, period=now.date())
+        return user, subscription, usage
 
     @staticmethod
-    def username_exists(username: str) -> bool:
-        """Verifica se username já existe"""
-        return User.objects.filter(username=username).exists()
+    def create_with_subscription(
+        email: str,
+        username: str,
+        password: str,
+        plan: PlanSnapshot,
+        now: datetime,
+        user_type: str = User.UserTypeChoices.INDIVIDUAL,
+        subscription_days: int = 30,
+    ) -> User:
+        """
+        Cria usuário, subscription ativa e usage inicial num único statement.
+
+        Raises:
+            IntegrityError: Se email ou username violarem a constraint unique
+        """
+        user, subscription, usage = UserRepository._build_registration(
+            email, username, plan, now, user_type, subscription_days,
+        )
+        user.set_password(password)
+        insert_instances(user, subscription, usage)
+        return user
 
     @staticmethod
-    def create(
+    async def acreate_with_subscription(
         email: str,
         username: str,
-        password: str,
-        plan: str = User.PlanChoices.FREE,
-        user_type: str = User.UserTypeChoices.INDIVIDUAL
+        password_hash: str,
+        plan: PlanSnapshot,
+        now: datetime,
+        user_type: str = User.UserTypeChoices.INDIVIDUAL,
+        subscription_days: int = 30,
     ) -> User:
-        """Cria novo usuário"""
-        return User.objects.create_user(
-            email=email,
-            username=username,
-            password=password,
-            plan=plan,
-            user_type=user_type
+        """
+        Versão async de create_with_subscription(); recebe a senha já com hash
+        (PasswordVerifier.ahash) para não calcular o hash no event loop.
+        """
+        user, subscription, usage = UserRepository._build_registration(
+            email, username, plan, now, user_type, subscription_days,
         )
+        user.password = password_hash
+        await sync_to_async(transaction.atomic(insert_instances))(user, subscription, usage)
+        return user
+
+    @staticmethod
+    def duplicate_field(err: IntegrityError) -> str | None:
+        """
+        Campo único (email ou username) que o INSERT do usuário violou, ou
+        None se a violação é outra (ex.: FK de plano removido, Usage).
+
+        No PostgreSQL usa o nome da constraint do psycopg (``diag``); nos
+        demais bancos, a mensagem (``UNIQUE constraint failed: users.email``).
+        """
+        constraint = getattr(getattr(err.__cause__, "diag", None), "constraint_name", None)
+        for field in (User.email.field, User.username.field):
+            if constraint is not None:
+                if f"_{field.column}_" in constraint:
+                    return field.name
+            elif f"_{field.column}_" in str(err) or f".{field.column}" in str(err):
+                return field.name
+        return None
+
+    @staticmethod
+    async def aget_by_email(email: str) -> User | None:
+        """Versão async de get_by_email()"""
+        return await User.objects.filter(email=email).afirst()
+
+    @staticmethod
+    def get_active_by_id(user_id: UUID | str) -> User | None:
+        """Busca usuário ativo por id"""
+        return User.objects.filter(pk=user_id, is_active=True).first()
+
+    @staticmethod
+    async def aget_active_by_id(user_id: UUID | str) -> User | None:
+        """Versão async de get_active_by_id()"""
+        return await User.objects.filter(pk=user_id, is_active=True).afirst()
+
+    @staticmethod
+    def touch_last_login(user: User, now: datetime) -> bool:
+        """
+        Atualiza last_login se a última marca for mais antiga que
+        LAST_LOGIN_UPDATE_INTERVAL. Logins repetidos dentro da janela não
+        geram escrita nem round trip ao banco.
+        """
+        if user.last_login and now - user.last_login < settings.LAST_LOGIN_UPDATE_INTERVAL:
+            return False
+        User.objects.filter(pk=user.pk).update(last_login=now)
+        user.last_login = now
+        return True
+
+    @staticmethod
+    async def atouch_last_login(user: User, now: datetime) -> bool:
+        """Versão async de touch_last_login()"""
+        if user.last_login and now - user.last_login < settings.LAST_LOGIN_UPDATE_INTERVAL:
+            return False
+        await User.objects.filter(pk=user.pk).aupdate(last_login=now)
+        user.last_login = now
+        return True
 
     @staticmethod
     def get_active_users() -> list[User]:
@@ -54,58 +165,55 @@ class PlanRepository:
     """Repository para operações de Plan"""
 
     @staticmethod
-    def get_by_tier(tier: str) -> Plan | None:
-        """Busca plano por tier (FREE, PRO, PREMIUM)"""
-        return Plan.objects.filter(
-            tier=tier,
-            plan_type=Plan.UserChoices.INDIVIDUAL
-        ).first()
-
+    def get_by_tier(
+        tier: str,
+        plan_type: str = Plan.UserChoices.INDIVIDUAL,
+    ) -> PlanSnapshot | None:
+        """Busca plano por tier (FREE, PRO, PREMIUM) no catálogo em memória"""
+        return get_catalog().get(tier, plan_type)
 
-class SubscriptionRepository:
-    """Repository para operações de Subscription"""
+    @staticmethod
+    async def aget_by_tier(
+        tier: str,
+        plan_type: str = Plan.UserChoices.INDIVIDUAL,
+    ) -> PlanSnapshot | None:
+        """Versão async de get_by_tier()"""
+        return (await aget_catalog()).get(tier, plan_type)
 
     @staticmethod
-    def create(
-        user: User,
-        plan: Plan,
-        status: str = Subscription.StatusChoices.ACTIVE,
-        current_period_start=None,
-        current_period_end=None
-    ) -> Subscription:
-        """Cria nova subscription"""
-        return Subscription.objects.create(
-            user=user,
-            plan=plan,
-            status=status,
-            organization=None,
-            current_period_start=current_period_start,
-            current_period_end=current_period_end
-        )
+    def get_by_id(plan_id: UUID | str) -> PlanSnapshot | None:
+        """Busca plano por id no catálogo em memória"""
+        return get_catalog().get_by_id(plan_id)
 
 
 class UsageRepository:
     """Repository para operações de Usage"""
 
     @staticmethod
-    def get_or_create_period_usage(
-        user: User,
-        period: str,
-        defaults: dict | None = None
-    ) -> Usage:
-        """Pega ou cria usage para um período"""
-        if defaults is None:
-            defaults = {
-                "documents_uploaded": 0,
-                "queries_executed": 0,
-                "storage_used_mb": 0,
-                "tokens_used": 0,
-            }
-
-        usage, _ = Usage.objects.get_or_create(
-            user=user,
-            organization=None,
-            period=period,
-            defaults=defaults
+    def adjust_storage(
+        user_id: UUID | str | None,
+        organization_id: UUID | str | None,
+        storage_mb: int,
+        documents_uploaded: int = 0,
+        using: str = DEFAULT_DB_ALIAS,
+    ) -> bool:
+        """
+        Soma ``storage_mb`` (negativo para liberar, sem passar de zero) e
+        ``documents_uploaded`` no Usage mais recente do dono: a organização,
+        se houver, senão o usuário. Um UPDATE com F(), sem ler a linha.
+
+        Returns:
+            bool: False se o dono não tem Usage
+        """
+        if organization_id is not None:
+            usages = Usage.objects.using(using).filter(organization_id=organization_id)
+        else:
+            usages = Usage.objects.using(using).filter(user_id=user_id, organization__isnull=True)
+        usage_id = usages.order_by("-period").values_list("id", flat=True).first()
+        if usage_id is None:
+            return False
+        Usage.objects.using(using).filter(id=usage_id).update(
+            storage_used_mb=Greatest(F("storage_used_mb") + storage_mb, 0),
+            documents_uploaded=F("documents_uploaded") + documents_uploaded,
         )
-        return usage
+        return True
@@ -4,13 +4,18 @@ from typing import Any, Generic, TypeVar
 
 T = TypeVar('T')
 
-@dataclass
+@dataclass(slots=True)
 class ErroreDtail:
     code: str
     details: dict[str, Any] | None = None
 
-@dataclass
+@dataclass(slots=True)
 class APIResponse(Generic[T]):
+    """
+    Envelope padrão das respostas. ``to_dict`` monta o dict final de uma vez,
+    já sem as chaves None (sem cópia intermediária); ``data`` segue intacto
+    para o renderer serializar (UUID, datetime, Decimal).
+    """
     status_code: int
     message: str | None = None
     data: T | None = None
@@ -19,18 +24,19 @@ class APIResponse(Generic[T]):
     timestamp: str | datetime | None = None
 
     def to_dict(self) -> dict[str, Any]:
-        if isinstance(self.timestamp, datetime):
-            self.timestamp = self.timestamp.isoformat()
-        response = {
-            "status_code": self.status_code,
-            "message": self.message,
-            "data": self.data,
-            "trace_id": self.trace_id,
-            "timestamp": self.timestamp,
-        }
+        response: dict[str, Any] = {"status_code": self.status_code}
+        if self.message is not None:
+            response["message"] = self.message
+        if self.data is not None:
+            response["data"] = self.data
+        if self.trace_id is not None:
+            response["trace_id"] = self.trace_id
+        if self.timestamp is not None:
+            timestamp = self.timestamp
+            response["timestamp"] = timestamp.isoformat() if isinstance(timestamp, datetime) else timestamp
         if self.error:
             response["error"] = {
                 "code": self.error.code,
                 "details": self.error.details,
             }
-        return {k: v for k, v in response.items() if v is not None}
+        return response
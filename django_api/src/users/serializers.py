@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING
 from rest_framework import serializers
 
 from users.dtos import UserLoginDTO, UserRegistrationDTO, UserResponseDTO
-from users.services import AuthService, TokenService
+from users.services import AuthService
 
 if TYPE_CHECKING:
     from users.models import User
@@ -40,34 +40,32 @@ class RegisterSerializer(serializers.Serializer):
         dto = UserRegistrationDTO(**validated_data)
         return AuthService.register_user(dto)
 
+    def to_dto(self) -> UserRegistrationDTO:
+        """DTO a partir dos dados validados (caminho async da SignUpView)"""
+        return UserRegistrationDTO(**self.validated_data)
+
 
 
 class LoginSerializer(serializers.Serializer):
-    """Serializer para autenticação de  usuários"""
+    """
+    Serializer para autenticação de usuários.
+
+    Só valida o formato; a LoginView (async) chama
+    AuthService.aauthenticate_user com o DTO.
+    """
 
     email = serializers.EmailField()
     password = serializers.CharField(write_only=True)
     remember_me = serializers.BooleanField(default=False, required=False)
 
-    def validate(self, data: dict) -> dict: #type: ignore
-        """Validação global: autentica usuário via service"""
-
-        dto = UserLoginDTO(
-                email=data['email'],
-                password=data['password']
-            )
-
-        user_response = AuthService.authenticate_user(dto)
-        return {
-            "user": user_response}
+    def to_dto(self) -> UserLoginDTO:
+        """DTO a partir dos dados validados"""
+        return UserLoginDTO(
+            email=self.validated_data['email'],
+            password=self.validated_data['password'],
+            remember_me=self.validated_data['remember_me'],
+        )
 
 class RefreshTokenSerializer(serializers.Serializer):
     """Serializer para refresh de token"""
     refresh_token = serializers.CharField(write_only=True)
-
-    def validate(self, data: dict) -> dict: #type: ignore
-        """Validação global: valida o refresh token via service"""
-        refresh_token = data['refresh_token']
-        new_access_token = TokenService.validate_refresh_token(refresh_token)
-
-        return {"access_token": new_access_token}
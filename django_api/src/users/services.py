@@ -1,9 +1,9 @@
-from datetime import timedelta
 from typing import TYPE_CHECKING
 
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 
+from organizations.repositories import OrganizationMemberRepository
 from users.dtos import UserResponseDTO
 from users.exceptions import (
     InvalidCredentialsException,
@@ -11,19 +11,19 @@ from users.exceptions import (
     UserAlreadyExistsException,
     UserNotFoundException,
 )
-from users.repositories import (
-    PlanRepository,
-    SubscriptionRepository,
-    UsageRepository,
-    UserRepository,
-)
+from users.password_verifier import PasswordVerifier
+from users.repositories import PlanRepository, UserRepository
+from users.token_denylist import TokenDenylist
 
 if TYPE_CHECKING:
     from users.dtos import UserLoginDTO, UserRegistrationDTO
     from users.models import User
 
 from rest_framework_simplejwt.exceptions import TokenError
-from rest_framework_simplejwt.tokens import RefreshToken, Token
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken, Token, UntypedToken
+
+DUPLICATE_MESSAGES = {"email": "Email já em uso", "username": "Username já em uso"}
 
 
 class AuthService:
@@ -45,50 +45,69 @@ class AuthService:
             UserAlreadyExistsException: Se email ou username já existem
             PlanNotFoundException: Se plano não existe
         """
-        # Validação de negócio: email já existe?
-        if UserRepository.email_exists(user_dto.email):
-            msg = "Email já em uso"
-            raise UserAlreadyExistsException(msg) from None
-
-        # Validação de negócio: username já existe?
-        if UserRepository.username_exists(user_dto.username):
-            msg = "Username já em uso"
-            raise UserAlreadyExistsException(msg) from None
-
-        # Validação de negócio: plano existe?
+        # Validação de negócio: plano existe? (cache em memória, sem round trip)
         plan = PlanRepository.get_by_tier(user_dto.plan)
         if not plan:
             msg = f"Plano '{user_dto.plan}' não existe"
             raise PlanNotFoundException(msg) from None
 
-        # Cria usuário
-        user = UserRepository.create(
-            email=user_dto.email,
-            username=user_dto.username,
-            password=user_dto.password,
-            plan=user_dto.plan,
-            user_type=user_dto.user_type
-        )
+        # Cria usuário, subscription e usage inicial num único statement;
+        # email/username duplicados são barrados pelas constraints unique
+        try:
+            user = UserRepository.create_with_subscription(
+                email=user_dto.email,
+                username=user_dto.username,
+                password=user_dto.password,
+                plan=plan,
+                now=timezone.now(),
+                user_type=user_dto.user_type,
+            )
+        except IntegrityError as err:
+            AuthService._raise_if_duplicate(err)
+            raise
 
-        # Cria subscription
-        now = timezone.now()
-        SubscriptionRepository.create(
-            user=user,
-            plan=plan,
-            status='ACTIVE',
-            current_period_start=now,
-            current_period_end=now + timedelta(days=30)
-        )
+        return user
 
-        # Cria usage inicial
-        period = now.strftime("%Y-%m-%d")
-        UsageRepository.get_or_create_period_usage(
-            user=user,
-            period=period
-        )
+    @staticmethod
+    async def aregister_user(user_dto: UserRegistrationDTO) -> User:
+        """
+        Versão async de register_user() para as views ASGI.
+
+        O hash da senha roda no pool do PasswordVerifier e o INSERT numa
+        thread do ORM, sem bloquear o event loop.
+        """
+        plan = await PlanRepository.aget_by_tier(user_dto.plan)
+        if not plan:
+            msg = f"Plano '{user_dto.plan}' não existe"
+            raise PlanNotFoundException(msg) from None
+
+        password_hash = await PasswordVerifier.ahash(user_dto.password)
+        try:
+            user = await UserRepository.acreate_with_subscription(
+                email=user_dto.email,
+                username=user_dto.username,
+                password_hash=password_hash,
+                plan=plan,
+                now=timezone.now(),
+                user_type=user_dto.user_type,
+            )
+        except IntegrityError as err:
+            AuthService._raise_if_duplicate(err)
+            raise
 
         return user
 
+    @staticmethod
+    def _raise_if_duplicate(err: IntegrityError) -> None:
+        """
+        Traduz a violação de unique em email/username para a exceção de
+        negócio; qualquer outra IntegrityError segue para quem chamou.
+        """
+        field = UserRepository.duplicate_field(err)
+        if field is not None:
+            msg = DUPLICATE_MESSAGES[field]
+            raise UserAlreadyExistsException(msg) from err
+
     @staticmethod
     def authenticate_user(user_dto: UserLoginDTO) -> UserResponseDTO:
         """
@@ -115,25 +134,50 @@ class AuthService:
             msg = "Usuário inativo"
             raise InvalidCredentialsException(msg) from None
 
-        # Valida senha
-        if not user.check_password(user_dto.password):
+        # Valida senha (pool dedicado, com upgrade transparente do hash)
+        if not PasswordVerifier.verify(user, user_dto.password):
             msg = "Senha incorreta"
             raise InvalidCredentialsException(msg) from None
 
         refresh = TokenService.generate_tokens_for_user(user)
 
-        # Atualiza último login
-        user.last_login = timezone.now()
-        user.save(update_fields=['last_login'])
+        # Atualiza último login (no máximo uma escrita por janela por usuário)
+        UserRepository.touch_last_login(user, timezone.now())
+
+        return AuthService._login_response(user, refresh)
+
+    @staticmethod
+    async def aauthenticate_user(user_dto: UserLoginDTO) -> UserResponseDTO:
+        """Versão async de authenticate_user() para as views ASGI"""
+        user = await UserRepository.aget_by_email(user_dto.email)
+        if not user:
+            msg = "Usuário não encontrado"
+            raise UserNotFoundException(msg) from None
+
+        if not user.is_active:
+            msg = "Usuário inativo"
+            raise InvalidCredentialsException(msg) from None
+
+        if not await PasswordVerifier.averify(user, user_dto.password):
+            msg = "Senha incorreta"
+            raise InvalidCredentialsException(msg) from None
+
+        refresh = await TokenService.agenerate_tokens_for_user(user)
+
+        await UserRepository.atouch_last_login(user, timezone.now())
+
+        return AuthService._login_response(user, refresh)
 
+    @staticmethod
+    def _login_response(user: User, tokens: dict) -> UserResponseDTO:
         return UserResponseDTO(
             id=str(user.id),
             email=user.email,
             username=user.username,
             plan=user.plan,
             user_type=user.user_type,
-            jwt_access=refresh['jwt-access'],
-            jwt_refresh=refresh['jwt-refresh']
+            jwt_access=tokens['jwt-access'],
+            jwt_refresh=tokens['jwt-refresh']
         )
 
 class TokenService:
@@ -150,16 +194,49 @@ class TokenService:
         Returns:
             dict: Dicionário com 'access' e 'refresh' tokens
         """
+        return TokenService._build_tokens(
+            user, OrganizationMemberRepository.list_roles(user.id),
+        )
+
+    @staticmethod
+    async def agenerate_tokens_for_user(user: User) -> dict:
+        """Versão async de generate_tokens_for_user()"""
+        return TokenService._build_tokens(
+            user, await OrganizationMemberRepository.alist_roles(user.id),
+        )
+
+    @staticmethod
+    def _build_tokens(user: User, organization_roles: list[tuple[str, str]]) -> dict:
         refresh = RefreshToken.for_user(user)
+        TokenService._set_claims(refresh, user, organization_roles)
         return {
             'jwt-access': str(refresh.access_token),
             'jwt-refresh': str(refresh),
         }
 
+    @staticmethod
+    def _set_claims(token: Token, user: User, organization_roles: list[tuple[str, str]]) -> None:
+        # Claims usadas pela StatelessJWTAuthentication para dispensar a
+        # consulta ao usuário em cada requisição
+        token['email'] = user.email
+        token['username'] = user.username
+        token['plan'] = user.plan
+        token['user_type'] = user.user_type
+        token['is_staff'] = user.is_staff
+        token['is_superuser'] = user.is_superuser
+        token['orgs'] = organization_roles
+        # Garante o carimbo no cache: a autenticação não precisa do banco
+        TokenDenylist.set_valid_after(user.pk, user.tokens_valid_after, overwrite=False)
+
     @staticmethod
     def validate_refresh_token(refresh_token: Token) -> str:
         """
-        Valida o refresh token e retorna o usuário associado.
+        Valida o refresh token e emite um novo token de acesso.
+
+        As claims do token de acesso vêm do usuário atual no banco, não do
+        refresh: plano, is_staff e organizações alterados desde o login já
+        valem no novo token. O carimbo de revogação do usuário não se aplica
+        ao refresh (que sempre relê o banco); um usuário inativo é recusado.
 
         Args:
             refresh_token: Token de refresh
@@ -168,14 +245,69 @@ class TokenService:
             str: Novo token de acesso
 
         Raises:
-            InvalidCredentialsException: Se o token é inválido ou expirado
+            InvalidCredentialsException: Se o token é inválido, expirado ou
+                revogado, ou se o usuário não existe mais ou está inativo
         """
+        token = TokenService._decode_refresh_token(refresh_token)
+        user = UserRepository.get_active_by_id(token[api_settings.USER_ID_CLAIM])
+        TokenService._check_refresh_user(user)
+        return TokenService._build_access_token(
+            token, user, OrganizationMemberRepository.list_roles(user.id),
+        )
 
+    @staticmethod
+    async def avalidate_refresh_token(refresh_token: Token) -> str:
+        """Versão async de validate_refresh_token()"""
+        token = TokenService._decode_refresh_token(refresh_token)
+        user = await UserRepository.aget_active_by_id(token[api_settings.USER_ID_CLAIM])
+        TokenService._check_refresh_user(user)
+        return TokenService._build_access_token(
+            token, user, await OrganizationMemberRepository.alist_roles(user.id),
+        )
+
+    @staticmethod
+    def _decode_refresh_token(refresh_token: Token) -> RefreshToken:
         try:
             token = RefreshToken(refresh_token)
-            new_access_token = str(token.access_token)
         except TokenError as err:
             error_msg = TokenError("Refresh token inválido ou expirado")
             raise InvalidCredentialsException(str(error_msg)) from err
 
-        return new_access_token
+        if TokenDenylist.is_revoked(token['jti']):
+            msg = "Refresh token revogado"
+            raise InvalidCredentialsException(msg) from None
+        return token
+
+    @staticmethod
+    def _check_refresh_user(user: User | None) -> None:
+        if user is None:
+            msg = "Usuário não encontrado ou inativo"
+            raise InvalidCredentialsException(msg) from None
+
+    @staticmethod
+    def _build_access_token(token: RefreshToken, user: User, organization_roles: list[tuple[str, str]]) -> str:
+        access = token.access_token
+        TokenService._set_claims(access, user, organization_roles)
+        return str(access)
+
+    @staticmethod
+    def revoke_tokens(*raw_tokens: str | None) -> int:
+        """
+        Revoga tokens (access ou refresh) adicionando o jti à denylist.
+
+        Tokens ausentes, inválidos ou expirados são ignorados.
+
+        Returns:
+            int: Quantidade de tokens revogados
+        """
+        revoked = 0
+        for raw_token in raw_tokens:
+            if not raw_token:
+                continue
+            try:
+                token = UntypedToken(raw_token)
+            except TokenError:
+                continue
+            TokenDenylist.revoke(token['jti'], token['exp'])
+            revoked += 1
+        return revoked
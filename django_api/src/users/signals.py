@@ -0,0 +1,42 @@
+from django.db.models.signals import post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from users.models import User
+from users.token_denylist import TokenDenylist
+
+# Campos copiados para as claims do JWT que mudam o que o usuário pode fazer
+TOKEN_CLAIM_FIELDS = ("is_active", "is_staff", "is_superuser", "plan")
+
+
+def _token_claims(user: User) -> dict:
+    # __dict__: campos adiados (only/defer) não disparam query
+    return {field: user.__dict__[field] for field in TOKEN_CLAIM_FIELDS if field in user.__dict__}
+
+
+@receiver(post_init, sender=User)
+def remember_token_claims(sender: type[User], instance: User, **kwargs: object) -> None:
+    # Claims como carregadas/salvas pela última vez, comparadas no post_save
+    instance.loaded_token_claims = _token_claims(instance)
+
+
+@receiver(post_save, sender=User)
+def revoke_stale_tokens(
+    sender: type[User], instance: User, *, created: bool, **kwargs: object
+) -> None:
+    """
+    Desativação, mudança de is_staff/is_superuser ou de plano invalida os
+    tokens já emitidos: as claims deles (e o acesso de um usuário
+    desativado) deixariam de refletir o banco até o refresh expirar.
+    Escritas que não disparam signals (``update()``) não são cobertas.
+    """
+    claims = _token_claims(instance)
+    previous = instance.loaded_token_claims
+    instance.loaded_token_claims = claims
+    if created or all(previous.get(field, value) == value for field, value in claims.items()):
+        return
+
+    now = timezone.now()
+    User.objects.filter(pk=instance.pk).update(tokens_valid_after=now)
+    instance.tokens_valid_after = now
+    TokenDenylist.set_valid_after(instance.pk, now)
@@ -0,0 +1,262 @@
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from organizations.models import Organization, OrganizationMember
+from users.authentication import ClaimsUser, StatelessJWTAuthentication
+from users.checks import check_shared_cache
+from users.models import User
+from users.services import TokenService
+
+
+class StatelessJWTAuthenticationTestCase(TestCase):
+    """Testes para users.authentication.StatelessJWTAuthentication"""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            username="testuser",
+            password=None,
+            plan="PRO",
+            user_type="ORGANIZATION",
+        )
+        self.organization = Organization.objects.create(name="Acme", slug="acme")
+        OrganizationMember.objects.create(
+            organization=self.organization,
+            user=self.user,
+            role=OrganizationMember.RoleChoices.ADMIN,
+        )
+        self.tokens = TokenService.generate_tokens_for_user(self.user)
+        self.factory = RequestFactory()
+        self.auth = StatelessJWTAuthentication()
+
+    def _authenticate(self, token: str) -> tuple[ClaimsUser, AccessToken] | None:
+        request = self.factory.get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        return self.auth.authenticate(request)
+
+    def test_authenticate_without_queries(self) -> None:
+        """
+        O que testa: Autenticação usa só as claims do token
+        Resultado esperado [PASS]:
+        - Nenhuma query ao banco
+        - ClaimsUser com id, email, plan, user_type e organizações do token
+        """
+        with self.assertNumQueries(0):
+            user, _ = self._authenticate(self.tokens["jwt-access"])
+            self.assertIsInstance(user, ClaimsUser)
+            self.assertTrue(user.is_authenticated)
+            self.assertEqual(user.id, self.user.id)
+            self.assertEqual(user.email, "test@example.com")
+            self.assertEqual(user.plan, "PRO")
+            self.assertEqual(user.user_type, "ORGANIZATION")
+            self.assertEqual(user.organizations, {str(self.organization.id): "ADMIN"})
+
+    def test_falls_back_to_model_for_other_attributes(self) -> None:
+        """
+        O que testa: Atributos fora das claims buscam o model completo uma vez
+        Resultado esperado [PASS]: 1 query para created_at e instance reutilizada
+        """
+        user, _ = self._authenticate(self.tokens["jwt-access"])
+
+        with self.assertNumQueries(1):
+            self.assertEqual(user.created_at, self.user.created_at)
+            self.assertEqual(user.instance.pk, self.user.pk)
+
+    def test_fallback_for_inactive_user_fails(self) -> None:
+        """
+        O que testa: Fallback para o model com usuário desativado após o login
+        Resultado esperado [FAIL]: AuthenticationFailed lançada
+        """
+        user, _ = self._authenticate(self.tokens["jwt-access"])
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        with self.assertRaises(AuthenticationFailed):
+            _ = user.instance
+
+    def test_revoked_token_is_rejected(self) -> None:
+        """
+        O que testa: Token revogado via denylist
+        Resultado esperado [FAIL]: InvalidToken lançada após revoke_tokens
+        """
+        revoked = TokenService.revoke_tokens(self.tokens["jwt-access"], None, "invalid")
+
+        self.assertEqual(revoked, 1)
+        with self.assertRaises(InvalidToken):
+            self._authenticate(self.tokens["jwt-access"])
+
+    def test_deactivated_user_token_is_rejected(self) -> None:
+        """
+        O que testa: Desativar o usuário invalida os tokens já emitidos
+        Resultado esperado [FAIL]: InvalidToken lançada, sem consulta ao banco
+        """
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertNumQueries(0), self.assertRaises(InvalidToken):
+            self._authenticate(self.tokens["jwt-access"])
+
+    def test_plan_change_revokes_token(self) -> None:
+        """
+        O que testa: Mudança de plano ou is_staff invalida as claims antigas
+        Resultado esperado [FAIL]: InvalidToken lançada após cada mudança
+        """
+        self.user.plan = User.PlanChoices.FREE
+        self.user.save()
+        with self.assertRaises(InvalidToken):
+            self._authenticate(self.tokens["jwt-access"])
+
+    def test_unrelated_change_keeps_token(self) -> None:
+        """
+        O que testa: Salvar campos fora das claims não revoga tokens
+        Resultado esperado [PASS]: Autenticação continua válida
+        """
+        self.user.username = "outro"
+        self.user.save()
+
+        user, _ = self._authenticate(self.tokens["jwt-access"])
+        self.assertEqual(user.id, self.user.id)
+        self.user.refresh_from_db()
+        self.assertIsNone(self.user.tokens_valid_after)
+
+    def test_stamp_is_read_from_database_on_cache_miss(self) -> None:
+        """
+        O que testa: Carimbo ausente do cache (evicção) é lido do banco
+        Resultado esperado [FAIL]: InvalidToken com 1 query, carimbo republicado
+        """
+        self.user.is_active = False
+        self.user.save()
+        cache.clear()
+
+        with self.assertNumQueries(1), self.assertRaises(InvalidToken):
+            self._authenticate(self.tokens["jwt-access"])
+        with self.assertNumQueries(0), self.assertRaises(InvalidToken):
+            self._authenticate(self.tokens["jwt-access"])
+
+
+class AsyncViewRevocationTestCase(TestCase):
+    """Revogação de tokens nas views async (AsyncAPIViewMixin)"""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            username="testuser",
+            password=None,
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {TokenService.generate_tokens_for_user(self.user)['jwt-access']}")
+        self.url = reverse("queries:ask")
+
+    def test_cache_miss_keeps_token_valid(self) -> None:
+        """
+        O que testa: Carimbo ausente do cache (evicção, restart) numa view async
+        Resultado esperado [PASS]: Carimbo lido do banco fora do loop; Status HTTP 200
+        """
+        cache.clear()
+
+        response = self.client.post(self.url, {"query": "férias"}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_cache_miss_still_rejects_deactivated_user(self) -> None:
+        """
+        O que testa: Usuário desativado e carimbo ausente do cache numa view async
+        Resultado esperado [FAIL]: Status HTTP 401
+        """
+        self.user.is_active = False
+        self.user.save()
+        cache.clear()
+
+        response = self.client.post(self.url, {"query": "férias"}, format="json")
+
+        self.assertEqual(response.status_code, 401)
+
+
+class SharedCacheCheckTestCase(TestCase):
+    """Testes para users.checks.check_shared_cache"""
+
+    def test_process_local_cache_is_an_error(self) -> None:
+        """
+        O que testa: SHARED_CACHE_ALIAS apontando para LocMemCache
+        Resultado esperado [FAIL]: Erro users.E002
+        """
+        caches = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+        with override_settings(CACHES=caches, SHARED_CACHE_ALIAS="default"):
+            errors = check_shared_cache(None)
+
+        self.assertEqual([error.id for error in errors], ["users.E002"])
+
+    def test_shared_cache_passes(self) -> None:
+        """
+        O que testa: SHARED_CACHE_ALIAS apontando para Redis
+        Resultado esperado [PASS]: Nenhum erro
+        """
+        caches = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache"}}
+        with override_settings(CACHES=caches, SHARED_CACHE_ALIAS="default"):
+            self.assertEqual(check_shared_cache(None), [])
+
+
+class LogoutRevocationTestCase(TestCase):
+    """Testes para a revogação de tokens em POST /api/auth/logout/"""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            username="testuser",
+            password=None,
+        )
+        self.tokens = TokenService.generate_tokens_for_user(self.user)
+
+    def test_logout_revokes_refresh_token(self) -> None:
+        """
+        O que testa: Refresh token do cookie deixa de funcionar após logout
+        Resultado esperado [PASS]:
+        - Logout 200
+        - Refresh-token seguinte com o mesmo cookie: 401
+        """
+        self.client.cookies["jwt-refresh"] = self.tokens["jwt-refresh"]
+        self.client.cookies["jwt-access"] = self.tokens["jwt-access"]
+
+        response = self.client.post("/api/auth/logout/")
+        self.assertEqual(response.status_code, 200)
+
+        self.client.cookies["jwt-refresh"] = self.tokens["jwt-refresh"]
+        response = self.client.post("/api/auth/refresh-token/")
+        self.assertEqual(response.status_code, 401)
+
+    def test_refresh_rejects_inactive_user(self) -> None:
+        """
+        O que testa: Refresh de um usuário desativado após o login
+        Resultado esperado [FAIL]: 401
+        """
+        self.user.is_active = False
+        self.user.save()
+
+        self.client.cookies["jwt-refresh"] = self.tokens["jwt-refresh"]
+        response = self.client.post("/api/auth/refresh-token/")
+        self.assertEqual(response.status_code, 401)
+
+    def test_refresh_uses_current_claims(self) -> None:
+        """
+        O que testa: Refresh após mudança de plano e is_staff
+        Resultado esperado [PASS]:
+        - 200
+        - Novo token de acesso com plano e is_staff atuais, não os do refresh
+        """
+        self.user.plan = User.PlanChoices.PRO
+        self.user.is_staff = True
+        self.user.save()
+
+        self.client.cookies["jwt-refresh"] = self.tokens["jwt-refresh"]
+        response = self.client.post("/api/auth/refresh-token/")
+        self.assertEqual(response.status_code, 200)
+
+        access = AccessToken(response.json()["data"]["access_token"])
+        self.assertEqual(access["plan"], "PRO")
+        self.assertTrue(access["is_staff"])
@@ -3,7 +3,11 @@ Testes de Integração End-to-End.
 Testa o fluxo completo desde a requisição HTTP até o banco de dados.
 """
 
+import secrets
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from plans.models import Plan, Subscription, Usage
 from users.dtos import UserLoginDTO, UserRegistrationDTO
@@ -15,6 +19,9 @@ from users.exceptions import (
 from users.models import User
 from users.services import AuthService
 
+# Senha dos registros de teste, gerada por execução
+PASSWORD = secrets.token_urlsafe(12)
+
 
 class RegisterUserIntegrationTestCase(TestCase):
     """Testes de integração para registro de usuário"""
@@ -191,6 +198,49 @@ class RegisterUserIntegrationTestCase(TestCase):
         # Verifica que nada foi criado
         self.assertEqual(User.objects.count(), 0)
 
+    def test_register_user_username_duplicate_error(self) -> None:
+        """
+        O que testa: Registro com username duplicado barrado pela constraint unique
+        Resultado esperado [FAIL]:
+        - UserAlreadyExistsException com mensagem de username
+        - Nenhuma subscription extra criada
+        """
+        AuthService.register_user(UserRegistrationDTO(
+            email="primeiro@example.com",
+            username="repetido",
+            password=PASSWORD,
+        ))
+
+        with self.assertRaises(UserAlreadyExistsException) as ctx:
+            AuthService.register_user(UserRegistrationDTO(
+                email="segundo@example.com",
+                username="repetido",
+                password=PASSWORD,
+            ))
+
+        self.assertEqual(ctx.exception.message, "Username já em uso")
+        self.assertEqual(Subscription.objects.count(), 1)
+
+    def test_register_user_reuses_cached_plan(self) -> None:
+        """
+        O que testa: Plano resolvido em memória depois da primeira consulta
+        Resultado esperado [PASS]: segundo registro não consulta a tabela plans
+        """
+        AuthService.register_user(UserRegistrationDTO(
+            email="um@example.com",
+            username="um",
+            password=PASSWORD,
+        ))
+
+        with CaptureQueriesContext(connection) as ctx:
+            AuthService.register_user(UserRegistrationDTO(
+                email="dois@example.com",
+                username="dois",
+                password=PASSWORD,
+            ))
+
+        self.assertFalse(any('"plans"' in q["sql"] for q in ctx.captured_queries))
+
 
 class AuthenticateUserIntegrationTestCase(TestCase):
     """✅ Testes de integração para autenticação"""
@@ -0,0 +1,160 @@
+import asyncio
+import secrets
+import threading
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.conf import global_settings, settings
+from django.contrib.auth.hashers import get_hashers_by_algorithm, make_password
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from users.exceptions import LoginThrottledException
+from users.models import User
+from users.password_verifier import PasswordVerifier
+from users.repositories import UserRepository
+
+# Senha dos usuários de teste, gerada por execução
+PASSWORD = secrets.token_urlsafe(12)
+FAST_HASHING = {**settings.PASSWORD_HASHING, 'PBKDF2_ITERATIONS': 1000}
+FAST_HASHERS = [*settings.PASSWORD_HASHERS]
+SINGLE_SLOT = {**settings.PASSWORD_HASHING, 'VERIFY_WORKERS': 1, 'VERIFY_MAX_PENDING': 0, 'VERIFY_TIMEOUT': 5}
+
+
+class PasswordVerifierTestCase(TestCase):
+    """Testes para users.password_verifier.PasswordVerifier"""
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            username="testuser",
+            password=PASSWORD,
+        )
+
+    def test_verify_correct_and_wrong_password(self) -> None:
+        """
+        O que testa: Verificação no pool dedicado
+        Resultado esperado [PASS]: True para a senha correta, False para a errada
+        """
+        self.assertTrue(PasswordVerifier.verify(self.user, PASSWORD))
+        self.assertFalse(PasswordVerifier.verify(self.user, "senhaerrada"))
+
+    def test_verify_upgrades_legacy_hash(self) -> None:
+        """
+        O que testa: Upgrade transparente de hash legado (pbkdf2_sha1) no login
+        Resultado esperado [PASS]: senha regravada com o hasher preferido
+        """
+        User.objects.filter(pk=self.user.pk).update(
+            password=make_password(PASSWORD, hasher="pbkdf2_sha1")
+        )
+        self.user.refresh_from_db()
+
+        self.assertTrue(PasswordVerifier.verify(self.user, PASSWORD))
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$"))
+
+    def test_default_hashers_still_verify(self) -> None:
+        """
+        O que testa: Hashes gerados por qualquer hasher padrão do Django (ex.: bcrypt_sha256)
+        Resultado esperado [PASS]: Todos os algoritmos padrão continuam em PASSWORD_HASHERS
+        """
+        algorithms = get_hashers_by_algorithm()
+        for path in global_settings.PASSWORD_HASHERS:
+            self.assertIn(import_string(path).algorithm, algorithms, path)
+
+    @override_settings(PASSWORD_HASHING=FAST_HASHING, PASSWORD_HASHERS=FAST_HASHERS)
+    def test_verify_upgrades_when_iterations_change(self) -> None:
+        """
+        O que testa: Mudança de PBKDF2_ITERATIONS regrava o hash no próximo login
+        Resultado esperado [PASS]: hash passa a registrar 1000 iterações
+        """
+        self.assertTrue(PasswordVerifier.verify(self.user, PASSWORD))
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$1000$"))
+
+    def test_verify_throttled_when_pool_saturated(self) -> None:
+        """
+        O que testa: Pool saturado falha rápido
+        Resultado esperado [FAIL]: LoginThrottledException (503)
+        """
+        _, slots = PasswordVerifier.get_pool()
+        with patch.object(slots, "acquire", return_value=False), self.assertRaises(LoginThrottledException) as ctx:
+            PasswordVerifier.verify(self.user, PASSWORD)
+        self.assertEqual(ctx.exception.status_code, 503)
+
+
+    @override_settings(PASSWORD_HASHING=FAST_HASHING, PASSWORD_HASHERS=FAST_HASHERS)
+    def test_verify_rehashes_in_pool(self) -> None:
+        """
+        O que testa: Upgrade do hash no login síncrono
+        Resultado esperado [PASS]: make_password roda numa thread do pool
+        """
+        threads = []
+
+        def record(raw_password: str) -> str:
+            threads.append(threading.current_thread().name)
+            return make_password(raw_password)
+
+        with patch("users.password_verifier.make_password", side_effect=record):
+            self.assertTrue(PasswordVerifier.verify(self.user, PASSWORD))
+
+        self.assertEqual(len(threads), 1)
+        self.assertTrue(threads[0].startswith("password-verifier"))
+
+    @override_settings(PASSWORD_HASHING=SINGLE_SLOT)
+    async def test_cancelled_wait_returns_slot(self) -> None:
+        """
+        O que testa: Requisição cancelada enquanto espera um slot do pool
+        Resultado esperado [PASS]: A thread que obtém o slot depois do cancelamento o devolve
+        """
+        with patch.object(PasswordVerifier, "_executor", None), patch.object(PasswordVerifier, "_slots", None):
+            executor, slots = PasswordVerifier.get_pool()
+            slots.acquire()
+            task = asyncio.create_task(PasswordVerifier.ahash(PASSWORD))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+            # A thread que esperava o slot o obtém...
+            slots.release()
+            await asyncio.sleep(0.1)
+
+            # ...e o devolve ao terminar
+            self.assertTrue(await asyncio.to_thread(slots.acquire, timeout=2))
+            slots.release()
+            executor.shutdown()
+
+
+class TouchLastLoginTestCase(TestCase):
+    """Testes para UserRepository.touch_last_login()"""
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            username="testuser",
+            password=None,
+        )
+
+    def test_coalesces_writes_within_interval(self) -> None:
+        """
+        O que testa: Logins repetidos dentro da janela não geram escrita
+        Resultado esperado [PASS]:
+        - Primeiro login grava last_login (1 query)
+        - Segundo login dentro da janela: 0 queries
+        - Login após a janela grava de novo
+        """
+        now = timezone.now()
+
+        with self.assertNumQueries(1):
+            self.assertTrue(UserRepository.touch_last_login(self.user, now))
+        with self.assertNumQueries(0):
+            self.assertFalse(UserRepository.touch_last_login(self.user, now + timedelta(minutes=1)))
+
+        later = now + settings.LAST_LOGIN_UPDATE_INTERVAL
+        self.assertTrue(UserRepository.touch_last_login(self.user, later))
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.last_login, later)
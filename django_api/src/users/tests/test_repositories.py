@@ -59,77 +59,6 @@ class UserRepositoryTestCase(TestCase):
         self.assertIsNotNone(user)
         self.assertEqual(user.username, "testuser") #type: ignore
 
-    def test_email_exists_true(self):
-        """
-        O que testa: Verificacao se email existe
-        Resultado esperado [PASS]:
-        - UserRepository.email_exists('test@example.com') retorna True
-        """
-        # Act
-        exists = UserRepository.email_exists("test@example.com")
-
-        # Assert
-        self.assertTrue(exists)
-
-    def test_email_exists_false(self):
-        """
-        O que testa: Verificacao se email nao existe
-        Resultado esperado [PASS]:
-        - UserRepository.email_exists('inexistente@example.com') retorna False
-        """
-        # Act
-        exists = UserRepository.email_exists("inexistente@example.com")
-
-        # Assert
-        self.assertFalse(exists)
-
-    def test_username_exists_true(self):
-        """
-        O que testa: Verificacao se username existe
-        Resultado esperado [PASS]:
-        - UserRepository.username_exists('testuser') retorna True
-        """
-        # Act
-        exists = UserRepository.username_exists("testuser")
-
-        # Assert
-        self.assertTrue(exists)
-
-    def test_username_exists_false(self):
-        """
-        O que testa: Verificacao se username nao existe
-        Resultado esperado [PASS]:
-        - UserRepository.username_exists('inexistente') retorna False
-        """
-        # Act
-        exists = UserRepository.username_exists("inexistente")
-
-        # Assert
-        self.assertFalse(exists)
-
-    def test_create_user(self):
-        """
-        O que testa: Criacao de novo usuario via repositorio
-        Resultado esperado [PASS]:
-        - UserRepository.create(...) cria e retorna User
-        - user.id gerado (nao None)
-        - email, username, role salvos corretamente
-        - Novo registro persiste no BD (User.objects.count() = 2)
-        """
-        # Act
-        user = UserRepository.create(
-            email="novo@example.com",
-            username="novo",
-            password="senha12345",
-            plan="USER"
-        )
-
-        # Assert
-        self.assertIsNotNone(user.id)
-        self.assertEqual(user.email, "novo@example.com")
-        self.assertEqual(user.username, "novo")
-        self.assertEqual(user.plan, "USER")
-
     def test_get_active_users(self):
         """
         O que testa: Busca apenas de usuarios com is_active=True
@@ -1,5 +1,8 @@
+import secrets
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
+from django.db import IntegrityError
 from django.test import TestCase
 
 from users.dtos import UserLoginDTO, UserRegistrationDTO
@@ -11,42 +14,34 @@ from users.exceptions import (
 )
 from users.services import AuthService
 
+# Senha dos DTOs de teste, gerada por execução
+PASSWORD = secrets.token_urlsafe(12)
+
 
 class RegisterUserServiceTestCase(TestCase):
     """Testes para AuthService.register_user()"""
 
-    @patch("users.services.UserRepository.email_exists")
-    @patch("users.services.UserRepository.username_exists")
     @patch("users.services.PlanRepository.get_by_tier")
-    @patch("users.services.UserRepository.create")
-    @patch("users.services.SubscriptionRepository.create")
-    @patch("users.services.UsageRepository.get_or_create_period_usage")
+    @patch("users.services.UserRepository.create_with_subscription")
     def test_register_user_success(
         self,
-        mock_usage,
-        mock_subscription,
-        mock_user_create,
-        mock_plan_get,
-        mock_username_exists,
-        mock_email_exists,
+        mock_create: MagicMock,
+        mock_plan_get: MagicMock,
     ):
         """
         O que testa: Registro bem-sucedido isolado (com repositorios mockados)
         Resultado esperado [PASS]:
-        - Validacoes: email_exists, username_exists chamadas
+        - Sem pré-checagem de email/username (constraints unique fazem isso)
         - Plan buscado por tier ('FREE')
-        - User, Subscription e Usage criados via repositorios
+        - User, Subscription e Usage criados numa única chamada ao repositorio
         - User retornado com email 'novo@example.com'
         """
         # Arrange
-        mock_email_exists.return_value = False
-        mock_username_exists.return_value = False
-
         mock_plan = MagicMock(id=1, tier="FREE")
         mock_plan_get.return_value = mock_plan
 
         mock_user = MagicMock(id="123", email="novo@example.com", username="novo")
-        mock_user_create.return_value = mock_user
+        mock_create.return_value = mock_user
 
         dto = UserRegistrationDTO(
             email="novo@example.com",
@@ -60,22 +55,24 @@ class RegisterUserServiceTestCase(TestCase):
         user = AuthService.register_user(dto)
 
         # Assert
-        mock_email_exists.assert_called_once_with("novo@example.com")
-        mock_username_exists.assert_called_once_with("novo")
         mock_plan_get.assert_called_once_with("FREE")
-        mock_user_create.assert_called_once()
-        mock_subscription.assert_called_once()
-        mock_usage.assert_called_once()
+        mock_create.assert_called_once()
+        self.assertEqual(mock_create.call_args.kwargs["plan"], mock_plan)
         self.assertEqual(user.email, "novo@example.com")
 
-    @patch("users.services.UserRepository.email_exists")
-    def test_register_user_email_already_exists(self, mock_email_exists):
+    @patch("users.services.PlanRepository.get_by_tier")
+    @patch("users.services.UserRepository.create_with_subscription")
+    def test_register_user_email_already_exists(self, mock_create: MagicMock, mock_plan_get: MagicMock) -> None:
         """
         O que testa: Tentativa de registrar quando email ja existe (mockado)
         Resultado esperado [FAIL]: UserAlreadyExistsException lancada
+        - Insert viola a constraint unique de email (IntegrityError)
         """
         # Arrange
-        mock_email_exists.return_value = True
+        mock_plan_get.return_value = MagicMock(id=1, tier="FREE")
+        mock_create.side_effect = IntegrityError(
+            'duplicate key value violates unique constraint "users_email_key"'
+        )
 
         dto = UserRegistrationDTO(
             email="existente@example.com",
@@ -86,21 +83,23 @@ class RegisterUserServiceTestCase(TestCase):
         )
 
         # Act & Assert
-        with self.assertRaises(UserAlreadyExistsException):
+        with self.assertRaises(UserAlreadyExistsException) as ctx:
             AuthService.register_user(dto)
+        self.assertEqual(ctx.exception.message, "Email já em uso")
 
-    @patch("users.services.UserRepository.email_exists")
-    @patch("users.services.UserRepository.username_exists")
-    def test_register_user_username_already_exists(self, mock_username_exists, mock_email_exists):
+    @patch("users.services.PlanRepository.get_by_tier")
+    @patch("users.services.UserRepository.create_with_subscription")
+    def test_register_user_username_already_exists(self, mock_create: MagicMock, mock_plan_get: MagicMock) -> None:
         """
         O que testa: Tentativa de registrar quando username ja existe (mockado)
         Resultado esperado [FAIL]: UserAlreadyExistsException lancada
-        - Email check passa (False)
-        - Username check falha (True) -> exception
+        - Insert viola a constraint unique de username (IntegrityError)
         """
         # Arrange
-        mock_email_exists.return_value = False
-        mock_username_exists.return_value = True
+        mock_plan_get.return_value = MagicMock(id=1, tier="FREE")
+        mock_create.side_effect = IntegrityError(
+            'duplicate key value violates unique constraint "users_username_key"'
+        )
 
         dto = UserRegistrationDTO(
             email="novo@example.com",
@@ -111,22 +110,20 @@ class RegisterUserServiceTestCase(TestCase):
         )
 
         # Act & Assert
-        with self.assertRaises(UserAlreadyExistsException):
+        with self.assertRaises(UserAlreadyExistsException) as ctx:
             AuthService.register_user(dto)
+        self.assertEqual(ctx.exception.message, "Username já em uso")
 
-    @patch("users.services.UserRepository.email_exists")
-    @patch("users.services.UserRepository.username_exists")
     @patch("users.services.PlanRepository.get_by_tier")
-    def test_register_user_plan_not_found(self, mock_plan_get, mock_username_exists, mock_email_exists):
+    @patch("users.services.UserRepository.create_with_subscription")
+    def test_register_user_plan_not_found(self, mock_create: MagicMock, mock_plan_get: MagicMock) -> None:
         """
         O que testa: Tentativa de registrar com plano invalido (PlanRepository retorna None)
         Resultado esperado [FAIL]: PlanNotFoundException lancada
-        - Email/username checks passam
         - Plan lookup falha (mock_plan_get.return_value = None)
+        - Nenhum insert executado
         """
         # Arrange
-        mock_email_exists.return_value = False
-        mock_username_exists.return_value = False
         mock_plan_get.return_value = None
 
         dto = UserRegistrationDTO(
@@ -140,26 +137,87 @@ class RegisterUserServiceTestCase(TestCase):
         # Act & Assert
         with self.assertRaises(PlanNotFoundException):
             AuthService.register_user(dto)
+        mock_create.assert_not_called()
+
+    @patch("users.services.PlanRepository.get_by_tier")
+    @patch("users.services.UserRepository.create_with_subscription")
+    def test_register_user_reads_psycopg_constraint_name(self, mock_create: MagicMock, mock_plan_get: MagicMock) -> None:
+        """
+        O que testa: Violação de unique vinda do psycopg (constraint em err.__cause__.diag)
+        Resultado esperado [FAIL]: UserAlreadyExistsException para o campo da constraint
+        """
+        mock_plan_get.return_value = MagicMock(id=1, tier="FREE")
+        cause = Exception("duplicate key value violates unique constraint")
+        cause.diag = SimpleNamespace(constraint_name="users_username_key")
+        error = IntegrityError(str(cause))
+        error.__cause__ = cause
+        mock_create.side_effect = error
+
+        dto = UserRegistrationDTO(
+            email="novo@example.com",
+            username="novo",
+            password=PASSWORD,
+            plan="FREE",
+            user_type="INDIVIDUAL"
+        )
+
+        with self.assertRaises(UserAlreadyExistsException) as ctx:
+            AuthService.register_user(dto)
+        self.assertEqual(ctx.exception.message, "Username já em uso")
+
+    @patch("users.services.PlanRepository.get_by_tier")
+    @patch("users.services.UserRepository.create_with_subscription")
+    def test_register_user_other_integrity_error_is_raised(self, mock_create: MagicMock, mock_plan_get: MagicMock) -> None:
+        """
+        O que testa: IntegrityError que não é email/username duplicado (ex.: plano removido)
+        Resultado esperado [FAIL]: A IntegrityError original sobe, sem virar "Email já em uso"
+        """
+        mock_plan_get.return_value = MagicMock(id=1, tier="FREE")
+        mock_create.side_effect = IntegrityError(
+            'insert or update on table "subscriptions" violates foreign key constraint "subscriptions_plan_id_fkey"'
+        )
+
+        dto = UserRegistrationDTO(
+            email="novo@example.com",
+            username="novo",
+            password=PASSWORD,
+            plan="FREE",
+            user_type="INDIVIDUAL"
+        )
+
+        with self.assertRaises(IntegrityError) as ctx:
+            AuthService.register_user(dto)
+        self.assertNotIsInstance(ctx.exception, UserAlreadyExistsException)
 
 
 class AuthenticateUserServiceTestCase(TestCase):
     """Testes para AuthService.authenticate_user()"""
 
+    @patch("users.services.UserRepository.touch_last_login")
+    @patch("users.services.PasswordVerifier.verify")
     @patch("users.services.UserRepository.get_by_email")
-    def test_authenticate_user_success(self, mock_get_by_email):
+    def test_authenticate_user_success(
+        self, mock_get_by_email: MagicMock, mock_verify: MagicMock, mock_touch_last_login: MagicMock,
+    ) -> None:
         """
         O que testa: Autenticacao bem-sucedida com repositorio mockado
         Resultado esperado [PASS]:
         - User retornado com email correto
-        - check_password validou credenciais
+        - PasswordVerifier validou credenciais
+        - last_login registrado
         """
         # Arrange
         mock_user = MagicMock(
-            id="123",
+            id="8f9a2c4e-1b3d-4e5f-9a7b-6c5d4e3f2a1b",
             email="user@example.com",
-            is_active=True
+            username="user",
+            plan="FREE",
+            user_type="INDIVIDUAL",
+            is_active=True,
+            is_staff=False,
+            is_superuser=False,
         )
-        mock_user.check_password.return_value = True
+        mock_verify.return_value = True
         mock_get_by_email.return_value = mock_user
 
         dto = UserLoginDTO(
@@ -172,7 +230,8 @@ class AuthenticateUserServiceTestCase(TestCase):
 
         # Assert
         mock_get_by_email.assert_called_once_with("user@example.com")
-        mock_user.check_password.assert_called_once_with("senha12345")
+        mock_verify.assert_called_once_with(mock_user, "senha12345")
+        mock_touch_last_login.assert_called_once()
         self.assertEqual(user.email, "user@example.com")
 
     @patch("users.services.UserRepository.get_by_email")
@@ -194,17 +253,18 @@ class AuthenticateUserServiceTestCase(TestCase):
         with self.assertRaises(UserNotFoundException):
             AuthService.authenticate_user(dto)
 
+    @patch("users.services.PasswordVerifier.verify")
     @patch("users.services.UserRepository.get_by_email")
-    def test_authenticate_user_wrong_password(self, mock_get_by_email):
+    def test_authenticate_user_wrong_password(self, mock_get_by_email: MagicMock, mock_verify: MagicMock) -> None:
         """
         O que testa: Tentativa de autenticar com senha incorreta
         Resultado esperado [FAIL]: InvalidCredentialsException lancada
         - User encontrado
-        - check_password retorna False
+        - PasswordVerifier.verify retorna False
         """
         # Arrange
         mock_user = MagicMock(email="user@example.com")
-        mock_user.check_password.return_value = False
+        mock_verify.return_value = False
         mock_get_by_email.return_value = mock_user
 
         dto = UserLoginDTO(
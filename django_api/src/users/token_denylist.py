@@ -0,0 +1,88 @@
+import time
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core.cache import caches
+
+from core.profiling import span
+from users.models import User
+
+if TYPE_CHECKING:
+    from datetime import datetime
+    from uuid import UUID
+
+    from django.core.cache.backends.base import BaseCache
+
+KEY_PREFIX = "jwt:denylist:"
+STAMP_PREFIX = "jwt:valid-after:"
+
+
+def _cache() -> BaseCache:
+    return caches[settings.SHARED_CACHE_ALIAS]
+
+
+class TokenDenylist:
+    """
+    Revogação de tokens guardada no cache compartilhado (SHARED_CACHE_ALIAS).
+
+    - Denylist por jti: cada entrada expira junto com o token, então o
+      conjunto só contém tokens revogados ainda válidos (logout).
+    - Carimbo por usuário (User.tokens_valid_after): tokens de acesso
+      emitidos até ele (inclusive no mesmo segundo, a resolução do iat) são
+      inválidos. Mudanças em is_active, is_staff ou plan atualizam o carimbo
+      (users.signals), derrubando as claims antigas; o cliente renova o
+      token no refresh, que relê o usuário.
+
+    O cache precisa ser compartilhado entre processos (ex.: Redis) para a
+    revogação valer em todos; ``check --deploy`` acusa cache local.
+    """
+
+    @staticmethod
+    def revoke(jti: str, expires_at: int) -> None:
+        """Revoga o token até o timestamp ``expires_at`` (claim exp)"""
+        ttl = int(expires_at - time.time())
+        if ttl > 0:
+            _cache().set(f"{KEY_PREFIX}{jti}", value=True, timeout=ttl)
+
+    @staticmethod
+    def set_valid_after(user_id: UUID | str, valid_after: datetime | None, *, overwrite: bool = True) -> None:
+        """
+        Publica o carimbo do usuário. Com ``overwrite=False`` só preenche a
+        entrada ausente (e renova o prazo da existente), para uma leitura do
+        banco não sobrescrever um carimbo mais novo gravado no meio tempo.
+        """
+        key = f"{STAMP_PREFIX}{user_id}"
+        value = int(valid_after.timestamp()) if valid_after else 0
+        # Renovado a cada emissão: vive tanto quanto o token mais novo do usuário
+        timeout = int(settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"].total_seconds())
+        cache = _cache()
+        if overwrite:
+            cache.set(key, value, timeout=timeout)
+        elif not cache.add(key, value, timeout=timeout):
+            cache.touch(key, timeout=timeout)
+
+    @staticmethod
+    def is_revoked(jti: str, user_id: UUID | str | None = None, issued_at: int | None = None) -> bool:
+        """
+        Verifica se o token foi revogado: jti na denylist ou, com
+        ``user_id``, emitido (claim iat) até o carimbo do usuário. Uma
+        leitura de cache; no miss do carimbo (evicção, cache reiniciado),
+        uma query que o republica. Faz I/O: views async chamam fora do
+        event loop (AsyncAPIViewMixin).
+        """
+        denylist_key = f"{KEY_PREFIX}{jti}"
+        stamp_key = f"{STAMP_PREFIX}{user_id}"
+        keys = [denylist_key, stamp_key] if user_id is not None else [denylist_key]
+        with span("cache"):
+            found = _cache().get_many(keys)
+        if found.get(denylist_key):
+            return True
+        if user_id is None:
+            return False
+
+        stamp = found.get(stamp_key)
+        if stamp is None:
+            valid_after = User.objects.filter(pk=user_id).values_list("tokens_valid_after", flat=True).first()
+            TokenDenylist.set_valid_after(user_id, valid_after, overwrite=False)
+            stamp = int(valid_after.timestamp()) if valid_after else 0
+        return bool(stamp) and (issued_at is None or issued_at <= stamp)
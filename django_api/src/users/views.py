@@ -8,6 +8,7 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from core.async_views import AsyncAPIViewMixin
 from users.exceptions import UnauthorizedAccessException
 from users.response_handler import APIResponse
 from users.serializers import (
@@ -15,11 +16,12 @@ from users.serializers import (
     RefreshTokenSerializer,
     RegisterSerializer,
 )
+from users.services import AuthService, TokenService
 
 if TYPE_CHECKING:
     from rest_framework.request import Request
 
-class SignUpView(generics.CreateAPIView):
+class SignUpView(AsyncAPIViewMixin, generics.CreateAPIView):
     """
     API endpoint for user registration.
 
@@ -35,11 +37,11 @@ class SignUpView(generics.CreateAPIView):
     serializer_class = RegisterSerializer
     permission_classes = [AllowAny]
 
-    def post(self, request: Request) -> Response:
+    async def post(self, request: Request) -> Response:
         """Registra novo usuário"""
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user = serializer.save()
+        user = await AuthService.aregister_user(serializer.to_dto())
 
         response = APIResponse(
             status_code=status.HTTP_201_CREATED,
@@ -63,7 +65,7 @@ class SignUpView(generics.CreateAPIView):
         )
 
 
-class LoginView(generics.CreateAPIView):
+class LoginView(AsyncAPIViewMixin, generics.CreateAPIView):
     """
     API endpoint for user login.
 
@@ -78,12 +80,12 @@ class LoginView(generics.CreateAPIView):
     serializer_class = LoginSerializer
     permission_classes = [AllowAny]
 
-    def post(self, request: Request) -> Response:
+    async def post(self, request: Request) -> Response:
         """Autentica usuário"""
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        user = serializer.validated_data["user"]
+        user = await AuthService.aauthenticate_user(serializer.to_dto())
 
         response_data = APIResponse(
             status_code=status.HTTP_200_OK,
@@ -140,7 +142,14 @@ class LogoutView(generics.GenericAPIView):
     permission_classes = [AllowAny]
 
     def post(self, request: Request) -> Response:
-        """Desloga o usuário"""
+        """Desloga o usuário e revoga os tokens atuais"""
+        access_token = request.COOKIES.get(settings.SIMPLE_JWT['AUTH_COOKIE'])
+        if access_token is None and request.auth is not None:
+            access_token = str(request.auth)
+        TokenService.revoke_tokens(
+            access_token,
+            request.COOKIES.get(settings.SIMPLE_JWT['AUTH_COOKIE_REFRESH']),
+        )
 
         response_data = APIResponse(
             status_code=status.HTTP_200_OK,
@@ -161,7 +170,7 @@ class LogoutView(generics.GenericAPIView):
 
         return response
 
-class RefreshTokenView(generics.GenericAPIView):
+class RefreshTokenView(AsyncAPIViewMixin, generics.GenericAPIView):
     """
     API endpoint for refreshing JWT tokens.
 
@@ -174,8 +183,8 @@ class RefreshTokenView(generics.GenericAPIView):
     serializer_class = RefreshTokenSerializer
     permission_classes = [AllowAny]
 
-    def post(self, request: Request) -> Response:
-        """Refresca o token de acesso"""
+    async def post(self, request: Request) -> Response:
+        """Refresca o token de acesso com as claims atuais do usuário"""
         refresh_token = request.COOKIES.get(settings.SIMPLE_JWT['AUTH_COOKIE_REFRESH'])
 
         if not refresh_token:
@@ -183,7 +192,7 @@ class RefreshTokenView(generics.GenericAPIView):
             raise UnauthorizedAccessException(error_msg) from None
         serializer = self.get_serializer(data={"refresh_token":refresh_token})
         serializer.is_valid(raise_exception=True)
-        new_access_token = serializer.validated_data["access_token"]
+        new_access_token = await TokenService.avalidate_refresh_token(serializer.validated_data["refresh_token"])
         response_data = APIResponse(
                 status_code=status.HTTP_200_OK,
                 message="Access token refreshed successfully",